@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""Benchmark do codec JSON (orjson x stdlib) nos payloads reais do projeto.
+
+Mede loads/dumpb sobre as fixtures de webhook e um envelope de task
+inbound (payload + metadados), nos dois backends.
+
+Uso:
+    python scripts/bench_json_codec.py [--iterations 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Adicionar src ao path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from pyloto_corp.utils import json_codec  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures" / "whatsapp" / "webhook"
+
+
+def _measure(func, iterations: int) -> float:  # noqa: ANN001
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    raw_bodies = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob("*.json"))]
+    json_codec.set_backend("stdlib")
+    envelope = {
+        "payload": [json_codec.loads(raw) for raw in raw_bodies],
+        "inbound_event_id": "wamid.bench",
+        "correlation_id": "corr-bench",
+        "signature_validated": True,
+    }
+
+    backends = [b for b in json_codec.BACKENDS if b != "orjson" or json_codec.orjson]
+    print(f"{'operação':<18}" + "".join(f"{b + ' µs':>14}" for b in backends))
+    results: dict[str, list[float]] = {"loads webhooks": [], "dumpb envelope": []}
+    for backend in backends:
+        json_codec.set_backend(backend)
+        results["loads webhooks"].append(
+            _measure(lambda: [json_codec.loads(raw) for raw in raw_bodies], args.iterations)
+        )
+        results["dumpb envelope"].append(
+            _measure(lambda: json_codec.dumpb(envelope), args.iterations)
+        )
+    for name, timings in results.items():
+        print(f"{name:<18}" + "".join(f"{t:>14.1f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""Benchmark do middleware de correlation-id (ASGI puro vs BaseHTTPMiddleware).
+
+Mede requests/s em `/health` e `POST /webhooks/whatsapp` chamando a app ASGI
+diretamente (sem rede), para isolar o custo do middleware.
+
+Uso:
+    python scripts/bench_middleware.py [--requests 3000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Adicionar src ao path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from pyloto_corp.api.app import create_app  # noqa: E402
+from pyloto_corp.config.settings import get_settings  # noqa: E402
+from pyloto_corp.infra.cloud_tasks import TaskMetadata  # noqa: E402
+from pyloto_corp.observability.middleware import _correlation_id  # noqa: E402
+
+WEBHOOK_SECRET = "bench-secret"
+
+
+class LegacyCorrelationIdMiddleware(BaseHTTPMiddleware):
+    """Implementação anterior (BaseHTTPMiddleware), apenas para comparação."""
+
+    async def dispatch(self, request, call_next):  # noqa: ANN001
+        correlation_id = request.headers.get("x-correlation-id") or str(uuid.uuid4())
+        token = _correlation_id.set(correlation_id)
+        try:
+            response = await call_next(request)
+        finally:
+            _correlation_id.reset(token)
+        response.headers["x-correlation-id"] = correlation_id
+        return response
+
+
+class NullDispatcher:
+    """Dispatcher em memória: o benchmark não mede Cloud Tasks."""
+
+    async def enqueue_inbound(self, payload, schedule_time=None):  # noqa: ANN001
+        return TaskMetadata(name="bench", queue="bench", schedule_time=schedule_time)
+
+
+def _build_app(legacy: bool):
+    app = create_app()
+    app.state.tasks_dispatcher = NullDispatcher()
+    if legacy:
+        app.user_middleware = [Middleware(LegacyCorrelationIdMiddleware)]
+        app.middleware_stack = None
+    return app
+
+
+def _webhook_body(index: int) -> bytes:
+    payload = {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "changes": [
+                    {
+                        "value": {
+                            "messages": [
+                                {
+                                    "id": f"wamid.bench.{index}",
+                                    "from": "5511999999999",
+                                    "type": "text",
+                                    "text": {"body": "oi"},
+                                    "timestamp": "1738272000",
+                                }
+                            ]
+                        }
+                    }
+                ]
+            }
+        ],
+    }
+    return json.dumps(payload).encode()
+
+
+async def _call(app, method: str, path: str, body: bytes = b"", headers=None) -> int:  # noqa: ANN001
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), *(headers or [])],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    return status
+
+
+async def _bench(app, endpoint: str, total: int) -> float:  # noqa: ANN001
+    requests = []
+    for i in range(total):
+        if endpoint == "/health":
+            requests.append(("GET", b"", []))
+        else:
+            body = _webhook_body(i)
+            digest = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+            headers = [
+                (b"content-type", b"application/json"),
+                (b"x-hub-signature-256", f"sha256={digest}".encode()),
+            ]
+            requests.append(("POST", body, headers))
+
+    started = time.perf_counter()
+    for method, body, headers in requests:
+        status = await _call(app, method, endpoint, body, headers)
+        if status != 200:
+            raise RuntimeError(f"{endpoint} respondeu {status}")
+    return total / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("WHATSAPP_WEBHOOK_SECRET", WEBHOOK_SECRET)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    get_settings.cache_clear()
+
+    print(f"{'endpoint':<22}{'BaseHTTPMiddleware':>20}{'ASGI puro':>14}{'ganho':>10}")
+    for endpoint in ("/health", "/webhooks/whatsapp"):
+        legacy = asyncio.run(_bench(_build_app(legacy=True), endpoint, args.requests))
+        asgi = asyncio.run(_bench(_build_app(legacy=False), endpoint, args.requests))
+        print(f"{endpoint:<22}{legacy:>16.0f} r/s{asgi:>10.0f} r/s{asgi / legacy - 1:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""Benchmark do custo de preparo de mensagens outbound.
+
+Compara o caminho antigo (validação + payload construído duas vezes +
+serialização JSON a cada tentativa HTTP) com `WhatsAppOutboundClient.prepare`
+(validação, construção e serialização uma vez; retries reutilizam os bytes),
+para texto, botões, lista e template.
+
+Uso:
+    python scripts/bench_outbound_prepare.py [--iterations 20000] [--attempts 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Adicionar src ao path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from pyloto_corp.adapters.whatsapp.models import OutboundMessageRequest  # noqa: E402
+from pyloto_corp.adapters.whatsapp.outbound import (  # noqa: E402
+    PreparedMessage,
+    WhatsAppOutboundClient,
+)
+from pyloto_corp.adapters.whatsapp.payload_builders.factory import (  # noqa: E402
+    build_full_payload,
+)
+
+TO = "+5511987654321"
+
+REQUESTS = {
+    "texto": OutboundMessageRequest(
+        to=TO, message_type="text", text="Olá! Como posso ajudar hoje? " * 8
+    ),
+    "botões": OutboundMessageRequest(
+        to=TO,
+        message_type="interactive",
+        interactive_type="button",
+        text="Escolha uma opção para continuar o atendimento",
+        buttons=[{"id": f"opt_{i}", "title": f"Opção {i}"} for i in range(3)],
+    ),
+    "lista": OutboundMessageRequest(
+        to=TO,
+        message_type="interactive",
+        interactive_type="list",
+        text="Veja os serviços disponíveis",
+        buttons=[{"id": f"svc_{i}", "title": f"Serviço {i}"} for i in range(10)],
+    ),
+    "template": OutboundMessageRequest(
+        to=TO,
+        message_type="template",
+        template_name="retomada_atendimento",
+        template_params={f"p{i}": f"valor {i}" for i in range(4)},
+        category="UTILITY",
+    ),
+}
+
+
+def _legacy(client: WhatsAppOutboundClient, request: OutboundMessageRequest, attempts: int) -> None:
+    """Caminho anterior: valida, constrói 2x e o httpx serializa por tentativa."""
+    client.validator.validate_outbound_request(request)
+    build_full_payload(request)
+    payload = build_full_payload(request)
+    for _ in range(attempts):
+        json.dumps(payload).encode("utf-8")
+
+
+def _prepared(
+    client: WhatsAppOutboundClient, request: OutboundMessageRequest, attempts: int
+) -> None:
+    prepared = client.prepare(request)
+    for _ in range(attempts):
+        _ = prepared.body
+
+
+def _measure(func, args: tuple, iterations: int) -> float:  # noqa: ANN001
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(*args)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--attempts", type=int, default=3)
+    args = parser.parse_args()
+
+    client = WhatsAppOutboundClient(
+        api_endpoint="https://graph.facebook.com", access_token="x", phone_number_id="1"
+    )
+    for name, request in REQUESTS.items():
+        prepared = client.prepare(request)
+        if not isinstance(prepared, PreparedMessage):
+            raise SystemExit(f"request inválido no benchmark ({name}): {prepared.error_message}")
+
+    print(f"{'tipo':<10}{'antigo µs':>12}{'prepared µs':>14}{'speedup':>10}")
+    for name, request in REQUESTS.items():
+        legacy = _measure(_legacy, (client, request, args.attempts), args.iterations)
+        prepared = _measure(_prepared, (client, request, args.attempts), args.iterations)
+        print(f"{name:<10}{legacy:>12.2f}{prepared:>14.2f}{legacy / prepared:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Benchmark da verificação de assinatura do webhook.
+
+Compara `verify_meta_signature` (encode do secret + HMAC keyed por request)
+com `WebhookSignatureVerifier` (template pré-chaveado copiado por request),
+com um e com dois secrets ativos (rotação).
+
+Uso:
+    python scripts/bench_signature.py [--iterations 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import hmac
+import sys
+import time
+from pathlib import Path
+
+# Adicionar src ao path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from pyloto_corp.adapters.whatsapp.signature import (  # noqa: E402
+    WebhookSignatureVerifier,
+    verify_meta_signature,
+)
+
+SECRET = "bench-webhook-secret-" + "x" * 43
+
+
+def _measure(func, args: tuple, iterations: int) -> float:  # noqa: ANN001
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(*args)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'corpo':<10}{'função µs':>12}{'verifier µs':>14}{'rotação µs':>14}")
+    for size in (512, 4_096, 65_536):
+        body = b"x" * size
+        digest = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+        headers = {"x-hub-signature-256": f"sha256={digest}"}
+        single = WebhookSignatureVerifier([SECRET])
+        # pior caso da rotação: assinatura com o secret anterior (segunda chave)
+        rotating = WebhookSignatureVerifier(["next-secret", SECRET])
+
+        legacy = _measure(verify_meta_signature, (body, headers, SECRET), args.iterations)
+        cached = _measure(single.verify, (body, headers), args.iterations)
+        rotated = _measure(rotating.verify, (body, headers), args.iterations)
+        print(f"{size:<10}{legacy:>12.2f}{cached:>14.2f}{rotated:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Benchmark de cold start: tempo de import e time-to-first-request.
+
+Cada medição roda em um processo Python novo (como um cold start do Cloud
+Run) e reporta a mediana de:
+- import: `import pyloto_corp.api.app`
+- startup: criação da app + lifespan (backends e prewarm opcional)
+- first request: primeira resposta de `GET /health`
+
+Compara a construção eager (`create_app()`) com a lazy (`create_app(lazy=True)`).
+
+Uso:
+    python scripts/bench_startup.py [--runs 5] [--prewarm]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+src_path = Path(__file__).parent.parent / "src"
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import pyloto_corp.api.app as module
+from fastapi.testclient import TestClient
+t1 = time.perf_counter()
+app = module.create_app(lazy={lazy})
+with TestClient(app) as client:
+    t2 = time.perf_counter()
+    status = client.get("/health").status_code
+    t3 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "startup": t2 - t1, "first_request": t3 - t0,
+                  "status": status}}))
+"""
+
+
+def _run(lazy: bool, prewarm: bool) -> dict[str, float]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(src_path),
+        "LOG_LEVEL": "ERROR",
+        "APP_PREWARM_ENABLED": "true" if prewarm else "false",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(lazy=lazy)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--prewarm", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'modo':<8}{'import ms':>12}{'startup ms':>12}{'1ª request ms':>16}")
+    for lazy in (False, True):
+        samples = [_run(lazy, args.prewarm) for _ in range(args.runs)]
+        medians = {
+            key: statistics.median(sample[key] for sample in samples) * 1000
+            for key in ("import", "startup", "first_request")
+        }
+        mode = "lazy" if lazy else "eager"
+        print(
+            f"{mode:<8}{medians['import']:>12.0f}{medians['startup']:>12.0f}"
+            f"{medians['first_request']:>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""Benchmark do ingress do webhook: parse completo vs ingress raw.
+
+- parse: json.loads + compute_inbound_event_id + re-serialização da task
+- raw: HMAC sobre os bytes + varredura do id + bytes originais como corpo
+
+Mede requests/s e latência p50/p99 chamando a app ASGI diretamente, com
+payloads de tamanho crescente (mensagens com texto longo).
+
+Uso:
+    python scripts/bench_webhook_ingress.py [--requests 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Adicionar src ao path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from bench_middleware import _call  # noqa: E402
+
+from pyloto_corp.api.app import create_app  # noqa: E402
+from pyloto_corp.config.settings import get_settings  # noqa: E402
+from pyloto_corp.infra.cloud_tasks import TaskMetadata, _serialize_payload  # noqa: E402
+
+WEBHOOK_SECRET = "bench-secret"
+
+
+class SerializingDispatcher:
+    """Reproduz o custo de serialização do CloudTasksDispatcher, sem rede."""
+
+    async def enqueue_inbound(self, payload, schedule_time=None):  # noqa: ANN001
+        _serialize_payload(payload)
+        return TaskMetadata(name="bench", queue="bench", schedule_time=schedule_time)
+
+    async def enqueue_inbound_raw(self, body, *, headers, schedule_time=None):  # noqa: ANN001
+        return TaskMetadata(name="bench", queue="bench", schedule_time=schedule_time)
+
+
+def _webhook_body(index: int, text_size: int) -> bytes:
+    message = {
+        "id": f"wamid.bench.{index}",
+        "from": "5511999999999",
+        "type": "text",
+        "text": {"body": "x" * text_size},
+        "timestamp": "1738272000",
+    }
+    value = {
+        "messaging_product": "whatsapp",
+        "metadata": {"display_phone_number": "5511000000000", "phone_number_id": "123"},
+        "contacts": [{"profile": {"name": "Bench"}, "wa_id": "5511999999999"}],
+        "messages": [message],
+    }
+    payload = {
+        "object": "whatsapp_business_account",
+        "entry": [{"id": "waba", "changes": [{"field": "messages", "value": value}]}],
+    }
+    return json.dumps(payload).encode()
+
+
+async def _bench(raw: bool, total: int, text_size: int) -> tuple[float, float, float]:
+    os.environ["WEBHOOK_RAW_INGRESS_ENABLED"] = "true" if raw else "false"
+    get_settings.cache_clear()
+    app = create_app()
+    app.state.tasks_dispatcher = SerializingDispatcher()
+
+    requests = []
+    for i in range(total):
+        body = _webhook_body(i, text_size)
+        digest = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"x-hub-signature-256", f"sha256={digest}".encode()),
+        ]
+        requests.append((body, headers))
+
+    latencies = []
+    started = time.perf_counter()
+    for body, headers in requests:
+        t0 = time.perf_counter()
+        status = await _call(app, "POST", "/webhooks/whatsapp", body, headers)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if status != 200:
+            raise RuntimeError(f"webhook respondeu {status}")
+    rps = total / (time.perf_counter() - started)
+    quantiles = statistics.quantiles(latencies, n=100)
+    return rps, quantiles[49], quantiles[98]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("WHATSAPP_WEBHOOK_SECRET", WEBHOOK_SECRET)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    print(f"{'payload':<10}{'modo':<8}{'r/s':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for text_size in (16, 4_096, 65_536):
+        for raw in (False, True):
+            rps, p50, p99 = asyncio.run(_bench(raw, args.requests, text_size))
+            mode = "raw" if raw else "parse"
+            print(f"{text_size:<10}{mode:<8}{rps:>8.0f}{p50:>10.3f}{p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,11 @@ if TYPE_CHECKING:
 
 logger: logging.Logger = get_logger(__name__)
 
+# Rate limits da Meta (vêm com type OAuthException, mas são transitórios)
+PAIR_RATE_LIMIT_ERROR_CODE = 131056  # par empresa/usuário acima do pair rate
+THROUGHPUT_RATE_LIMIT_ERROR_CODES = frozenset({4, 80007, 130429})  # app, WABA, número
+RATE_LIMIT_ERROR_CODES = THROUGHPUT_RATE_LIMIT_ERROR_CODES | {PAIR_RATE_LIMIT_ERROR_CODE}
+
 
 @dataclass(frozen=True)
 class WhatsAppApiError:
@@ -42,6 +47,10 @@ class WhatsAppApiError:
     error_message: str
     is_permanent: bool  # True se erro não é retentável
 
+    @property
+    def is_rate_limited(self) -> bool:
+        return self.error_code in RATE_LIMIT_ERROR_CODES
+
 
 def _parse_meta_error(response_data: dict[str, Any]) -> WhatsAppApiError | None:
     """Extrai informações de erro do response da Meta.
@@ -75,8 +84,11 @@ def _is_permanent_error(error_code: int, error_type: str) -> bool:
     """Classifica erro como permanente ou transitório.
 
     Erros permanentes: 400, 401, 403, 404, 413
-    Erros transitórios: 429 (rate limit), 500+ (server errors)
+    Erros transitórios: 429 e códigos de rate limit Meta, 500+ (server errors)
     """
+    if error_code in RATE_LIMIT_ERROR_CODES:
+        return False
+
     permanent_codes = {400, 401, 403, 404, 413}
     if error_code in permanent_codes:
         return True
@@ -120,6 +132,14 @@ def _log_success(
     )
 
 
+def _json_or_empty(response: httpx.Response) -> dict[str, Any]:
+    try:
+        data = response.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
 class WhatsAppHttpClient(HttpClient):
     """Cliente HTTP especializado para Meta/WhatsApp API.
 
@@ -135,28 +155,31 @@ class WhatsAppHttpClient(HttpClient):
         self,
         config: HttpClientConfig | None = None,
         phone_number_id: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
     ) -> None:
         """Inicializa cliente WhatsApp.
 
         Args:
             config: Configuração HTTP base
             phone_number_id: ID do número (para logging/dedup)
+            transport: Transporte httpx alternativo (Graph API fake em testes)
         """
-        super().__init__(config)
+        super().__init__(config, transport=transport)
         self.phone_number_id = phone_number_id
 
     async def send_message(
         self,
         endpoint: str,
         access_token: str,
-        payload: dict[str, Any],
+        payload: dict[str, Any] | bytes,
     ) -> dict[str, Any]:
         """Envia mensagem via WhatsApp API.
 
         Args:
             endpoint: URL do endpoint (ex: .../messages)
             access_token: Bearer token para autenticação
-            payload: Payload JSON da mensagem
+            payload: Payload JSON da mensagem, ou o corpo já serializado
+                (bytes enviados como estão em todas as tentativas)
 
         Returns:
             Response JSON da Meta
@@ -208,16 +231,40 @@ class WhatsAppHttpClient(HttpClient):
     async def _execute_send(
         self,
         url: str,
-        payload: dict[str, Any],
+        payload: dict[str, Any] | bytes,
         headers: dict[str, str],
         endpoint: str,
     ) -> httpx.Response:
         """Executa POST com tratamento de erros previsível."""
         try:
+            if isinstance(payload, bytes):
+                return await self.post(url, content=payload, headers=headers)
             return await self.post(url, json=payload, headers=headers)
         except HttpError:
             raise
 
+    def _process_response(
+        self,
+        response: httpx.Response,
+        method: str,
+        url: str,
+    ) -> httpx.Response | None:
+        """Rate limit da Meta (HTTP 400/429 com código Meta) vira erro próprio.
+
+        Sem retry interno: quem envia (shaper/sequenciador) decide quando
+        tentar de novo, em vez de insistir no mesmo par/número.
+        """
+        if not response.is_success:
+            meta_error = _parse_meta_error(_json_or_empty(response))
+            if meta_error is not None and meta_error.is_rate_limited:
+                _log_meta_error(meta_error, method, url)
+                raise HttpError(
+                    f"Meta API rate limit ({meta_error.error_code})",
+                    status_code=meta_error.error_code,
+                    is_retryable=True,
+                )
+        return super()._process_response(response, method, url)
+
     def _process_whatsapp_response(
         self,
         response: httpx.Response,
@@ -218,6 +218,18 @@ def build_sticker_payload(
     }
 
 
+_TEXT_FIELDS = (
+    ("text", "body"),
+    ("interactive", "body", "text"),
+    ("interactive", "header", "text"),
+    ("interactive", "footer", "text"),
+)
+
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_DOCUMENT_RE = re.compile(r"\b\d{3}\.\d{3}\.\d{3}-\d{2}\b")
+_PHONE_RE = re.compile(r"\(\d{2}\)\s?9?\d{4}-\d{4}")
+
+
 def sanitize_payload(payload: dict[str, Any]) -> dict[str, Any]:
     """Sanitiza payload removendo PII para logging seguro.
 
@@ -226,15 +238,16 @@ def sanitize_payload(payload: dict[str, Any]) -> dict[str, Any]:
     - Emails
     - Documentos
 
+    Copia só os dicts no caminho dos campos mascarados (sem deepcopy); o
+    resto é compartilhado com o original, que não é modificado.
+
     Args:
         payload: Payload original (não modifica)
 
     Returns:
         Payload com campos sensíveis mascarados
     """
-    import copy
-
-    sanitized = copy.deepcopy(payload)
+    sanitized = dict(payload)
 
     # Mascarar número "to"
     if "to" in sanitized:
@@ -243,44 +256,46 @@ def sanitize_payload(payload: dict[str, Any]) -> dict[str, Any]:
             sanitized["to"] = f"***{phone[-4:]}"
 
     # Mascarar texto (se contiver email/documento)
-    text_fields = [
-        ("text", "body"),
-        ("interactive", "body", "text"),
-        ("interactive", "header", "text"),
-        ("interactive", "footer", "text"),
-    ]
-
-    for path in text_fields:
-        try:
-            current = sanitized
-            for key in path[:-1]:
-                if isinstance(current, dict):
-                    current = current.get(key)
-                else:
-                    current = None
-                    break
-
-            if current and isinstance(current, dict):
-                final_key = path[-1]
-                if final_key in current:
-                    text = current[final_key]
-                    current[final_key] = _mask_sensitive_text(text)
-        except (KeyError, TypeError, AttributeError):
-            pass  # Field not present, skip
+    for path in _TEXT_FIELDS:
+        _mask_path(sanitized, path)
 
     return sanitized
 
 
+def _mask_path(sanitized: dict[str, Any], path: tuple[str, ...]) -> None:
+    """Mascara o texto em `path`, copiando os dicts intermediários."""
+    parents = [sanitized]
+    for key in path[:-1]:
+        child = parents[-1].get(key)
+        if not isinstance(child, dict):
+            return
+        parents.append(child)
+
+    text = parents[-1].get(path[-1])
+    if not isinstance(text, str):
+        return
+    masked = _mask_sensitive_text(text)
+    if masked == text:
+        return
+
+    # Copy-on-write do caminho: nenhum dict do original é alterado
+    current = sanitized
+    for key in path[:-1]:
+        current[key] = dict(current[key])
+        current = current[key]
+    current[path[-1]] = masked
+
+
 def _mask_sensitive_text(text: str) -> str:
     """Mascareia email, CPF, telefone em texto."""
     # Email pattern
-    text = re.sub(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "[EMAIL]", text)
+    text = _EMAIL_RE.sub("[EMAIL]", text)
 
     # CPF/CNPJ-like patterns (11 dígitos)
-    text = re.sub(r"\b\d{3}\.\d{3}\.\d{3}-\d{2}\b", "[DOCUMENT]", text)
+    text = _DOCUMENT_RE.sub("[DOCUMENT]", text)
 
     # Telefone pattern (11 dígitos)
-    text = re.sub(r"\(\d{2}\)\s?9?\d{4}-\d{4}", "[PHONE]", text)
+    text = _PHONE_RE.sub("[PHONE]", text)
 
     return text
 
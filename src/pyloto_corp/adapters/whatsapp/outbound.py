@@ -2,6 +2,9 @@
 
 Responsabilidade:
 - Orquestrar validação e construção de payload
+- Preparar cada mensagem uma vez (`PreparedMessage`: validada, construída
+  e serializada em bytes) e reutilizá-la no envio e nos retries
+- Envio em lote concorrente e modelado por rate limit (`outbound_batch`)
 - Gerenciar idempotência via dedupe_key
 - Evitar exposição de secrets em logs
 - Rastrear envios para auditoria (sem PII)
@@ -13,7 +16,7 @@ import asyncio
 import hashlib
 import logging
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pyloto_corp.adapters.whatsapp.models import (
     OutboundMessageRequest,
@@ -26,6 +29,11 @@ from pyloto_corp.adapters.whatsapp.validators import (
     ValidationError,
     WhatsAppMessageValidator,
 )
+from pyloto_corp.utils import json_codec
+
+if TYPE_CHECKING:
+    from pyloto_corp.adapters.whatsapp.outbound_batch import BatchSendResult
+    from pyloto_corp.adapters.whatsapp.rate_shaper import OutboundRateShaper
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +56,25 @@ class OutboundMessage:
     idempotency_key: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class PreparedMessage:
+    """Mensagem pronta para envio: validada, construída e serializada uma vez.
+
+    `body` é o JSON exato enviado à Meta; o HTTP client o reutiliza em cada
+    tentativa sem reconstruir nem reserializar o payload.
+    """
+
+    message_type: str
+    recipient: str
+    idempotency_key: str | None
+    body: bytes
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        """Cópia decodificada do payload (inspeção/testes; não usada no envio)."""
+        return json_codec.loads(self.body)
+
+
 class WhatsAppOutboundClient:
     """Cliente para envio outbound via API Meta/WhatsApp.
 
@@ -59,6 +86,7 @@ class WhatsAppOutboundClient:
         api_endpoint: str,
         access_token: str,
         phone_number_id: str,
+        http_client: Any = None,
     ):
         """Inicializa o cliente.
 
@@ -66,11 +94,19 @@ class WhatsAppOutboundClient:
             api_endpoint: URL base da API Meta
             access_token: Bearer token para autenticação
             phone_number_id: ID do número de telefone registrado
+            http_client: WhatsAppHttpClient reutilizado entre envios
+                (None = um cliente por envio)
         """
         self.api_endpoint = api_endpoint
         self.access_token = access_token
         self.phone_number_id = phone_number_id
         self.validator = WhatsAppMessageValidator()
+        self._http_client = http_client
+
+    @property
+    def http_client(self) -> Any:
+        """Cliente HTTP compartilhado (None = um por envio)."""
+        return self._http_client
 
     def send_message_sync(self, request: OutboundMessageRequest) -> OutboundMessageResponse:
         """Envia mensagem em contexto síncrono (apoio para testes/local)."""
@@ -92,18 +128,35 @@ class WhatsAppOutboundClient:
         Returns:
             Resposta do envio
         """
-        # 1. Validar requisição
+        prepared = self.prepare(request)
+        if isinstance(prepared, OutboundMessageResponse):
+            return prepared
+        return await self.send_prepared(prepared)
+
+    def prepare(
+        self,
+        request: OutboundMessageRequest,
+    ) -> PreparedMessage | OutboundMessageResponse:
+        """Valida, constrói e serializa a mensagem (uma vez por mensagem).
+
+        Returns:
+            PreparedMessage pronta para `send_prepared`, ou resposta de erro
+            (VALIDATION_ERROR / PAYLOAD_BUILD_ERROR)
+        """
         validation_error = self._validate_request(request)
         if validation_error:
             return validation_error
 
-        # 2. Construir payload
         payload_result = self._build_payload_safe(request)
         if isinstance(payload_result, OutboundMessageResponse):
             return payload_result
 
-        # 3. Enviar via HTTP (async/await, padrão puro)
-        return await self._send_real(request)
+        return PreparedMessage(
+            message_type=request.message_type,
+            recipient=request.to,
+            idempotency_key=request.idempotency_key,
+            body=json_codec.dumpb(payload_result),
+        )
 
     def _validate_request(
         self,
@@ -142,35 +195,36 @@ class WhatsAppOutboundClient:
                 error_message=str(exc),
             )
 
-    async def _send_real(
+    async def send_prepared(
         self,
-        request: OutboundMessageRequest,
+        prepared: PreparedMessage,
+        *,
+        http_client: Any = None,
     ) -> OutboundMessageResponse:
-        """Envia mensagem via WhatsApp HTTP API."""
+        """Envia mensagem já preparada via WhatsApp HTTP API.
+
+        Pode ser chamado de novo com a mesma `PreparedMessage` (retry do
+        chamador) sem custo de validação/construção. Rate limit da Meta volta
+        como `WHATSAPP_PAIR_RATE_LIMITED` (131056, por destinatário) ou
+        `WHATSAPP_RATE_LIMITED` (número/WABA/app).
+        """
         from pyloto_corp.adapters.whatsapp.http_client import WhatsAppHttpClient
         from pyloto_corp.config.settings import get_settings
 
         settings = get_settings()
 
-        # Construir payload
-        payload_result = self._build_payload_safe(request)
-        if isinstance(payload_result, OutboundMessageResponse):
-            return payload_result
-
-        payload = payload_result
-
         # Construir endpoint para envio
-        phone_id = settings.whatsapp_phone_number_id
+        phone_id = self.sending_phone_number_id(settings)
         api_version = settings.whatsapp_api_version
         base_url = settings.whatsapp_api_base_url
         endpoint = f"{base_url}/{api_version}/{phone_id}/messages"
 
         try:
-            http_client = WhatsAppHttpClient()
+            http_client = http_client or self._http_client or WhatsAppHttpClient()
             response = await http_client.send_message(
                 endpoint=endpoint,
                 access_token=settings.whatsapp_access_token,
-                payload=payload,
+                payload=prepared.body,
             )
 
             message_id = response.get("messages", [{}])[0].get("id", "unknown")
@@ -178,7 +232,7 @@ class WhatsAppOutboundClient:
                 "message_sent_to_whatsapp_api",
                 extra={
                     "message_id": message_id,
-                    "request_id": request.idempotency_key,
+                    "request_id": prepared.idempotency_key,
                 },
             )
 
@@ -192,24 +246,43 @@ class WhatsAppOutboundClient:
                 "whatsapp_send_failed",
                 extra={
                     "error": str(e),
-                    "request_id": request.idempotency_key,
+                    "request_id": prepared.idempotency_key,
                 },
             )
             return OutboundMessageResponse(
                 success=False,
-                error_code="WHATSAPP_API_ERROR",
+                error_code=_send_error_code(e),
                 error_message=str(e),
             )
 
-    def send_batch(
+    def sending_phone_number_id(self, settings: Any) -> str | None:
+        """phone_number_id usado no endpoint (settings têm prioridade)."""
+        return settings.whatsapp_phone_number_id or self.phone_number_id
+
+    async def send_batch(
         self,
         requests: list[OutboundMessageRequest],
-    ) -> list[OutboundMessageResponse]:
-        """Envia lote de mensagens em modo síncrono (helper)."""
-        responses: list[OutboundMessageResponse] = []
-        for request in requests:
-            responses.append(self.send_message_sync(request))
-        return responses
+        *,
+        max_concurrency: int | None = None,
+        rate_shaper: OutboundRateShaper | None = None,
+    ) -> list[BatchSendResult]:
+        """Envia lote com concorrência limitada e vazão modelada (ver `outbound_batch`).
+
+        Returns:
+            Um `BatchSendResult` por request, na ordem de entrada
+        """
+        from pyloto_corp.adapters.whatsapp.outbound_batch import send_batch
+
+        return await send_batch(
+            self, requests, max_concurrency=max_concurrency, rate_shaper=rate_shaper
+        )
+
+    def send_batch_sync(
+        self,
+        requests: list[OutboundMessageRequest],
+    ) -> list[BatchSendResult]:
+        """Envia lote em contexto síncrono (um event loop para o lote todo)."""
+        return asyncio.run(self.send_batch(requests))
 
     @staticmethod
     def generate_dedupe_key(
@@ -229,3 +302,18 @@ class WhatsAppOutboundClient:
         """
         key_material = f"{to}:{message_type}:{content_hash}"
         return hashlib.sha256(key_material.encode()).hexdigest()
+
+
+def _send_error_code(exc: Exception) -> str:
+    """Classifica falha de envio; rate limit Meta ganha código próprio."""
+    from pyloto_corp.adapters.whatsapp.http_client import (
+        PAIR_RATE_LIMIT_ERROR_CODE,
+        THROUGHPUT_RATE_LIMIT_ERROR_CODES,
+    )
+
+    status_code = getattr(exc, "status_code", None)
+    if status_code == PAIR_RATE_LIMIT_ERROR_CODE:
+        return "WHATSAPP_PAIR_RATE_LIMITED"
+    if status_code in THROUGHPUT_RATE_LIMIT_ERROR_CODES:
+        return "WHATSAPP_RATE_LIMITED"
+    return "WHATSAPP_API_ERROR"
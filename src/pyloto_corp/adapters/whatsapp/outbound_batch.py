@@ -0,0 +1,194 @@
+"""Envio outbound em lote: concorrente, limitado e modelado por rate limit.
+
+Responsabilidades:
+- Preparar cada mensagem uma vez (`WhatsAppOutboundClient.prepare`)
+- Espaçar envios por número e por destinatário (`OutboundRateShaper`)
+- Limitar requisições HTTP simultâneas (semáforo) e reutilizar um único
+  cliente HTTP (pool de conexões) no lote
+- Em rate limit da Meta: penalizar número/par no shaper e reenviar de
+  forma limitada
+- Resultado estruturado por mensagem, na ordem de entrada (sem PII)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from pyloto_corp.adapters.whatsapp.models import (
+    OutboundMessageRequest,
+    OutboundMessageResponse,
+)
+from pyloto_corp.adapters.whatsapp.rate_shaper import (
+    OutboundRateShaper,
+    get_outbound_rate_shaper,
+)
+from pyloto_corp.observability.logging import get_logger
+
+if TYPE_CHECKING:
+    from pyloto_corp.adapters.whatsapp.outbound import (
+        PreparedMessage,
+        WhatsAppOutboundClient,
+    )
+
+logger: logging.Logger = get_logger(__name__)
+
+RATE_LIMITED_ERROR_CODES = frozenset({"WHATSAPP_RATE_LIMITED", "WHATSAPP_PAIR_RATE_LIMITED"})
+
+
+@dataclass(frozen=True, slots=True)
+class BatchSendResult:
+    """Resultado de uma mensagem do lote."""
+
+    index: int
+    idempotency_key: str | None
+    response: OutboundMessageResponse
+    attempts: int  # envios HTTP feitos (0 = falhou no preparo)
+    throttled_seconds: float  # espera imposta pelo shaper
+    rate_limited: int  # respostas de rate limit da Meta recebidas
+    source_keys: tuple[str | None, ...] = ()  # chaves originais quando coalescida
+
+    @property
+    def success(self) -> bool:
+        return self.response.success
+
+    @property
+    def message_id(self) -> str | None:
+        return self.response.message_id
+
+    @property
+    def error_code(self) -> str | None:
+        return self.response.error_code
+
+
+@dataclass(slots=True)
+class _BatchContext:
+    client: WhatsAppOutboundClient
+    shaper: OutboundRateShaper
+    semaphore: asyncio.Semaphore
+    http_client: Any
+    phone_number_id: str
+    max_rate_limit_retries: int
+
+
+async def send_batch(
+    client: WhatsAppOutboundClient,
+    requests: list[OutboundMessageRequest],
+    *,
+    max_concurrency: int | None = None,
+    rate_shaper: OutboundRateShaper | None = None,
+) -> list[BatchSendResult]:
+    """Envia o lote e devolve um resultado por request (mesma ordem)."""
+    if not requests:
+        return []
+
+    from pyloto_corp.adapters.whatsapp.http_client import WhatsAppHttpClient
+    from pyloto_corp.config.settings import get_settings
+
+    settings = get_settings()
+    owned_http = client.http_client is None
+    context = _BatchContext(
+        client=client,
+        shaper=rate_shaper or get_outbound_rate_shaper(),
+        semaphore=asyncio.Semaphore(
+            max(max_concurrency or settings.whatsapp_batch_max_concurrency, 1)
+        ),
+        http_client=client.http_client or WhatsAppHttpClient(),
+        phone_number_id=client.sending_phone_number_id(settings) or "",
+        max_rate_limit_retries=settings.whatsapp_rate_limit_max_retries,
+    )
+
+    started = time.monotonic()
+    try:
+        results = await asyncio.gather(
+            *(_send_one(context, index, request) for index, request in enumerate(requests))
+        )
+    finally:
+        if owned_http:
+            await context.http_client.close()
+
+    logger.info(
+        "whatsapp_batch_sent",
+        extra={
+            "total": len(results),
+            "succeeded": sum(result.success for result in results),
+            "rate_limited": sum(result.rate_limited for result in results),
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "shaper": context.shaper.snapshot(),
+        },
+    )
+    return list(results)
+
+
+async def _send_one(
+    context: _BatchContext, index: int, request: OutboundMessageRequest
+) -> BatchSendResult:
+    prepared = context.client.prepare(request)
+    if isinstance(prepared, OutboundMessageResponse):
+        return BatchSendResult(index, request.idempotency_key, prepared, 0, 0.0, 0)
+    return await send_with_rate_limit(
+        context.client,
+        prepared,
+        context.shaper,
+        context.phone_number_id,
+        max_rate_limit_retries=context.max_rate_limit_retries,
+        http_client=context.http_client,
+        semaphore=context.semaphore,
+        index=index,
+    )
+
+
+async def send_with_rate_limit(
+    client: WhatsAppOutboundClient,
+    prepared: PreparedMessage,
+    shaper: OutboundRateShaper,
+    phone_number_id: str,
+    *,
+    max_rate_limit_retries: int,
+    http_client: Any = None,
+    semaphore: asyncio.Semaphore | None = None,
+    index: int = 0,
+) -> BatchSendResult:
+    """Envia uma mensagem preparada respeitando o shaper.
+
+    Rate limit da Meta penaliza par/número e reenvia até
+    `max_rate_limit_retries` vezes; o resultado final (sucesso ou o último
+    rate limit) vai no `BatchSendResult`.
+    """
+    attempts = 0
+    rate_limited = 0
+    throttled = 0.0
+    while True:
+        throttled += await shaper.acquire_async(phone_number_id, prepared.recipient)
+        if semaphore is not None:
+            async with semaphore:
+                response = await client.send_prepared(prepared, http_client=http_client)
+        else:
+            response = await client.send_prepared(prepared, http_client=http_client)
+        attempts += 1
+        if response.error_code not in RATE_LIMITED_ERROR_CODES:
+            break
+        rate_limited += 1
+        _penalize(shaper, phone_number_id, prepared, response)
+        if rate_limited > max_rate_limit_retries:
+            break
+
+    return BatchSendResult(
+        index, prepared.idempotency_key, response, attempts, throttled, rate_limited
+    )
+
+
+def _penalize(
+    shaper: OutboundRateShaper,
+    phone_number_id: str,
+    prepared: PreparedMessage,
+    response: OutboundMessageResponse,
+) -> None:
+    """Pair rate pausa só o destinatário; os demais limites pausam o número."""
+    if response.error_code == "WHATSAPP_PAIR_RATE_LIMITED":
+        shaper.penalize(phone_number_id, prepared.recipient)
+    else:
+        shaper.penalize(phone_number_id)
@@ -0,0 +1,318 @@
+"""Sequenciamento outbound por destinatário: ordem, coalescência e pair rate.
+
+Responsabilidades:
+- Enviar as partes de uma resposta (rajada inbound, `MessagePlan` com várias
+  partes) ao mesmo destinatário em ordem, sem intercalar com outra
+  sequência para o mesmo destinatário no processo
+- Coalescer textos simples consecutivos numa única mensagem (até o limite
+  de texto da Meta), economizando pair rate
+- Espaçar envios via `OutboundRateShaper`; em rate limit da Meta (131056 e
+  limites de vazão, classificados por `_parse_meta_error`) penalizar e
+  reenviar de forma limitada (`send_with_rate_limit`)
+- Parar na primeira falha: as partes seguintes voltam `SEQUENCE_ABORTED`
+  e ficam para o retry da task, sem sair fora de ordem
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any
+
+from pyloto_corp.adapters.whatsapp.models import (
+    OutboundMessageRequest,
+    OutboundMessageResponse,
+)
+from pyloto_corp.adapters.whatsapp.outbound_batch import (
+    BatchSendResult,
+    send_with_rate_limit,
+)
+from pyloto_corp.adapters.whatsapp.rate_shaper import (
+    OutboundRateShaper,
+    get_outbound_rate_shaper,
+)
+from pyloto_corp.adapters.whatsapp.validators.limits import (
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+    MAX_TEXT_LENGTH,
+)
+from pyloto_corp.observability.logging import get_logger
+
+if TYPE_CHECKING:
+    from pyloto_corp.adapters.whatsapp.outbound import WhatsAppOutboundClient
+
+logger: logging.Logger = get_logger(__name__)
+
+SEQUENCE_ABORTED = "SEQUENCE_ABORTED"
+
+# Campos que tornam um texto "não simples" (não coalescível)
+_NON_TEXT_FIELDS = (
+    "media_id",
+    "media_url",
+    "buttons",
+    "interactive_type",
+    "template_name",
+    "footer",
+)
+
+
+def is_plain_text(request: OutboundMessageRequest) -> bool:
+    """Texto sem mídia/interativo/template: pode ser concatenado a outro."""
+    if request.message_type != "text" or not request.text:
+        return False
+    return all(getattr(request, field) is None for field in _NON_TEXT_FIELDS)
+
+
+def merged_idempotency_key(keys: list[str | None]) -> str | None:
+    """Chave determinística da mensagem coalescida (retry da task a reproduz).
+
+    Uma parte mantém a própria chave; várias viram `<primeira>+<n>`, ou hash
+    quando passaria do limite de tamanho.
+    """
+    if len(keys) == 1:
+        return keys[0]
+    if any(key is None for key in keys):
+        return None
+    merged = f"{keys[0]}+{len(keys) - 1}"
+    if len(merged) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+        return merged
+    digest = hashlib.sha256("\n".join(str(key) for key in keys).encode("utf-8")).hexdigest()
+    return f"seq:{digest}"
+
+
+def group_text_requests(
+    requests: list[OutboundMessageRequest],
+    *,
+    max_chars: int = MAX_TEXT_LENGTH,
+    separator: str = "\n\n",
+) -> list[list[OutboundMessageRequest]]:
+    """Agrupa textos simples consecutivos ao mesmo destinatário (ordem mantida).
+
+    Mídia, interativos e templates quebram a sequência e seguem sozinhos;
+    cada grupo cabe em `max_chars` já com os separadores. `max_chars <= 0`
+    desliga a coalescência (um grupo por request).
+    """
+    if max_chars <= 0:
+        return [[request] for request in requests]
+
+    groups: list[list[OutboundMessageRequest]] = []
+    length = 0
+    mergeable = False
+    for request in requests:
+        size = len(request.text or "")
+        if (
+            mergeable
+            and is_plain_text(request)
+            and groups[-1][0].to == request.to
+            and length + len(separator) + size <= max_chars
+        ):
+            groups[-1].append(request)
+            length += len(separator) + size
+            continue
+        groups.append([request])
+        length = size
+        mergeable = is_plain_text(request)
+    return groups
+
+
+def merge_group(
+    group: list[OutboundMessageRequest], separator: str = "\n\n"
+) -> OutboundMessageRequest:
+    """Mensagem única de um grupo de `group_text_requests`."""
+    if len(group) == 1:
+        return group[0]
+    return group[0].model_copy(
+        update={
+            "text": separator.join(part.text or "" for part in group),
+            "idempotency_key": merged_idempotency_key([part.idempotency_key for part in group]),
+        }
+    )
+
+
+def coalesce_text_requests(
+    requests: list[OutboundMessageRequest],
+    *,
+    max_chars: int = MAX_TEXT_LENGTH,
+    separator: str = "\n\n",
+) -> list[OutboundMessageRequest]:
+    """Junta textos simples consecutivos ao mesmo destinatário (ordem mantida)."""
+    groups = group_text_requests(requests, max_chars=max_chars, separator=separator)
+    return [merge_group(group, separator) for group in groups]
+
+
+class OutboundSequencer:
+    """Envia sequências por destinatário em ordem, coalescidas e espaçadas.
+
+    Um lock por destinatário (por event loop, criado sob demanda e removido
+    quando ocioso) impede que duas sequências para o mesmo usuário se
+    intercalem dentro do processo.
+    """
+
+    def __init__(
+        self,
+        rate_shaper: OutboundRateShaper | None = None,
+        *,
+        max_merge_chars: int = MAX_TEXT_LENGTH,
+        rate_limit_max_retries: int = 2,
+        separator: str = "\n\n",
+    ) -> None:
+        self._shaper = rate_shaper
+        self._max_merge_chars = max_merge_chars
+        self._max_retries = rate_limit_max_retries
+        self._separator = separator
+        self._turns: dict[str, list[Any]] = {}  # destinatário -> [Lock, usuários]
+
+    @classmethod
+    def from_settings(
+        cls, settings: Any, rate_shaper: OutboundRateShaper | None = None
+    ) -> OutboundSequencer:
+        return cls(
+            rate_shaper,
+            max_merge_chars=settings.outbound_merge_max_chars,
+            rate_limit_max_retries=settings.whatsapp_rate_limit_max_retries,
+        )
+
+    @property
+    def shaper(self) -> OutboundRateShaper:
+        return self._shaper or get_outbound_rate_shaper()
+
+    def coalesce(self, requests: list[OutboundMessageRequest]) -> list[OutboundMessageRequest]:
+        return coalesce_text_requests(
+            requests, max_chars=self._max_merge_chars, separator=self._separator
+        )
+
+    def _groups(self, requests: list[OutboundMessageRequest]) -> list[list[OutboundMessageRequest]]:
+        return group_text_requests(
+            requests, max_chars=self._max_merge_chars, separator=self._separator
+        )
+
+    @asynccontextmanager
+    async def turn(self, recipient: str) -> AsyncIterator[None]:
+        """Vez exclusiva de envio para `recipient` (FIFO entre sequências)."""
+        entry = self._turns.get(recipient)
+        if entry is None:
+            entry = [asyncio.Lock(), 0]
+            self._turns[recipient] = entry
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._turns[recipient]
+
+    def active_recipients(self) -> int:
+        return len(self._turns)
+
+    async def send(
+        self,
+        client: WhatsAppOutboundClient,
+        requests: list[OutboundMessageRequest],
+    ) -> list[BatchSendResult]:
+        """Coalesce e envia em ordem; um resultado por mensagem efetivamente enviada.
+
+        Resultados de mensagens coalescidas trazem as chaves originais em
+        `source_keys` (a dedupe por parte sobrevive a um reagrupamento no
+        retry da task).
+        """
+        groups = self._groups(requests)
+        if not groups:
+            return []
+
+        from pyloto_corp.adapters.whatsapp.http_client import WhatsAppHttpClient
+        from pyloto_corp.config.settings import get_settings
+
+        settings = get_settings()
+        shaper = self.shaper
+        phone_number_id = client.sending_phone_number_id(settings) or ""
+        owned_http = client.http_client is None
+        http_client = client.http_client or WhatsAppHttpClient()
+
+        results: list[BatchSendResult] = []
+        try:
+            async with AsyncExitStack() as stack:
+                # Ordem fixa de aquisição: sequências com vários destinatários não travam
+                for recipient in sorted({request.to for request in requests}):
+                    await stack.enter_async_context(self.turn(recipient))
+                for index, group in enumerate(groups):
+                    if results and not results[-1].success:
+                        result = _aborted(index, merge_group(group, self._separator))
+                    else:
+                        result = await self._send_group(
+                            client, group, index, shaper, phone_number_id, http_client
+                        )
+                    if len(group) > 1:
+                        keys = tuple(part.idempotency_key for part in group)
+                        result = replace(result, source_keys=keys)
+                    results.append(result)
+        finally:
+            if owned_http:
+                await http_client.close()
+
+        logger.info(
+            "whatsapp_sequence_sent",
+            extra={
+                "requested": len(requests),
+                "messages": len(groups),
+                "succeeded": sum(result.success for result in results),
+                "aborted": sum(result.error_code == SEQUENCE_ABORTED for result in results),
+                "rate_limited": sum(result.rate_limited for result in results),
+                "throttled_seconds": round(sum(r.throttled_seconds for r in results), 3),
+            },
+        )
+        return results
+
+    async def _send_group(
+        self,
+        client: WhatsAppOutboundClient,
+        group: list[OutboundMessageRequest],
+        index: int,
+        shaper: OutboundRateShaper,
+        phone_number_id: str,
+        http_client: Any,
+    ) -> BatchSendResult:
+        request = merge_group(group, self._separator)
+        prepared = client.prepare(request)
+        if isinstance(prepared, OutboundMessageResponse):
+            return BatchSendResult(index, request.idempotency_key, prepared, 0, 0.0, 0)
+        return await send_with_rate_limit(
+            client,
+            prepared,
+            shaper,
+            phone_number_id,
+            max_rate_limit_retries=self._max_retries,
+            http_client=http_client,
+            index=index,
+        )
+
+
+def _aborted(index: int, part: OutboundMessageRequest) -> BatchSendResult:
+    response = OutboundMessageResponse(
+        success=False,
+        error_code=SEQUENCE_ABORTED,
+        error_message="parte anterior da sequência falhou",
+    )
+    return BatchSendResult(index, part.idempotency_key, response, 0, 0.0, 0)
+
+
+_sequencer: OutboundSequencer | None = None
+
+
+def get_outbound_sequencer() -> OutboundSequencer:
+    """Sequenciador global do processo (lazy, a partir das settings)."""
+    global _sequencer
+    if _sequencer is None:
+        from pyloto_corp.config.settings import get_settings
+
+        _sequencer = OutboundSequencer.from_settings(get_settings())
+    return _sequencer
+
+
+def set_outbound_sequencer(sequencer: OutboundSequencer | None) -> None:
+    """Substitui o sequenciador global (testes/wiring); None recria das settings."""
+    global _sequencer
+    _sequencer = sequencer
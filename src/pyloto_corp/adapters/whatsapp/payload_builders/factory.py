@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 from pyloto_corp.adapters.whatsapp.models import OutboundMessageRequest
@@ -57,6 +58,16 @@ def get_payload_builder(message_type: MessageType) -> PayloadBuilder | None:
     return _BUILDERS.get(message_type)
 
 
+@lru_cache(maxsize=64)
+def _builder_for(message_type: str) -> PayloadBuilder:
+    """Builder por tipo bruto (str do request), resolvido uma vez por tipo."""
+    msg_type = MessageType(message_type)
+    builder = get_payload_builder(msg_type)
+    if builder is None:
+        raise ValueError(f"Tipo de mensagem não suportado: {msg_type}")
+    return builder
+
+
 def build_full_payload(request: OutboundMessageRequest) -> dict[str, Any]:
     """Constrói payload completo para a API Meta.
 
@@ -76,12 +87,6 @@ def build_full_payload(request: OutboundMessageRequest) -> dict[str, Any]:
         payload.update(_TEMPLATE_BUILDER.build(request))
         return payload
 
-    # Obtém builder pelo tipo
-    msg_type = MessageType(request.message_type)
-    builder = get_payload_builder(msg_type)
-
-    if builder is None:
-        raise ValueError(f"Tipo de mensagem não suportado: {msg_type}")
-
-    payload.update(builder.build(request))
+    # Obtém builder pelo tipo (cache por tipo; erro não é cacheado)
+    payload.update(_builder_for(request.message_type).build(request))
     return payload
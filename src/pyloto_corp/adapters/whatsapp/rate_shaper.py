@@ -0,0 +1,186 @@
+"""Modelagem de vazão outbound conforme limites da Meta/WhatsApp.
+
+Responsabilidades:
+- Throughput por phone_number_id (tier do número: 80 msg/s padrão, até
+  1000 msg/s após upgrade)
+- Pair rate por destinatário (mesmo par empresa/usuário): 1 mensagem a cada
+  6 s em regime, com rajada limitada — acima disso a Meta devolve 131056
+- Penalizar número/par quando a Meta sinaliza rate limit mesmo assim
+  (outras instâncias dividem o mesmo limite)
+
+Reserva antecipada: cada envio consome um token na hora e recebe o atraso
+até o token existir, então envios concorrentes saem espaçados na ordem da
+reserva, sem polling. Estado protegido por `threading.Lock` (o shaper global
+é compartilhado entre event loops, como o limitador OpenAI).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+# Tiers de throughput da Meta por número (mensagens/segundo)
+THROUGHPUT_TIERS = {"standard": 80.0, "upgraded": 1000.0}
+
+
+class _Bucket:
+    """Token bucket com reserva (tokens negativos = fila de reservas)."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Consome um token; retorna segundos até ele estar disponível."""
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def penalize(self, now: float, seconds: float) -> None:
+        """Esvazia o bucket: a próxima vaga fica `seconds` após a fila atual."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate + 1
+
+    def is_idle(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class OutboundRateShaper:
+    """Espaça envios por número (throughput) e por destinatário (pair rate)."""
+
+    def __init__(
+        self,
+        messages_per_second: float = THROUGHPUT_TIERS["standard"],
+        pair_interval_seconds: float = 6.0,
+        pair_burst: int = 45,
+        max_tracked_pairs: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self._rate = messages_per_second
+        self._pair_rate = 1.0 / pair_interval_seconds
+        self._pair_interval = pair_interval_seconds
+        self._pair_burst = float(max(pair_burst, 1))
+        self._max_pairs = max_tracked_pairs
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._numbers: dict[str, _Bucket] = {}
+        self._pairs: dict[tuple[str, str], _Bucket] = {}
+        self._stats = {"acquired": 0, "throttled": 0, "penalties": 0}
+        self._wait_total = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> OutboundRateShaper:
+        return cls(
+            messages_per_second=settings.whatsapp_messages_per_second,
+            pair_interval_seconds=settings.whatsapp_pair_interval_seconds,
+            pair_burst=settings.whatsapp_pair_burst,
+        )
+
+    def reserve(self, phone_number_id: str, recipient: str) -> float:
+        """Reserva vaga no número e no par; retorna o atraso a aguardar."""
+        with self._lock:
+            now = self._clock()
+            number = self._number_bucket(phone_number_id, now)
+            pair = self._pair_bucket(phone_number_id, recipient, now)
+            delay = max(number.reserve(now), pair.reserve(now))
+            self._stats["acquired"] += 1
+            if delay > 0:
+                self._stats["throttled"] += 1
+                self._wait_total += delay
+            return delay
+
+    async def acquire_async(self, phone_number_id: str, recipient: str) -> float:
+        """Aguarda a vaga reservada; retorna os segundos de espera."""
+        delay = self.reserve(phone_number_id, recipient)
+        if delay > 0:
+            await self._sleep(delay)
+        return delay
+
+    def penalize(
+        self,
+        phone_number_id: str,
+        recipient: str | None = None,
+        seconds: float | None = None,
+    ) -> None:
+        """Rate limit da Meta: pausa o par (com recipient) ou o número inteiro.
+
+        Sem `seconds`, o par pausa um intervalo de pair rate e o número 1 s.
+        """
+        with self._lock:
+            now = self._clock()
+            self._stats["penalties"] += 1
+            if recipient is not None:
+                pause = seconds if seconds is not None else self._pair_interval
+                self._pair_bucket(phone_number_id, recipient, now).penalize(now, pause)
+            else:
+                pause = seconds if seconds is not None else 1.0
+                self._number_bucket(phone_number_id, now).penalize(now, pause)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Estatísticas para logs/métricas (sem PII)."""
+        with self._lock:
+            throttled = self._stats["throttled"]
+            return {
+                **self._stats,
+                "tracked_pairs": len(self._pairs),
+                "avg_throttle_ms": round(self._wait_total / throttled * 1000, 1)
+                if throttled
+                else 0.0,
+            }
+
+    def _number_bucket(self, phone_number_id: str, now: float) -> _Bucket:
+        bucket = self._numbers.get(phone_number_id)
+        if bucket is None:
+            # Rajada de 1 s de vazão: o tier é médio, não instantâneo
+            bucket = _Bucket(self._rate, max(self._rate, 1.0), now)
+            self._numbers[phone_number_id] = bucket
+        return bucket
+
+    def _pair_bucket(self, phone_number_id: str, recipient: str, now: float) -> _Bucket:
+        key = (phone_number_id, recipient)
+        bucket = self._pairs.get(key)
+        if bucket is None:
+            if len(self._pairs) >= self._max_pairs:
+                self._prune_pairs(now)
+            bucket = _Bucket(self._pair_rate, self._pair_burst, now)
+            self._pairs[key] = bucket
+        return bucket
+
+    def _prune_pairs(self, now: float) -> None:
+        """Descarta pares ociosos (bucket cheio equivale a par novo)."""
+        idle = [key for key, bucket in self._pairs.items() if bucket.is_idle(now)]
+        for key in idle:
+            del self._pairs[key]
+
+
+_rate_shaper: OutboundRateShaper | None = None
+
+
+def get_outbound_rate_shaper() -> OutboundRateShaper:
+    """Shaper global do processo (lazy, a partir das settings)."""
+    global _rate_shaper
+    if _rate_shaper is None:
+        from pyloto_corp.config.settings import get_settings
+
+        _rate_shaper = OutboundRateShaper.from_settings(get_settings())
+    return _rate_shaper
+
+
+def set_outbound_rate_shaper(shaper: OutboundRateShaper | None) -> None:
+    """Substitui o shaper global (testes/wiring); None recria das settings."""
+    global _rate_shaper
+    _rate_shaper = shaper
@@ -4,8 +4,17 @@ from __future__ import annotations
 
 import hashlib
 import hmac
-from collections.abc import Mapping
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from dataclasses import dataclass
+from typing import Any
+
+from pyloto_corp.observability.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Nomes no Secret Manager, em ordem de prioridade (atual, anterior)
+WEBHOOK_SECRET_NAMES = ("WHATSAPP_WEBHOOK_SECRET", "WHATSAPP_WEBHOOK_PREVIOUS_SECRET")
 
 
 @dataclass(slots=True)
@@ -44,3 +53,138 @@ def verify_meta_signature(
         return SignatureResult(valid=False, error="signature_mismatch")
 
     return SignatureResult(valid=True)
+
+
+class WebhookSignatureVerifier:
+    """Verificador de assinatura construído uma vez (startup).
+
+    - Chaves HMAC pré-carregadas: por request apenas `copy()` do template
+    - Vários secrets ativos (rotação sem downtime: atual + anterior)
+    - Refresh em background a partir de um loader (ex.: Secret Manager);
+      falha no refresh mantém os secrets vigentes
+    """
+
+    def __init__(
+        self,
+        secrets: Iterable[str | None] = (),
+        *,
+        loader: Callable[[], Sequence[str | None]] | None = None,
+        refresh_interval_seconds: float = 300.0,
+        required: bool = False,
+    ) -> None:
+        self._templates: tuple[Any, ...] = ()
+        self._loader = loader
+        self._refresh_interval = refresh_interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.required = required
+        self.refresh_failures = 0
+        self.set_secrets(secrets)
+
+    @classmethod
+    def from_settings(cls, settings: Any, provider: Any | None = None) -> WebhookSignatureVerifier:
+        """Secrets atual/anterior das settings; com provider, recarrega deles.
+
+        Cada refresh invalida o cache do provider (`CachedSecretProvider`): a
+        rotação leva no máximo `webhook_secret_refresh_seconds`.
+        """
+        loader = None
+        if provider is not None:
+
+            def loader() -> list[str | None]:
+                # Falha no secret atual propaga: o refresh falha e mantém as chaves
+                current_name, previous_name = WEBHOOK_SECRET_NAMES
+                # Cache do provider (TTL + stale) somaria ao intervalo do refresh
+                invalidate = getattr(provider, "invalidate", None)
+                if invalidate is not None:
+                    for name in WEBHOOK_SECRET_NAMES:
+                        invalidate(name)
+                return [
+                    provider.get_secret(current_name),
+                    _optional_secret(provider, previous_name),
+                ]
+
+        return cls(
+            [settings.whatsapp_webhook_secret, settings.whatsapp_webhook_previous_secret],
+            loader=loader,
+            refresh_interval_seconds=settings.webhook_secret_refresh_seconds,
+            required=settings.is_staging or settings.is_production,
+        )
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._templates)
+
+    def set_secrets(self, secrets: Iterable[str | None]) -> None:
+        """Troca atômica do conjunto de chaves ativas (ordem = prioridade)."""
+        unique = dict.fromkeys(secret for secret in secrets if secret)
+        self._templates = tuple(
+            hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256) for secret in unique
+        )
+
+    def verify(self, raw_body: bytes, headers: Mapping[str, str]) -> SignatureResult:
+        """Mesma semântica de `verify_meta_signature`, aceitando qualquer chave ativa."""
+        templates = self._templates
+        if not templates:
+            return SignatureResult(valid=True, skipped=True)
+
+        signature = headers.get("x-hub-signature-256")
+        if not signature:
+            return SignatureResult(valid=False, error="missing_signature")
+
+        if not signature.startswith("sha256="):
+            return SignatureResult(valid=False, error="invalid_signature_format")
+
+        expected = signature[7:]
+        for template in templates:
+            mac = template.copy()
+            mac.update(raw_body)
+            if hmac.compare_digest(mac.hexdigest(), expected):
+                return SignatureResult(valid=True)
+
+        return SignatureResult(valid=False, error="signature_mismatch")
+
+    def refresh(self) -> bool:
+        """Recarrega os secrets do loader; retorna False (e mantém os atuais) em falha."""
+        if self._loader is None:
+            return False
+        try:
+            secrets = [secret for secret in self._loader() if secret]
+        except Exception as exc:  # noqa: BLE001
+            self.refresh_failures += 1
+            logger.warning("webhook_secret_refresh_failed", extra={"error": type(exc).__name__})
+            return False
+        if not secrets:
+            self.refresh_failures += 1
+            logger.warning("webhook_secret_refresh_empty")
+            return False
+        self.set_secrets(secrets)
+        return True
+
+    def start_refresh(self) -> None:
+        """Inicia a thread de refresh (no-op sem loader ou intervalo <= 0)."""
+        if self._loader is None or self._refresh_interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="webhook-secret-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop_refresh(self, timeout: float | None = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self._refresh_interval):
+            self.refresh()
+
+
+def _optional_secret(provider: Any, name: str) -> str | None:
+    """None se o secret não existe; falha ao ler um secret existente propaga."""
+    if not provider.secret_exists(name):
+        return None
+    return provider.get_secret(name)
@@ -0,0 +1,88 @@
+"""Varredura leve do corpo bruto do webhook Meta (sem json.loads).
+
+Responsabilidade única: extrair o id da primeira mensagem direto dos bytes,
+para deduplicar e enfileirar no ingress sem parse/re-serialização.
+
+Regras (equivalentes a `compute_inbound_event_id`):
+- Percorre os arrays `"messages": [{...}]` na ordem do documento
+- Usa a chave `id` do PRIMEIRO objeto de cada array, apenas no nível
+  raiz desse objeto (ignora `context.id` de respostas)
+- Strings são puladas respeitando escapes, então texto do usuário nunca
+  é confundido com chaves
+"""
+
+from __future__ import annotations
+
+import re
+
+from pyloto_corp.utils import json_codec
+
+_MESSAGES_ARRAY = re.compile(rb'"messages"\s*:\s*\[\s*\{')
+_WHITESPACE = b" \t\r\n"
+_QUOTE = 0x22
+_BACKSLASH = 0x5C
+_OPENERS = frozenset(b"{[")
+_CLOSERS = frozenset(b"}]")
+
+
+def _string_end(raw: bytes, start: int) -> int:
+    """Índice da aspa que fecha a string iniciada em `start` (-1 se truncada)."""
+    pos = start + 1
+    while True:
+        pos = raw.find(b'"', pos)
+        if pos == -1:
+            return -1
+        backslashes = 0
+        back = pos - 1
+        while back > start and raw[back] == _BACKSLASH:
+            backslashes += 1
+            back -= 1
+        if backslashes % 2 == 0:
+            return pos
+        pos += 1
+
+
+def _skip_whitespace(raw: bytes, pos: int) -> int:
+    while pos < len(raw) and raw[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _object_id(raw: bytes, pos: int) -> str | None:
+    """Lê a chave `id` do objeto cujo conteúdo começa em `pos` (após `{`)."""
+    depth = 1
+    size = len(raw)
+    while pos < size and depth > 0:
+        char = raw[pos]
+        if char == _QUOTE:
+            end = _string_end(raw, pos)
+            if end == -1:
+                return None
+            token = raw[pos : end + 1]
+            pos = _skip_whitespace(raw, end + 1)
+            is_key = pos < size and raw[pos] == 0x3A  # ':'
+            if depth == 1 and is_key and token == b'"id"':
+                pos = _skip_whitespace(raw, pos + 1)
+                if pos >= size or raw[pos] != _QUOTE:
+                    return None
+                value_end = _string_end(raw, pos)
+                if value_end == -1:
+                    return None
+                value = json_codec.loads(raw[pos : value_end + 1])
+                return value or None
+            continue
+        if char in _OPENERS:
+            depth += 1
+        elif char in _CLOSERS:
+            depth -= 1
+        pos += 1
+    return None
+
+
+def scan_first_message_id(raw_body: bytes) -> str | None:
+    """Retorna o id da primeira mensagem do webhook, ou None se não houver."""
+    for match in _MESSAGES_ARRAY.finditer(raw_body):
+        message_id = _object_id(raw_body, match.end())
+        if message_id:
+            return message_id
+    return None
@@ -0,0 +1,93 @@
+"""Divisão de webhooks Meta grandes em payloads menores.
+
+Responsabilidade única: limitar quantos eventos (`messages` + `statuses`)
+cada task processa. Um webhook com mais eventos que o limite vira vários
+payloads com a mesma estrutura (`object` → `entry` → `changes` → `value`),
+preservando metadados (`metadata`, `contacts`) em cada pedaço e a ordem
+original dos eventos.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+EVENT_KEYS = ("messages", "statuses")
+
+
+def _changes(payload: Any) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+    """Pares (entry, change) válidos do payload, na ordem do documento."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("entry"), list):
+        return []
+    pairs = []
+    for entry in payload["entry"]:
+        if not isinstance(entry, dict) or not isinstance(entry.get("changes"), list):
+            continue
+        for change in entry["changes"]:
+            if isinstance(change, dict) and isinstance(change.get("value"), dict):
+                pairs.append((entry, change))
+    return pairs
+
+
+def _events(value: dict[str, Any]) -> list[tuple[str, Any]]:
+    events: list[tuple[str, Any]] = []
+    for key in EVENT_KEYS:
+        items = value.get(key)
+        if isinstance(items, list):
+            events.extend((key, item) for item in items)
+    return events
+
+
+def iter_webhook_events(payload: Any) -> Iterator[tuple[str, Any]]:
+    """Eventos `(tipo, item)` do webhook na ordem do documento."""
+    for _, change in _changes(payload):
+        yield from _events(change["value"])
+
+
+def count_webhook_events(payload: Any) -> int:
+    """Total de `messages` + `statuses` do webhook."""
+    return sum(1 for _ in iter_webhook_events(payload))
+
+
+def _change_piece(
+    entry: dict[str, Any], change: dict[str, Any], events: list[tuple[str, Any]]
+) -> dict[str, Any]:
+    value = {key: item for key, item in change["value"].items() if key not in EVENT_KEYS}
+    for key, item in events:
+        value.setdefault(key, []).append(item)
+    piece = {key: item for key, item in entry.items() if key != "changes"}
+    piece["changes"] = [{**change, "value": value}]
+    return piece
+
+
+def split_webhook_payload(payload: dict[str, Any], max_events: int) -> list[dict[str, Any]]:
+    """Divide o webhook em payloads com no máximo `max_events` eventos cada.
+
+    Retorna `[payload]` (o mesmo objeto) quando já cabe no limite,
+    `max_events <= 0` ou o formato não é reconhecido.
+    """
+    if max_events <= 0 or count_webhook_events(payload) <= max_events:
+        return [payload]
+
+    header = {key: item for key, item in payload.items() if key != "entry"}
+    chunks: list[dict[str, Any]] = []
+    entries: list[dict[str, Any]] = []
+    used = 0
+
+    for entry, change in _changes(payload):
+        events = _events(change["value"])
+        if not events:
+            entries.append(_change_piece(entry, change, []))
+            continue
+        while events:
+            if used == max_events:
+                chunks.append({**header, "entry": entries})
+                entries, used = [], 0
+            take = events[: max_events - used]
+            events = events[len(take) :]
+            entries.append(_change_piece(entry, change, take))
+            used += len(take)
+
+    if entries:
+        chunks.append({**header, "entry": entries})
+    return chunks
@@ -129,6 +129,10 @@ class InstitucionalContextLoader:
             String formatada com todo contexto institucional.
             Estrutura: vertentes + princípios + taxonomy/intents
         """
+        cache_key = "system_prompt"
+        if cache_key in self._cached_context:
+            return self._cached_context[cache_key]
+
         try:
             parts = [
                 "# CONTEXTO INSTITUCIONAL DA PYLOTO",
@@ -158,6 +162,7 @@ class InstitucionalContextLoader:
             ]
 
             context = "\n".join(parts)
+            self._cached_context[cache_key] = context
             logger.debug(f"System prompt context gerado com sucesso ({len(context)} caracteres)")
             return context
         except Exception as e:
@@ -0,0 +1,75 @@
+"""Requisições "hedged" para chamadas LLM com cauda de latência longa.
+
+Responsabilidades:
+- Acompanhar latências recentes por estágio (janela deslizante)
+- Derivar o atraso de hedge a partir de um percentil (ex.: p95)
+- Disparar uma segunda chamada idêntica se a primeira passar desse atraso,
+  usando a que terminar primeiro e cancelando a outra
+
+O hedge só é disparado com amostras suficientes (`min_samples`); antes
+disso a chamada segue simples. Cada tentativa passa pelo limitador de
+taxa, então hedges são naturalmente contidos sob pressão.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class LatencyTracker:
+    """Janela deslizante de latências (segundos) com cálculo de percentil."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, quantile: float) -> float | None:
+        """Percentil das amostras; None enquanto houver poucas amostras."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self._min_samples:
+            return None
+        index = min(max(math.ceil(quantile * len(samples)) - 1, 0), len(samples) - 1)
+        return samples[index]
+
+
+async def hedged_call(factory: Callable[[], Awaitable[Any]], hedge_delay: float | None) -> Any:
+    """Executa `factory()`; após `hedge_delay` sem resposta, dispara uma cópia.
+
+    Retorna o primeiro resultado bem-sucedido. Se ambas falharem, propaga o
+    erro da última a terminar. Tarefas pendentes são sempre canceladas.
+    """
+    first = asyncio.ensure_future(factory())
+    tasks = [first]
+    try:
+        if hedge_delay is None:
+            return await first
+        done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+        if done:
+            return first.result()
+
+        tasks.append(asyncio.ensure_future(factory()))
+        pending = set(tasks)
+        last_error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+        assert last_error is not None
+        raise last_error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
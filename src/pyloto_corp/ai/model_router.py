@@ -0,0 +1,192 @@
+"""Roteamento de modelo por complexidade em cada estágio LLM.
+
+Responsabilidades:
+- Escolher o modelo de cada estágio (detecção de evento, seleção de estado,
+  geração de resposta, tipo de mensagem, decisão final)
+- Escalar para o modelo "forte" com base em sinais baratos: tamanho da
+  mensagem, confiança do precheck determinístico e estado da FSM
+- Contabilizar latência e erros por rota (estágio + modelo), sem PII
+
+Precedência: modelo explícito do chamador > modelo configurado do estágio >
+tier (rápido/forte). Sem modelo forte configurado, não há escalonamento.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+
+class LLMStage(StrEnum):
+    """Estágios LLM roteáveis."""
+
+    EVENT_DETECTION = "event_detection"
+    STATE_SELECTION = "state_selection"
+    RESPONSE_GENERATION = "response_generation"
+    MESSAGE_TYPE_SELECTION = "message_type_selection"
+    MASTER_DECISION = "master_decision"
+
+
+# Estágios de classificação curta: só escalam por mensagem longa
+_TRIVIAL_STAGES = frozenset({LLMStage.EVENT_DETECTION, LLMStage.MESSAGE_TYPE_SELECTION})
+
+# Estados com consequência (handoff, rota externa, agendamento)
+_COMPLEX_STATES = frozenset({"HANDOFF_HUMAN", "ROUTE_EXTERNAL", "SCHEDULED_FOLLOWUP"})
+
+
+@dataclass(frozen=True, slots=True)
+class RouteSignals:
+    """Sinais de complexidade disponíveis antes da chamada."""
+
+    message_length: int = 0
+    precheck_confidence: float | None = None
+    fsm_state: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ModelRoute:
+    """Modelo escolhido para um estágio e o motivo (para logs/métricas)."""
+
+    stage: LLMStage
+    model: str
+    tier: str  # fast | strong | override
+    reason: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage.value}:{self.model}"
+
+
+class ModelRouter:
+    """Escolhe o modelo por estágio e acumula latência/erros por rota."""
+
+    def __init__(
+        self,
+        fast_model: str = "gpt-4o-mini",
+        strong_model: str | None = None,
+        stage_models: dict[LLMStage, str | None] | None = None,
+        long_message_chars: int = 280,
+        low_confidence: float = 0.7,
+        complex_states: frozenset[str] = _COMPLEX_STATES,
+    ) -> None:
+        self._fast_model = fast_model
+        self._strong_model = strong_model
+        self._stage_models = {k: v for k, v in (stage_models or {}).items() if v}
+        self._long_message_chars = long_message_chars
+        self._low_confidence = low_confidence
+        self._complex_states = complex_states
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> ModelRouter:
+        return cls(
+            fast_model=settings.llm_fast_model or settings.openai_model,
+            strong_model=settings.llm_strong_model,
+            stage_models={
+                LLMStage.EVENT_DETECTION: settings.event_detection_model,
+                LLMStage.STATE_SELECTION: settings.state_selector_model,
+                LLMStage.RESPONSE_GENERATION: settings.response_generator_model,
+                LLMStage.MESSAGE_TYPE_SELECTION: settings.message_type_selection_model,
+                LLMStage.MASTER_DECISION: settings.master_decider_model,
+            },
+            long_message_chars=settings.llm_route_long_message_chars,
+            low_confidence=settings.llm_route_low_confidence,
+        )
+
+    def _escalation_reason(self, stage: LLMStage, signals: RouteSignals) -> str | None:
+        if signals.message_length > self._long_message_chars:
+            return "long_message"
+        if stage in _TRIVIAL_STAGES:
+            return None
+        if (
+            signals.precheck_confidence is not None
+            and signals.precheck_confidence < self._low_confidence
+        ):
+            return "low_confidence"
+        if signals.fsm_state in self._complex_states:
+            return "complex_state"
+        return None
+
+    def route(
+        self, stage: LLMStage, signals: RouteSignals | None = None, model: str | None = None
+    ) -> ModelRoute:
+        """Escolhe o modelo do estágio (`model` explícito tem precedência)."""
+        if model:
+            return ModelRoute(stage, model, "override", "explicit")
+        configured = self._stage_models.get(stage)
+        if configured:
+            return ModelRoute(stage, configured, "override", "stage_config")
+        reason = self._escalation_reason(stage, signals or RouteSignals())
+        if reason and self._strong_model:
+            return ModelRoute(stage, self._strong_model, "strong", reason)
+        return ModelRoute(stage, self._fast_model, "fast", reason or "simple")
+
+    def record(self, route: ModelRoute, latency_seconds: float, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                route.key, {"calls": 0, "errors": 0, "latency_total": 0.0, "latency_max": 0.0}
+            )
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["latency_total"] += latency_seconds
+            stats["latency_max"] = max(stats["latency_max"], latency_seconds)
+
+    def observe(self, route: ModelRoute, fn: Callable[[], Any]) -> Any:
+        """Executa `fn` contabilizando latência e erro na rota."""
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self.record(route, time.monotonic() - started, error=True)
+            raise
+        self.record(route, time.monotonic() - started)
+        return result
+
+    async def observe_async(self, route: ModelRoute, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Versão assíncrona de `observe`."""
+        started = time.monotonic()
+        try:
+            result = await factory()
+        except Exception:
+            self.record(route, time.monotonic() - started, error=True)
+            raise
+        self.record(route, time.monotonic() - started)
+        return result
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Chamadas, erros e latência (média/máx em ms) por rota."""
+        with self._lock:
+            items = {key: dict(stats) for key, stats in self._stats.items()}
+        return {
+            key: {
+                "calls": int(stats["calls"]),
+                "errors": int(stats["errors"]),
+                "avg_latency_ms": round(stats["latency_total"] / stats["calls"] * 1000, 1),
+                "max_latency_ms": round(stats["latency_max"] * 1000, 1),
+            }
+            for key, stats in items.items()
+        }
+
+
+_model_router: ModelRouter | None = None
+
+
+def get_model_router() -> ModelRouter:
+    """Roteador global (lazy, a partir das settings)."""
+    global _model_router
+    if _model_router is None:
+        from pyloto_corp.config.settings import get_settings
+
+        _model_router = ModelRouter.from_settings(get_settings())
+    return _model_router
+
+
+def set_model_router(router: ModelRouter | None) -> None:
+    """Substitui o roteador global (testes/wiring); None recria das settings."""
+    global _model_router
+    _model_router = router
@@ -11,6 +11,7 @@ Todos os métodos incluem retry logic, timeout e fallback determinístico.
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from openai import APIConnectionError, APIError, APITimeoutError, AsyncOpenAI
@@ -19,6 +20,18 @@ from pyloto_corp.ai import openai_parser, openai_prompts
 from pyloto_corp.ai.contracts.event_detection import EventDetectionResult
 from pyloto_corp.ai.contracts.message_type_selection import MessageTypeSelectionResult
 from pyloto_corp.ai.contracts.response_generation import ResponseGenerationResult
+from pyloto_corp.ai.hedging import LatencyTracker, hedged_call
+from pyloto_corp.ai.model_router import (
+    LLMStage,
+    ModelRoute,
+    ModelRouter,
+    RouteSignals,
+    get_model_router,
+)
+from pyloto_corp.ai.openai_rate_limit import OpenAIRateLimiter, get_openai_rate_limiter
+from pyloto_corp.ai.rate_limiter import LLMRateLimitExceeded
+from pyloto_corp.ai.single_flight import AsyncSingleFlight, llm_call_key
+from pyloto_corp.ai.token_estimator import estimate_messages_tokens
 from pyloto_corp.domain.enums import Intent
 from pyloto_corp.observability.logging import get_logger, log_fallback
 
@@ -35,17 +48,96 @@ class OpenAIClientManager:
     - Manter fallback determinístico em caso de erro
     """
 
-    def __init__(self, api_key: str | None = None) -> None:
-        """Inicializa cliente OpenAI."""
+    def __init__(
+        self,
+        api_key: str | None = None,
+        rate_limiter: OpenAIRateLimiter | None = None,
+        model_router: ModelRouter | None = None,
+    ) -> None:
+        """Inicializa cliente OpenAI.
+
+        Retries ficam a cargo do `OpenAIRateLimiter` (429 com Retry-After e AIMD);
+        o SDK roda com `max_retries=0` para não amplificar tempestades de 429.
+        O modelo de cada chamada vem do `ModelRouter` (por estágio/complexidade).
+        """
+        from pyloto_corp.config.settings import get_settings
+
+        settings = get_settings()
         self._model = "gpt-4o-mini"
         self._timeout = 15.0
-        self._max_retries = 3
-        # Configurar timeout e retry no cliente (não só nas chamadas)
+        self._rate_limiter = rate_limiter or get_openai_rate_limiter()
+        self._router = model_router or get_model_router()
         self._client = AsyncOpenAI(
             api_key=api_key,
             timeout=self._timeout,
-            max_retries=self._max_retries,
+            max_retries=0,
         )
+        # Coalesce prompts idênticos simultâneos (retries da Meta, rajadas)
+        self._single_flight = AsyncSingleFlight()
+        # Hedge após o percentil de latência do estágio (desligado por padrão)
+        self._hedging_enabled = settings.llm_hedging_enabled
+        self._hedge_percentile = settings.llm_hedge_percentile
+        self._hedge_min_samples = settings.llm_hedge_min_samples
+        self._latency: dict[str, LatencyTracker] = {}
+
+    def _latency_tracker(self, route: ModelRoute) -> LatencyTracker:
+        tracker = self._latency.get(route.key)
+        if tracker is None:
+            tracker = LatencyTracker(min_samples=self._hedge_min_samples)
+            self._latency[route.key] = tracker
+        return tracker
+
+    async def _complete(
+        self,
+        route: ModelRoute,
+        system_prompt: str,
+        user_message: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Executa chat completion compartilhando chamadas idênticas em andamento.
+
+        Com hedging ligado, uma segunda tentativa é disparada quando a primeira
+        passa do percentil de latência da rota; vence a que responder antes.
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ]
+
+        async def _create() -> str:
+            response = await self._client.chat.completions.create(
+                model=route.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=self._timeout,
+            )
+            return response.choices[0].message.content or ""
+
+        tokens = estimate_messages_tokens(messages) + max_tokens
+        tracker = self._latency_tracker(route)
+
+        async def _attempt() -> str:
+            started = time.monotonic()
+            result = await self._rate_limiter.run(route.model, tokens, _create)
+            tracker.record(time.monotonic() - started)
+            return result
+
+        hedge_delay = tracker.percentile(self._hedge_percentile) if self._hedging_enabled else None
+        key = llm_call_key(route.model, messages, temperature, max_tokens)
+        return await self._single_flight.do(
+            key,
+            lambda: self._router.observe_async(route, lambda: hedged_call(_attempt, hedge_delay)),
+        )
+
+    def rate_limiter_stats(self) -> dict[str, dict[str, Any]]:
+        """Profundidade de fila, espera e concorrência atual por modelo."""
+        return self._rate_limiter.snapshot()
+
+    def route_stats(self) -> dict[str, dict[str, Any]]:
+        """Chamadas, erros e latência por rota (estágio + modelo)."""
+        return self._router.snapshot()
 
     async def detect_event(
         self,
@@ -59,21 +151,16 @@ class OpenAIClientManager:
             user_input, session_history, known_intent
         )
 
+        route = self._router.route(
+            LLMStage.EVENT_DETECTION, RouteSignals(message_length=len(user_input or ""))
+        )
         try:
-            response = await self._client.chat.completions.create(
-                model=self._model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
-                temperature=0.3,
-                max_tokens=150,
-                timeout=self._timeout,
+            result_text = await self._complete(
+                route, system_prompt, user_message, temperature=0.3, max_tokens=150
             )
-            result_text = response.choices[0].message.content or ""
             return openai_parser.parse_event_detection_response(result_text)
 
-        except (APIConnectionError, APIError, APITimeoutError) as e:
+        except (APIConnectionError, APIError, APITimeoutError, LLMRateLimitExceeded) as e:
             log_fallback(
                 logger,
                 "event_detection",
@@ -95,21 +182,17 @@ class OpenAIClientManager:
             user_input, detected_intent, current_state, next_state, session_context
         )
 
+        route = self._router.route(
+            LLMStage.RESPONSE_GENERATION,
+            RouteSignals(message_length=len(user_input or ""), fsm_state=next_state),
+        )
         try:
-            response = await self._client.chat.completions.create(
-                model=self._model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
-                temperature=0.4,
-                max_tokens=400,
-                timeout=self._timeout,
+            result_text = await self._complete(
+                route, system_prompt, user_message, temperature=0.4, max_tokens=400
             )
-            result_text = response.choices[0].message.content or ""
             return openai_parser.parse_response_generation_response(result_text)
 
-        except (APIConnectionError, APIError, APITimeoutError) as e:
+        except (APIConnectionError, APIError, APITimeoutError, LLMRateLimitExceeded) as e:
             log_fallback(
                 logger,
                 "response_generation",
@@ -129,21 +212,20 @@ class OpenAIClientManager:
             text_content, options, intent_type
         )
 
+        route = self._router.route(
+            LLMStage.MESSAGE_TYPE_SELECTION, RouteSignals(message_length=len(text_content or ""))
+        )
         try:
-            response = await self._client.chat.completions.create(
-                model=self._model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
+            result_text = await self._complete(
+                route,
+                system_prompt,
+                user_message,
                 temperature=0.2,
                 max_tokens=200,
-                timeout=self._timeout,
             )
-            result_text = response.choices[0].message.content or ""
             return openai_parser.parse_message_type_response(result_text)
 
-        except (APIConnectionError, APIError, APITimeoutError) as e:
+        except (APIConnectionError, APIError, APITimeoutError, LLMRateLimitExceeded) as e:
             log_fallback(
                 logger,
                 "message_type_selection",
@@ -8,7 +8,6 @@ Responsabilidades:
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import Any
 
@@ -17,6 +16,7 @@ from pyloto_corp.ai.contracts.message_type_selection import MessageTypeSelection
 from pyloto_corp.ai.contracts.response_generation import ResponseGenerationResult
 from pyloto_corp.domain.enums import MessageType
 from pyloto_corp.domain.session.events import SessionEvent
+from pyloto_corp.utils import json_codec
 
 logger = logging.getLogger(__name__)
 
@@ -114,7 +114,7 @@ def _extract_json_from_response(response: str) -> dict[str, Any]:
         response = response[:-3]
 
     response = response.strip()
-    data = json.loads(response)
+    data = json_codec.loads(response)
 
     if not isinstance(data, dict):
         raise ValueError("Response não é um JSON object")
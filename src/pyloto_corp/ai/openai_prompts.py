@@ -1,19 +1,22 @@
 """Prompts e formatação para chamadas à OpenAI.
 
 Responsabilidades:
-- Definir system prompts (com contexto institucional)
+- Definir system prompts (com contexto institucional), montados uma vez
+  por processo (pré-aquecidos no startup)
 - Formatar inputs para cada ponto de LLM
 - Manter instruções JSON estruturadas
 """
 
 from __future__ import annotations
 
+from functools import cache
 from typing import Any
 
 from pyloto_corp.ai.context_loader import get_system_prompt_context
 from pyloto_corp.domain.enums import Intent
 
 
+@cache
 def get_event_detection_prompt() -> str:
     """Retorna system prompt para detecção de eventos."""
     institutional_context = get_system_prompt_context()
@@ -48,6 +51,7 @@ Seu trabalho é **detectar eventos** e **intenções** a partir de mensagens.
 """
 
 
+@cache
 def get_response_generation_prompt() -> str:
     """Retorna system prompt para geração de respostas."""
     institutional_context = get_system_prompt_context()
@@ -90,6 +94,7 @@ e alinhadas com os princípios da Pyloto.
 """
 
 
+@cache
 def get_message_type_selection_prompt() -> str:
     """Retorna system prompt para seleção de tipo de mensagem."""
     return """Você é Otto, assistente de IA da Pyloto.
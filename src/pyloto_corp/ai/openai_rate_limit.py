@@ -0,0 +1,175 @@
+"""Aplicação do limitador adaptativo às chamadas OpenAI.
+
+Responsabilidades:
+- Manter um `ModelRateLimiter` por modelo
+- Executar a chamada dentro de uma vaga do limitador
+- Tratar 429 no cliente: reportar ao AIMD, respeitar `Retry-After` e tentar
+  novamente de forma limitada (os retries do SDK ficam desligados para não
+  multiplicar a tempestade de 429)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from pyloto_corp.ai.rate_limiter import ModelRateLimiter, parse_retry_after
+from pyloto_corp.ai.token_estimator import estimate_tokens
+from pyloto_corp.observability.logging import get_logger
+
+logger: logging.Logger = get_logger(__name__)
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) == 429
+
+
+def _is_transient(exc: BaseException) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status >= 500
+    # APIConnectionError/APITimeoutError não carregam status_code
+    return type(exc).__name__ in {"APIConnectionError", "APITimeoutError"}
+
+
+class OpenAIRateLimiter:
+    """Registro de `ModelRateLimiter` por modelo (criados sob demanda)."""
+
+    def __init__(self, max_retries: int = 2, **limiter_kwargs: Any) -> None:
+        self._max_retries = max_retries
+        self._kwargs = limiter_kwargs
+        self._limiters: dict[str, ModelRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> OpenAIRateLimiter:
+        return cls(
+            max_retries=settings.openai_max_retries,
+            requests_per_minute=settings.openai_requests_per_minute,
+            tokens_per_minute=settings.openai_tokens_per_minute,
+            max_concurrency=settings.openai_max_concurrency,
+            target_latency_seconds=settings.openai_target_latency_seconds,
+            queue_timeout_seconds=settings.openai_queue_timeout_seconds,
+        )
+
+    def for_model(self, model: str) -> ModelRateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                limiter = ModelRateLimiter(**self._kwargs)
+                self._limiters[model] = limiter
+            return limiter
+
+    async def run(self, model: str, tokens: int, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Executa `call` sob o limitador do modelo, com retry limitado.
+
+        Raises:
+            LLMRateLimitExceeded: fila do limitador excedeu o prazo
+            Exception: erro da última tentativa (429, 5xx, conexão)
+        """
+        limiter = self.for_model(model)
+        attempt = 0
+        while True:
+            await limiter.acquire(tokens)
+            started = time.monotonic()
+            try:
+                result = await call()
+            except asyncio.CancelledError:
+                # Timeout/cancelamento do chamador: devolver a vaga sem penalizar o AIMD
+                limiter.release(None)
+                raise
+            except Exception as exc:
+                attempt += 1
+                delay = self._retry_delay(model, limiter, exc, started, attempt)
+                if delay:
+                    await asyncio.sleep(delay)
+                continue
+            limiter.release(time.monotonic() - started)
+            return result
+
+    def run_sync(self, model: str, tokens: int, call: Callable[[], Any]) -> Any:
+        """`run` para clientes síncronos (mesmo limitador, mesmos retries)."""
+        limiter = self.for_model(model)
+        attempt = 0
+        while True:
+            limiter.acquire_sync(tokens)
+            started = time.monotonic()
+            try:
+                result = call()
+            except Exception as exc:
+                attempt += 1
+                delay = self._retry_delay(model, limiter, exc, started, attempt)
+                if delay:
+                    time.sleep(delay)
+                continue
+            limiter.release(time.monotonic() - started)
+            return result
+
+    def _retry_delay(
+        self,
+        model: str,
+        limiter: ModelRateLimiter,
+        exc: Exception,
+        started: float,
+        attempt: int,
+    ) -> float:
+        """Libera a vaga da tentativa que falhou e decide o retry.
+
+        Retorna o backoff antes da próxima tentativa (0 em 429: o Retry-After
+        já pausa o modelo). Re-levanta `exc` quando não há retry.
+        """
+        rate_limited = _is_rate_limited(exc)
+        retry_after = None
+        if rate_limited:
+            response = getattr(exc, "response", None)
+            retry_after = parse_retry_after(getattr(response, "headers", None))
+        limiter.release(time.monotonic() - started, rate_limited, retry_after)
+        if attempt > self._max_retries or not (rate_limited or _is_transient(exc)):
+            raise exc
+        logger.warning(
+            "openai_call_retry",
+            extra={
+                "model": model,
+                "attempt": attempt,
+                "rate_limited": rate_limited,
+                "retry_after": retry_after,
+                **limiter.snapshot(),
+            },
+        )
+        return 0.0 if rate_limited else min(0.25 * 2**attempt, 2.0)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Estatísticas por modelo (fila, espera, limite de concorrência)."""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {model: limiter.snapshot() for model, limiter in limiters.items()}
+
+
+# Limitador do processo (lazy): clientes async e chamadas síncronas dividem as cotas
+_openai_rate_limiter: OpenAIRateLimiter | None = None
+
+
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """Retorna o `OpenAIRateLimiter` global, criado a partir de `Settings`."""
+    global _openai_rate_limiter
+    if _openai_rate_limiter is None:
+        from pyloto_corp.config.settings import get_settings
+
+        _openai_rate_limiter = OpenAIRateLimiter.from_settings(get_settings())
+    return _openai_rate_limiter
+
+
+def set_openai_rate_limiter(rate_limiter: OpenAIRateLimiter | None) -> None:
+    """Substitui o limitador global (testes; None recria a partir de `Settings`)."""
+    global _openai_rate_limiter
+    _openai_rate_limiter = rate_limiter
+
+
+def run_llm_call_sync(model: str, prompt: str, max_tokens: int, call: Callable[[], Any]) -> Any:
+    """Executa uma chamada LLM síncrona sob o limitador global do modelo."""
+    tokens = estimate_tokens(prompt) + max_tokens
+    return get_openai_rate_limiter().run_sync(model, tokens, call)
@@ -0,0 +1,214 @@
+"""Limitador adaptativo de chamadas OpenAI por modelo.
+
+Responsabilidades:
+- Token buckets de requisições (RPM) e tokens (TPM) por modelo
+- Concorrência adaptativa AIMD: reduz pela metade em 429, cresce +1/limite
+  em sucesso rápido, reduz 10% quando a latência passa do alvo
+- Respeitar `Retry-After` (pausa o modelo inteiro até o prazo)
+- Expor profundidade de fila e tempo de espera (sem PII)
+
+Registro por modelo e laço de retry ficam em `ai/openai_rate_limit.py`.
+
+Espera por polling com `asyncio.sleep` (sem primitivas asyncio presas a um
+event loop — o cliente global é usado por loops diferentes em pipeline_v2);
+`acquire_sync` faz o mesmo polling com `time.sleep` para os caminhos síncronos.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+# Rajada permitida nos buckets (segundos de vazão acumulada)
+_BURST_SECONDS = 2.0
+
+
+class LLMRateLimitExceeded(TimeoutError):
+    """Espera na fila do limitador excedeu o prazo configurado."""
+
+
+def parse_retry_after(headers: Mapping[str, str] | None) -> float | None:
+    """Extrai `retry-after-ms`/`retry-after` (segundos) dos headers da resposta."""
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(float(value) * scale, 0.0)
+        except ValueError:
+            continue
+    return None
+
+
+class TokenBucket:
+    """Token bucket clássico (reposição contínua)."""
+
+    def __init__(
+        self, rate_per_second: float, capacity: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._rate = rate_per_second
+        self._capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def time_until_available(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self._capacity)
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self._rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= min(amount, self._capacity)
+
+
+class ModelRateLimiter:
+    """Limitador de um modelo: RPM + TPM + concorrência AIMD + Retry-After."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        target_latency_seconds: float = 8.0,
+        queue_timeout_seconds: float = 5.0,
+        default_retry_after_seconds: float = 1.0,
+        poll_interval_seconds: float = 0.02,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        request_rate = requests_per_minute / 60.0
+        token_rate = tokens_per_minute / 60.0
+        self._requests = TokenBucket(
+            request_rate, max(request_rate * _BURST_SECONDS, 1.0), clock=clock
+        )
+        self._tokens = TokenBucket(token_rate, token_rate * _BURST_SECONDS, clock=clock)
+        self._min_limit = float(min_concurrency)
+        self._max_limit = float(max_concurrency)
+        self._limit = float(max_concurrency)
+        self._target_latency = target_latency_seconds
+        self._queue_timeout = queue_timeout_seconds
+        self._default_retry_after = default_retry_after_seconds
+        self._poll = poll_interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self._paused_until = 0.0
+        self._stats = {"acquired": 0, "rate_limited": 0, "timeouts": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Tenta reservar; retorna 0 se conseguiu ou o atraso sugerido."""
+        with self._lock:
+            now = self._clock()
+            delay = max(
+                self._paused_until - now,
+                self._requests.time_until_available(1),
+                self._tokens.time_until_available(tokens),
+            )
+            if delay <= 0 and self._in_flight < int(self._limit):
+                self._requests.consume(1)
+                self._tokens.consume(tokens)
+                self._in_flight += 1
+                return 0.0
+            return max(delay, self._poll)
+
+    def _next_delay(self, tokens: int, started: float) -> float:
+        """0 quando reservou a vaga; senão o atraso até a próxima tentativa.
+
+        Raises:
+            LLMRateLimitExceeded: a espera passaria do `queue_timeout_seconds`
+        """
+        delay = self._try_acquire(tokens)
+        waited = self._clock() - started
+        if delay == 0.0:
+            self._record_wait(waited)
+            return 0.0
+        if waited + delay > self._queue_timeout:
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise LLMRateLimitExceeded("openai_rate_limiter_queue_timeout")
+        return delay
+
+    async def acquire(self, tokens: int) -> float:
+        """Aguarda vaga (concorrência + buckets). Retorna segundos de espera."""
+        started = self._clock()
+        with self._lock:
+            self._waiting += 1
+        try:
+            while delay := self._next_delay(tokens, started):
+                await asyncio.sleep(delay)
+            return self._clock() - started
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def acquire_sync(self, tokens: int) -> float:
+        """`acquire` para chamadas síncronas (bloqueia a thread enquanto espera)."""
+        started = self._clock()
+        with self._lock:
+            self._waiting += 1
+        try:
+            while delay := self._next_delay(tokens, started):
+                time.sleep(delay)
+            return self._clock() - started
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def release(
+        self,
+        latency_seconds: float | None,
+        rate_limited: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        """Libera a vaga e ajusta o limite de concorrência (AIMD).
+
+        `latency_seconds=None` (chamada cancelada) libera sem ajustar o limite.
+        """
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+            if latency_seconds is None:
+                return
+            if rate_limited:
+                self._stats["rate_limited"] += 1
+                self._limit = max(self._min_limit, self._limit / 2)
+                pause = retry_after if retry_after is not None else self._default_retry_after
+                self._paused_until = max(self._paused_until, self._clock() + pause)
+            elif latency_seconds > self._target_latency:
+                self._limit = max(self._min_limit, self._limit * 0.9)
+            else:
+                self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+    def _record_wait(self, waited: float) -> None:
+        with self._lock:
+            self._stats["acquired"] += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Estatísticas para logs/métricas."""
+        with self._lock:
+            acquired = self._stats["acquired"]
+            return {
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "concurrency_limit": round(self._limit, 2),
+                **self._stats,
+                "avg_wait_ms": round(self._wait_total / acquired * 1000, 1) if acquired else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 1),
+            }
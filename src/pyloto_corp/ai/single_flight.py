@@ -0,0 +1,160 @@
+"""Single-flight: coalescência de chamadas LLM idênticas concorrentes.
+
+Responsabilidade única: garantir que chamadas simultâneas com a mesma chave
+(hash do prompt + parâmetros) compartilhem UMA execução em andamento.
+
+Não é cache: assim que a chamada líder termina, a chave é liberada e a
+próxima chamada idêntica executa novamente.
+
+Cenário alvo: retries da Meta e rajadas de mensagens idênticas que disparam
+o mesmo prompt em paralelo (custo duplicado e cauda de latência).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+def llm_call_key(*parts: Any) -> str:
+    """Gera chave determinística (sha256) para prompt + parâmetros.
+
+    O prompt nunca é armazenado em claro (apenas o hash).
+    """
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class SingleFlightStats:
+    """Contadores para observabilidade (sem PII)."""
+
+    leaders: int = 0
+    coalesced: int = 0
+
+
+@dataclass(slots=True)
+class _InFlightCall:
+    done: threading.Event
+    result: Any = None
+    error: BaseException | None = None
+
+
+class SingleFlight:
+    """Single-flight síncrono e thread-safe (helpers `_call_llm`)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _InFlightCall] = {}
+        self.stats = SingleFlightStats()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Executa `fn` uma única vez por chave entre chamadas simultâneas.
+
+        Seguidores recebem o mesmo resultado ou a mesma exceção do líder.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = _InFlightCall(done=threading.Event())
+                self._calls[key] = call
+                self.stats.leaders += 1
+            else:
+                self.stats.coalesced += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+@dataclass(slots=True)
+class _AsyncInFlightCall:
+    task: asyncio.Task[Any]
+    waiters: int = 0
+
+
+class AsyncSingleFlight:
+    """Single-flight assíncrono (OpenAIClientManager).
+
+    Tarefas são presas ao event loop onde nasceram; chamadas vindas de outro
+    loop (ex.: `_run_async_in_thread`) executam sem coalescência.
+
+    A tarefa compartilhada roda sob `shield` para que o timeout de um
+    chamador não derrube os demais; quando o último chamador desiste (prazo
+    da mensagem estourado), ela é cancelada, liberando a vaga do limitador
+    e as tentativas de hedge em vez de seguir órfã.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _AsyncInFlightCall] = {}
+        self.stats = SingleFlightStats()
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        call = self._calls.get(key)
+        if call is not None and not call.task.done() and call.task.get_loop() is loop:
+            self.stats.coalesced += 1
+        else:
+            call = _AsyncInFlightCall(task=asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda finished: self._release(key, finished))
+            self.stats.leaders += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _release(self, key: str, finished: asyncio.Task[Any]) -> None:
+        call = self._calls.get(key)
+        if call is not None and call.task is finished:
+            del self._calls[key]
+
+
+# Instância global usada pelos helpers síncronos `_call_llm` (lazy init)
+_llm_single_flight: Any | None = None
+
+
+def get_llm_single_flight() -> Any:
+    """Retorna o single-flight global (em memória por padrão)."""
+    global _llm_single_flight
+    if _llm_single_flight is None:
+        _llm_single_flight = SingleFlight()
+    return _llm_single_flight
+
+
+def set_llm_single_flight(single_flight: Any | None) -> None:
+    """Substitui o single-flight global (ex.: variante Redis no bootstrap)."""
+    global _llm_single_flight
+    _llm_single_flight = single_flight
+
+
+def coalesce_llm_call(stage: str, model: str | None, prompt: str, fn: Callable[[], Any]) -> Any:
+    """Executa chamada LLM síncrona coalescendo prompts idênticos simultâneos."""
+    from pyloto_corp.config.settings import get_settings
+
+    if not getattr(get_settings(), "llm_single_flight_enabled", True):
+        return fn()
+    return get_llm_single_flight().do(llm_call_key(stage, model, prompt), fn)
@@ -0,0 +1,44 @@
+"""Estimativa barata de tokens para orçamento de contexto LLM.
+
+Responsabilidade única: aproximar a contagem de tokens de textos/mensagens
+sem depender de tokenizer externo (tiktoken não é dependência do projeto).
+
+Heurística: ~4 caracteres por token (média para PT-BR em modelos GPT-4o),
+arredondando para cima e nunca subestimando palavras curtas.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from typing import Any
+
+# Média empírica de caracteres por token para PT-BR
+CHARS_PER_TOKEN: float = 4.0
+
+# Overhead aproximado por mensagem de chat (role + delimitadores)
+MESSAGE_OVERHEAD_TOKENS: int = 4
+
+
+def estimate_tokens(text: str | None) -> int:
+    """Estima quantidade de tokens de um texto.
+
+    Usa o maior valor entre a estimativa por caracteres e a quantidade de
+    palavras (palavras curtas costumam virar 1 token cada).
+
+    Returns:
+        Estimativa >= 0 (0 apenas para texto vazio/None)
+    """
+    if not text:
+        return 0
+    by_chars = math.ceil(len(text) / CHARS_PER_TOKEN)
+    by_words = len(text.split())
+    return max(by_chars, by_words, 1)
+
+
+def estimate_messages_tokens(messages: Iterable[dict[str, Any]]) -> int:
+    """Estima tokens de uma lista de mensagens de chat (`role`/`content`)."""
+    total = 0
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS + estimate_tokens(str(message.get("content") or ""))
+    return total
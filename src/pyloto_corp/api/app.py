@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
+import os
+from typing import Any
+
 from fastapi import FastAPI
 
+from pyloto_corp.adapters.whatsapp.signature import WebhookSignatureVerifier
 from pyloto_corp.ai.orchestrator import AIOrchestrator
+from pyloto_corp.ai.single_flight import set_llm_single_flight
+from pyloto_corp.api.lifespan import (
+    BackendGroup,
+    create_lifespan,
+    initialize_backends,
+)
 from pyloto_corp.api.routes import router
 from pyloto_corp.config.settings import Settings, get_settings
 from pyloto_corp.infra.cloud_tasks import CloudTasksDispatcher, LocalCloudTasksClient
@@ -13,7 +23,11 @@ from pyloto_corp.infra.dedupe import create_dedupe_store
 from pyloto_corp.infra.flood_detector_factory import create_flood_detector_from_settings
 from pyloto_corp.infra.inbound_processing_log import create_inbound_log_store
 from pyloto_corp.infra.outbound_dedup_factory import create_outbound_dedupe_store
+from pyloto_corp.infra.secrets import create_secret_provider
+from pyloto_corp.infra.session_cache import wrap_session_store
+from pyloto_corp.infra.session_lock import create_session_lease_manager
 from pyloto_corp.infra.session_store import create_session_store
+from pyloto_corp.infra.single_flight_redis import create_llm_single_flight_from_settings
 from pyloto_corp.observability.logging import configure_logging, get_logger
 from pyloto_corp.observability.middleware import CorrelationIdMiddleware
 
@@ -102,11 +116,27 @@ def _create_tasks_dispatcher(settings: Settings) -> CloudTasksDispatcher:
     )
 
 
-def create_app(settings: Settings | None = None) -> FastAPI:
-    """Cria a aplicação FastAPI."""
-    settings = settings or get_settings()
-    configure_logging(settings.log_level, settings.service_name)
+def _create_signature_verifier(settings: Settings) -> WebhookSignatureVerifier:
+    """Verificador de assinatura; em staging/prod recarrega do Secret Manager."""
+    provider = None
+    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+    if (
+        (settings.is_staging or settings.is_production)
+        and project_id
+        and settings.webhook_secret_refresh_seconds > 0
+    ):
+        provider = create_secret_provider(
+            backend="secret_manager",
+            project_id=project_id,
+            cache_ttl_seconds=settings.secret_cache_ttl_seconds,
+            cache_max_stale_seconds=settings.secret_cache_max_stale_seconds,
+        )
+    verifier = WebhookSignatureVerifier.from_settings(settings, provider)
+    verifier.start_refresh()
+    return verifier
 
+
+def _validate_settings(settings: Settings) -> None:
     validation_errors: list[str] = []
     validation_errors.extend(settings.validate_session_store_config())
     validation_errors.extend(settings.validate_dedupe_backend())
@@ -121,12 +151,10 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         error_msg = "; ".join(validation_errors)
         raise ValueError(f"Configuração inválida: {error_msg}")
 
-    app = FastAPI(title=settings.service_name, version=settings.version)
-    app.add_middleware(CorrelationIdMiddleware)
-    app.include_router(router)
 
-    app.state.settings = settings
-    app.state.dedupe_store = create_dedupe_store(settings)
+def _build_stores(settings: Settings) -> dict[str, Any]:
+    """Stores que compartilham clientes Redis/Firestore (sequenciais entre si)."""
+    built: dict[str, Any] = {"dedupe_store": create_dedupe_store(settings)}
 
     redis_client = None
     firestore_client = None
@@ -138,23 +166,22 @@ def create_app(settings: Settings | None = None) -> FastAPI:
             raise ValueError(
                 "SESSION_STORE_BACKEND=redis mas REDIS_URL não configurado ou conexão falhou"
             )
-        app.state.session_store = create_session_store("redis", client=redis_client)
+        built["session_store"] = wrap_session_store(
+            create_session_store("redis", client=redis_client), settings, "redis"
+        )
     elif backend == "firestore":
         from google.cloud import firestore
 
         firestore_client = firestore.Client()
-        app.state.session_store = create_session_store("firestore", client=firestore_client)
+        built["session_store"] = wrap_session_store(
+            create_session_store("firestore", client=firestore_client), settings, "firestore"
+        )
     else:
-        app.state.session_store = create_session_store("memory")
+        built["session_store"] = create_session_store("memory")
 
-    app.state.flood_detector = create_flood_detector_from_settings(settings)
-    app.state.orchestrator = AIOrchestrator()
-    app.state.outbound_dedupe_store = _create_outbound_store(
+    built["outbound_dedupe_store"] = _create_outbound_store(
         settings, redis_client, firestore_client
     )
-    tasks_dispatcher = _create_tasks_dispatcher(settings)
-    app.state.tasks_dispatcher = tasks_dispatcher
-    app.state.cloud_tasks_client = tasks_dispatcher._client  # noqa: SLF001 - usado em testes
 
     # Rastro de processamento inbound
     if redis_client is None and settings.inbound_log_backend.lower() == "redis":
@@ -171,14 +198,102 @@ def create_app(settings: Settings | None = None) -> FastAPI:
             database=settings.firestore_database_id,
         )
 
-    app.state.inbound_log_store = create_inbound_log_store(
+    built["inbound_log_store"] = create_inbound_log_store(
         settings, redis_client=redis_client, firestore_client=firestore_client
     )
-    app.state.decision_audit_store = create_decision_audit_store(
+    built["decision_audit_store"] = create_decision_audit_store(
         settings, firestore_client=firestore_client
     )
 
+    # Single-flight de chamadas LLM (variante Redis coordena instâncias)
+    if redis_client is None and settings.llm_single_flight_backend.lower() == "redis":
+        redis_client = _create_redis_client(settings.redis_url)
+    set_llm_single_flight(create_llm_single_flight_from_settings(settings, redis_client))
+
+    # Lease de sessão: reusa o cliente Redis/Firestore dos stores
+    lock_backend = settings.session_lock_backend.lower()
+    if redis_client is None and lock_backend == "redis":
+        redis_client = _create_redis_client(settings.redis_url)
+        if redis_client is None:
+            raise ValueError(
+                "SESSION_LOCK_BACKEND=redis mas REDIS_URL não configurado ou conexão falhou"
+            )
+    if firestore_client is None and lock_backend == "firestore":
+        from google.cloud import firestore
+
+        firestore_client = firestore.Client(
+            project=settings.firestore_project_id or settings.gcp_project,
+            database=settings.firestore_database_id,
+        )
+    built["session_lease_manager"] = create_session_lease_manager(
+        settings, client=redis_client if lock_backend == "redis" else firestore_client
+    )
+
+    built["redis_client"] = redis_client
+    built["firestore_client"] = firestore_client
+    return built
+
+
+def _build_dispatcher(settings: Settings) -> dict[str, Any]:
+    tasks_dispatcher = _create_tasks_dispatcher(settings)
+    return {
+        "tasks_dispatcher": tasks_dispatcher,
+        "cloud_tasks_client": tasks_dispatcher._client,  # noqa: SLF001 - usado em testes
+    }
+
+
+def _backend_groups(settings: Settings) -> list[BackendGroup]:
+    """Grupos independentes de inicialização (executados em paralelo no lifespan)."""
+    return [
+        lambda: _build_stores(settings),
+        lambda: _build_dispatcher(settings),
+        lambda: {"flood_detector": create_flood_detector_from_settings(settings)},
+        lambda: {"orchestrator": AIOrchestrator()},
+    ]
+
+
+def create_app(settings: Settings | None = None, *, lazy: bool = False) -> FastAPI:
+    """Cria a aplicação FastAPI.
+
+    Com `lazy=True`, clientes e stores são criados no lifespan (em paralelo),
+    não na construção — usado pela instância padrão para cold start rápido.
+    """
+    settings = settings or get_settings()
+    configure_logging(
+        settings.log_level,
+        settings.service_name,
+        async_enabled=settings.log_async_enabled,
+        queue_max_size=settings.log_queue_max_size,
+        overflow_policy=settings.log_queue_overflow_policy,
+        batch_size=settings.log_batch_size,
+        sample_rates=settings.log_sample_rates,
+        rate_limits=settings.log_rate_limits,
+        always_log_correlation_ids=settings.log_always_correlation_ids,
+    )
+    _validate_settings(settings)
+
+    app = FastAPI(
+        title=settings.service_name,
+        version=settings.version,
+        lifespan=create_lifespan(_backend_groups),
+    )
+    app.add_middleware(CorrelationIdMiddleware)
+    app.include_router(router)
+
+    app.state.settings = settings
+    app.state.backends_ready = False
+    app.state.ready = False
+    app.state.signature_verifier = _create_signature_verifier(settings)
+    if not lazy:
+        initialize_backends(app, _backend_groups(settings))
+
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> Any:
+    """Instância padrão para uvicorn/Cloud Run, criada no primeiro acesso."""
+    if name == "app":
+        instance = create_app(lazy=True)
+        globals()["app"] = instance
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
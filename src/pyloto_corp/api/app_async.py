@@ -6,9 +6,18 @@ usando Cloud Tasks ou fila em memória.
 
 from __future__ import annotations
 
+import os
+from typing import Any
+
 from fastapi import FastAPI
 
+from pyloto_corp.adapters.whatsapp.signature import WebhookSignatureVerifier
 from pyloto_corp.ai.orchestrator import AIOrchestrator
+from pyloto_corp.api.lifespan import (
+    BackendGroup,
+    create_lifespan,
+    initialize_backends,
+)
 from pyloto_corp.api.routes_async import router
 from pyloto_corp.config.settings import Settings, get_settings
 from pyloto_corp.infra.cloud_tasks import CloudTasksDispatcher, LocalCloudTasksClient
@@ -17,6 +26,9 @@ from pyloto_corp.infra.dedupe import InMemoryDedupeStore, RedisDedupeStore
 from pyloto_corp.infra.flood_detector_factory import create_flood_detector_from_settings
 from pyloto_corp.infra.inbound_processing_log import create_inbound_log_store
 from pyloto_corp.infra.outbound_dedup_factory import create_outbound_dedupe_store
+from pyloto_corp.infra.secrets import create_secret_provider
+from pyloto_corp.infra.session_cache import wrap_session_store
+from pyloto_corp.infra.session_lock import create_session_lease_manager
 from pyloto_corp.infra.session_store import create_session_store
 from pyloto_corp.observability.logging import configure_logging, get_logger
 from pyloto_corp.observability.middleware import CorrelationIdMiddleware
@@ -114,66 +126,56 @@ def _create_tasks_dispatcher(settings: Settings) -> CloudTasksDispatcher:
     )
 
 
-def create_app(settings: Settings | None = None) -> FastAPI:
-    """Cria a aplicação FastAPI com suporte a fila assíncrona."""
-    settings = settings or get_settings()
-    configure_logging(settings.log_level, settings.service_name)
+def _create_signature_verifier(settings: Settings) -> WebhookSignatureVerifier:
+    """Verificador de assinatura; em staging/prod recarrega do Secret Manager."""
+    provider = None
+    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
+    if (
+        (settings.is_staging or settings.is_production)
+        and project_id
+        and settings.webhook_secret_refresh_seconds > 0
+    ):
+        provider = create_secret_provider(
+            backend="secret_manager",
+            project_id=project_id,
+            cache_ttl_seconds=settings.secret_cache_ttl_seconds,
+            cache_max_stale_seconds=settings.secret_cache_max_stale_seconds,
+        )
+    verifier = WebhookSignatureVerifier.from_settings(settings, provider)
+    verifier.start_refresh()
+    return verifier
 
-    app = FastAPI(title=settings.service_name, version=settings.version)
-    app.add_middleware(CorrelationIdMiddleware)
-    app.include_router(router)
 
-    app.state.settings = settings
-    app.state.dedupe_store = create_dedupe_store(settings)
+def _build_stores(settings: Settings) -> dict[str, Any]:
+    """Stores que compartilham clientes Redis/Firestore (sequenciais entre si)."""
+    built: dict[str, Any] = {"dedupe_store": create_dedupe_store(settings)}
 
     redis_client = None
     firestore_client = None
 
-    # Validar session store backend
-    store_errors = settings.validate_session_store_config()
-    if store_errors:
-        error_msg = "; ".join(store_errors)
-        raise ValueError(
-            f"Configuração de session store inválida para '{settings.environment}': {error_msg}"
-        )
-
     # Criar session store
     backend = settings.session_store_backend.lower()
     if backend == "redis":
         redis_client = _create_redis_client(settings.redis_url)
         if redis_client is None:
             raise ValueError("SESSION_STORE_BACKEND=redis mas REDIS_URL não configurado")
-        app.state.session_store = create_session_store("redis", client=redis_client)
+        built["session_store"] = wrap_session_store(
+            create_session_store("redis", client=redis_client), settings, "redis"
+        )
     elif backend == "firestore":
         from google.cloud import firestore
 
         firestore_client = firestore.Client()
-        app.state.session_store = create_session_store("firestore", client=firestore_client)
+        built["session_store"] = wrap_session_store(
+            create_session_store("firestore", client=firestore_client), settings, "firestore"
+        )
     else:
-        app.state.session_store = create_session_store("memory")
+        built["session_store"] = create_session_store("memory")
 
-    app.state.flood_detector = create_flood_detector_from_settings(settings)
-    app.state.orchestrator = AIOrchestrator()
-    app.state.outbound_dedupe_store = _create_outbound_store(
+    built["outbound_dedupe_store"] = _create_outbound_store(
         settings, redis_client, firestore_client
     )
 
-    # **NOVO**: Criar dispatcher Cloud Tasks
-    try:
-        tasks_dispatcher = _create_tasks_dispatcher(settings)
-        app.state.tasks_dispatcher = tasks_dispatcher
-        app.state.message_queue = tasks_dispatcher
-        logger.info(
-            "tasks_dispatcher_initialized",
-            extra={"backend": getattr(settings, "queue_backend", "memory")},
-        )
-    except Exception as e:
-        logger.error(
-            "failed_to_initialize_tasks_dispatcher",
-            extra={"error": str(e)},
-        )
-        raise
-
     # Rastro de processamento inbound
     if redis_client is None and settings.inbound_log_backend.lower() == "redis":
         redis_client = _create_redis_client(settings.redis_url)
@@ -189,15 +191,110 @@ def create_app(settings: Settings | None = None) -> FastAPI:
             database=settings.firestore_database_id,
         )
 
-    app.state.inbound_log_store = create_inbound_log_store(
+    built["inbound_log_store"] = create_inbound_log_store(
         settings, redis_client=redis_client, firestore_client=firestore_client
     )
-    app.state.decision_audit_store = create_decision_audit_store(
+    built["decision_audit_store"] = create_decision_audit_store(
         settings, firestore_client=firestore_client
     )
+    # Lease de sessão: reusa o cliente Redis/Firestore dos stores
+    lock_backend = settings.session_lock_backend.lower()
+    if redis_client is None and lock_backend == "redis":
+        redis_client = _create_redis_client(settings.redis_url)
+        if redis_client is None:
+            raise ValueError(
+                "SESSION_LOCK_BACKEND=redis mas REDIS_URL não configurado ou conexão falhou"
+            )
+    if firestore_client is None and lock_backend == "firestore":
+        from google.cloud import firestore
+
+        firestore_client = firestore.Client(
+            project=settings.firestore_project_id or settings.gcp_project,
+            database=settings.firestore_database_id,
+        )
+    built["session_lease_manager"] = create_session_lease_manager(
+        settings, client=redis_client if lock_backend == "redis" else firestore_client
+    )
+
+    built["redis_client"] = redis_client
+    built["firestore_client"] = firestore_client
+    return built
+
+
+def _build_dispatcher(settings: Settings) -> dict[str, Any]:
+    try:
+        tasks_dispatcher = _create_tasks_dispatcher(settings)
+    except Exception as e:
+        logger.error(
+            "failed_to_initialize_tasks_dispatcher",
+            extra={"error": str(e)},
+        )
+        raise
+    logger.info(
+        "tasks_dispatcher_initialized",
+        extra={"backend": getattr(settings, "queue_backend", "memory")},
+    )
+    return {"tasks_dispatcher": tasks_dispatcher, "message_queue": tasks_dispatcher}
+
+
+def _backend_groups(settings: Settings) -> list[BackendGroup]:
+    """Grupos independentes de inicialização (executados em paralelo no lifespan)."""
+    return [
+        lambda: _build_stores(settings),
+        lambda: _build_dispatcher(settings),
+        lambda: {"flood_detector": create_flood_detector_from_settings(settings)},
+        lambda: {"orchestrator": AIOrchestrator()},
+    ]
+
+
+def create_app(settings: Settings | None = None, *, lazy: bool = False) -> FastAPI:
+    """Cria a aplicação FastAPI com suporte a fila assíncrona.
+
+    Com `lazy=True`, clientes e stores são criados no lifespan (em paralelo).
+    """
+    settings = settings or get_settings()
+    configure_logging(
+        settings.log_level,
+        settings.service_name,
+        async_enabled=settings.log_async_enabled,
+        queue_max_size=settings.log_queue_max_size,
+        overflow_policy=settings.log_queue_overflow_policy,
+        batch_size=settings.log_batch_size,
+        sample_rates=settings.log_sample_rates,
+        rate_limits=settings.log_rate_limits,
+        always_log_correlation_ids=settings.log_always_correlation_ids,
+    )
+
+    # Validar session store backend
+    store_errors = settings.validate_session_store_config()
+    if store_errors:
+        error_msg = "; ".join(store_errors)
+        raise ValueError(
+            f"Configuração de session store inválida para '{settings.environment}': {error_msg}"
+        )
+
+    app = FastAPI(
+        title=settings.service_name,
+        version=settings.version,
+        lifespan=create_lifespan(_backend_groups),
+    )
+    app.add_middleware(CorrelationIdMiddleware)
+    app.include_router(router)
+
+    app.state.settings = settings
+    app.state.backends_ready = False
+    app.state.ready = False
+    app.state.signature_verifier = _create_signature_verifier(settings)
+    if not lazy:
+        initialize_backends(app, _backend_groups(settings))
 
     return app
 
 
-# Criar instância padrão para uvicorn/Cloud Run
-app = create_app()
+def __getattr__(name: str) -> Any:
+    """Instância padrão para uvicorn/Cloud Run, criada no primeiro acesso."""
+    if name == "app":
+        instance = create_app(lazy=True)
+        globals()["app"] = instance
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
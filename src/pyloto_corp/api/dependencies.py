@@ -4,13 +4,17 @@ from __future__ import annotations
 
 from fastapi import Request
 
+from pyloto_corp.adapters.whatsapp.signature import WebhookSignatureVerifier
 from pyloto_corp.ai.orchestrator import AIOrchestrator
+from pyloto_corp.api.readiness import ReadinessChecker, create_readiness_checker
+from pyloto_corp.application.keyed_executor import KeyedExecutor
 from pyloto_corp.config.settings import Settings
 from pyloto_corp.domain.abuse_detection import FloodDetector
 from pyloto_corp.domain.outbound_dedup import OutboundDedupeStore
 from pyloto_corp.infra.cloud_tasks import CloudTasksDispatcher
 from pyloto_corp.infra.dedupe import DedupeStore
 from pyloto_corp.infra.inbound_processing_log import InboundProcessingLogStore
+from pyloto_corp.infra.session_lock import SessionLeaseManager
 from pyloto_corp.infra.session_store import SessionStore
 
 
@@ -20,6 +24,35 @@ def get_settings(request: Request) -> Settings:
     return request.app.state.settings
 
 
+def get_signature_verifier(request: Request) -> WebhookSignatureVerifier:
+    """Retorna o verificador de assinatura (criado das settings se ausente)."""
+
+    verifier = getattr(request.app.state, "signature_verifier", None)
+    if verifier is None:
+        verifier = WebhookSignatureVerifier.from_settings(request.app.state.settings)
+        request.app.state.signature_verifier = verifier
+    return verifier
+
+
+def get_readiness_checker(request: Request) -> ReadinessChecker:
+    """Retorna o checker de readiness (criado do estado atual se ausente)."""
+
+    checker = getattr(request.app.state, "readiness", None)
+    if checker is None:
+        checker = create_readiness_checker(request.app.state, request.app.state.settings)
+        request.app.state.readiness = checker
+    return checker
+
+
+def get_inbound_executor(request: Request) -> KeyedExecutor:
+    """Executor por conversa compartilhado pelas tasks inbound da instância."""
+    executor = getattr(request.app.state, "inbound_executor", None)
+    if executor is None:
+        executor = KeyedExecutor(request.app.state.settings.inbound_max_concurrency)
+        request.app.state.inbound_executor = executor
+    return executor
+
+
 def get_dedupe_store(request: Request) -> DedupeStore:
     """Retorna o store de dedupe ativo."""
 
@@ -38,6 +71,12 @@ def get_session_store(request: Request) -> SessionStore:
     return request.app.state.session_store
 
 
+def get_session_lease_manager(request: Request) -> SessionLeaseManager | None:
+    """Retorna o lease manager de sessão (None quando `session_lock_backend=none`)."""
+
+    return getattr(request.app.state, "session_lease_manager", None)
+
+
 def get_flood_detector(request: Request) -> FloodDetector:
     """Retorna o detector de flood ativo."""
 
@@ -0,0 +1,157 @@
+"""Ciclo de vida da aplicação (startup/shutdown via FastAPI lifespan).
+
+Responsabilidades:
+- Inicializar backends independentes em paralelo (threads), cada grupo
+  devolvendo os atributos de `app.state` que constrói
+- Pré-aquecimento opcional antes de marcar a app como pronta: abre conexões
+  (primeira rodada das probes de readiness), monta os system prompts,
+  carrega o contexto institucional e cria o cliente OpenAI
+- Shutdown: parar refresh de secrets, gravar escritas pendentes do cache
+  de sessão e drenar logs
+
+Compartilhado por `app.py` e `app_async.py`; cada fábrica define seus grupos.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi import FastAPI
+
+from pyloto_corp.api.readiness import create_readiness_checker
+from pyloto_corp.config.settings import Settings
+from pyloto_corp.observability.logging import get_logger, shutdown_logging
+
+logger = get_logger(__name__)
+
+# Grupo de inicialização: constrói backends e retorna {atributo_state: valor}
+BackendGroup = Callable[[], dict[str, Any]]
+
+
+def _apply(app: FastAPI, built: dict[str, Any]) -> None:
+    for name, value in built.items():
+        setattr(app.state, name, value)
+
+
+def initialize_backends(app: FastAPI, groups: Sequence[BackendGroup]) -> None:
+    """Inicialização síncrona (sequencial), usada quando a app não é lazy."""
+    for group in groups:
+        _apply(app, group())
+    app.state.backends_ready = True
+
+
+async def initialize_backends_async(app: FastAPI, groups: Sequence[BackendGroup]) -> None:
+    """Inicializa os grupos em paralelo (SDKs bloqueantes rodam em threads)."""
+    started = time.perf_counter()
+    results = await asyncio.gather(*(asyncio.to_thread(group) for group in groups))
+    for built in results:
+        _apply(app, built)
+    app.state.backends_ready = True
+    logger.info(
+        "backends_initialized",
+        extra={
+            "groups": len(groups),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        },
+    )
+
+
+async def _check_dependencies(app: FastAPI) -> None:
+    results = await app.state.readiness.check()
+    failed = [name for name, result in results.items() if not result.ok]
+    if failed:
+        raise RuntimeError(f"probes com falha: {', '.join(failed)}")
+
+
+def _build_prompts() -> None:
+    from pyloto_corp.ai import openai_prompts
+
+    openai_prompts.get_event_detection_prompt()
+    openai_prompts.get_response_generation_prompt()
+    openai_prompts.get_message_type_selection_prompt()
+
+
+def _build_openai_client(settings: Settings) -> None:
+    from pyloto_corp.ai.openai_client import get_openai_client
+
+    get_openai_client(settings.openai_api_key)
+
+
+async def _load_institutional_context(app: FastAPI) -> None:
+    from pyloto_corp.infra.institutional_context import InstitutionalContextLoader
+
+    loader = InstitutionalContextLoader()
+    await loader.load()
+    app.state.institutional_context = loader
+
+
+async def prewarm(app: FastAPI, settings: Settings) -> None:
+    """Aquece conexões, prompts e caches; falhas são logadas, nunca fatais."""
+    steps: dict[str, Any] = {
+        "dependencies": _check_dependencies(app),
+        "institutional_context": _load_institutional_context(app),
+        "prompts": asyncio.to_thread(_build_prompts),
+    }
+    if settings.openai_enabled and settings.openai_api_key:
+        steps["openai_client"] = asyncio.to_thread(_build_openai_client, settings)
+
+    started = time.perf_counter()
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*steps.values(), return_exceptions=True),
+            timeout=settings.app_prewarm_timeout_seconds,
+        )
+    except TimeoutError:
+        logger.warning("prewarm_timeout", extra={"steps": list(steps)})
+        return
+    for step, result in zip(steps, results, strict=True):
+        if isinstance(result, Exception):
+            logger.warning(
+                "prewarm_step_failed", extra={"step": step, "error": type(result).__name__}
+            )
+    logger.info(
+        "prewarm_finished",
+        extra={"elapsed_ms": round((time.perf_counter() - started) * 1000, 1)},
+    )
+
+
+def _close_session_store(app: FastAPI) -> None:
+    """Grava escritas pendentes do cache de sessão (write-behind)."""
+    close = getattr(getattr(app.state, "session_store", None), "close", None)
+    if not callable(close):
+        return
+    try:
+        close()
+    except Exception as exc:  # noqa: BLE001 - shutdown segue
+        logger.warning("session_store_close_failed", extra={"error": type(exc).__name__})
+
+
+def create_lifespan(
+    groups_factory: Callable[[Settings], Sequence[BackendGroup]],
+) -> Callable[[FastAPI], Any]:
+    """Lifespan que inicializa backends pendentes, pré-aquece e faz shutdown."""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        settings: Settings = app.state.settings
+        if not getattr(app.state, "backends_ready", False):
+            await initialize_backends_async(app, groups_factory(settings))
+        app.state.readiness = create_readiness_checker(app.state, settings)
+        if settings.app_prewarm_enabled:
+            await prewarm(app, settings)
+        app.state.ready = True
+        try:
+            yield
+        finally:
+            app.state.ready = False
+            verifier = getattr(app.state, "signature_verifier", None)
+            if verifier is not None:
+                verifier.stop_refresh()
+            _close_session_store(app)
+            shutdown_logging()
+
+    return lifespan
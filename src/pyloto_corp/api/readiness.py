@@ -0,0 +1,124 @@
+"""Readiness probe: checagens de dependências com cache e timeout.
+
+Responsabilidades:
+- Montar probes só para os backends configurados (Redis, Firestore,
+  Cloud Tasks, OpenAI)
+- Executar as probes em paralelo, cada uma limitada por timeout
+- Cachear o resultado por alguns segundos (probes do Cloud Run não viram
+  carga nos backends) e coalescer checagens simultâneas
+
+Probes síncronas rodam em threads; em timeout a thread segue até o timeout
+do próprio client, mas o resultado já é reportado como falha.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from pyloto_corp.config.settings import Settings
+
+Probe = Callable[[], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    """Resultado de uma probe (sem detalhes sensíveis do erro)."""
+
+    ok: bool
+    latency_ms: float
+    error: str | None = None
+
+
+class ReadinessChecker:
+    """Executa probes com timeout e cache de resultado."""
+
+    def __init__(
+        self,
+        probes: Mapping[str, Probe],
+        *,
+        timeout_seconds: float = 2.0,
+        cache_ttl_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._probes = dict(probes)
+        self._timeout = timeout_seconds
+        self._cache_ttl = cache_ttl_seconds
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._cached: dict[str, ProbeResult] | None = None
+        self._checked_at = 0.0
+
+    @property
+    def probe_names(self) -> list[str]:
+        return list(self._probes)
+
+    async def check(self) -> dict[str, ProbeResult]:
+        """Resultado por probe (cacheado por `cache_ttl_seconds`)."""
+        if self._fresh():
+            return self._cached  # type: ignore[return-value]
+        async with self._lock:
+            if self._fresh():
+                return self._cached  # type: ignore[return-value]
+            names = list(self._probes)
+            results = await asyncio.gather(*(self._run(self._probes[name]) for name in names))
+            self._cached = dict(zip(names, results, strict=True))
+            self._checked_at = self._clock()
+            return self._cached
+
+    def _fresh(self) -> bool:
+        return self._cached is not None and self._clock() - self._checked_at < self._cache_ttl
+
+    async def _run(self, probe: Probe) -> ProbeResult:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(probe), timeout=self._timeout)
+        except TimeoutError:
+            return ProbeResult(ok=False, latency_ms=self._elapsed(started), error="timeout")
+        except Exception as exc:  # noqa: BLE001
+            return ProbeResult(
+                ok=False, latency_ms=self._elapsed(started), error=type(exc).__name__
+            )
+        return ProbeResult(ok=True, latency_ms=self._elapsed(started))
+
+    @staticmethod
+    def _elapsed(started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _require_openai_key(settings: Settings) -> None:
+    if not settings.openai_api_key:
+        raise RuntimeError("openai_api_key_missing")
+
+
+def build_probes(state: Any, settings: Settings) -> dict[str, Probe]:
+    """Probes para os backends presentes em `app.state`."""
+    probes: dict[str, Probe] = {}
+
+    redis_client = getattr(state, "redis_client", None)
+    if redis_client is not None:
+        probes["redis"] = redis_client.ping
+
+    firestore_client = getattr(state, "firestore_client", None)
+    if firestore_client is not None:
+        probes["firestore"] = lambda: firestore_client.collection("_readiness").limit(1).get()
+
+    dispatcher = getattr(state, "tasks_dispatcher", None)
+    if dispatcher is not None and hasattr(dispatcher, "ping"):
+        probes["cloud_tasks"] = dispatcher.ping
+
+    if settings.openai_enabled:
+        probes["openai"] = lambda: _require_openai_key(settings)
+
+    return probes
+
+
+def create_readiness_checker(state: Any, settings: Settings) -> ReadinessChecker:
+    return ReadinessChecker(
+        build_probes(state, settings),
+        timeout_seconds=settings.readiness_probe_timeout_seconds,
+        cache_ttl_seconds=settings.readiness_cache_ttl_seconds,
+    )
@@ -2,34 +2,55 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+from dataclasses import asdict
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from pyloto_corp.adapters.whatsapp.signature import verify_meta_signature
+from pyloto_corp.adapters.whatsapp.signature import WebhookSignatureVerifier
+from pyloto_corp.adapters.whatsapp.webhook_split import split_webhook_payload
 from pyloto_corp.ai.orchestrator import AIOrchestrator
 from pyloto_corp.api.dependencies import (
     get_dedupe_store,
+    get_inbound_executor,
     get_inbound_log_store,
     get_orchestrator,
     get_outbound_dedupe_store,
+    get_readiness_checker,
     get_settings,
+    get_signature_verifier,
     get_tasks_dispatcher,
 )
+from pyloto_corp.api.readiness import ReadinessChecker
+from pyloto_corp.application.keyed_executor import KeyedExecutor
 from pyloto_corp.application.whatsapp_async import (
+    INBOUND_EVENT_ID_HEADER,
+    RAW_INGRESS_HEADER,
+    SIGNATURE_SKIPPED_HEADER,
+    SIGNATURE_VALIDATED_HEADER,
     compute_inbound_event_id,
+    compute_inbound_event_id_raw,
     ensure_webhook_secret,
+    fan_out_webhook,
     handle_inbound_task,
     handle_outbound_task,
+    inbound_chunk_event_id,
+    read_limited_body,
     require_internal_token,
 )
 from pyloto_corp.config.settings import Settings
-from pyloto_corp.infra.cloud_tasks import CloudTaskDispatchError, CloudTasksDispatcher
+from pyloto_corp.infra.cloud_tasks import (
+    CloudTaskDispatchError,
+    CloudTasksDispatcher,
+    TaskMetadata,
+)
 from pyloto_corp.infra.dedupe import DedupeError, DedupeStore
 from pyloto_corp.infra.inbound_processing_log import InboundProcessingLogStore
+from pyloto_corp.infra.unit_of_work import async_unit_of_work
 from pyloto_corp.observability.logging import get_logger
 from pyloto_corp.observability.middleware import get_correlation_id
+from pyloto_corp.utils import json_codec
 
 logger = get_logger(__name__)
 
@@ -42,6 +63,27 @@ def health(settings: Settings = Depends(get_settings)) -> dict[str, str]:
     return {"status": "ok", "service": settings.service_name, "version": settings.version}
 
 
+@router.get("/ready")
+async def ready(
+    request: Request,
+    response: Response,
+    checker: ReadinessChecker = Depends(get_readiness_checker),
+) -> dict[str, Any]:
+    """Readiness para Cloud Run: 503 até o warm-up terminar ou se algum backend falhar."""
+    if not getattr(request.app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up", "checks": {}}
+
+    results = await checker.check()
+    is_ready = all(result.ok for result in results.values())
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if is_ready else "unavailable",
+        "checks": {name: asdict(result) for name, result in results.items()},
+    }
+
+
 @router.get("/webhooks/whatsapp")
 def whatsapp_verify(
     hub_mode: str | None = Query(None, alias="hub.mode"),
@@ -69,27 +111,97 @@ def whatsapp_verify(
 async def whatsapp_webhook(
     request: Request,
     settings: Settings = Depends(get_settings),
+    verifier: WebhookSignatureVerifier = Depends(get_signature_verifier),
     dedupe_store: DedupeStore = Depends(get_dedupe_store),
     tasks_dispatcher: CloudTasksDispatcher = Depends(get_tasks_dispatcher),
 ) -> dict[str, Any]:
-    """Recebe eventos do WhatsApp e apenas enfileira para processamento."""
-    ensure_webhook_secret(settings)
+    """Recebe eventos do WhatsApp e apenas enfileira para processamento.
 
-    raw_body = await request.body()
-    signature_result = verify_meta_signature(
-        raw_body, request.headers, settings.whatsapp_webhook_secret
-    )
+    Com `webhook_raw_ingress_enabled`, o corpo não é parseado aqui: a chave de
+    dedupe vem de uma varredura dos bytes e a task leva os bytes originais
+    (parse completo fica para o worker). Com `webhook_fanout_enabled` (que
+    tem precedência sobre o raw), cada mensagem/status vira uma task própria.
+
+    O corpo é lido em streaming com teto de `webhook_max_body_bytes` (413 sem
+    bufferizar o excedente); webhooks com mais de `webhook_max_events_per_task`
+    mensagens/status viram várias tasks.
+    """
+    ensure_webhook_secret(settings, verifier)
+
+    raw_body = await read_limited_body(request, settings.webhook_max_body_bytes)
+    signature_result = verifier.verify(raw_body, request.headers)
 
     if not signature_result.valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_signature")
 
-    try:
-        payload = json.loads(raw_body or b"{}")
-    except json.JSONDecodeError as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_json") from exc
+    raw_ingress = (
+        settings.webhook_raw_ingress_enabled
+        and not settings.webhook_fanout_enabled
+        and hasattr(tasks_dispatcher, "enqueue_inbound_raw")
+    )
+    payload: Any = None
+    if raw_ingress:
+        raw_body = raw_body or b"{}"
+        inbound_event_id = compute_inbound_event_id_raw(raw_body)
+    else:
+        try:
+            payload = json_codec.loads(raw_body or b"{}")
+        except json_codec.JSONDecodeError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_json"
+            ) from exc
+        inbound_event_id = compute_inbound_event_id(payload, raw_body)
 
-    inbound_event_id = compute_inbound_event_id(payload, raw_body)
     correlation_id = get_correlation_id()
+    signature_validated = signature_result.valid and not signature_result.skipped
+    if settings.webhook_fanout_enabled:
+        return await _fan_out_ingress(
+            payload,
+            parent_event_id=inbound_event_id,
+            dedupe_store=dedupe_store,
+            tasks_dispatcher=tasks_dispatcher,
+            correlation_id=correlation_id,
+            signature_validated=signature_validated,
+            signature_skipped=signature_result.skipped,
+        )
+
+    if not raw_ingress:
+        chunks = split_webhook_payload(payload, settings.webhook_max_events_per_task)
+        units = [
+            (inbound_chunk_event_id(inbound_event_id, index, len(chunks)), chunk)
+            for index, chunk in enumerate(chunks)
+        ]
+        # Chave por pedaço: falha parcial libera só os pedaços não enfileirados
+        enqueued = await _enqueue_inbound_once(
+            units,
+            dedupe_store=dedupe_store,
+            tasks_dispatcher=tasks_dispatcher,
+            correlation_id=correlation_id,
+            task_fields={
+                "correlation_id": correlation_id,
+                "signature_skipped": signature_result.skipped,
+                "signature_validated": signature_validated,
+            },
+        )
+        if not enqueued:
+            logger.info("inbound_duplicate_skipped", extra={"inbound_event_id": inbound_event_id})
+            return _duplicate_ingress_response(
+                correlation_id, inbound_event_id, signature_validated, signature_result.skipped
+            )
+        return {
+            "ok": True,
+            "status": "enqueued",
+            "enqueued": True,
+            "result": "enqueued",
+            "task_name": enqueued[0].name,
+            "queue": enqueued[0].queue,
+            "task_count": len(enqueued),
+            "correlation_id": correlation_id,
+            "inbound_event_id": inbound_event_id,
+            "signature_validated": signature_validated,
+            "signature_skipped": signature_result.skipped,
+        }
+
     try:
         is_new = dedupe_store.mark_if_new(inbound_event_id)
     except DedupeError as exc:
@@ -103,26 +215,21 @@ async def whatsapp_webhook(
 
     if not is_new:
         logger.info("inbound_duplicate_skipped", extra={"inbound_event_id": inbound_event_id})
-        return {
-            "ok": True,
-            "status": "duplicate",
-            "enqueued": False,
-            "result": "duplicate",
-            "correlation_id": correlation_id,
-            "inbound_event_id": inbound_event_id,
-            "signature_validated": signature_result.valid and not signature_result.skipped,
-            "signature_skipped": signature_result.skipped,
-        }
+        return _duplicate_ingress_response(
+            correlation_id, inbound_event_id, signature_validated, signature_result.skipped
+        )
 
-    task_payload = {
-        "payload": payload,
-        "inbound_event_id": inbound_event_id,
-        "correlation_id": correlation_id,
-        "signature_skipped": signature_result.skipped,
-        "signature_validated": signature_result.valid and not signature_result.skipped,
-    }
     try:
-        task_meta = await tasks_dispatcher.enqueue_inbound(task_payload)
+        task_meta = await tasks_dispatcher.enqueue_inbound_raw(
+            raw_body,
+            headers={
+                RAW_INGRESS_HEADER: "1",
+                INBOUND_EVENT_ID_HEADER: inbound_event_id,
+                "X-Correlation-ID": correlation_id,
+                SIGNATURE_VALIDATED_HEADER: str(signature_validated).lower(),
+                SIGNATURE_SKIPPED_HEADER: str(signature_result.skipped).lower(),
+            },
+        )
     except CloudTaskDispatchError as exc:
         dedupe_store.clear(inbound_event_id)
         raise HTTPException(
@@ -137,14 +244,141 @@ async def whatsapp_webhook(
         "result": "enqueued",
         "task_name": task_meta.name,
         "queue": task_meta.queue,
+        "task_count": 1,
         "correlation_id": correlation_id,
         "inbound_event_id": inbound_event_id,
-        "signature_validated": signature_result.valid and not signature_result.skipped,
+        "signature_validated": signature_validated,
         "signature_skipped": signature_result.skipped,
     }
 
 
-def _mark_inbound_started(
+def _duplicate_ingress_response(
+    correlation_id: str,
+    inbound_event_id: str,
+    signature_validated: bool,
+    signature_skipped: bool,
+) -> dict[str, Any]:
+    return {
+        "ok": True,
+        "status": "duplicate",
+        "enqueued": False,
+        "result": "duplicate",
+        "correlation_id": correlation_id,
+        "inbound_event_id": inbound_event_id,
+        "signature_validated": signature_validated,
+        "signature_skipped": signature_skipped,
+    }
+
+
+async def _enqueue_inbound_once(
+    units: list[tuple[str, dict[str, Any]]],
+    *,
+    dedupe_store: DedupeStore,
+    tasks_dispatcher: CloudTasksDispatcher,
+    correlation_id: str | None,
+    task_fields: dict[str, Any],
+) -> list[TaskMetadata]:
+    """Enfileira uma task por unidade `(chave, payload)`, com dedupe por chave.
+
+    Chaves já vistas são puladas; os enqueues rodam concorrentes. Em falha,
+    só as chaves das unidades não enfileiradas são liberadas (o retry da
+    Meta/Cloud Tasks reenfileira apenas essas) e a resposta é 503.
+    """
+    keys = [key for key, _ in units]
+    try:
+        new_flags = dedupe_store.mark_many_if_new(keys)
+    except DedupeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "inbound_dedupe_unavailable", "correlation_id": correlation_id},
+        ) from exc
+
+    pending = [(key, unit) for (key, unit), is_new in zip(units, new_flags, strict=True) if is_new]
+    results = await asyncio.gather(
+        *(
+            tasks_dispatcher.enqueue_inbound(
+                {"payload": unit, "inbound_event_id": key, **task_fields}
+            )
+            for key, unit in pending
+        ),
+        return_exceptions=True,
+    )
+
+    failed = [
+        key
+        for (key, _), result in zip(pending, results, strict=True)
+        if isinstance(result, BaseException)
+    ]
+    for key in failed:
+        dedupe_store.clear(key)
+    if failed:
+        logger.error(
+            "inbound_enqueue_partial_failure",
+            extra={"failed": len(failed), "units": len(units), "correlation_id": correlation_id},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="enqueue_failed"
+        )
+    return list(results)
+
+
+async def _fan_out_ingress(
+    payload: dict[str, Any],
+    *,
+    parent_event_id: str,
+    dedupe_store: DedupeStore,
+    tasks_dispatcher: CloudTasksDispatcher,
+    correlation_id: str,
+    signature_validated: bool,
+    signature_skipped: bool,
+) -> dict[str, Any]:
+    """Uma task por evento: dedupe em lote e enqueues concorrentes.
+
+    Em falha de enqueue, só as chaves das unidades não enfileiradas são
+    liberadas (o retry da Meta reenfileira apenas essas). Cada task leva
+    `parent_event_id` (chave do webhook original) para rastreio.
+    """
+    units = fan_out_webhook(payload)
+    keys = [key for key, _ in units]
+    enqueued_tasks = await _enqueue_inbound_once(
+        units,
+        dedupe_store=dedupe_store,
+        tasks_dispatcher=tasks_dispatcher,
+        correlation_id=correlation_id,
+        task_fields={
+            "parent_event_id": parent_event_id,
+            "correlation_id": correlation_id,
+            "signature_skipped": signature_skipped,
+            "signature_validated": signature_validated,
+        },
+    )
+
+    enqueued = len(enqueued_tasks)
+    logger.info(
+        "inbound_fanout_enqueued",
+        extra={
+            "parent_event_id": parent_event_id,
+            "units": len(units),
+            "enqueued": enqueued,
+            "correlation_id": correlation_id,
+        },
+    )
+    return {
+        "ok": True,
+        "status": "enqueued" if enqueued else "duplicate",
+        "enqueued": enqueued > 0,
+        "result": "enqueued" if enqueued else "duplicate",
+        "task_count": enqueued,
+        "duplicates": len(units) - enqueued,
+        "correlation_id": correlation_id,
+        "inbound_event_id": parent_event_id,
+        "inbound_event_ids": keys,
+        "signature_validated": signature_validated,
+        "signature_skipped": signature_skipped,
+    }
+
+
+async def _mark_inbound_started(
     inbound_log_store: InboundProcessingLogStore,
     inbound_event_id: str,
     correlation_id: str | None,
@@ -160,7 +394,7 @@ def _mark_inbound_started(
         },
     )
     try:
-        inbound_log_store.mark_started(inbound_event_id, correlation_id, task_name)
+        await inbound_log_store.mark_started_async(inbound_event_id, correlation_id, task_name)
     except Exception as exc:  # noqa: BLE001
         logger.error(
             "inbound_log_start_failed",
@@ -236,34 +470,45 @@ async def _run_inbound_with_rastro(
     tasks_dispatcher: CloudTasksDispatcher,
     inbound_log_store: InboundProcessingLogStore,
     orchestrator: AIOrchestrator,
+    executor: KeyedExecutor | None = None,
+    sequence_outbound: bool = False,
 ) -> dict[str, Any]:
-    """Executa worker inbound com rastro persistente."""
-    _mark_inbound_started(inbound_log_store, inbound_event_id, correlation_id, task_name)
-
-    try:
-        result = await handle_inbound_task(
-            payload=payload,
-            inbound_event_id=inbound_event_id,
-            correlation_id=correlation_id,
-            tasks_dispatcher=tasks_dispatcher,
-            orchestrator=orchestrator,
-        )
-        return _handle_inbound_success(
+    """Executa worker inbound com rastro persistente.
+
+    O início do rastro é gravado na hora; as escritas cegas do processamento
+    (fim do rastro, auditoria) saem em um commit só no fim do request.
+    """
+    await _mark_inbound_started(inbound_log_store, inbound_event_id, correlation_id, task_name)
+
+    async with async_unit_of_work() as uow:
+        try:
+            result = await handle_inbound_task(
+                payload=payload,
+                inbound_event_id=inbound_event_id,
+                correlation_id=correlation_id,
+                tasks_dispatcher=tasks_dispatcher,
+                orchestrator=orchestrator,
+                executor=executor,
+                sequence_outbound=sequence_outbound,
+            )
+        except Exception as exc:  # noqa: BLE001
+            _handle_inbound_failure(
+                inbound_log_store,
+                inbound_event_id,
+                correlation_id,
+                task_name,
+                exc,
+            )
+            raise
+        response = _handle_inbound_success(
             inbound_log_store,
             inbound_event_id,
             correlation_id,
             task_name,
             result,
         )
-    except Exception as exc:  # noqa: BLE001
-        _handle_inbound_failure(
-            inbound_log_store,
-            inbound_event_id,
-            correlation_id,
-            task_name,
-            exc,
-        )
-        raise
+        await uow.try_flush_async()
+    return response
 
 
 def _handle_inbound_success(
@@ -329,20 +574,11 @@ def _handle_inbound_failure(
     )
 
 
-@router.post("/internal/process_inbound")
-async def process_inbound(
-    request: Request,
-    settings: Settings = Depends(get_settings),
-    tasks_dispatcher: CloudTasksDispatcher = Depends(get_tasks_dispatcher),
-    inbound_log_store: InboundProcessingLogStore = Depends(get_inbound_log_store),
-    orchestrator: AIOrchestrator = Depends(get_orchestrator),
-) -> dict[str, Any]:
-    """Processa task inbound e enfileira outbound."""
-    require_internal_token(request, settings)
-
+async def _parse_inbound_task(request: Request) -> tuple[dict[str, Any], str, str]:
+    """Task com envelope JSON ({payload, inbound_event_id, correlation_id})."""
     try:
-        task_body = await request.json()
-    except Exception as exc:  # noqa: BLE001
+        task_body = json_codec.loads(await request.body())
+    except json_codec.JSONDecodeError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_json") from exc
 
     if not isinstance(task_body, dict) or "payload" not in task_body:
@@ -354,8 +590,112 @@ async def process_inbound(
         payload, raw_body
     )
     correlation_id = task_body.get("correlation_id") or get_correlation_id()
+    return payload, inbound_event_id, correlation_id
+
+
+async def _parse_raw_inbound_task(
+    request: Request,
+) -> tuple[dict[str, Any], str, str] | None:
+    """Task do ingress raw: corpo = webhook original; metadados nos headers.
+
+    Corpo que não é um objeto JSON retorna None: o ingress raw não parseia,
+    então o erro só aparece aqui, e responder 4xx faria o Cloud Tasks
+    reenviar uma task que nunca vai passar.
+    """
+    raw_body = await request.body()
+    reason = None
+    try:
+        payload = json_codec.loads(raw_body)
+        if not isinstance(payload, dict):
+            reason = "invalid_task_payload"
+    except json_codec.JSONDecodeError:
+        reason = "invalid_json"
+
+    if reason is not None:
+        logger.error(
+            "inbound_raw_task_dropped",
+            extra={
+                "reason": reason,
+                "inbound_event_id": request.headers.get(INBOUND_EVENT_ID_HEADER),
+                "task_name": request.headers.get("X-CloudTasks-TaskName"),
+                "body_bytes": len(raw_body),
+                "correlation_id": get_correlation_id(),
+            },
+        )
+        return None
+
+    inbound_event_id = request.headers.get(INBOUND_EVENT_ID_HEADER) or compute_inbound_event_id(
+        payload, raw_body
+    )
+    # correlation_id chega pelo header X-Correlation-ID (middleware)
+    return payload, inbound_event_id, get_correlation_id()
+
+
+async def _split_inbound_task(
+    chunks: list[dict[str, Any]],
+    inbound_event_id: str,
+    correlation_id: str | None,
+    tasks_dispatcher: CloudTasksDispatcher,
+    dedupe_store: DedupeStore,
+) -> dict[str, Any]:
+    """Reenfileira um webhook grande como uma task por pedaço.
+
+    Dedupe por pedaço: no retry da task (falha parcial), só os pedaços que
+    não foram enfileirados saem de novo.
+    """
+    units = [
+        (inbound_chunk_event_id(inbound_event_id, index, len(chunks)), chunk)
+        for index, chunk in enumerate(chunks)
+    ]
+    enqueued = await _enqueue_inbound_once(
+        units,
+        dedupe_store=dedupe_store,
+        tasks_dispatcher=tasks_dispatcher,
+        correlation_id=correlation_id,
+        task_fields={"correlation_id": correlation_id},
+    )
+
+    logger.info(
+        "inbound_task_split",
+        extra={
+            "inbound_event_id": inbound_event_id,
+            "task_count": len(chunks),
+            "enqueued": len(enqueued),
+        },
+    )
+    return {"ok": True, "inbound_event_id": inbound_event_id, "split": len(chunks)}
+
+
+@router.post("/internal/process_inbound")
+async def process_inbound(
+    request: Request,
+    settings: Settings = Depends(get_settings),
+    tasks_dispatcher: CloudTasksDispatcher = Depends(get_tasks_dispatcher),
+    inbound_log_store: InboundProcessingLogStore = Depends(get_inbound_log_store),
+    orchestrator: AIOrchestrator = Depends(get_orchestrator),
+    executor: KeyedExecutor = Depends(get_inbound_executor),
+    dedupe_store: DedupeStore = Depends(get_dedupe_store),
+) -> dict[str, Any]:
+    """Processa task inbound e enfileira outbound."""
+    require_internal_token(request, settings)
+
+    if request.headers.get(RAW_INGRESS_HEADER) == "1":
+        parsed = await _parse_raw_inbound_task(request)
+        if parsed is None:
+            # 2xx: task venenosa é descartada (com log) em vez de reenviada
+            return {"ok": True, "status": "dropped", "reason": "invalid_raw_body"}
+        payload, inbound_event_id, correlation_id = parsed
+    else:
+        payload, inbound_event_id, correlation_id = await _parse_inbound_task(request)
     task_name = request.headers.get("X-CloudTasks-TaskName")
 
+    chunks = split_webhook_payload(payload, settings.webhook_max_events_per_task)
+    if len(chunks) > 1:
+        # Ingress raw não parseia: a divisão acontece aqui, antes de processar
+        return await _split_inbound_task(
+            chunks, inbound_event_id, correlation_id, tasks_dispatcher, dedupe_store
+        )
+
     return await _run_inbound_with_rastro(
         payload=payload,
         inbound_event_id=inbound_event_id,
@@ -364,6 +704,8 @@ async def process_inbound(
         tasks_dispatcher=tasks_dispatcher,
         inbound_log_store=inbound_log_store,
         orchestrator=orchestrator,
+        executor=executor,
+        sequence_outbound=settings.outbound_sequencing_enabled,
     )
 
 
@@ -377,9 +719,11 @@ async def process_outbound(
     require_internal_token(request, settings)
 
     try:
-        task_body = await request.json()
-    except Exception as exc:  # noqa: BLE001
+        task_body = json_codec.loads(await request.body())
+    except json_codec.JSONDecodeError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_json") from exc
 
-    result = await handle_outbound_task(task_body, settings, outbound_store)
+    async with async_unit_of_work() as uow:
+        result = await handle_outbound_task(task_body, settings, outbound_store)
+        await uow.try_flush_async()
     return result
@@ -21,34 +21,45 @@ MANUTENÇÃO:
 
 from __future__ import annotations
 
-import json
+from dataclasses import asdict
 from typing import TYPE_CHECKING, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from pyloto_corp.adapters.whatsapp.signature import verify_meta_signature
+from pyloto_corp.adapters.whatsapp.signature import WebhookSignatureVerifier
+from pyloto_corp.adapters.whatsapp.webhook_split import split_webhook_payload
 from pyloto_corp.api.dependencies import (
     get_dedupe_store,
     get_flood_detector,
     get_message_queue,
     get_orchestrator,
     get_outbound_dedupe_store,
+    get_readiness_checker,
+    get_session_lease_manager,
     get_session_store,
     get_settings,
+    get_signature_verifier,
     get_tasks_dispatcher,
 )
+from pyloto_corp.api.readiness import ReadinessChecker
+from pyloto_corp.application.deadline import Deadline
 from pyloto_corp.application.whatsapp_async import (
     compute_inbound_event_id,
     handle_inbound_task,
     handle_outbound_task,
+    read_limited_body,
 )
 from pyloto_corp.config.settings import Settings
+from pyloto_corp.domain.protocols.session_lock import SessionLockTimeoutError
+from pyloto_corp.infra.unit_of_work import async_unit_of_work
 from pyloto_corp.observability.logging import get_logger
+from pyloto_corp.utils import json_codec
 
 if TYPE_CHECKING:
     from pyloto_corp.domain.abuse_detection import FloodDetector
     from pyloto_corp.infra.dedupe import DedupeStore
     from pyloto_corp.infra.message_queue import MessageQueue
+    from pyloto_corp.infra.session_lock import SessionLeaseManager
     from pyloto_corp.infra.session_store import SessionStore
 import traceback
 
@@ -88,6 +99,27 @@ def health(settings: Settings = Depends(get_settings)) -> dict[str, str]:
     }
 
 
+@router.get("/ready")
+async def ready(
+    request: Request,
+    response: Response,
+    checker: ReadinessChecker = Depends(get_readiness_checker),
+) -> dict[str, Any]:
+    """Readiness para Cloud Run: 503 até o warm-up terminar ou se algum backend falhar."""
+    if not getattr(request.app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up", "checks": {}}
+
+    results = await checker.check()
+    is_ready = all(result.ok for result in results.values())
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if is_ready else "unavailable",
+        "checks": {name: asdict(result) for name, result in results.items()},
+    }
+
+
 @router.get("/webhooks/whatsapp")
 def whatsapp_verify(
     hub_mode: str | None = Query(None, alias="hub.mode"),
@@ -115,6 +147,7 @@ def whatsapp_verify(
 async def whatsapp_webhook_async(
     request: Request,
     settings: Settings = Depends(get_settings),
+    verifier: WebhookSignatureVerifier = Depends(get_signature_verifier),
     message_queue: MessageQueue = Depends(get_message_queue),
 ) -> dict[str, Any]:
     """Recebe webhook do WhatsApp e enfileira para processamento assíncrono.
@@ -131,18 +164,16 @@ async def whatsapp_webhook_async(
     - Permite 100+ msgs/segundo sem bloqueio
     - LLM calls não travam webhook handler
     """
-    raw_body = await request.body()
-    signature_result = verify_meta_signature(
-        raw_body, request.headers, settings.whatsapp_webhook_secret
-    )
+    raw_body = await read_limited_body(request, settings.webhook_max_body_bytes)
+    signature_result = verifier.verify(raw_body, request.headers)
 
     if not signature_result.valid:
         logger.warning("invalid_webhook_signature", extra={"reason": signature_result.error})
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_signature")
 
     try:
-        payload = json.loads(raw_body or b"{}")
-    except json.JSONDecodeError as exc:
+        payload = json_codec.loads(raw_body or b"{}")
+    except json_codec.JSONDecodeError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_json") from exc
 
     status_summaries = _extract_status_summaries(payload)
@@ -161,25 +192,27 @@ async def whatsapp_webhook_async(
     correlation_id = get_correlation_id()
 
     # **ENFILEIRAMENTO**: Envolver payload no formato esperado pelo handler
-    task_body = {
-        "payload": payload,
-        "raw_body": raw_body.decode("utf-8", errors="replace") if raw_body else "",
-        "correlation_id": correlation_id,
-    }
+    # (webhooks grandes viram uma task por pedaço de `webhook_max_events_per_task`)
+    chunks = split_webhook_payload(payload, settings.webhook_max_events_per_task)
+    task_bodies = [{"payload": chunk, "correlation_id": correlation_id} for chunk in chunks]
+    if len(chunks) == 1:
+        task_bodies[0]["raw_body"] = raw_body.decode("utf-8", errors="replace") if raw_body else ""
 
     try:
-        task_id = await message_queue.enqueue(task_body)
+        task_ids = [await message_queue.enqueue(task_body) for task_body in task_bodies]
         logger.info(
             "webhook_enqueued",
             extra={
-                "task_id": task_id,
+                "task_id": task_ids[0],
+                "task_count": len(task_ids),
                 "signature_valid": not signature_result.skipped,
             },
         )
         return {
             "ok": True,
             "status": "enqueued",
-            "task_id": task_id,
+            "task_id": task_ids[0],
+            "task_count": len(task_ids),
         }
     except Exception as e:
         traceback.print_exc()
@@ -190,6 +223,32 @@ async def whatsapp_webhook_async(
         ) from e
 
 
+def _get_async_session_store(request: Request, settings: Settings) -> Any:
+    """Store de sessão assíncrono da instância (criado uma vez; cache L1 conforme settings)."""
+    store = getattr(request.app.state, "async_session_store", None)
+    if store is not None:
+        return store
+
+    from pyloto_corp.infra.session_cache import wrap_async_session_store
+    from pyloto_corp.infra.session_store_firestore_async import AsyncFirestoreSessionStore
+
+    try:
+        from google.cloud import firestore
+
+        firestore_client = getattr(request.app.state, "firestore_client", None)
+        store = AsyncFirestoreSessionStore(firestore_client or firestore.Client())
+    except ImportError:
+        logger.error("firestore_not_available")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="firestore_not_available",
+        ) from None
+
+    store = wrap_async_session_store(store, settings, "firestore")
+    request.app.state.async_session_store = store
+    return store
+
+
 @router.post("/tasks/process")
 async def process_task(
     request: Request,
@@ -198,6 +257,7 @@ async def process_task(
     session_store: SessionStore = Depends(get_session_store),
     flood_detector: FloodDetector = Depends(get_flood_detector),
     message_queue: MessageQueue = Depends(get_message_queue),
+    session_lease_manager: SessionLeaseManager | None = Depends(get_session_lease_manager),
 ) -> dict[str, Any]:
     """Processa uma tarefa enfileirada.
 
@@ -205,6 +265,8 @@ async def process_task(
     Retorna 200 se sucesso → Cloud Tasks reconhece e remove da fila.
     Retorna 5xx se erro → Cloud Tasks retry com exponential backoff.
     """
+    # Prazo por mensagem começa no dequeue, não depois do lease
+    deadline = Deadline.start(settings.message_deadline_seconds)
     try:
         payload = await request.json()
     except Exception as e:
@@ -215,31 +277,24 @@ async def process_task(
         ) from e
 
     # Aqui importa o pipeline assíncrono
-    from pyloto_corp.application.pipeline_async import PipelineAsyncV3
-    from pyloto_corp.infra.session_store_firestore_async import (
-        AsyncFirestoreSessionStore,
-    )
-
-    try:
-        from google.cloud import firestore
+    from pyloto_corp.application.factories.pipeline_factory import build_pipeline_async
 
-        firestore_client = firestore.Client()
-        async_session_store = AsyncFirestoreSessionStore(firestore_client)
-    except ImportError:
-        logger.error("firestore_not_available")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="firestore_not_available",
-        ) from None
-
-    pipeline = PipelineAsyncV3(
-        dedupe_store=dedupe_store,
-        async_session_store=async_session_store,
-        flood_detector=flood_detector,
+    pipeline = build_pipeline_async(
+        dedupe_store,
+        _get_async_session_store(request, settings),
+        flood_detector,
+        session_lease_manager=session_lease_manager,
     )
 
     # **PROCESSAMENTO ASSÍNCRONO**: Sem bloqueios
-    summary = await pipeline.process_webhook(payload)
+    try:
+        summary = await pipeline.process_webhook(payload, deadline=deadline)
+    except SessionLockTimeoutError as exc:
+        # 503: o Cloud Tasks reenvia; a mensagem não foi marcada no dedupe
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="session_lease_unavailable",
+        ) from exc
     summary.signature_validated = False  # Padrão: não validado em task handler
     logger.info("task_processed", extra={"result": summary.model_dump()})
 
@@ -315,13 +370,16 @@ async def process_inbound(
         },
     )
 
-    result = await handle_inbound_task(
-        payload=payload,
-        inbound_event_id=inbound_event_id,
-        correlation_id=correlation_id,
-        tasks_dispatcher=tasks_dispatcher,
-        orchestrator=orchestrator,
-    )
+    async with async_unit_of_work() as uow:
+        result = await handle_inbound_task(
+            payload=payload,
+            inbound_event_id=inbound_event_id,
+            correlation_id=correlation_id,
+            tasks_dispatcher=tasks_dispatcher,
+            orchestrator=orchestrator,
+            sequence_outbound=settings.outbound_sequencing_enabled,
+        )
+        await uow.try_flush_async()
     logger.info(
         "inbound_task_processed",
         extra={
@@ -367,7 +425,9 @@ async def process_outbound(
         },
     )
 
-    result = await handle_outbound_task(task_body, settings, outbound_store)
+    async with async_unit_of_work() as uow:
+        result = await handle_outbound_task(task_body, settings, outbound_store)
+        await uow.try_flush_async()
     logger.info(
         "outbound_task_processed",
         extra={
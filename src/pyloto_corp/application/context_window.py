@@ -0,0 +1,118 @@
+"""Janela de contexto limitada + resumo incremental para os estágios LLM.
+
+Responsabilidade única: derivar de `session.message_history` um contexto
+limitado por orçamento de tokens, já sanitizado (sem PII), igual para todos
+os estágios LLM de uma mesma mensagem.
+
+Estratégia:
+- Janela recente: entradas mais novas até `max_tokens - summary_max_tokens`
+- Resumo rolante: entradas que saem da janela são incorporadas uma única vez
+  em `session.context_summary` (cursor em `session.context_summary_upto`),
+  limitado a `summary_max_tokens`
+
+O resumo é determinístico (sem chamada LLM) para não adicionar latência.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from pyloto_corp.ai.sanitizer import sanitize_response_content
+from pyloto_corp.ai.token_estimator import CHARS_PER_TOKEN, estimate_tokens
+
+# Campos do histórico relevantes para o LLM (demais são metadados internos)
+_RENDERED_FIELDS: tuple[str, ...] = ("summary", "hint", "role", "intent", "state", "text")
+_SUMMARY_SEPARATOR = " | "
+_TRUNCATION_MARK = "…"
+
+
+@dataclass(frozen=True, slots=True)
+class LLMContext:
+    """Contexto limitado e sanitizado compartilhado pelos estágios LLM."""
+
+    recent: list[dict[str, Any]] = field(default_factory=list)
+    rolling_summary: str = ""
+    token_count: int = 0
+
+    def history_summary(self) -> list[str]:
+        """Linhas textuais (resumo + janela) para prompts baseados em texto."""
+        lines = [f"resumo: {self.rolling_summary}"] if self.rolling_summary else []
+        lines.extend(render_history_entry(entry) for entry in self.recent)
+        return lines
+
+
+def render_history_entry(entry: dict[str, Any]) -> str:
+    """Converte uma entrada do histórico em linha curta e sem PII."""
+    parts = [
+        f"{name}={entry[name]}" for name in _RENDERED_FIELDS if entry.get(name) not in (None, "")
+    ]
+    if not parts:
+        parts = ["mensagem recebida"] if entry.get("received_at") else ["evento"]
+    return sanitize_response_content(" ".join(parts))
+
+
+def _sanitize_entry(entry: dict[str, Any]) -> dict[str, Any]:
+    return {
+        key: sanitize_response_content(value) if isinstance(value, str) else value
+        for key, value in entry.items()
+    }
+
+
+class ContextWindowManager:
+    """Monta `LLMContext` com janela por tokens e resumo rolante na sessão."""
+
+    def __init__(self, max_tokens: int = 600, summary_max_tokens: int = 150) -> None:
+        if summary_max_tokens <= 0 or max_tokens <= summary_max_tokens:
+            raise ValueError("orçamentos inválidos: 0 < summary_max_tokens < max_tokens")
+        self._max_tokens = max_tokens
+        self._summary_max_tokens = summary_max_tokens
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> ContextWindowManager:
+        return cls(
+            max_tokens=int(getattr(settings, "llm_context_max_tokens", 600)),
+            summary_max_tokens=int(getattr(settings, "llm_context_summary_max_tokens", 150)),
+        )
+
+    def build(self, session: Any) -> LLMContext:
+        """Atualiza o resumo rolante da sessão e retorna o contexto limitado.
+
+        Muta apenas `context_summary`/`context_summary_upto` (persistidos com a
+        sessão pelo fluxo normal).
+        """
+        history: list[dict[str, Any]] = list(getattr(session, "message_history", None) or [])
+        upto = min(max(int(getattr(session, "context_summary_upto", 0) or 0), 0), len(history))
+        summary = str(getattr(session, "context_summary", "") or "")
+
+        # Espaço do resumo é reservado: a janela nunca depende do tamanho atual dele
+        budget = self._max_tokens - self._summary_max_tokens
+        window_start = len(history)
+        used = 0
+        for index in range(len(history) - 1, upto - 1, -1):
+            cost = estimate_tokens(render_history_entry(history[index]))
+            if used + cost > budget:
+                break
+            used += cost
+            window_start = index
+
+        if window_start > upto:
+            evicted = [render_history_entry(entry) for entry in history[upto:window_start]]
+            summary = self._fold(summary, evicted)
+            session.context_summary = summary
+            session.context_summary_upto = window_start
+
+        recent = [_sanitize_entry(entry) for entry in history[window_start:]]
+        return LLMContext(
+            recent=recent,
+            rolling_summary=summary,
+            token_count=used + estimate_tokens(summary),
+        )
+
+    def _fold(self, summary: str, lines: list[str]) -> str:
+        """Incorpora linhas ao resumo, preservando as mais recentes no limite."""
+        merged = _SUMMARY_SEPARATOR.join(part for part in [summary, *lines] if part)
+        max_chars = int(self._summary_max_tokens * CHARS_PER_TOKEN)
+        if len(merged) <= max_chars:
+            return merged
+        return _TRUNCATION_MARK + merged[-(max_chars - len(_TRUNCATION_MARK)) :]
@@ -0,0 +1,43 @@
+"""Prazo fim-a-fim por mensagem, propagado entre os estágios LLM.
+
+Responsabilidade única: representar o orçamento de tempo restante de uma
+mensagem e derivar dele o timeout de cada estágio.
+
+Cada estágio usa `min(timeout configurado do estágio, tempo restante)`;
+quando o prazo estoura, os estágios LLM seguintes são pulados (fallback
+determinístico), limitando a latência de pior caso da resposta.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True, slots=True)
+class Deadline:
+    """Instante-limite (relógio monotônico) para processar uma mensagem."""
+
+    expires_at: float
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False, compare=False)
+
+    @classmethod
+    def start(cls, budget_seconds: float, clock: Callable[[], float] = time.monotonic) -> Deadline:
+        """Cria prazo a partir de agora com `budget_seconds` de orçamento."""
+        return cls(expires_at=clock() + budget_seconds, clock=clock)
+
+    def remaining(self) -> float:
+        """Segundos restantes (nunca negativo)."""
+        return max(self.expires_at - self.clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def stage_timeout(self, configured_seconds: float | None = None) -> float:
+        """Timeout do estágio: o menor entre o configurado e o tempo restante."""
+        remaining = self.remaining()
+        if configured_seconds is None:
+            return remaining
+        return min(float(configured_seconds), remaining)
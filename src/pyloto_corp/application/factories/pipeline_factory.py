@@ -30,6 +30,7 @@ def build_whatsapp_pipeline(
     response_generator_client: Any | None = None,
     master_decider_client: Any | None = None,
     decision_audit_store: Any | None = None,
+    session_lease_manager: Any | None = None,
     settings: Settings | None = None,
 ) -> WhatsAppInboundPipeline:
     """Constrói e retorna `WhatsAppInboundPipeline` usando infra/settings.
@@ -43,8 +44,10 @@ def build_whatsapp_pipeline(
     from pyloto_corp.infra import (
         create_decision_audit_store,
         create_dedupe_store,
+        create_session_lease_manager,
         create_session_store,
     )
+    from pyloto_corp.infra.session_cache import wrap_session_store
 
     # Preencher stores se não fornecidos (ambiente de execução decide backend)
     if dedupe_store is None:
@@ -53,7 +56,11 @@ def build_whatsapp_pipeline(
 
     if session_store is None:
         # Usar backend configurado nas settings (criador interno trata clients quando necessário)
-        session_store = create_session_store(settings.session_store_backend)
+        session_store = wrap_session_store(
+            create_session_store(settings.session_store_backend),
+            settings,
+            settings.session_store_backend,
+        )
         logger.debug("factory: created session_store via infra create_session_store")
 
     if decision_audit_store is None:
@@ -68,7 +75,15 @@ def build_whatsapp_pipeline(
     # Construir SessionManager e incluí‑lo no config para injeção nos pipelines
     from pyloto_corp.application.session.manager import SessionManager
 
-    session_manager = SessionManager(session_store=session_store, logger=logger, settings=settings)
+    if session_lease_manager is None:
+        session_lease_manager = create_session_lease_manager(settings)
+
+    session_manager = SessionManager(
+        session_store=session_store,
+        logger=logger,
+        settings=settings,
+        lease_manager=session_lease_manager,
+    )
 
     config = PipelineConfig(
         dedupe_store=dedupe_store,
@@ -91,6 +106,7 @@ def build_whatsapp_pipeline(
         master_decider_timeout=settings.master_decider_timeout_seconds,
         master_decider_confidence_threshold=settings.master_decider_confidence_threshold,
         decision_audit_store=decision_audit_store,
+        message_deadline_seconds=settings.message_deadline_seconds,
         session_manager=session_manager,
     )
 
@@ -102,15 +118,22 @@ def build_pipeline_v2(
     dedupe_store: Any,
     session_store: Any,
     flood_detector: Any | None = None,
+    session_lease_manager: Any | None = None,
 ) -> Any:
     """Constrói e retorna um PipelineV2 (compatibilidade)."""
     from pyloto_corp.application.pipeline_v2 import PipelineV2
     from pyloto_corp.application.session.manager import SessionManager
+    from pyloto_corp.infra import create_session_lease_manager
+
+    settings = get_settings()
+    if session_lease_manager is None:
+        session_lease_manager = create_session_lease_manager(settings)
 
     session_manager = SessionManager(
         session_store=session_store,
         logger=logger,
-        settings=get_settings(),
+        settings=settings,
+        lease_manager=session_lease_manager,
     )
 
     return PipelineV2(
@@ -125,15 +148,22 @@ def build_pipeline_async(
     dedupe_store: Any,
     async_session_store: Any,
     flood_detector: Any | None = None,
+    session_lease_manager: Any | None = None,
 ) -> Any:
     """Constrói e retorna um PipelineAsyncV3 (compatibilidade)."""
     from pyloto_corp.application.pipeline_async import PipelineAsyncV3
     from pyloto_corp.application.session.manager import AsyncSessionManager
+    from pyloto_corp.infra import create_session_lease_manager
+
+    settings = get_settings()
+    if session_lease_manager is None:
+        session_lease_manager = create_session_lease_manager(settings)
 
     async_session_manager = AsyncSessionManager(
         async_session_store=async_session_store,
         logger=logger,
-        settings=get_settings(),
+        settings=settings,
+        lease_manager=session_lease_manager,
     )
 
     return PipelineAsyncV3(
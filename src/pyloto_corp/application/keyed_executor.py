@@ -0,0 +1,91 @@
+"""Executor por chave: ordem por conversa, paralelismo entre conversas.
+
+Responsabilidade única: executar corrotinas de forma que
+- trabalhos com a MESMA chave (telefone do remetente / user_key) rodem um
+  por vez, na ordem de submissão (read-modify-write de sessão consistente)
+- trabalhos de chaves diferentes rodem em paralelo, até `max_concurrency`
+
+O slot global só é ocupado depois do lock da chave: mensagens esperando a
+vez da própria conversa não bloqueiam outras conversas.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class KeyedExecutorStats:
+    """Contadores para observabilidade."""
+
+    completed: int = 0
+    max_in_flight: int = 0
+
+
+@dataclass(slots=True)
+class _KeyLock:
+    lock: asyncio.Lock
+    users: int = 0
+
+
+class KeyedExecutor:
+    """Serializa por chave e limita a concorrência global (FIFO por chave)."""
+
+    def __init__(self, max_concurrency: int = 8) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency deve ser >= 1")
+        self._max_concurrency = max_concurrency
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._keys: dict[Hashable, _KeyLock] = {}
+        self._in_flight = 0
+        self.stats = KeyedExecutorStats()
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Executa `factory()` respeitando a fila da chave e o limite global."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Primitivas presas ao loop atual: o executor nasce fora do event loop
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._keys = {}
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = self._keys[key] = _KeyLock(lock=asyncio.Lock())
+        entry.users += 1
+        try:
+            async with entry.lock, self._semaphore:
+                self._in_flight += 1
+                self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+                try:
+                    return await factory()
+                finally:
+                    self._in_flight -= 1
+                    self.stats.completed += 1
+        finally:
+            entry.users -= 1
+            if entry.users == 0 and self._keys.get(key) is entry:
+                del self._keys[key]
+
+    async def map(
+        self,
+        items: Iterable[Any],
+        key: Callable[[Any], Hashable],
+        fn: Callable[[Any], Awaitable[Any]],
+    ) -> list[Any]:
+        """Aplica `fn` a cada item; resultados (ou exceções) na ordem de entrada."""
+        return await asyncio.gather(
+            *(self.run(key(item), _bind(fn, item)) for item in items),
+            return_exceptions=True,
+        )
+
+
+def _bind(fn: Callable[[Any], Awaitable[Any]], item: Any) -> Callable[[], Awaitable[Any]]:
+    return lambda: fn(item)
@@ -6,10 +6,14 @@ import json
 from collections.abc import Mapping
 from typing import Any
 
+from pyloto_corp.ai.model_router import LLMStage, RouteSignals, get_model_router
+from pyloto_corp.ai.openai_rate_limit import run_llm_call_sync
+from pyloto_corp.ai.single_flight import coalesce_llm_call
 from pyloto_corp.domain.conversation_state import ConversationState
 from pyloto_corp.domain.enums import MessageType
 from pyloto_corp.domain.master_decision import MasterDecisionInput, MasterDecisionOutput
 from pyloto_corp.observability.logging import get_logger
+from pyloto_corp.utils import json_codec
 
 logger = get_logger(__name__)
 
@@ -113,6 +117,15 @@ def _build_prompt(data: MasterDecisionInput) -> str:
 
 def _call_llm(
     llm_client: Any, prompt: str, model: str | None, timeout: float | None
+) -> Mapping[str, Any]:
+    """Chamada resiliente ao LLM sob o limitador OpenAI; espera dict."""
+    return run_llm_call_sync(
+        model or "gpt-4o-mini", prompt, 200, lambda: _invoke_llm(llm_client, prompt, model, timeout)
+    )
+
+
+def _invoke_llm(
+    llm_client: Any, prompt: str, model: str | None, timeout: float | None
 ) -> Mapping[str, Any]:
     if hasattr(llm_client, "complete"):
         return llm_client.complete(prompt, model=model, timeout=timeout)
@@ -125,7 +138,7 @@ def _call_llm(
             timeout=timeout,
         )
         content = response.choices[0].message.content or "{}"
-        return json.loads(content)
+        return json_codec.loads(content)
     if callable(llm_client):
         return llm_client(prompt)
     raise RuntimeError("llm_client incompatível")
@@ -179,9 +192,26 @@ def decide_master(
         deterministic.decision_trace["responses"] = data.response_options.responses
         return deterministic
 
+    router = get_model_router()
+    route = router.route(
+        LLMStage.MASTER_DECISION,
+        RouteSignals(
+            message_length=len(data.last_user_message or ""),
+            precheck_confidence=data.state_decision.confidence,
+            fsm_state=data.state_decision.next_state.value,
+        ),
+        model=model,
+    )
     try:
         prompt = _build_prompt(data)
-        raw = _call_llm(llm_client, prompt, model, timeout_seconds)
+        raw = coalesce_llm_call(
+            "master_decider",
+            route.model,
+            prompt,
+            lambda: router.observe(
+                route, lambda: _call_llm(llm_client, prompt, route.model, timeout_seconds)
+            ),
+        )
         idx = int(raw.get("selected_response_index", data.response_options.chosen_index))
         responses = data.response_options.responses
         idx = idx if 0 <= idx < len(responses) else 0
@@ -7,7 +7,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from pyloto_corp.application.context_window import ContextWindowManager, LLMContext
 from pyloto_corp.application.master_decider import decide_master
+from pyloto_corp.config.settings import get_settings
 from pyloto_corp.domain.conversation_state import ConversationState
 from pyloto_corp.domain.master_decision import MasterDecisionInput
 from pyloto_corp.observability.logging import get_logger
@@ -30,11 +32,15 @@ def orchestrate_master_decision(
     master_decider_timeout: int,
     master_decider_confidence_threshold: float,
     decision_audit_store: Any | None = None,
+    llm_context: LLMContext | None = None,
 ) -> MasterDecisionOutput | None:
     """Orquestra decisão final via master decider LLM.
 
     Retorna MasterDecisionOutput ou None se desabilitado.
     """
+    if llm_context is None:
+        llm_context = ContextWindowManager.from_settings(get_settings()).build(session)
+
     # Normalizar estado inválido para fallback seguro
     try:
         current_conv = ConversationState(session.current_state)
@@ -43,7 +49,7 @@ def orchestrate_master_decision(
 
     md_input = MasterDecisionInput(
         last_user_message=message.text or "",
-        day_history=session.message_history,
+        day_history=llm_context.recent,
         state_decision=state_decision,
         response_options=response_options,
         current_state=current_conv,
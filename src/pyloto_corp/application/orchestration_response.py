@@ -7,7 +7,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from pyloto_corp.application.context_window import ContextWindowManager, LLMContext
 from pyloto_corp.application.response_generator import generate_response_options
+from pyloto_corp.config.settings import get_settings
 from pyloto_corp.domain.conversation_state import ConversationState
 from pyloto_corp.domain.response_generator import ResponseGeneratorInput
 
@@ -24,11 +26,15 @@ def orchestrate_response_generation(
     response_generator_model: str | None,
     response_generator_timeout: int,
     response_generator_min_responses: int,
+    llm_context: LLMContext | None = None,
 ) -> ResponseGeneratorOutput | None:
     """Orquestra geração de respostas via response generator LLM.
 
     Retorna ResponseGeneratorOutput ou None se desabilitado/sem state_decision.
     """
+    if llm_context is None:
+        llm_context = ContextWindowManager.from_settings(get_settings()).build(session)
+
     # Normalizar estado inválido para fallback seguro
     try:
         current_conv = ConversationState(session.current_state)
@@ -37,7 +43,7 @@ def orchestrate_response_generation(
 
     rg_input = ResponseGeneratorInput(
         last_user_message=message.text or "",
-        day_history=session.message_history,
+        day_history=llm_context.recent,
         state_decision=state_decision,
         current_state=current_conv,
         candidate_next_state=state_decision.selected_state,
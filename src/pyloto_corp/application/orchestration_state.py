@@ -7,7 +7,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from pyloto_corp.application.context_window import ContextWindowManager, LLMContext
 from pyloto_corp.application.state_selector import select_next_state
+from pyloto_corp.config.settings import get_settings
 from pyloto_corp.domain.conversation_state import (
     ConversationState,
     StateSelectorInput,
@@ -23,11 +25,18 @@ def orchestrate_state_selection(
     state_selector_client: Any,
     state_selector_model: str | None,
     state_selector_threshold: float,
+    llm_context: LLMContext | None = None,
 ) -> StateSelectorOutput | None:
     """Orquestra decisão de próximo estado via state selector LLM.
 
+    `llm_context` deve ser o mesmo contexto limitado usado pelos demais
+    estágios; quando omitido, é montado com os limites de `Settings`.
+
     Retorna StateSelectorOutput ou None se desabilitado.
     """
+    if llm_context is None:
+        llm_context = ContextWindowManager.from_settings(get_settings()).build(session)
+
     try:
         current_conv = ConversationState(session.current_state)
     except Exception:
@@ -45,7 +54,7 @@ def orchestrate_state_selection(
         current_state=current_conv,
         possible_next_states=possible_next,
         message_text=message.text or "",
-        history_summary=[h.get("summary", "") for h in session.message_history],
+        history_summary=llm_context.history_summary(),
     )
 
     state_decision = select_next_state(
@@ -23,6 +23,8 @@ from typing import TYPE_CHECKING, Any
 
 from pyloto_corp.adapters.whatsapp.models import WebhookProcessingSummary
 from pyloto_corp.adapters.whatsapp.normalizer import extract_messages
+from pyloto_corp.application.context_window import ContextWindowManager
+from pyloto_corp.application.deadline import Deadline
 from pyloto_corp.application.orchestration_decision import (
     orchestrate_master_decision,
 )
@@ -151,6 +153,13 @@ class WhatsAppInboundPipeline:
         self._master_decider_timeout = config.master_decider_timeout
         self._master_decider_confidence_threshold = config.master_decider_confidence_threshold
         self._decision_audit_store = config.decision_audit_store
+        self._context_window = ContextWindowManager.from_settings(get_settings())
+        deadline_seconds = getattr(config, "message_deadline_seconds", None)
+        self._message_deadline_seconds = (
+            deadline_seconds
+            if deadline_seconds is not None
+            else get_settings().message_deadline_seconds
+        )
 
     @classmethod
     def from_dependencies(
@@ -235,14 +244,25 @@ class WhatsAppInboundPipeline:
     def _process_single_message(
         self, message: Any, sender_phone: str | None
     ) -> tuple[ProcessedMessage | None, bool]:
-        """Processa uma mensagem e indica se foi deduplicada."""
-        if self._dedupe_manager.inbound(message.message_id):
-            logger.debug(
-                "Message deduplicated",
-                extra={"message_id": message.message_id[:8]},
-            )
-            return None, True
+        """Processa uma mensagem e indica se foi deduplicada.
 
+        O dedupe marca sob o lease: timeout do lease não consome a mensagem.
+        O prazo começa antes do lease: a espera por ele consome o orçamento.
+        """
+        deadline = Deadline.start(self._message_deadline_seconds)
+        with self._session_manager.lease(message):
+            if self._dedupe_manager.inbound(message.message_id):
+                logger.debug(
+                    "Message deduplicated",
+                    extra={"message_id": message.message_id[:8]},
+                )
+                return None, True
+            return self._process_leased_message(message, sender_phone, deadline), False
+
+    def _process_leased_message(
+        self, message: Any, sender_phone: str | None, deadline: Deadline | None = None
+    ) -> ProcessedMessage | None:
+        """Read-modify-write da sessão (executado sob o lease do remetente)."""
         session, is_first = self._session_manager.prepare_for_processing(
             message, sender_phone, correlation_id=getattr(message, "message_id", None)
         )
@@ -254,23 +274,44 @@ class WhatsAppInboundPipeline:
         if not is_valid:
             session.outcome = rejection_outcome
             self._session_manager.persist(session)
-            return (
-                ProcessedMessage(
-                    message_id=message.message_id,
-                    is_duplicate=False,
-                    session_id=session.session_id,
-                    outcome=rejection_outcome,
-                ),
-                False,
+            return ProcessedMessage(
+                message_id=message.message_id,
+                is_duplicate=False,
+                session_id=session.session_id,
+                outcome=rejection_outcome,
             )
 
-        result = self._orchestrate_and_save(message, session, is_first)
-        return result, False
+        return self._orchestrate_and_save(message, session, is_first, deadline)
+
+    def _deadline_allows(self, deadline: Deadline, stage: str, message: Any) -> bool:
+        """Indica se ainda há orçamento para o estágio LLM; loga quando não há."""
+        if not deadline.expired:
+            return True
+        logger.warning(
+            "message_deadline_exceeded",
+            extra={
+                "stage": stage,
+                "message_id": (getattr(message, "message_id", None) or "")[:8],
+                "budget_seconds": self._message_deadline_seconds,
+            },
+        )
+        return False
 
     def _orchestrate_and_save(
-        self, message: Any, session: SessionState, is_first: bool = False
+        self,
+        message: Any,
+        session: SessionState,
+        is_first: bool = False,
+        deadline: Deadline | None = None,
     ) -> ProcessedMessage:
-        """Orquestra IA, atualiza e persiste sessão."""
+        """Orquestra IA, atualiza e persiste sessão.
+
+        `deadline` limita o tempo total dos estágios LLM: cada estágio recebe
+        o menor entre seu timeout e o tempo restante; com o prazo estourado,
+        os estágios seguintes são pulados (fallback determinístico).
+        """
+        if deadline is None:
+            deadline = Deadline.start(self._message_deadline_seconds)
         from pyloto_corp.application.session_helpers import (
             is_first_message_of_day,
         )
@@ -292,31 +333,47 @@ class WhatsAppInboundPipeline:
             session, correlation_id=getattr(message, "message_id", None)
         )
 
+        # Contexto limitado e sanitizado, idêntico para todos os estágios LLM
+        llm_context = self._context_window.build(session)
+
         state_decision: StateSelectorOutput | None = None
         response_options: ResponseGeneratorOutput | None = None
         master_decision: MasterDecisionOutput | None = None
 
-        if self._state_selector_enabled:
+        if self._state_selector_enabled and self._deadline_allows(
+            deadline, "state_selector", message
+        ):
             state_decision = orchestrate_state_selection(
                 session,
                 message,
                 self._state_selector_client,
                 self._state_selector_model,
                 self._state_selector_threshold,
+                llm_context=llm_context,
             )
 
-        if self._response_generator_enabled and state_decision:
+        if (
+            self._response_generator_enabled
+            and state_decision
+            and self._deadline_allows(deadline, "response_generator", message)
+        ):
             response_options = orchestrate_response_generation(
                 session,
                 message,
                 state_decision,
                 self._response_generator_client,
                 self._response_generator_model,
-                self._response_generator_timeout,
+                deadline.stage_timeout(self._response_generator_timeout),
                 self._response_generator_min_responses,
+                llm_context=llm_context,
             )
 
-        if self._master_decider_enabled and state_decision and response_options:
+        if (
+            self._master_decider_enabled
+            and state_decision
+            and response_options
+            and self._deadline_allows(deadline, "master_decider", message)
+        ):
             master_decision = orchestrate_master_decision(
                 session,
                 message,
@@ -324,9 +381,10 @@ class WhatsAppInboundPipeline:
                 response_options,
                 self._master_decider_client,
                 self._master_decider_model,
-                self._master_decider_timeout,
+                deadline.stage_timeout(self._master_decider_timeout),
                 self._master_decider_confidence_threshold,
                 self._decision_audit_store,
+                llm_context=llm_context,
             )
 
         ai_response = self._orchestrator.process_message(
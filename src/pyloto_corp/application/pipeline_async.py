@@ -36,7 +36,9 @@ from pyloto_corp.adapters.whatsapp.models import WebhookProcessingSummary
 from pyloto_corp.adapters.whatsapp.normalizer import extract_messages
 from pyloto_corp.ai.assistant_message_type import choose_message_plan
 from pyloto_corp.ai.openai_client import get_openai_client
-from pyloto_corp.ai.sanitizer import mask_pii_in_history
+from pyloto_corp.application.context_window import ContextWindowManager
+from pyloto_corp.application.deadline import Deadline
+from pyloto_corp.application.keyed_executor import KeyedExecutor
 from pyloto_corp.application.session import SessionState
 from pyloto_corp.config.settings import get_settings
 from pyloto_corp.domain.abuse_detection import (
@@ -45,6 +47,7 @@ from pyloto_corp.domain.abuse_detection import (
     SpamDetector,
 )
 from pyloto_corp.domain.enums import Outcome
+from pyloto_corp.domain.protocols.session_lock import SessionLockTimeoutError
 from pyloto_corp.observability.logging import get_logger
 
 if TYPE_CHECKING:
@@ -54,6 +57,13 @@ logger: logging.Logger = get_logger(__name__)
 settings = get_settings()
 
 
+async def _within_deadline(awaitable: Any, deadline: Deadline | None) -> Any:
+    """Aguarda o estágio LLM usando o tempo restante do prazo como timeout."""
+    if deadline is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout=deadline.stage_timeout())
+
+
 class PipelineAsyncV3:
     """Pipeline assíncrono com paralelização de LLMs e persistência não-bloqueante.
 
@@ -78,6 +88,7 @@ class PipelineAsyncV3:
         flood_detector: FloodDetector | None = None,
         max_intent_limit: int = 3,
         async_session_manager: Any | None = None,
+        executor: KeyedExecutor | None = None,
     ) -> None:
         self._dedupe = dedupe_store
         self._async_sessions = async_session_store
@@ -86,6 +97,8 @@ class PipelineAsyncV3:
         self._spam = SpamDetector()
         self._abuse = AbuseChecker(max_intents_exceeded=max_intent_limit)
         self._openai_client = get_openai_client() if settings.openai_enabled else None
+        self._context_window = ContextWindowManager.from_settings(settings)
+        self._executor = executor or KeyedExecutor(settings.inbound_max_concurrency)
 
         if async_session_manager is not None:
             self._async_session_manager = async_session_manager
@@ -108,12 +121,19 @@ class PipelineAsyncV3:
             phone_number_id=settings.whatsapp_phone_number_id or "",
         )
 
-    async def process_webhook(self, payload: dict[str, Any]) -> WebhookProcessingSummary:
-        """Processa webhook: extrai mensagens e processa em paralelo."""
+    async def process_webhook(
+        self, payload: dict[str, Any], deadline: Deadline | None = None
+    ) -> WebhookProcessingSummary:
+        """Processa webhook: extrai mensagens e processa em paralelo.
+
+        `deadline` começa quando a task sai da fila (o handler o cria ao
+        receber a requisição): espera na fila do remetente e no lease consomem
+        o mesmo orçamento dos LLMs. Sem `deadline`, o prazo começa aqui.
+        """
+        if deadline is None:
+            deadline = Deadline.start(settings.message_deadline_seconds)
         messages = extract_messages(payload)
         total_received = len(messages)
-        total_deduped = 0
-        total_processed = 0
 
         logger.debug(
             "webhook_messages_extracted",
@@ -123,15 +143,17 @@ class PipelineAsyncV3:
             },
         )
 
-        tasks = []
-        for msg in messages:
-            if self._dedupe_check(msg):
-                total_deduped += 1
-                continue
-
-            tasks.append(self._process_message(msg))
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Mesmo remetente em ordem (sessão consistente); conversas em paralelo
+        results = await self._executor.map(
+            messages,
+            key=lambda msg: msg.from_number,
+            fn=lambda msg: self._process_message(msg, deadline),
+        )
+        # Lease indisponível: nada foi marcado no dedupe, o retry da task reprocessa
+        for result in results:
+            if isinstance(result, SessionLockTimeoutError):
+                raise result
+        total_deduped = sum(1 for r in results if r is None)
         total_processed = sum(1 for r in results if r is True and not isinstance(r, Exception))
 
         return WebhookProcessingSummary(
@@ -147,8 +169,22 @@ class PipelineAsyncV3:
             return True
         return False
 
-    async def _process_message(self, msg: Any) -> bool:
-        """Processa 1 mensagem de forma assíncrona."""
+    async def _process_message(self, msg: Any, deadline: Deadline) -> bool | None:
+        """Processa 1 mensagem sob o lease da sessão (None quando duplicada).
+
+        O dedupe só marca depois do lease: um `SessionLockTimeoutError` sobe
+        sem consumir a mensagem.
+        """
+        try:
+            async with self._async_session_manager.lease(msg):
+                if self._dedupe_check(msg):
+                    return None
+                return await self._process_message_leased(msg, deadline)
+        except SessionLockTimeoutError:
+            logger.warning("session_lease_unavailable", extra={"msg_id": msg.message_id[:8]})
+            raise
+
+    async def _process_message_leased(self, msg: Any, deadline: Deadline) -> bool:
         try:
             session = await self._async_session_manager.get_or_create_session(msg)
 
@@ -161,7 +197,9 @@ class PipelineAsyncV3:
                 logger.info("openai_disabled: using fallback")
                 return await self._process_with_fallback(msg, session)
 
-            return await self._process_with_llm(msg, session, fsm_state, fsm_next_state)
+            return await self._process_with_llm(
+                msg, session, fsm_state, fsm_next_state, deadline=deadline
+            )
 
         except (TimeoutError, ValueError, RuntimeError) as e:
             logger.warning("llm_pipeline_error", extra={"error": type(e).__name__})
@@ -176,10 +214,17 @@ class PipelineAsyncV3:
         session: SessionState,
         fsm_state: str,
         fsm_next_state: str,
+        deadline: Deadline | None = None,
     ) -> bool:
-        """Pipeline LLM com paralelização."""
+        """Pipeline LLM com paralelização.
+
+        `deadline` é o orçamento da mensagem: cada LLM usa o tempo restante
+        como timeout e cai no fallback determinístico quando ele se esgota.
+        """
         # **PARALELIZAÇÃO #1**: LLM#1 e LLM#2 em paralelo
-        llm1_task = asyncio.create_task(self._run_llm1_event_detection(msg, session))
+        llm1_task = asyncio.create_task(
+            self._run_llm1_event_detection(msg, session, deadline=deadline)
+        )
         llm1_result = await llm1_task
 
         logger.debug(
@@ -193,7 +238,7 @@ class PipelineAsyncV3:
 
         # LLM#2: Response generation (pode iniciar em paralelo com LLM#1)
         llm2_result = await self._run_llm2_response_generation(
-            msg, llm1_result, fsm_state, fsm_next_state
+            msg, llm1_result, fsm_state, fsm_next_state, deadline=deadline
         )
         logger.debug(
             "llm2_response_generated",
@@ -206,7 +251,7 @@ class PipelineAsyncV3:
 
         # LLM#3: Select message type (após LLM#1)
         msg_plan = await self._run_llm3_message_selection(
-            fsm_state, llm1_result.event.value, llm2_result
+            fsm_state, llm1_result.event.value, llm2_result, deadline=deadline
         )
         logger.debug(
             "llm3_message_type_selected",
@@ -269,13 +314,18 @@ class PipelineAsyncV3:
         await self._async_session_manager.persist(session)
         return True
 
-    async def _run_llm1_event_detection(self, msg: Any, session: SessionState) -> Any:
+    async def _run_llm1_event_detection(
+        self, msg: Any, session: SessionState, deadline: Deadline | None = None
+    ) -> Any:
         """LLM #1: Detect event (assíncrono nativo)."""
         user_input = msg.text or ""
         try:
-            result = await self._openai_client.detect_event(
-                user_input=user_input,
-                session_history=mask_pii_in_history(session.message_history),
+            result = await _within_deadline(
+                self._openai_client.detect_event(
+                    user_input=user_input,
+                    session_history=self._context_window.build(session).recent,
+                ),
+                deadline,
             )
             return result
         except Exception as e:
@@ -285,16 +335,24 @@ class PipelineAsyncV3:
             return _fallback_event_detection()
 
     async def _run_llm2_response_generation(
-        self, msg: Any, llm1_result: Any, state: str, next_state: str
+        self,
+        msg: Any,
+        llm1_result: Any,
+        state: str,
+        next_state: str,
+        deadline: Deadline | None = None,
     ) -> Any:
         """LLM #2: Generate response (assíncrono nativo)."""
         user_input = msg.text or ""
         try:
-            result = await self._openai_client.generate_response(
-                user_input=user_input,
-                detected_intent=llm1_result.detected_intent,
-                current_state=state,
-                next_state=next_state,
+            result = await _within_deadline(
+                self._openai_client.generate_response(
+                    user_input=user_input,
+                    detected_intent=llm1_result.detected_intent,
+                    current_state=state,
+                    next_state=next_state,
+                ),
+                deadline,
             )
             return result
         except Exception as e:
@@ -303,10 +361,14 @@ class PipelineAsyncV3:
 
             return _fallback_response_generation()
 
-    async def _run_llm3_message_selection(self, state: str, event: str, llm2_result: Any) -> Any:
+    async def _run_llm3_message_selection(
+        self, state: str, event: str, llm2_result: Any, deadline: Deadline | None = None
+    ) -> Any:
         """LLM #3: Select message type (assíncrono nativo)."""
         try:
-            msg_plan = await choose_message_plan(self._openai_client, state, event, llm2_result)
+            msg_plan = await _within_deadline(
+                choose_message_plan(self._openai_client, state, event, llm2_result), deadline
+            )
             return msg_plan
         except Exception as e:
             logger.warning(
@@ -358,7 +420,7 @@ class PipelineAsyncV3:
         """Fallback quando OPENAI_ENABLED = False."""
         logger.info("using_fallback_response")
         session.outcome = Outcome.AWAITING_USER
-        await self._async_sessions.save(session)
+        await self._async_session_manager.persist(session)
         return True
 
     def _is_abuse(self, msg: Any, session: SessionState) -> bool:
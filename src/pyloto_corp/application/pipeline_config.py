@@ -46,6 +46,9 @@ class PipelineConfig:
 
     decision_audit_store: DecisionAuditStoreProtocol | None = None
 
+    # Orçamento fim-a-fim por mensagem (None = settings.message_deadline_seconds)
+    message_deadline_seconds: float | None = None
+
     # Optional higher-level managers (injected by factory)
     session_manager: Any | None = None
 
@@ -133,11 +133,10 @@ class PipelineV2:
         total_processed = 0
 
         for msg in messages:
-            if self._dedupe_check(msg):
+            result = self._process_message(msg)
+            if result is None:
                 total_deduped += 1
-                continue
-
-            if self._process_message(msg):
+            elif result:
                 total_processed += 1
 
         return WebhookProcessingSummary(
@@ -153,7 +152,17 @@ class PipelineV2:
             return True
         return False
 
-    def _process_message(self, msg: Any) -> bool:
+    def _process_message(self, msg: Any) -> bool | None:
+        """Processa 1 mensagem sob o lease da sessão (None quando duplicada).
+
+        O dedupe marca sob o lease: timeout do lease não consome a mensagem.
+        """
+        with self._session_manager.lease(msg):
+            if self._dedupe_check(msg):
+                return None
+            return self._process_message_leased(msg)
+
+    def _process_message_leased(self, msg: Any) -> bool:
         """Processa 1 mensagem (FSM → LLM#1 → LLM#2 → LLM#3)."""
         # 1. Recuperar/criar sessão
         session = self._get_or_create_session(msg)
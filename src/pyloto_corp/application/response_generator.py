@@ -6,11 +6,15 @@ import json
 from collections.abc import Mapping
 from typing import Any
 
+from pyloto_corp.ai.model_router import LLMStage, RouteSignals, get_model_router
+from pyloto_corp.ai.openai_rate_limit import run_llm_call_sync
+from pyloto_corp.ai.single_flight import coalesce_llm_call
 from pyloto_corp.domain.response_generator import (
     ResponseGeneratorInput,
     ResponseGeneratorOutput,
 )
 from pyloto_corp.observability.logging import get_logger
+from pyloto_corp.utils import json_codec
 
 logger = get_logger(__name__)
 
@@ -62,7 +66,15 @@ def _build_prompt(data: ResponseGeneratorInput) -> str:
 def _call_llm(
     llm_client: Any, prompt: str, model: str | None, timeout: float | None
 ) -> Mapping[str, Any]:
-    """Chamada resiliente ao LLM; espera dict."""
+    """Chamada resiliente ao LLM sob o limitador OpenAI; espera dict."""
+    return run_llm_call_sync(
+        model or "gpt-4o-mini", prompt, 220, lambda: _invoke_llm(llm_client, prompt, model, timeout)
+    )
+
+
+def _invoke_llm(
+    llm_client: Any, prompt: str, model: str | None, timeout: float | None
+) -> Mapping[str, Any]:
     if hasattr(llm_client, "complete"):
         return llm_client.complete(prompt, model=model, timeout=timeout)
     if hasattr(llm_client, "chat") and hasattr(llm_client.chat, "completions"):
@@ -74,7 +86,7 @@ def _call_llm(
             timeout=timeout,
         )
         content = response.choices[0].message.content or "{}"
-        return json.loads(content)
+        return json_codec.loads(content)
     if callable(llm_client):
         return llm_client(prompt)
     raise RuntimeError("llm_client incompatível")
@@ -91,9 +103,26 @@ def generate_response_options(
 ) -> ResponseGeneratorOutput:
     """Gera opções de resposta; nunca retorna menos de 3 itens."""
     safety_notes = ["não expor PII", "não repetir número do cliente", "tom neutro"]
+    router = get_model_router()
+    route = router.route(
+        LLMStage.RESPONSE_GENERATION,
+        RouteSignals(
+            message_length=len(data.last_user_message or ""),
+            precheck_confidence=data.confidence,
+            fsm_state=data.candidate_next_state.value,
+        ),
+        model=model,
+    )
     try:
         prompt = _build_prompt(data)
-        raw = _call_llm(llm_client, prompt, model, timeout_seconds)
+        raw = coalesce_llm_call(
+            "response_generator",
+            route.model,
+            prompt,
+            lambda: router.observe(
+                route, lambda: _call_llm(llm_client, prompt, route.model, timeout_seconds)
+            ),
+        )
         responses = raw.get("responses") or []
         if len(responses) < min_responses:
             raise ValueError("llm_responses_insufficient")
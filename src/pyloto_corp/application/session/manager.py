@@ -3,13 +3,23 @@
 Centraliza operações de sessão (load/create, append, normalize, persist) que antes
 estavam espalhadas nos pipelines. Mantém compatibilidade com logs e comportamentos
 existentes.
+
+Com `lease_manager`, `lease(message)` delimita o read-modify-write da sessão
+sob um lease distribuído por usuário (ver `infra/session_lock.py`); sem ele,
+`lease` é um no-op.
+
+`persist` grava com controle de concorrência otimista (`compare_and_set`):
+em conflito recarrega a versão persistida, faz o merge (ver
+`session/merge.py`) e tenta de novo até `session_save_max_attempts`.
 """
 
 from __future__ import annotations
 
 import logging
+from contextlib import AbstractAsyncContextManager, AbstractContextManager, nullcontext
 from typing import Any
 
+from pyloto_corp.application.session.merge import merge_concurrent_session
 from pyloto_corp.application.session.models import SessionState
 from pyloto_corp.application.session_helpers import (
     append_received_event,
@@ -18,9 +28,15 @@ from pyloto_corp.application.session_helpers import (
 from pyloto_corp.config.settings import get_settings
 from pyloto_corp.domain.conversation_state import ConversationState
 from pyloto_corp.domain.fsm.initial_state import INITIAL_STATE
+from pyloto_corp.domain.protocols.session_store import SessionConflictError
 from pyloto_corp.observability.logging import get_logger
 
 
+def session_lock_key(message: Any) -> str | None:
+    """Chave do lease: conversa (`chat_id`) ou, na falta, telefone do remetente."""
+    return getattr(message, "chat_id", None) or getattr(message, "from_number", None)
+
+
 class SessionManager:
     """Gerencia ciclo de vida de sessão (load/create, append, normalize, persist).
 
@@ -33,10 +49,22 @@ class SessionManager:
         session_store: Any,
         logger: logging.Logger | None = None,
         settings: Any | None = None,
+        lease_manager: Any | None = None,
     ) -> None:
         self._sessions = session_store
         self._logger = logger or get_logger(__name__)
         self._settings = settings or get_settings()
+        self._leases = lease_manager
+
+    def lease(self, message: Any) -> AbstractContextManager[Any]:
+        """Lease da sessão do remetente de `message` (no-op sem lease_manager).
+
+        Levanta `SessionLockTimeoutError` se o lease não vier a tempo.
+        """
+        key = session_lock_key(message)
+        if self._leases is None or key is None:
+            return nullcontext()
+        return self._leases.hold(key)
 
     def get_or_create_session(self, message: Any, sender_phone: str | None = None) -> SessionState:
         """Recupera sessão existente (chat_id) ou cria nova, preservando logs atuais."""
@@ -135,13 +163,25 @@ class SessionManager:
     def persist(self, session: SessionState, correlation_id: str | None = None) -> None:
         """Persiste sessão via `session_store` com log amigável de erro."""
         try:
-            self._sessions.save(session)
+            self.save_with_merge(session, correlation_id)
         except Exception as e:  # pragma: no cover - tratado nos pipelines
             self._logger.error(
                 "Failed to save session",
                 extra={"session_id": session.session_id[:8], "error": str(e)},
             )
 
+    def save_with_merge(self, session: SessionState, correlation_id: str | None = None) -> None:
+        """Save otimista com merge-and-retry; `SessionConflictError` se esgotar."""
+        attempts = _max_save_attempts(self._settings)
+        for attempt in range(1, attempts + 1):
+            if self._sessions.compare_and_set(session):
+                return
+            _log_conflict(self._logger, session, attempt, correlation_id)
+            remote = self._sessions.load(session.session_id)
+            if remote is not None:
+                merge_concurrent_session(session, remote)
+        raise SessionConflictError(f"sessão alterada concorrentemente ({attempts} tentativas)")
+
     def prepare_for_processing(
         self, message: Any, sender_phone: str | None = None, correlation_id: str | None = None
     ) -> tuple[SessionState, bool]:
@@ -186,10 +226,19 @@ class AsyncSessionManager:
         async_session_store: Any,
         logger: logging.Logger | None = None,
         settings: Any | None = None,
+        lease_manager: Any | None = None,
     ) -> None:
         self._async_sessions = async_session_store
         self._logger = logger or get_logger(__name__)
         self._settings = settings or get_settings()
+        self._leases = lease_manager
+
+    def lease(self, message: Any) -> AbstractAsyncContextManager[Any]:
+        """Versão assíncrona de `SessionManager.lease` (`async with`)."""
+        key = session_lock_key(message)
+        if self._leases is None or key is None:
+            return nullcontext()
+        return self._leases.hold_async(key)
 
     async def get_or_create_session(
         self,
@@ -236,9 +285,7 @@ class AsyncSessionManager:
 
         # Não anexar se message_id já estiver no histórico
         if message_id:
-            already = any(
-                rec.get("message_id") == message_id for rec in session.message_history
-            )
+            already = any(rec.get("message_id") == message_id for rec in session.message_history)
             if already:
                 return is_first
 
@@ -277,14 +324,46 @@ class AsyncSessionManager:
 
     async def persist(self, session: SessionState, correlation_id: str | None = None) -> None:
         try:
-            await self._async_sessions.save(session)
+            await self.save_with_merge(session, correlation_id)
         except Exception as e:  # pragma: no cover - tratado nos pipelines
             self._logger.error(
                 "Failed to save session",
                 extra={"session_id": session.session_id[:8], "error": str(e)},
             )
 
+    async def save_with_merge(
+        self, session: SessionState, correlation_id: str | None = None
+    ) -> None:
+        """Versão assíncrona de `SessionManager.save_with_merge`."""
+        attempts = _max_save_attempts(self._settings)
+        for attempt in range(1, attempts + 1):
+            if await self._async_sessions.compare_and_set(session):
+                return
+            _log_conflict(self._logger, session, attempt, correlation_id)
+            remote = await self._async_sessions.load(session.session_id)
+            if remote is not None:
+                merge_concurrent_session(session, remote)
+        raise SessionConflictError(f"sessão alterada concorrentemente ({attempts} tentativas)")
+
     def _new_session_id(self) -> str:
         from pyloto_corp.utils.ids import new_session_id
 
         return new_session_id()
+
+
+def _max_save_attempts(settings: Any) -> int:
+    return max(int(getattr(settings, "session_save_max_attempts", 3)), 1)
+
+
+def _log_conflict(
+    logger: logging.Logger, session: SessionState, attempt: int, correlation_id: str | None
+) -> None:
+    logger.info(
+        "session_save_conflict",
+        extra={
+            "session_id": session.session_id[:8],
+            "version": session.version,
+            "attempt": attempt,
+            "correlation_id": correlation_id,
+        },
+    )
@@ -0,0 +1,52 @@
+"""Merge de gravações concorrentes da mesma sessão.
+
+Usado quando o save otimista (`compare_and_set`) detecta que outra instância
+gravou a sessão depois da leitura. Política:
+- `message_history`: união — entradas persistidas primeiro, depois as locais
+  ausentes (idempotente por `message_id`)
+- Decisão da conversa (`current_state`, `outcome`, `intent_queue`): a local
+  vence (é o resultado do processamento que está sendo salvo)
+- `lead_profile`: campos locais vencem; vazios são completados pelo persistido
+- Resumo rolante: o que cobre mais entradas do histórico
+- `version`: a persistida (o próximo CAS compara com ela)
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pyloto_corp.application.session.models import SessionState
+
+
+def _merge_history(
+    remote: list[dict[str, Any]], local: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    merged = list(remote)
+    seen_ids = {rec.get("message_id") for rec in remote if rec.get("message_id")}
+    for rec in local:
+        message_id = rec.get("message_id")
+        duplicate = message_id in seen_ids if message_id else rec in merged
+        if duplicate:
+            continue
+        if message_id:
+            seen_ids.add(message_id)
+        merged.append(rec)
+    return merged
+
+
+def merge_concurrent_session(local: SessionState, remote: SessionState) -> None:
+    """Incorpora em `local` (in-place) a versão persistida `remote`."""
+    local.message_history = _merge_history(remote.message_history, local.message_history)
+
+    if remote.context_summary_upto > local.context_summary_upto:
+        local.context_summary = remote.context_summary
+        local.context_summary_upto = remote.context_summary_upto
+    local.context_summary_upto = min(local.context_summary_upto, len(local.message_history))
+
+    profile = remote.lead_profile.model_dump()
+    profile.update(local.lead_profile.model_dump(exclude_none=True))
+    local.lead_profile = type(local.lead_profile).model_validate(profile)
+
+    local.created_at = min(local.created_at, remote.created_at)
+    local.updated_at = max(local.updated_at, remote.updated_at)
+    local.version = remote.version
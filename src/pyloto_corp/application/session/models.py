@@ -45,3 +45,14 @@ class SessionState(BaseModel):
     # Campos adicionados para suporte ao pipeline v2 (FSM + LLM)
     current_state: str = Field(default_factory=_initial_state_value)
     message_history: list[dict[str, Any]] = Field(default_factory=list)
+
+    # Resumo rolante do histórico que saiu da janela de contexto LLM
+    # (ver application/context_window.py); `context_summary_upto` é o cursor
+    # de entradas de `message_history` já incorporadas ao resumo.
+    context_summary: str = ""
+    context_summary_upto: int = 0
+
+    # Versão monotônica da última gravação (controle de concorrência otimista):
+    # cada save persiste `version + 1`; `compare_and_set` só grava se o store
+    # ainda estiver na versão lida.
+    version: int = 0
@@ -94,6 +94,10 @@ def append_received_event(
         new_history = history[-max_entries:]
         session.message_history = new_history
         new_len = len(session.message_history)
+        # Manter cursor do resumo rolante alinhado às entradas removidas
+        summary_upto = getattr(session, "context_summary_upto", None)
+        if summary_upto:
+            session.context_summary_upto = max(summary_upto - (previous_len - new_len), 0)
         # Emitir log estruturado, sem PII
         logger.info(
             "session_history_pruned",
@@ -6,6 +6,9 @@ import json
 from collections.abc import Mapping
 from typing import Any
 
+from pyloto_corp.ai.model_router import LLMStage, RouteSignals, get_model_router
+from pyloto_corp.ai.openai_rate_limit import run_llm_call_sync
+from pyloto_corp.ai.single_flight import coalesce_llm_call
 from pyloto_corp.domain.conversation_state import (
     ConversationState,
     StateSelectorInput,
@@ -13,6 +16,7 @@ from pyloto_corp.domain.conversation_state import (
     StateSelectorStatus,
 )
 from pyloto_corp.observability.logging import get_logger
+from pyloto_corp.utils import json_codec
 
 logger = get_logger(__name__)
 
@@ -79,11 +83,16 @@ def _build_prompt(data: StateSelectorInput) -> str:
 
 
 def _call_llm(llm_client: Any, prompt: str, model: str | None = None) -> Mapping[str, Any]:
-    """Chama LLM de forma resiliente, esperando JSON."""
+    """Chama LLM de forma resiliente, esperando JSON (sob o limitador OpenAI)."""
     if llm_client is None:
         msg = "llm_client ausente"
         raise RuntimeError(msg)
+    return run_llm_call_sync(
+        model or "gpt-4o-mini", prompt, 200, lambda: _invoke_llm(llm_client, prompt, model)
+    )
+
 
+def _invoke_llm(llm_client: Any, prompt: str, model: str | None) -> Mapping[str, Any]:
     # Interface simples: objeto com método complete(prompt, model=None)
     if hasattr(llm_client, "complete"):
         return llm_client.complete(prompt, model=model)
@@ -97,7 +106,7 @@ def _call_llm(llm_client: Any, prompt: str, model: str | None = None) -> Mapping
             max_tokens=200,
         )
         content = response.choices[0].message.content or "{}"
-        return json.loads(content)
+        return json_codec.loads(content)
 
     # Último recurso: tentar callable
     if callable(llm_client):
@@ -118,9 +127,25 @@ def select_next_state(
     """Executa seleção de estado com gate de confiança e fallback seguro."""
     max_confidence, pre_hint, pre_status = _deterministic_precheck(data, confidence_threshold)
 
+    router = get_model_router()
+    route = router.route(
+        LLMStage.STATE_SELECTION,
+        RouteSignals(
+            message_length=len(data.message_text or ""),
+            precheck_confidence=max_confidence,
+            fsm_state=data.current_state.value,
+        ),
+        model=model,
+    )
+
     try:
         prompt = _build_prompt(data)
-        raw = _call_llm(llm_client, prompt, model=model)
+        raw = coalesce_llm_call(
+            "state_selector",
+            route.model,
+            prompt,
+            lambda: router.observe(route, lambda: _call_llm(llm_client, prompt, model=route.model)),
+        )
         llm_selected = raw.get("selected_state") or data.current_state.value
         if llm_selected not in [s.value for s in data.possible_next_states + [data.current_state]]:
             llm_selected = data.current_state.value
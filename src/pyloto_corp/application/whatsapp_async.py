@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 from typing import Any
@@ -11,13 +12,30 @@ from fastapi import HTTPException, Request, status
 from pyloto_corp.adapters.whatsapp.models import OutboundMessageRequest
 from pyloto_corp.adapters.whatsapp.normalizer import extract_messages
 from pyloto_corp.adapters.whatsapp.outbound import WhatsAppOutboundClient
+from pyloto_corp.adapters.whatsapp.outbound_sequencer import merged_idempotency_key
+from pyloto_corp.adapters.whatsapp.signature import WebhookSignatureVerifier
+from pyloto_corp.adapters.whatsapp.webhook_scan import scan_first_message_id
+from pyloto_corp.adapters.whatsapp.webhook_split import (
+    iter_webhook_events,
+    split_webhook_payload,
+)
 from pyloto_corp.ai.orchestrator import AIOrchestrator
+from pyloto_corp.application.keyed_executor import KeyedExecutor
 from pyloto_corp.config.settings import Settings
 from pyloto_corp.domain.outbound_dedup import OutboundDedupeStore
 from pyloto_corp.observability.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Ingress "raw": corpo da task = bytes originais do webhook; metadados em headers
+RAW_INGRESS_HEADER = "X-Pyloto-Raw-Ingress"
+INBOUND_EVENT_ID_HEADER = "X-Inbound-Event-Id"
+SIGNATURE_VALIDATED_HEADER = "X-Signature-Validated"
+SIGNATURE_SKIPPED_HEADER = "X-Signature-Skipped"
+
+# Literal: o nome do 413 em `starlette.status` mudou entre versões suportadas
+HTTP_PAYLOAD_TOO_LARGE = 413
+
 
 def _safe_mark_failed(store: OutboundDedupeStore, key: str, error: str | None) -> None:
     """Marca falha sem permitir que exceções quebrem o handler."""
@@ -36,9 +54,20 @@ def _safe_mark_sent(store: OutboundDedupeStore, key: str, message_id: str) -> bo
         return False
 
 
-def ensure_webhook_secret(settings: Settings) -> None:
-    """Fail-closed quando secret está ausente em staging/prod."""
-    if (settings.is_staging or settings.is_production) and not settings.whatsapp_webhook_secret:
+def ensure_webhook_secret(
+    settings: Settings, verifier: WebhookSignatureVerifier | None = None
+) -> None:
+    """Fail-closed quando secret está ausente em staging/prod.
+
+    Com `verifier`, usa o estado pré-computado dele (inclui secrets de refresh).
+    """
+    if verifier is not None:
+        missing = verifier.required and not verifier.configured
+    else:
+        missing = (
+            settings.is_staging or settings.is_production
+        ) and not settings.whatsapp_webhook_secret
+    if missing:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="missing_webhook_secret",
@@ -60,6 +89,35 @@ def require_internal_token(request: Request, settings: Settings) -> None:
     )
 
 
+async def read_limited_body(request: Request, max_bytes: int) -> bytes:
+    """Lê o corpo em streaming, abortando com 413 ao passar de `max_bytes`.
+
+    `Content-Length` acima do limite é rejeitado antes de ler qualquer byte;
+    sem ele (chunked), o limite vale sobre o que já chegou, sem bufferizar
+    o restante. `max_bytes <= 0` desliga o limite.
+    """
+    if max_bytes <= 0:
+        return await request.body()
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise HTTPException(status_code=HTTP_PAYLOAD_TOO_LARGE, detail="payload_too_large")
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise HTTPException(status_code=HTTP_PAYLOAD_TOO_LARGE, detail="payload_too_large")
+    return bytes(body)
+
+
+def inbound_chunk_event_id(inbound_event_id: str, index: int, total: int) -> str:
+    """Chave de idempotência do pedaço `index` de um webhook dividido em `total`."""
+    if total <= 1:
+        return inbound_event_id
+    return f"{inbound_event_id}#{index + 1}/{total}"
+
+
 def compute_inbound_event_id(payload: dict[str, Any], raw_body: bytes) -> str:
     """Gera chave de idempotência inbound baseada no message_id ou hash."""
     for entry in payload.get("entry", []):
@@ -77,147 +135,253 @@ def compute_inbound_event_id(payload: dict[str, Any], raw_body: bytes) -> str:
     return f"payload:{digest}"
 
 
-async def handle_inbound_task(
-    payload: dict[str, Any],
+def compute_inbound_event_id_raw(raw_body: bytes) -> str:
+    """Mesma chave de `compute_inbound_event_id`, via varredura dos bytes (sem parse)."""
+    message_id = scan_first_message_id(raw_body)
+    if message_id:
+        return message_id
+    return f"payload:{hashlib.sha256(raw_body).hexdigest()}"
+
+
+def _unit_event_key(unit: dict[str, Any]) -> str | None:
+    for kind, item in iter_webhook_events(unit):
+        if isinstance(item, dict) and item.get("id"):
+            if kind == "messages":
+                return item["id"]
+            return f"status:{item['id']}:{item.get('status', '')}"
+    return None
+
+
+def fan_out_webhook(payload: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    """Divide o webhook em unidades de um evento, cada uma com sua chave.
+
+    Mensagem → `message.id` (mesma chave de `compute_inbound_event_id`);
+    status → `status:<id>:<status>` (o mesmo wamid recebe vários status).
+    Unidades sem id usam o hash do próprio payload da unidade.
+    """
+    units = split_webhook_payload(payload, 1)
+    return [(_unit_event_key(unit) or compute_inbound_event_id(unit, b""), unit) for unit in units]
+
+
+async def _process_inbound_message(
+    idx: int,
+    msg: Any,
     inbound_event_id: str,
     correlation_id: str | None,
     tasks_dispatcher: Any,
     orchestrator: AIOrchestrator,
-) -> dict[str, int | str]:
-    """Processa payload inbound e enfileira mensagens outbound via Cloud Tasks."""
-    logger.info(
-        "handle_inbound_task_started",
-        extra={
-            "inbound_event_id": inbound_event_id,
-            "correlation_id": correlation_id,
-        },
+    *,
+    offload: bool,
+) -> str | None:
+    """Processa uma mensagem; retorna o nome da task outbound (None = pulada)."""
+    outbound_job = await _answer_inbound_message(
+        idx, msg, inbound_event_id, correlation_id, orchestrator, offload=offload
     )
+    if outbound_job is None:
+        return None
+    return await _enqueue_outbound_job(outbound_job, tasks_dispatcher)
 
-    messages = extract_messages(payload)
+
+async def _answer_inbound_message(
+    idx: int,
+    msg: Any,
+    inbound_event_id: str,
+    correlation_id: str | None,
+    orchestrator: AIOrchestrator,
+    *,
+    offload: bool,
+) -> dict[str, Any] | None:
+    """Gera a resposta de uma mensagem; retorna o job outbound (None = pulada)."""
     logger.info(
-        "messages_extracted",
+        "processing_message",
         extra={
-            "count": len(messages),
-            "inbound_event_id": inbound_event_id,
+            "index": idx,
+            "message_id_prefix": msg.message_id[:8] if msg.message_id else None,
+            "has_from": bool(msg.from_number),
+            "has_text": bool(msg.text),
         },
     )
 
-    deduped = 0
-    enqueued = 0
-    skipped = 0
-    outbound_tasks: list[str] = []
-
-    for idx, msg in enumerate(messages):
-        logger.info(
-            "processing_message",
+    if not msg.from_number or not msg.text:
+        logger.warning(
+            "message_skipped_missing_fields",
             extra={
                 "index": idx,
-                "message_id_prefix": msg.message_id[:8] if msg.message_id else None,
                 "has_from": bool(msg.from_number),
                 "has_text": bool(msg.text),
             },
         )
+        return None
 
-        if not msg.from_number or not msg.text:
-            logger.warning(
-                "message_skipped_missing_fields",
-                extra={
-                    "index": idx,
-                    "has_from": bool(msg.from_number),
-                    "has_text": bool(msg.text),
-                },
-            )
-            skipped += 1
-            continue
+    recipient = msg.from_number
+    if recipient and not recipient.startswith("+"):
+        recipient = f"+{recipient}"
 
-        recipient = msg.from_number
-        if recipient and not recipient.startswith("+"):
-            recipient = f"+{recipient}"
+    logger.info(
+        "calling_orchestrator",
+        extra={
+            "message_id_prefix": msg.message_id[:8],
+            "text_preview": msg.text[:30] if msg.text else None,
+        },
+    )
 
-        logger.info(
-            "calling_orchestrator",
+    # Orchestrator é síncrono: com conversas em paralelo, roda em thread
+    if offload:
+        response = await asyncio.to_thread(orchestrator.process_message, message=msg)
+    else:
+        response = orchestrator.process_message(message=msg)
+
+    logger.info(
+        "orchestrator_response",
+        extra={
+            "message_id_prefix": msg.message_id[:8],
+            "has_reply": bool(response.reply_text),
+            "intent": str(response.intent) if response.intent else None,
+            "outcome": str(response.outcome) if response.outcome else None,
+            "reply_preview": response.reply_text[:50] if response.reply_text else None,
+        },
+    )
+
+    if not response.reply_text:
+        logger.warning(
+            "message_skipped_no_reply",
             extra={
                 "message_id_prefix": msg.message_id[:8],
-                "text_preview": msg.text[:30] if msg.text else None,
+                "intent": str(response.intent) if response.intent else None,
+                "outcome": str(response.outcome) if response.outcome else None,
             },
         )
+        return None
 
-        response = orchestrator.process_message(message=msg)
+    outbound_job = {
+        "to": recipient,
+        "message_type": "text",
+        "text": response.reply_text,
+        "idempotency_key": msg.message_id,
+        "correlation_id": correlation_id,
+        "inbound_event_id": inbound_event_id,
+    }
+
+    logger.info(
+        "outbound_job_prepared",
+        extra={
+            "recipient_has_plus": recipient.startswith("+") if recipient else False,
+            "recipient_len": len(recipient) if recipient else 0,
+            "idempotency_key_prefix": msg.message_id[:8],
+            "text_len": len(response.reply_text) if response.reply_text else 0,
+        },
+    )
+
+    return outbound_job
 
+
+async def _enqueue_outbound_job(outbound_job: dict[str, Any], tasks_dispatcher: Any) -> str:
+    """Enfileira o job outbound; falha vira 503 (fail-closed)."""
+    key_prefix = (outbound_job.get("idempotency_key") or "")[:8]
+    try:
         logger.info(
-            "orchestrator_response",
+            "enqueuing_outbound",
             extra={
-                "message_id_prefix": msg.message_id[:8],
-                "has_reply": bool(response.reply_text),
-                "intent": str(response.intent) if response.intent else None,
-                "outcome": str(response.outcome) if response.outcome else None,
-                "reply_preview": response.reply_text[:50] if response.reply_text else None,
+                "idempotency_key_prefix": key_prefix,
+                "parts": len(outbound_job.get("parts") or ()) or 1,
+            },
+        )
+        task_meta = await tasks_dispatcher.enqueue_outbound(outbound_job)
+        logger.info(
+            "outbound_enqueued",
+            extra={
+                "task_name": task_meta.name,
+                "idempotency_key_prefix": key_prefix,
+            },
+        )
+        return task_meta.name
+    except Exception as exc:
+        logger.error(
+            "enqueue_outbound_failed",
+            extra={
+                "error": str(exc),
+                "error_type": type(exc).__name__,
+                "idempotency_key_prefix": key_prefix,
             },
+            exc_info=True,
         )
+        # Falha na enfileiração: tratamos como 503 (fail-closed)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="enqueue_outbound_failed",
+        ) from exc
 
-        if not response.reply_text:
-            logger.warning(
-                "message_skipped_no_reply",
-                extra={
-                    "message_id_prefix": msg.message_id[:8],
-                    "intent": str(response.intent) if response.intent else None,
-                    "outcome": str(response.outcome) if response.outcome else None,
-                },
-            )
-            skipped += 1
-            continue
-
-        outbound_job = {
-            "to": recipient,
-            "message_type": "text",
-            "text": response.reply_text,
-            "idempotency_key": msg.message_id,
+
+async def handle_inbound_task(
+    payload: dict[str, Any],
+    inbound_event_id: str,
+    correlation_id: str | None,
+    tasks_dispatcher: Any,
+    orchestrator: AIOrchestrator,
+    executor: KeyedExecutor | None = None,
+    sequence_outbound: bool = False,
+) -> dict[str, int | str]:
+    """Processa payload inbound e enfileira mensagens outbound via Cloud Tasks.
+
+    Com `executor`, mensagens do mesmo remetente seguem em ordem e conversas
+    diferentes rodam em paralelo (limite do executor); sem ele, tudo é
+    sequencial. A primeira falha é propagada depois que as demais terminam.
+
+    Com `sequence_outbound`, as respostas ao mesmo destinatário viram uma
+    única task outbound com `parts` (enviadas em ordem pelo sequenciador),
+    em vez de tasks independentes que podem chegar fora de ordem.
+    """
+    logger.info(
+        "handle_inbound_task_started",
+        extra={
+            "inbound_event_id": inbound_event_id,
             "correlation_id": correlation_id,
+        },
+    )
+
+    messages = extract_messages(payload)
+    logger.info(
+        "messages_extracted",
+        extra={
+            "count": len(messages),
             "inbound_event_id": inbound_event_id,
-        }
+        },
+    )
 
-        logger.info(
-            "outbound_job_prepared",
-            extra={
-                "recipient_has_plus": recipient.startswith("+") if recipient else False,
-                "recipient_len": len(recipient) if recipient else 0,
-                "idempotency_key_prefix": msg.message_id[:8],
-                "text_len": len(response.reply_text) if response.reply_text else 0,
-            },
+    executor = executor or KeyedExecutor(max_concurrency=1)
+    offload = executor.max_concurrency > 1
+    if sequence_outbound:
+        return await _handle_inbound_sequenced(
+            messages,
+            inbound_event_id,
+            correlation_id,
+            tasks_dispatcher,
+            orchestrator,
+            executor,
+            offload=offload,
         )
 
-        try:
-            logger.info(
-                "enqueuing_outbound",
-                extra={
-                    "idempotency_key_prefix": msg.message_id[:8],
-                },
-            )
-            task_meta = await tasks_dispatcher.enqueue_outbound(outbound_job)
-            outbound_tasks.append(task_meta.name)
-            enqueued += 1
-            logger.info(
-                "outbound_enqueued",
-                extra={
-                    "task_name": task_meta.name,
-                    "idempotency_key_prefix": msg.message_id[:8],
-                },
-            )
-        except Exception as exc:
-            logger.error(
-                "enqueue_outbound_failed",
-                extra={
-                    "error": str(exc),
-                    "error_type": type(exc).__name__,
-                    "idempotency_key_prefix": msg.message_id[:8],
-                },
-                exc_info=True,
-            )
-            # Falha na enfileiração: tratamos como 503 (fail-closed)
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="enqueue_outbound_failed",
-            ) from exc
+    results = await executor.map(
+        list(enumerate(messages)),
+        key=lambda item: item[1].from_number,
+        fn=lambda item: _process_inbound_message(
+            item[0],
+            item[1],
+            inbound_event_id,
+            correlation_id,
+            tasks_dispatcher,
+            orchestrator,
+            offload=offload,
+        ),
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+    outbound_tasks: list[str] = [name for name in results if name is not None]
+    enqueued = len(outbound_tasks)
+    skipped = len(results) - enqueued
+    deduped = 0
 
     logger.info(
         "handle_inbound_task_completed",
@@ -238,6 +402,90 @@ async def handle_inbound_task(
     }
 
 
+async def _handle_inbound_sequenced(
+    messages: list[Any],
+    inbound_event_id: str,
+    correlation_id: str | None,
+    tasks_dispatcher: Any,
+    orchestrator: AIOrchestrator,
+    executor: KeyedExecutor,
+    *,
+    offload: bool,
+) -> dict[str, int | str]:
+    """Gera as respostas e enfileira uma task por destinatário (ordem mantida)."""
+    answers = await executor.map(
+        list(enumerate(messages)),
+        key=lambda item: item[1].from_number,
+        fn=lambda item: _answer_inbound_message(
+            item[0],
+            item[1],
+            inbound_event_id,
+            correlation_id,
+            orchestrator,
+            offload=offload,
+        ),
+    )
+    jobs = [job for job in answers if isinstance(job, dict)]
+
+    by_recipient: dict[str, list[dict[str, Any]]] = {}
+    for job in jobs:
+        by_recipient.setdefault(job["to"], []).append(job)
+    enqueued = await asyncio.gather(
+        *(
+            _enqueue_outbound_job(sequence_outbound_job(group), tasks_dispatcher)
+            for group in by_recipient.values()
+        ),
+        return_exceptions=True,
+    )
+    for result in (*answers, *enqueued):
+        if isinstance(result, BaseException):
+            raise result
+
+    outbound_tasks = [name for name in enqueued if isinstance(name, str)]
+    skipped = len(answers) - len(jobs)
+    logger.info(
+        "handle_inbound_task_completed",
+        extra={
+            "inbound_event_id": inbound_event_id,
+            "processed": len(jobs),
+            "skipped": skipped,
+            "deduped": 0,
+            "outbound_tasks": len(outbound_tasks),
+        },
+    )
+    return {
+        "inbound_event_id": inbound_event_id,
+        "processed": len(jobs),
+        "deduped": 0,
+        "skipped": skipped,
+        "outbound_tasks": outbound_tasks,
+    }
+
+
+def sequence_outbound_job(jobs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Junta jobs ao mesmo destinatário numa task com `parts` (um job passa direto).
+
+    A chave da task é derivada das chaves das partes; cada parte mantém a
+    sua para a dedupe outbound.
+    """
+    if len(jobs) == 1:
+        return jobs[0]
+    first = jobs[0]
+    return {
+        "to": first["to"],
+        "parts": [
+            {key: value for key, value in job.items() if key not in _SEQUENCE_ENVELOPE_FIELDS}
+            for job in jobs
+        ],
+        "idempotency_key": merged_idempotency_key([job.get("idempotency_key") for job in jobs]),
+        "correlation_id": first.get("correlation_id"),
+        "inbound_event_id": first.get("inbound_event_id"),
+    }
+
+
+_SEQUENCE_ENVELOPE_FIELDS = frozenset({"to", "correlation_id", "inbound_event_id"})
+
+
 async def handle_outbound_task(
     task_body: dict[str, Any],
     settings: Settings,
@@ -247,6 +495,9 @@ async def handle_outbound_task(
     correlation_id = task_body.get("correlation_id") if isinstance(task_body, dict) else None
     inbound_event_id = task_body.get("inbound_event_id") if isinstance(task_body, dict) else None
 
+    if isinstance(task_body, dict) and "parts" in task_body:
+        return await _handle_outbound_sequence(task_body, settings, outbound_store)
+
     try:
         outbound_request = OutboundMessageRequest.model_validate(task_body)
     except Exception as exc:  # noqa: BLE001
@@ -339,3 +590,121 @@ async def handle_outbound_task(
         "correlation_id": correlation_id,
         "inbound_event_id": inbound_event_id,
     }
+
+
+def _parse_sequence_parts(task_body: dict[str, Any]) -> list[OutboundMessageRequest]:
+    parts = task_body.get("parts")
+    if not isinstance(parts, list) or not parts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_outbound_payload"
+        )
+    try:
+        requests = [
+            OutboundMessageRequest.model_validate({**part, "to": task_body.get("to")})
+            for part in parts
+        ]
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid_outbound_payload"
+        ) from exc
+    if any(not request.idempotency_key for request in requests):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="missing_idempotency_key",
+        )
+    return requests
+
+
+def _pending_parts(
+    requests: list[OutboundMessageRequest], outbound_store: OutboundDedupeStore
+) -> tuple[list[OutboundMessageRequest], dict[str, str | None]]:
+    """Separa partes ainda não enviadas (retry da task retoma de onde parou)."""
+    pending: list[OutboundMessageRequest] = []
+    already_sent: dict[str, str | None] = {}
+    for request in requests:
+        key = request.idempotency_key or ""
+        try:
+            dedupe_result = outbound_store.check_and_mark(key, key)
+        except Exception as exc:  # noqa: BLE001
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="outbound_dedupe_unavailable",
+            ) from exc
+        if dedupe_result.is_duplicate and dedupe_result.status == "sent":
+            already_sent[key] = dedupe_result.original_message_id
+        else:
+            pending.append(request)
+    return pending, already_sent
+
+
+async def _handle_outbound_sequence(
+    task_body: dict[str, Any],
+    settings: Settings,
+    outbound_store: OutboundDedupeStore,
+) -> dict[str, Any]:
+    """Envia as partes de uma task sequenciada em ordem, com dedupe por parte.
+
+    Rate limit da Meta que persiste após os reenvios do sequenciador vira
+    503 sem marcar falha: o retry da task reenvia só o que faltou.
+    """
+    from pyloto_corp.adapters.whatsapp.outbound_batch import RATE_LIMITED_ERROR_CODES
+    from pyloto_corp.adapters.whatsapp.outbound_sequencer import (
+        SEQUENCE_ABORTED,
+        get_outbound_sequencer,
+    )
+
+    requests = _parse_sequence_parts(task_body)
+    pending, already_sent = _pending_parts(requests, outbound_store)
+
+    client = WhatsAppOutboundClient(
+        api_endpoint=settings.whatsapp_api_endpoint,
+        access_token=settings.whatsapp_access_token or "",
+        phone_number_id=settings.whatsapp_phone_number_id or "",
+    )
+    results = await get_outbound_sequencer().send(client, pending) if pending else []
+
+    message_ids: list[str | None] = list(already_sent.values())
+    failure = None
+    for result in results:
+        keys = result.source_keys or (result.idempotency_key,)
+        if result.success:
+            message_ids.append(result.message_id)
+            for key in keys:
+                if key:
+                    _safe_mark_sent(outbound_store, key, result.message_id or key)
+        elif result.error_code != SEQUENCE_ABORTED and failure is None:
+            failure = result
+            if result.error_code not in RATE_LIMITED_ERROR_CODES:
+                for key in keys:
+                    if key:
+                        _safe_mark_failed(outbound_store, key, result.response.error_message)
+
+    if failure is not None:
+        logger.error(
+            "whatsapp_sequence_failed",
+            extra={
+                "error_code": failure.error_code,
+                "part_index": failure.index,
+                "parts": len(requests),
+            },
+        )
+        if failure.error_code in RATE_LIMITED_ERROR_CODES:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="whatsapp_rate_limited",
+            )
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="whatsapp_send_failed",
+        )
+
+    return {
+        "ok": True,
+        "status": "sent",
+        "message_ids": message_ids,
+        "parts": len(requests),
+        "messages": len(results),
+        "idempotency_key": task_body.get("idempotency_key"),
+        "correlation_id": task_body.get("correlation_id"),
+        "inbound_event_id": task_body.get("inbound_event_id"),
+    }
@@ -11,6 +11,7 @@ import os
 from functools import lru_cache
 from typing import Any
 
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Importar create_secret_provider para uso em model_post_init
@@ -54,6 +55,14 @@ class Settings(BaseSettings):
     # WhatsApp / Meta API (versão v24.0 conforme README.md jan/2026)
     whatsapp_verify_token: str | None = None  # Para verificação de webhook
     whatsapp_webhook_secret: str | None = None  # HMAC SHA-256 secret
+    whatsapp_webhook_previous_secret: str | None = None  # Aceito durante rotação
+    # Refresh do Secret Manager (0 = desliga); ignora o cache de secrets, então
+    # a rotação do webhook leva no máximo este intervalo
+    webhook_secret_refresh_seconds: float = 300.0
+
+    # Cache de secrets do Secret Manager (TTL + stale-while-revalidate; 0 = sem cache)
+    secret_cache_ttl_seconds: float = 300.0
+    secret_cache_max_stale_seconds: float = 3600.0
     whatsapp_access_token: str | None = None  # Bearer token (Secret Manager)
     whatsapp_phone_number_id: str | None = None  # ID do número registrado
     whatsapp_business_account_id: str | None = None  # ID da conta comercial
@@ -76,6 +85,14 @@ class Settings(BaseSettings):
     whatsapp_circuit_breaker_fail_max: int = 5  # Falhas consecutivas antes de abrir
     whatsapp_circuit_breaker_reset_timeout_seconds: float = 60.0  # Tempo até half-open
     whatsapp_circuit_breaker_half_open_max_calls: int = 1  # Tentativas em half-open
+    whatsapp_messages_per_second: float = 80.0  # Tier do número (80 padrão; 1000 após upgrade)
+    whatsapp_pair_interval_seconds: float = 6.0  # Pair rate Meta: 1 msg a cada 6 s por usuário
+    whatsapp_pair_burst: int = 45  # Rajada aceita por destinatário antes do pair rate
+    whatsapp_batch_max_concurrency: int = 16  # Envios HTTP simultâneos em send_batch
+    whatsapp_rate_limit_max_retries: int = 2  # Reenvios após rate limit da Meta
+    # Respostas ao mesmo destinatário numa task inbound viram uma task sequenciada
+    outbound_sequencing_enabled: bool = False
+    outbound_merge_max_chars: int = 4096  # Textos consecutivos coalescidos (0 = desliga)
 
     # Upload de mídia
     whatsapp_media_upload_max_mb: int = 100  # Limite de arquivo
@@ -135,6 +152,25 @@ class Settings(BaseSettings):
     openai_timeout_seconds: int = 10  # Timeout para chamadas OpenAI
     openai_max_retries: int = 2  # Retries em falha
     openai_enabled: bool = False  # Feature flag: habilita LLM (fail-safe: false)
+    openai_requests_per_minute: int = 500  # Limite RPM do cliente (token bucket)
+    openai_tokens_per_minute: int = 200_000  # Limite TPM do cliente (token bucket)
+    openai_max_concurrency: int = 16  # Teto da concorrência adaptativa (AIMD)
+    openai_target_latency_seconds: float = 8.0  # Acima disso o AIMD reduz concorrência
+    openai_queue_timeout_seconds: float = 5.0  # Espera máxima na fila do limitador
+    llm_single_flight_enabled: bool = True  # Coalesce prompts idênticos simultâneos
+    llm_single_flight_backend: str = "memory"  # memory | redis (entre instâncias)
+    llm_hedging_enabled: bool = False  # Segunda tentativa após o percentil de latência
+    llm_hedge_percentile: float = 0.95  # Percentil (por estágio) que dispara o hedge
+    llm_hedge_min_samples: int = 20  # Amostras mínimas antes de hedgear
+    message_deadline_seconds: float = 25.0  # Orçamento fim-a-fim por mensagem (LLMs)
+
+    # Roteamento de modelo por complexidade (ai/model_router.py)
+    llm_fast_model: str | None = None  # Tier rápido (None = openai_model)
+    llm_strong_model: str | None = None  # Tier forte (None = sem escalonamento)
+    llm_route_long_message_chars: int = 280  # Acima disso escala para o tier forte
+    llm_route_low_confidence: float = 0.7  # Confiança abaixo disso escala (= gate padrão)
+    event_detection_model: str | None = None  # Modelo fixo do estágio (opcional)
+    message_type_selection_model: str | None = None  # Modelo fixo do estágio (opcional)
 
     # State selector (LLM #1)
     state_selector_enabled: bool = True
@@ -154,8 +190,36 @@ class Settings(BaseSettings):
     master_decider_confidence_threshold: float = 0.7
     decision_audit_backend: str = "memory"  # memory | firestore
 
+    # Startup: pré-aquecimento (conexões, contexto institucional) antes de ficar pronto
+    app_prewarm_enabled: bool = False
+    app_prewarm_timeout_seconds: float = 10.0
+
+    # Readiness (/ready): timeout por probe e cache do resultado
+    readiness_probe_timeout_seconds: float = 2.0
+    readiness_cache_ttl_seconds: float = 5.0
+
+    # Ingress do webhook: dedupe por varredura dos bytes e task com o corpo original
+    webhook_raw_ingress_enabled: bool = False
+    # Limites do webhook: corpo (413 em streaming) e eventos por task (excedente vira outras)
+    webhook_max_body_bytes: int = 1_048_576
+    webhook_max_events_per_task: int = 50
+    # Fan-out: uma task (e uma chave de dedupe) por mensagem/status do webhook
+    webhook_fanout_enabled: bool = False
+    # Worker inbound: conversas distintas em paralelo (mesmo remetente segue em ordem)
+    inbound_max_concurrency: int = 8
+
     # Observabilidade
     log_format: str = "json"  # json | text
+    log_async_enabled: bool = True  # Fila + listener em background (fora do hot path)
+    log_queue_max_size: int = 10_000  # Capacidade da fila de logs
+    log_queue_overflow_policy: str = "drop_new"  # drop_new | drop_oldest
+    log_batch_size: int = 256  # Records formatados/escritos por lote
+    # Amostragem por evento (JSON), ex.: {"inbound_processing_started": 0.1}
+    log_sample_rates: dict[str, float] = Field(default_factory=dict)
+    # Teto por evento/segundo (JSON), ex.: {"response_generator_result": 50}
+    log_rate_limits: dict[str, float] = Field(default_factory=dict)
+    # correlation_ids sempre logados (debug de um fluxo específico)
+    log_always_correlation_ids: list[str] = Field(default_factory=list)
     correlation_id_header: str = "X-Correlation-ID"
     enable_request_logging: bool = True
     enable_response_logging: bool = True
@@ -174,8 +238,27 @@ class Settings(BaseSettings):
     # Máximo de entradas armazenadas em `session.message_history` (poda segura)
     SESSION_MESSAGE_HISTORY_MAX_ENTRIES: int = 200
 
+    # Janela de contexto LLM (application/context_window.py)
+    llm_context_max_tokens: int = 600  # Orçamento total (resumo + janela recente)
+    llm_context_summary_max_tokens: int = 150  # Limite do resumo rolante
+
     # Session store backend — conforme C2
     session_store_backend: str = "memory"  # memory | redis | firestore
+    # Lease por sessão no read-modify-write (none | memory | redis | firestore)
+    session_lock_backend: str = "none"
+    session_lock_ttl_ms: int = 15_000  # Renovado a cada ttl/3 durante o processamento
+    session_lock_wait_seconds: float = 10.0  # Espera máxima (backoff) pelo lease
+    # Save otimista (versão): tentativas de merge-and-retry em conflito
+    session_save_max_attempts: int = 3
+    # Cache L1 em processo na frente do session store (infra/session_cache.py)
+    session_cache_enabled: bool = False
+    session_cache_max_entries: int = 1024  # LRU
+    session_cache_ttl_seconds: float = 30.0  # Staleness máxima de uma entrada limpa
+    # Política de escrita por backend: through | behind (behind exige lease de sessão)
+    session_cache_write_policies: dict[str, str] = Field(
+        default_factory=lambda: {"redis": "through", "firestore": "through"}
+    )
+    session_cache_flush_interval_seconds: float = 1.0  # Flush periódico do write-behind
 
     # Flood detection — conforme A4 / regras_e_padroes.md
     flood_detector_backend: str = "memory"  # memory | redis
@@ -485,6 +568,7 @@ class Settings(BaseSettings):
             # Mapa de secrets: nome no Secret Manager → atributo em Settings
             secret_mappings = {
                 "WHATSAPP_WEBHOOK_SECRET": "whatsapp_webhook_secret",
+                "WHATSAPP_WEBHOOK_PREVIOUS_SECRET": "whatsapp_webhook_previous_secret",
                 "WHATSAPP_ACCESS_TOKEN": "whatsapp_access_token",
                 "WHATSAPP_VERIFY_TOKEN": "whatsapp_verify_token",
             }
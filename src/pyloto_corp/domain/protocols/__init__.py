@@ -4,8 +4,10 @@ from __future__ import annotations
 
 from pyloto_corp.domain.protocols.decision_audit_store import DecisionAuditStoreProtocol
 from pyloto_corp.domain.protocols.dedupe import DedupeProtocol
+from pyloto_corp.domain.protocols.session_lock import SessionLockProtocol
 from pyloto_corp.domain.protocols.session_store import (
     AsyncSessionStoreProtocol,
+    SessionConflictError,
     SessionStoreProtocol,
 )
 
@@ -14,4 +16,6 @@ __all__ = [
     "SessionStoreProtocol",
     "AsyncSessionStoreProtocol",
     "DecisionAuditStoreProtocol",
+    "SessionLockProtocol",
+    "SessionConflictError",
 ]
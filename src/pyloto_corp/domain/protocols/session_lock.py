@@ -0,0 +1,32 @@
+"""Protocolo de domínio para lock distribuído de sessão (lease com token)."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+
+class SessionLockError(Exception):
+    """Erro no lock de sessão."""
+
+
+class SessionLockTimeoutError(SessionLockError):
+    """Lease não obtido dentro do tempo máximo de espera."""
+
+
+class SessionLockProtocol(ABC):
+    """Contrato mínimo de lock com lease.
+
+    - `try_acquire` nunca bloqueia: True se o lease foi obtido para `token`
+    - `renew` e `release` só têm efeito se o lease ainda pertence a `token`
+      (um lease expirado e tomado por outra instância nunca é liberado por
+      quem o perdeu)
+    """
+
+    @abstractmethod
+    def try_acquire(self, key: str, token: str, ttl_ms: int) -> bool: ...
+
+    @abstractmethod
+    def renew(self, key: str, token: str, ttl_ms: int) -> bool: ...
+
+    @abstractmethod
+    def release(self, key: str, token: str) -> bool: ...
@@ -1,4 +1,9 @@
-"""Protocolos de domínio para persistência de sessão (sync e async)."""
+"""Protocolos de domínio para persistência de sessão (sync e async).
+
+`compare_and_set` é o save com controle de concorrência otimista: grava
+somente se a versão persistida ainda for `session.version` (a versão lida).
+Backends sem suporte caem no `save` incondicional.
+"""
 
 from __future__ import annotations
 
@@ -9,6 +14,10 @@ if TYPE_CHECKING:
     from pyloto_corp.application.session import SessionState
 
 
+class SessionConflictError(Exception):
+    """Sessão alterada por outro escritor e retentativas de merge esgotadas."""
+
+
 class SessionStoreProtocol(ABC):
     """Contrato mínimo síncrono para armazenamento de SessionState."""
 
@@ -24,6 +33,11 @@ class SessionStoreProtocol(ABC):
     @abstractmethod
     def exists(self, session_id: str) -> bool: ...
 
+    def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        """Grava se a versão persistida for `session.version` (False em conflito)."""
+        self.save(session, ttl_seconds)
+        return True
+
 
 class AsyncSessionStoreProtocol(ABC):
     """Contrato mínimo assíncrono para armazenamento de SessionState."""
@@ -39,3 +53,8 @@ class AsyncSessionStoreProtocol(ABC):
 
     @abstractmethod
     async def exists(self, session_id: str) -> bool: ...
+
+    async def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        """Versão assíncrona de `SessionStoreProtocol.compare_and_set`."""
+        await self.save(session, ttl_seconds)
+        return True
@@ -5,6 +5,9 @@ componentes de infraestrutura:
 
 - Dedupe: InMemoryDedupeStore, RedisDedupeStore
 - Session: InMemorySessionStore, RedisSessionStore, FirestoreSessionStore, create_session_store
+- Session cache: CachedSessionStore (L1 LRU + TTL, write-through/behind), AsyncCachedSessionStore
+- Session lock: SessionLeaseManager, create_session_lock, create_session_lease_manager
+- Unit of work: unit_of_work (escritas do request em um WriteBatch / MULTI)
 - Secrets: EnvSecretProvider, SecretManagerProvider
 - HTTP: HttpClient
 
@@ -17,49 +20,123 @@ Conforme regras_e_padroes.md:
 - Logs estruturados sem PII
 """
 
-from pyloto_corp.infra.decision_audit_store import (
-    DecisionAuditStore,
-    FirestoreDecisionAuditStore,
-    MemoryDecisionAuditStore,
-    create_decision_audit_store,
-)
-from pyloto_corp.infra.dedupe import (
-    DedupeError,
-    DedupeStore,
-    InMemoryDedupeStore,
-    RedisDedupeStore,
-    create_dedupe_store,
-)
-from pyloto_corp.infra.dedupe_firestore import FirestoreDedupeStore
-from pyloto_corp.infra.http import (
-    HttpClient,
-    HttpClientConfig,
-    HttpError,
-    create_http_client,
-)
-from pyloto_corp.infra.inbound_processing_log import (
-    FirestoreInboundProcessingLogStore,
-    InboundProcessingLogStore,
-    MemoryInboundProcessingLogStore,
-    RedisInboundProcessingLogStore,
-    create_inbound_log_store,
-)
-from pyloto_corp.infra.secrets import (
-    EnvSecretProvider,
-    SecretManagerProvider,
-    SecretProvider,
-    create_secret_provider,
-    get_pepper_secret,
-    get_whatsapp_secrets,
-)
-from pyloto_corp.infra.session_store import (
-    FirestoreSessionStore,
-    InMemorySessionStore,
-    RedisSessionStore,
-    SessionStore,
-    SessionStoreError,
-    create_session_store,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pyloto_corp.infra.decision_audit_store import (
+        DecisionAuditStore,
+        FirestoreDecisionAuditStore,
+        MemoryDecisionAuditStore,
+        create_decision_audit_store,
+    )
+    from pyloto_corp.infra.dedupe import (
+        DedupeError,
+        DedupeStore,
+        InMemoryDedupeStore,
+        RedisDedupeStore,
+        create_dedupe_store,
+    )
+    from pyloto_corp.infra.dedupe_firestore import FirestoreDedupeStore
+    from pyloto_corp.infra.http import (
+        HttpClient,
+        HttpClientConfig,
+        HttpError,
+        create_http_client,
+    )
+    from pyloto_corp.infra.inbound_processing_log import (
+        FirestoreInboundProcessingLogStore,
+        InboundProcessingLogStore,
+        MemoryInboundProcessingLogStore,
+        RedisInboundProcessingLogStore,
+        create_inbound_log_store,
+    )
+    from pyloto_corp.infra.secrets import (
+        CachedSecretProvider,
+        EnvSecretProvider,
+        SecretManagerProvider,
+        SecretProvider,
+        create_secret_provider,
+        get_pepper_secret,
+        get_whatsapp_secrets,
+    )
+    from pyloto_corp.infra.session_cache import (
+        AsyncCachedSessionStore,
+        CachedSessionStore,
+        SessionCacheStats,
+    )
+    from pyloto_corp.infra.session_lock import (
+        SessionLeaseManager,
+        SessionLockError,
+        SessionLockTimeoutError,
+        create_session_lease_manager,
+        create_session_lock,
+    )
+    from pyloto_corp.infra.session_store import (
+        FirestoreSessionStore,
+        InMemorySessionStore,
+        RedisSessionStore,
+        SessionStore,
+        SessionStoreError,
+        create_session_store,
+    )
+    from pyloto_corp.infra.unit_of_work import (
+        UnitOfWork,
+        UnitOfWorkError,
+        current_unit_of_work,
+        unit_of_work,
+    )
+
+# Exports resolvidos sob demanda (PEP 562): importar `pyloto_corp.infra.secrets`
+# (ex.: via settings) não carrega SDKs pesados (google-cloud-firestore etc.).
+_EXPORTS: dict[str, str] = {
+    "DecisionAuditStore": "pyloto_corp.infra.decision_audit_store",
+    "FirestoreDecisionAuditStore": "pyloto_corp.infra.decision_audit_store",
+    "MemoryDecisionAuditStore": "pyloto_corp.infra.decision_audit_store",
+    "create_decision_audit_store": "pyloto_corp.infra.decision_audit_store",
+    "DedupeError": "pyloto_corp.infra.dedupe",
+    "DedupeStore": "pyloto_corp.infra.dedupe",
+    "InMemoryDedupeStore": "pyloto_corp.infra.dedupe",
+    "RedisDedupeStore": "pyloto_corp.infra.dedupe",
+    "create_dedupe_store": "pyloto_corp.infra.dedupe",
+    "FirestoreDedupeStore": "pyloto_corp.infra.dedupe_firestore",
+    "HttpClient": "pyloto_corp.infra.http",
+    "HttpClientConfig": "pyloto_corp.infra.http",
+    "HttpError": "pyloto_corp.infra.http",
+    "create_http_client": "pyloto_corp.infra.http",
+    "FirestoreInboundProcessingLogStore": "pyloto_corp.infra.inbound_processing_log",
+    "InboundProcessingLogStore": "pyloto_corp.infra.inbound_processing_log",
+    "MemoryInboundProcessingLogStore": "pyloto_corp.infra.inbound_processing_log",
+    "RedisInboundProcessingLogStore": "pyloto_corp.infra.inbound_processing_log",
+    "create_inbound_log_store": "pyloto_corp.infra.inbound_processing_log",
+    "CachedSecretProvider": "pyloto_corp.infra.secrets",
+    "EnvSecretProvider": "pyloto_corp.infra.secrets",
+    "SecretManagerProvider": "pyloto_corp.infra.secrets",
+    "SecretProvider": "pyloto_corp.infra.secrets",
+    "create_secret_provider": "pyloto_corp.infra.secrets",
+    "get_pepper_secret": "pyloto_corp.infra.secrets",
+    "get_whatsapp_secrets": "pyloto_corp.infra.secrets",
+    "AsyncCachedSessionStore": "pyloto_corp.infra.session_cache",
+    "CachedSessionStore": "pyloto_corp.infra.session_cache",
+    "SessionCacheStats": "pyloto_corp.infra.session_cache",
+    "SessionLeaseManager": "pyloto_corp.infra.session_lock",
+    "SessionLockError": "pyloto_corp.infra.session_lock",
+    "SessionLockTimeoutError": "pyloto_corp.infra.session_lock",
+    "create_session_lease_manager": "pyloto_corp.infra.session_lock",
+    "create_session_lock": "pyloto_corp.infra.session_lock",
+    "FirestoreSessionStore": "pyloto_corp.infra.session_store",
+    "InMemorySessionStore": "pyloto_corp.infra.session_store",
+    "RedisSessionStore": "pyloto_corp.infra.session_store",
+    "SessionStore": "pyloto_corp.infra.session_store",
+    "SessionStoreError": "pyloto_corp.infra.session_store",
+    "create_session_store": "pyloto_corp.infra.session_store",
+    "UnitOfWork": "pyloto_corp.infra.unit_of_work",
+    "UnitOfWorkError": "pyloto_corp.infra.unit_of_work",
+    "current_unit_of_work": "pyloto_corp.infra.unit_of_work",
+    "unit_of_work": "pyloto_corp.infra.unit_of_work",
+}
 
 __all__ = [
     # Dedupe
@@ -76,6 +153,19 @@ __all__ = [
     "RedisSessionStore",
     "FirestoreSessionStore",
     "create_session_store",
+    "AsyncCachedSessionStore",
+    "CachedSessionStore",
+    "SessionCacheStats",
+    "SessionLeaseManager",
+    "SessionLockError",
+    "SessionLockTimeoutError",
+    "create_session_lease_manager",
+    "create_session_lock",
+    # Unit of work
+    "UnitOfWork",
+    "UnitOfWorkError",
+    "current_unit_of_work",
+    "unit_of_work",
     # HTTP
     "HttpClient",
     "HttpClientConfig",
@@ -96,7 +186,21 @@ __all__ = [
     "SecretProvider",
     "EnvSecretProvider",
     "SecretManagerProvider",
+    "CachedSecretProvider",
     "create_secret_provider",
     "get_pepper_secret",
     "get_whatsapp_secrets",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
@@ -2,21 +2,31 @@
 
 from __future__ import annotations
 
-import json
 from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import anyio
-from google.cloud import tasks_v2
-from google.protobuf import timestamp_pb2
 
 from pyloto_corp.observability.logging import get_logger
+from pyloto_corp.utils import json_codec
+
+if TYPE_CHECKING:
+    from google.cloud import tasks_v2
 
 logger = get_logger(__name__)
 
 
+def __getattr__(name: str) -> Any:
+    """`tasks_v2` importado sob demanda (SDK pesado fora do import da app)."""
+    if name == "tasks_v2":
+        from google.cloud import tasks_v2
+
+        return tasks_v2
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class CloudTaskDispatchError(Exception):
     """Erro ao criar task no Cloud Tasks."""
 
@@ -33,7 +43,7 @@ class TaskMetadata:
 def _serialize_payload(payload: Mapping[str, Any]) -> bytes:
     """Serializa payload para JSON bytes."""
     try:
-        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        return json_codec.dumpb(payload)
     except (TypeError, ValueError) as exc:
         raise CloudTaskDispatchError("invalid_task_payload") from exc
 
@@ -50,16 +60,20 @@ def _build_url(base_url: str, endpoint: str) -> str:
 
 def _build_task(
     url: str,
-    payload: Mapping[str, Any],
+    payload: Mapping[str, Any] | bytes,
     headers: Mapping[str, str],
     schedule_time: datetime | None,
 ) -> tasks_v2.Task:
-    """Monta objeto Task com HttpRequest JSON."""
+    """Monta objeto Task com HttpRequest JSON (bytes são enviados sem re-serializar)."""
+    from google.cloud import tasks_v2
+    from google.protobuf import timestamp_pb2
+
+    body = payload if isinstance(payload, bytes) else _serialize_payload(payload)
     http_request = tasks_v2.HttpRequest(
         http_method=tasks_v2.HttpMethod.POST,
         url=url,
         headers={"Content-Type": "application/json", **dict(headers)},
-        body=_serialize_payload(payload),
+        body=body,
     )
 
     task = tasks_v2.Task(http_request=http_request)
@@ -103,12 +117,14 @@ class CloudTasksDispatcher:
         self,
         queue: str,
         endpoint: str,
-        payload: Mapping[str, Any],
+        payload: Mapping[str, Any] | bytes,
         schedule_time: datetime | None = None,
+        extra_headers: Mapping[str, str] | None = None,
     ) -> TaskMetadata:
         """Cria task sincronicamente (usada por wrappers async)."""
         url = _build_url(self._base_url, endpoint)
-        task = _build_task(url, payload, self._headers, schedule_time)
+        headers = {**self._headers, **dict(extra_headers)} if extra_headers else self._headers
+        task = _build_task(url, payload, headers, schedule_time)
 
         try:
             parent = self._client.queue_path(self._project, self._location, queue)
@@ -121,6 +137,13 @@ class CloudTasksDispatcher:
             )
             raise CloudTaskDispatchError(str(exc)) from exc
 
+    def ping(self) -> None:
+        """Probe de readiness: consulta a fila inbound (no-op no client local)."""
+        get_queue = getattr(self._client, "get_queue", None)
+        if get_queue is None:
+            return
+        get_queue(name=self._client.queue_path(self._project, self._location, self._inbound_queue))
+
     async def enqueue_inbound(
         self,
         payload: Mapping[str, Any],
@@ -136,6 +159,23 @@ class CloudTasksDispatcher:
             schedule_time,
         )
 
+    async def enqueue_inbound_raw(
+        self,
+        body: bytes,
+        *,
+        headers: Mapping[str, str],
+        schedule_time: datetime | None = None,
+    ) -> TaskMetadata:
+        """Enfileia os bytes originais do webhook (metadados em `headers`)."""
+        return await anyio.to_thread.run_sync(
+            self._create_task,
+            self._inbound_queue,
+            "/internal/process_inbound",
+            body,
+            schedule_time,
+            headers,
+        )
+
     async def enqueue(self, payload: Mapping[str, Any]) -> str:
         """Compatibilidade com MessageQueue: enfileia inbound e retorna task_id."""
         meta = await self.enqueue_inbound(payload)
@@ -8,6 +8,7 @@ from datetime import UTC, datetime
 from typing import Any
 
 from pyloto_corp.domain.protocols.decision_audit_store import DecisionAuditStoreProtocol
+from pyloto_corp.infra.unit_of_work import current_unit_of_work
 from pyloto_corp.observability.logging import get_logger
 
 logger = get_logger(__name__)
@@ -31,7 +32,7 @@ class MemoryDecisionAuditStore(DecisionAuditStore):
 
 
 class FirestoreDecisionAuditStore(DecisionAuditStore):
-    """Store em Firestore."""
+    """Store em Firestore (agrupado na unit of work do request, se houver)."""
 
     def __init__(self, firestore_client: Any, collection: str = "decision_audit") -> None:
         self._client = firestore_client
@@ -43,7 +44,12 @@ class FirestoreDecisionAuditStore(DecisionAuditStore):
             or hashlib.sha256(json.dumps(record, sort_keys=True).encode("utf-8")).hexdigest()
         )
         record = {**record, "created_at": datetime.now(tz=UTC)}
-        self._client.collection(self._collection).document(doc_id).set(record)
+        doc_ref = self._client.collection(self._collection).document(doc_id)
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.firestore_set(self._client, doc_ref, record)
+            return
+        doc_ref.set(record)
 
 
 def create_decision_audit_store(
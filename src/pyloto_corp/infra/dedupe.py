@@ -55,6 +55,17 @@ class DedupeStore(DedupeProtocol):
         """
         ...
 
+    def mark_many_if_new(self, keys: list[str]) -> list[bool]:
+        """`mark_if_new` em lote, na ordem de `keys` (chave repetida = duplicada).
+
+        Implementação padrão chama `mark_if_new` por chave; backends com
+        round-trip caro sobrescrevem com uma operação em lote.
+
+        Raises:
+            DedupeError: Em caso de falha no backend (fail-closed)
+        """
+        return [self.mark_if_new(key) for key in keys]
+
     @abstractmethod
     def is_duplicate(self, key: str) -> bool:
         """Apenas verifica se chave existe, sem marcar.
@@ -158,7 +169,6 @@ class InMemoryDedupeStore(DedupeStore):
             del self._seen[k]
 
 
-
 class RedisDedupeStore(DedupeStore):
     """Dedupe via Redis com TTL nativo e fail-closed.
 
@@ -279,6 +289,30 @@ class RedisDedupeStore(DedupeStore):
         """Compat wrapper: True se novo, False se duplicado."""
         return not self.seen(key, self._ttl_seconds)
 
+    def mark_many_if_new(self, keys: list[str]) -> list[bool]:
+        """SETNX de todas as chaves em um único pipeline (um round-trip)."""
+        client = self._get_client()
+
+        if client is None:
+            logger.warning("Redis indisponível, ignorando dedupe")
+            return [True] * len(keys)
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(self._make_key(key), "1", nx=True, ex=self._ttl_seconds)
+            results = pipe.execute()
+        except Exception as e:
+            logger.error(
+                "Erro em operação Redis",
+                extra={"operation": "mark_many_if_new", "error_type": type(e).__name__},
+            )
+            if self._fail_closed:
+                raise DedupeError(f"Falha ao verificar dedupe em lote: {e}") from e
+            return [True] * len(keys)
+
+        return [bool(was_set) for was_set in results]
+
     def is_duplicate(self, key: str) -> bool:
         """Verifica existência sem modificar."""
         client = self._get_client()
@@ -35,6 +35,10 @@ class FirestoreDedupeStore(DedupeStore):
         self._ttl_seconds = ttl_seconds
         self._fail_closed = fail_closed
 
+    def seen(self, key: str, ttl: int) -> bool:
+        """API canônica: True se duplicado (TTL é o configurado no construtor)."""
+        return not self.mark_if_new(key)
+
     def mark_if_new(self, key: str) -> bool:
         """Cria documento com ID=key; retorna False se já existia."""
         doc_ref = self._client.collection(self._collection).document(key)
@@ -59,6 +63,52 @@ class FirestoreDedupeStore(DedupeStore):
                 raise DedupeError(f"Falha ao gravar dedupe no Firestore: {exc}") from exc
             return True
 
+    def mark_many_if_new(self, keys: list[str]) -> list[bool]:
+        """Marca o lote numa única transação (um get_all + um commit).
+
+        Documentos já existentes contam como duplicados, como em `mark_if_new`;
+        chave repetida no lote é duplicada a partir da segunda ocorrência.
+        """
+        if not keys:
+            return []
+
+        collection = self._client.collection(self._collection)
+        refs = [collection.document(key) for key in dict.fromkeys(keys)]
+        expires_at = datetime.now(UTC) + timedelta(seconds=self._ttl_seconds)
+
+        @firestore.transactional
+        def _txn(tx: firestore.Transaction) -> set[str]:
+            existing = {
+                snapshot.id
+                for snapshot in self._client.get_all(refs, transaction=tx)
+                if snapshot.exists
+            }
+            for ref in refs:
+                if ref.id not in existing:
+                    tx.create(
+                        ref,
+                        {"created_at": firestore.SERVER_TIMESTAMP, "expires_at": expires_at},
+                    )
+            return existing
+
+        try:
+            existing = _txn(self._client.transaction())
+        except Exception as exc:  # noqa: BLE001
+            logger.error(
+                "firestore_dedupe_error",
+                extra={"operation": "mark_many_if_new", "error": type(exc).__name__},
+            )
+            if self._fail_closed:
+                raise DedupeError(f"Falha ao gravar dedupe em lote no Firestore: {exc}") from exc
+            return [True] * len(keys)
+
+        seen: set[str] = set()
+        results = []
+        for key in keys:
+            results.append(key not in existing and key not in seen)
+            seen.add(key)
+        return results
+
     def is_duplicate(self, key: str) -> bool:
         """Retorna True se documento existe e ainda não expirou."""
         try:
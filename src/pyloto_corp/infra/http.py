@@ -205,9 +205,18 @@ class HttpClient:
             response = await client.post(url, json=payload)
     """
 
-    def __init__(self, config: HttpClientConfig | None = None) -> None:
-        """Inicializa cliente com configuração."""
+    def __init__(
+        self,
+        config: HttpClientConfig | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Inicializa cliente com configuração.
+
+        `transport` substitui o transporte httpx (ex.: `httpx.MockTransport`
+        para uma Graph API fake em testes).
+        """
         self._config = config or HttpClientConfig()
+        self._transport = transport
         self._client: httpx.AsyncClient | None = None
         self._circuit_breaker: CircuitBreaker | None = None
         if self._config.circuit_breaker_enabled:
@@ -226,6 +235,7 @@ class HttpClient:
                 timeout=httpx.Timeout(self._config.timeout_seconds),
                 headers=self._config.default_headers,
                 verify=self._config.verify_ssl,
+                transport=self._transport,
             )
         return self._client
 
@@ -1,13 +1,22 @@
-"""Registro persistente do processamento inbound (rastro auditável)."""
+"""Registro persistente do processamento inbound (rastro auditável).
+
+Início e fim gravam só os próprios campos, cada um em uma escrita atômica:
+a ordem de chegada não importa (um fim que chega antes do início não é
+apagado por ele) e não há leitura antes da escrita.
+
+- Redis: hash por evento; `HSET` + `EXPIRE` em um pipeline `MULTI/EXEC`
+- Firestore: um `set(..., merge=True)` por marca
+"""
 
 from __future__ import annotations
 
-import json
-from collections.abc import Mapping
+import asyncio
+import threading
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+from pyloto_corp.infra.unit_of_work import current_unit_of_work
 from pyloto_corp.observability.logging import get_logger
 
 logger = get_logger(__name__)
@@ -27,7 +36,11 @@ class InboundProcessingRecord:
 
 
 class InboundProcessingLogStore:
-    """Contrato simples para registrar início/fim do processamento inbound."""
+    """Contrato simples para registrar início/fim do processamento inbound.
+
+    As variantes `_async` rodam a escrita fora do event loop; stores com
+    client nativo async podem sobrescrevê-las.
+    """
 
     def mark_started(
         self, inbound_event_id: str, correlation_id: str | None, task_name: str | None
@@ -45,28 +58,55 @@ class InboundProcessingLogStore:
     ) -> None:
         raise NotImplementedError
 
+    async def mark_started_async(
+        self, inbound_event_id: str, correlation_id: str | None, task_name: str | None
+    ) -> None:
+        await asyncio.to_thread(self.mark_started, inbound_event_id, correlation_id, task_name)
+
+    async def mark_finished_async(
+        self,
+        inbound_event_id: str,
+        *,
+        correlation_id: str | None,
+        task_name: str | None,
+        enqueued_outbound: bool,
+        error: str | None = None,
+    ) -> None:
+        await asyncio.to_thread(
+            self.mark_finished,
+            inbound_event_id,
+            correlation_id=correlation_id,
+            task_name=task_name,
+            enqueued_outbound=enqueued_outbound,
+            error=error,
+        )
+
 
 class MemoryInboundProcessingLogStore(InboundProcessingLogStore):
     """Store em memória (apenas dev/testes)."""
 
     def __init__(self, ttl_seconds: int = 604800) -> None:
         self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
         self._data: dict[str, tuple[InboundProcessingRecord, float]] = {}
 
+    def get(self, inbound_event_id: str) -> InboundProcessingRecord | None:
+        with self._lock:
+            self._cleanup()
+            entry = self._data.get(inbound_event_id)
+        return entry[0] if entry is not None else None
+
     def mark_started(
         self, inbound_event_id: str, correlation_id: str | None, task_name: str | None
     ) -> None:
-        self._cleanup()
-        record = InboundProcessingRecord(
-            inbound_event_id=inbound_event_id,
-            correlation_id=correlation_id,
-            task_name=task_name,
-            started_at=datetime.now(tz=UTC),
-            finished_at=None,
-            enqueued_outbound=None,
-            error=None,
-        )
-        self._data[inbound_event_id] = (record, record.started_at.timestamp())
+        now = datetime.now(tz=UTC)
+        with self._lock:
+            self._cleanup()
+            record = self._record(inbound_event_id, now)
+            record.correlation_id = correlation_id or record.correlation_id
+            record.task_name = task_name or record.task_name
+            record.started_at = now
+            self._data[inbound_event_id] = (record, now.timestamp())
 
     def mark_finished(
         self,
@@ -77,27 +117,44 @@ class MemoryInboundProcessingLogStore(InboundProcessingLogStore):
         enqueued_outbound: bool,
         error: str | None = None,
     ) -> None:
-        self._cleanup()
-        started, _ = self._data.get(
+        now = datetime.now(tz=UTC)
+        with self._lock:
+            self._cleanup()
+            record = self._record(inbound_event_id, now)
+            record.correlation_id = correlation_id or record.correlation_id
+            record.task_name = task_name or record.task_name
+            record.finished_at = now
+            record.enqueued_outbound = enqueued_outbound
+            record.error = error
+            self._data[inbound_event_id] = (record, now.timestamp())
+
+    async def mark_started_async(
+        self, inbound_event_id: str, correlation_id: str | None, task_name: str | None
+    ) -> None:
+        self.mark_started(inbound_event_id, correlation_id, task_name)
+
+    async def mark_finished_async(
+        self,
+        inbound_event_id: str,
+        *,
+        correlation_id: str | None,
+        task_name: str | None,
+        enqueued_outbound: bool,
+        error: str | None = None,
+    ) -> None:
+        self.mark_finished(
             inbound_event_id,
-            (
-                InboundProcessingRecord(
-                    inbound_event_id,
-                    correlation_id,
-                    task_name,
-                    datetime.now(tz=UTC),
-                    None,
-                    None,
-                    None,
-                ),
-                datetime.now(tz=UTC).timestamp(),
-            ),
+            correlation_id=correlation_id,
+            task_name=task_name,
+            enqueued_outbound=enqueued_outbound,
+            error=error,
         )
-        finished = started
-        finished.finished_at = datetime.now(tz=UTC)
-        finished.enqueued_outbound = enqueued_outbound
-        finished.error = error
-        self._data[inbound_event_id] = (finished, finished.finished_at.timestamp())
+
+    def _record(self, inbound_event_id: str, now: datetime) -> InboundProcessingRecord:
+        entry = self._data.get(inbound_event_id)
+        if entry is not None:
+            return entry[0]
+        return InboundProcessingRecord(inbound_event_id, None, None, now, None, None, None)
 
     def _cleanup(self) -> None:
         now = datetime.now(tz=UTC).timestamp()
@@ -107,7 +164,7 @@ class MemoryInboundProcessingLogStore(InboundProcessingLogStore):
 
 
 class RedisInboundProcessingLogStore(InboundProcessingLogStore):
-    """Store baseado em Redis com TTL."""
+    """Store baseado em Redis com TTL (hash por evento, escritas atômicas)."""
 
     def __init__(
         self, redis_client: Any, *, ttl_seconds: int = 604800, key_prefix: str = "inbound:log:"
@@ -122,16 +179,18 @@ class RedisInboundProcessingLogStore(InboundProcessingLogStore):
     def mark_started(
         self, inbound_event_id: str, correlation_id: str | None, task_name: str | None
     ) -> None:
-        payload = {
-            "inbound_event_id": inbound_event_id,
-            "correlation_id": correlation_id,
-            "task_name": task_name,
-            "started_at": datetime.now(tz=UTC).isoformat(),
-            "finished_at": None,
-            "enqueued_outbound": None,
-            "error": None,
-        }
-        self._redis.set(self._key(inbound_event_id), json.dumps(payload), ex=self._ttl)
+        key = self._key(inbound_event_id)
+        fields = _present(
+            inbound_event_id=inbound_event_id,
+            correlation_id=correlation_id,
+            task_name=task_name,
+            started_at=datetime.now(tz=UTC).isoformat(),
+        )
+        # Início vai na hora (rastro de crash): um round trip, MULTI/EXEC
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, self._ttl)
+        pipe.execute()
 
     def mark_finished(
         self,
@@ -143,21 +202,33 @@ class RedisInboundProcessingLogStore(InboundProcessingLogStore):
         error: str | None = None,
     ) -> None:
         key = self._key(inbound_event_id)
-        existing_raw = self._redis.get(key)
-        if existing_raw and isinstance(existing_raw, bytes):
-            existing_raw = existing_raw.decode("utf-8")
-        base: Mapping[str, Any] = json.loads(existing_raw) if existing_raw else {}
-        payload = {
-            **base,
-            "inbound_event_id": inbound_event_id,
-            "correlation_id": correlation_id or base.get("correlation_id"),
-            "task_name": task_name or base.get("task_name"),
-            "started_at": base.get("started_at") or datetime.now(tz=UTC).isoformat(),
-            "finished_at": datetime.now(tz=UTC).isoformat(),
-            "enqueued_outbound": enqueued_outbound,
-            "error": error,
-        }
-        self._redis.set(key, json.dumps(payload), ex=self._ttl)
+        now = datetime.now(tz=UTC).isoformat()
+        fields = _present(
+            inbound_event_id=inbound_event_id,
+            correlation_id=correlation_id,
+            task_name=task_name,
+            finished_at=now,
+            enqueued_outbound="1" if enqueued_outbound else "0",
+            error=error,
+        )
+        commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = [
+            ("hset", (key,), {"mapping": fields}),
+            # Fim antes do início (entrega fora de ordem): início provisório
+            ("hsetnx", (key, "started_at", now), {}),
+            ("expire", (key, self._ttl), {}),
+        ]
+        if error is None:
+            commands.append(("hdel", (key, "error"), {}))
+
+        uow = current_unit_of_work()
+        if uow is not None:
+            for command, args, kwargs in commands:
+                uow.redis(self._redis, command, *args, **kwargs)
+            return
+        pipe = self._redis.pipeline(transaction=True)
+        for command, args, kwargs in commands:
+            getattr(pipe, command)(*args, **kwargs)
+        pipe.execute()
 
 
 class FirestoreInboundProcessingLogStore(InboundProcessingLogStore):
@@ -174,21 +245,20 @@ class FirestoreInboundProcessingLogStore(InboundProcessingLogStore):
         self._collection = collection
         self._ttl_seconds = ttl_seconds
 
+    def _expires_at(self) -> datetime:
+        return datetime.now(tz=UTC) + timedelta(seconds=self._ttl_seconds)
+
     def mark_started(
         self, inbound_event_id: str, correlation_id: str | None, task_name: str | None
     ) -> None:
-        expires_at = datetime.now(tz=UTC) + timedelta(seconds=self._ttl_seconds)
-        doc = {
-            "inbound_event_id": inbound_event_id,
-            "correlation_id": correlation_id,
-            "task_name": task_name,
-            "started_at": datetime.now(tz=UTC),
-            "finished_at": None,
-            "enqueued_outbound": None,
-            "error": None,
-            "expires_at": expires_at,
-        }
-        self._client.collection(self._collection).document(inbound_event_id).set(doc)
+        fields = _present(
+            inbound_event_id=inbound_event_id,
+            correlation_id=correlation_id,
+            task_name=task_name,
+            started_at=datetime.now(tz=UTC),
+            expires_at=self._expires_at(),
+        )
+        self._client.collection(self._collection).document(inbound_event_id).set(fields, merge=True)
 
     def mark_finished(
         self,
@@ -200,16 +270,28 @@ class FirestoreInboundProcessingLogStore(InboundProcessingLogStore):
         error: str | None = None,
     ) -> None:
         doc_ref = self._client.collection(self._collection).document(inbound_event_id)
-        doc_ref.set(
-            {
-                "correlation_id": correlation_id,
-                "task_name": task_name,
-                "finished_at": datetime.now(tz=UTC),
-                "enqueued_outbound": enqueued_outbound,
-                "error": error,
-            },
-            merge=True,
-        )
+        fields = {
+            **_present(
+                inbound_event_id=inbound_event_id,
+                correlation_id=correlation_id,
+                task_name=task_name,
+            ),
+            "finished_at": datetime.now(tz=UTC),
+            "enqueued_outbound": enqueued_outbound,
+            "error": error,
+            "expires_at": self._expires_at(),
+        }
+        # Início é gravado na hora (rastro de crash); o fim entra no commit do request
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.firestore_set(self._client, doc_ref, fields, merge=True)
+            return
+        doc_ref.set(fields, merge=True)
+
+
+def _present(**fields: Any) -> dict[str, Any]:
+    """Campos com valor: None não sobrescreve o que a outra marca gravou."""
+    return {name: value for name, value in fields.items() if value is not None}
 
 
 def create_inbound_log_store(
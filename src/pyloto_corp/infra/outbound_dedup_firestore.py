@@ -16,6 +16,7 @@ from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from pyloto_corp.domain.outbound_dedup import DedupeResult, OutboundDedupeError, OutboundDedupeStore
+from pyloto_corp.infra.unit_of_work import current_unit_of_work
 from pyloto_corp.observability.logging import get_logger
 
 if TYPE_CHECKING:
@@ -53,18 +54,26 @@ class FirestoreOutboundDedupeStore(OutboundDedupeStore):
         expire_at: datetime,
         status: str,
         error: str | None = None,
+        *,
+        deferrable: bool = False,
     ) -> None:
-        """Cria/atualiza entrada de dedupe."""
+        """Cria/atualiza entrada de dedupe.
+
+        Com `deferrable`, a escrita entra no batch da unit of work do request.
+        """
         now = datetime.now(tz=UTC)
-        doc_ref.set(
-            {
-                "message_id": message_id,
-                "timestamp": now,
-                "_ttl_expire_at": expire_at,
-                "status": status,
-                "error": error,
-            }
-        )
+        entry = {
+            "message_id": message_id,
+            "timestamp": now,
+            "_ttl_expire_at": expire_at,
+            "status": status,
+            "error": error,
+        }
+        uow = current_unit_of_work() if deferrable else None
+        if uow is not None:
+            uow.firestore_set(self._client, doc_ref, entry)
+            return
+        doc_ref.set(entry)
 
     def _handle_existing(
         self,
@@ -174,6 +183,7 @@ class FirestoreOutboundDedupeStore(OutboundDedupeStore):
                 expire_at=expire_at,
                 status="sent",
                 error=None,
+                deferrable=True,
             )
             return True
 
@@ -202,6 +212,7 @@ class FirestoreOutboundDedupeStore(OutboundDedupeStore):
                 expire_at=expire_at,
                 status="failed",
                 error=error,
+                deferrable=True,
             )
             return True
         except Exception as e:
@@ -11,13 +11,14 @@ Conforme regras_e_padroes.md (SRP, implementação isolada, zero-trust).
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
 from pyloto_corp.domain.outbound_dedup import DedupeResult, OutboundDedupeError, OutboundDedupeStore
+from pyloto_corp.infra.unit_of_work import current_unit_of_work
 from pyloto_corp.observability.logging import get_logger
+from pyloto_corp.utils import json_codec
 
 if TYPE_CHECKING:
     pass
@@ -53,7 +54,7 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
 
         try:
             now = datetime.now(tz=UTC)
-            value = json.dumps(
+            value = json_codec.dumps(
                 {
                     "message_id": message_id,
                     "timestamp": now.isoformat(),
@@ -77,7 +78,7 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
             if existing:
                 if isinstance(existing, bytes):
                     existing = existing.decode("utf-8")
-                data = json.loads(existing)
+                data = json_codec.loads(existing)
                 logger.debug(
                     "Outbound dedup hit (Redis)",
                     extra={"key_prefix": idempotency_key[:8] + "..."},
@@ -111,7 +112,7 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
                 return False
             if isinstance(existing, bytes):
                 existing = existing.decode("utf-8")
-            data = json.loads(existing)
+            data = json_codec.loads(existing)
             return data.get("status") == "sent"
         except Exception as e:
             logger.error(
@@ -132,7 +133,7 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
 
         try:
             now = datetime.now(tz=UTC)
-            value = json.dumps(
+            value = json_codec.dumps(
                 {
                     "message_id": message_id,
                     "timestamp": now.isoformat(),
@@ -142,7 +143,7 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
             )
 
             # Atualiza sempre, preservando TTL
-            self._redis.set(key, value, ex=ttl)
+            self._set(key, value, ttl)
             return True
 
         except Exception as e:
@@ -164,7 +165,7 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
 
         try:
             now = datetime.now(tz=UTC)
-            value = json.dumps(
+            value = json_codec.dumps(
                 {
                     "message_id": idempotency_key,
                     "timestamp": now.isoformat(),
@@ -172,7 +173,7 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
                     "error": error,
                 }
             )
-            self._redis.set(key, value, ex=ttl)
+            self._set(key, value, ttl)
             return True
         except Exception as e:
             logger.error(
@@ -181,6 +182,14 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
             )
             raise OutboundDedupeError(f"Redis unavailable: {e}") from e
 
+    def _set(self, key: str, value: str, ttl: int) -> None:
+        """SET cego: entra no pipeline da unit of work do request, se houver."""
+        uow = current_unit_of_work()
+        if uow is not None:
+            uow.redis(self._redis, "set", key, value, ex=ttl)
+            return
+        self._redis.set(key, value, ex=ttl)
+
     def get_status(self, idempotency_key: str) -> str | None:
         """Retorna status armazenado ou None."""
         key = f"{self._prefix}{idempotency_key}"
@@ -190,7 +199,7 @@ class RedisOutboundDedupeStore(OutboundDedupeStore):
                 return None
             if isinstance(existing, bytes):
                 existing = existing.decode("utf-8")
-            data = json.loads(existing)
+            data = json_codec.loads(existing)
             return data.get("status")
         except Exception as e:
             logger.error(
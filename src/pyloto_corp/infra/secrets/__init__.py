@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from .cached_provider import CachedSecretProvider
 from .env_provider import EnvSecretProvider
 from .factory import create_secret_provider, get_pepper_secret, get_whatsapp_secrets
 from .gcp_provider import SecretManagerProvider
@@ -7,6 +8,7 @@ from .protocol import SecretProvider
 
 __all__ = [
     "SecretProvider",
+    "CachedSecretProvider",
     "EnvSecretProvider",
     "SecretManagerProvider",
     "create_secret_provider",
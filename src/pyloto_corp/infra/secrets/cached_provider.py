@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+
+from pyloto_corp.ai.single_flight import SingleFlight
+from pyloto_corp.observability.logging import get_logger
+
+from .protocol import SecretProvider
+
+logger: logging.Logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class _CachedSecret:
+    value: str
+    fetched_at: float
+
+
+@dataclass(slots=True)
+class SecretCacheStats:
+    """Contadores do cache (nunca inclui valores)."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+
+class CachedSecretProvider:
+    """Decorator de SecretProvider com cache TTL e refresh em background.
+
+    - TTL por secret (`ttl_overrides`), padrão `ttl_seconds`
+    - Stale-while-revalidate: após o TTL e até `max_stale_seconds`, devolve o
+      valor em cache e recarrega em background (falha mantém o valor antigo)
+    - Single-flight em misses: chamadas simultâneas fazem UMA leitura
+    - `invalidate()` força nova leitura; `prefetch()` aquece no startup
+
+    Assim a leitura de secrets sai do caminho crítico das requests.
+    """
+
+    def __init__(
+        self,
+        provider: SecretProvider,
+        ttl_seconds: float = 300.0,
+        *,
+        ttl_overrides: Mapping[str, float] | None = None,
+        max_stale_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._provider = provider
+        self._ttl = ttl_seconds
+        self._ttl_overrides = dict(ttl_overrides or {})
+        self._max_stale = max_stale_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], _CachedSecret] = {}
+        self._refreshing: set[tuple[str, str]] = set()
+        self._single_flight = SingleFlight()
+        self.stats = SecretCacheStats()
+
+    def get_secret(self, name: str, version: str = "latest") -> str:
+        key = (name, version)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.fetched_at
+            ttl = self._ttl_overrides.get(name, self._ttl)
+            if age < ttl:
+                self.stats.hits += 1
+                return entry.value
+            if age < ttl + self._max_stale:
+                self.stats.stale_hits += 1
+                self._schedule_refresh(key)
+                return entry.value
+
+        self.stats.misses += 1
+        return self._single_flight.do(f"{name}@{version}", lambda: self._load(key))
+
+    def secret_exists(self, name: str) -> bool:
+        if any(cached_name == name for cached_name, _ in self._entries):
+            return True
+        return self._provider.secret_exists(name)
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Descarta o cache de `name` (todas as versões) ou de todos os secrets."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+
+    def prefetch(self, names: Iterable[str]) -> None:
+        """Carrega secrets no startup; ausentes são ignorados (RuntimeError)."""
+        for name in names:
+            try:
+                self.get_secret(name)
+            except RuntimeError:
+                logger.warning("Secret ausente no prefetch", extra={"secret_name": name})
+
+    def _load(self, key: tuple[str, str]) -> str:
+        value = self._provider.get_secret(*key)
+        with self._lock:
+            self._entries[key] = _CachedSecret(value=value, fetched_at=self._clock())
+        return value
+
+    def _schedule_refresh(self, key: tuple[str, str]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        threading.Thread(
+            target=self._refresh, args=(key,), name="secret-refresh", daemon=True
+        ).start()
+
+    def _refresh(self, key: tuple[str, str]) -> None:
+        try:
+            self._load(key)
+            self.stats.refreshes += 1
+        except Exception as exc:  # noqa: BLE001
+            self.stats.refresh_errors += 1
+            logger.warning(
+                "Falha no refresh de secret (mantendo valor em cache)",
+                extra={"secret_name": key[0], "error_type": type(exc).__name__},
+            )
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
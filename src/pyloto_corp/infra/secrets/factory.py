@@ -4,6 +4,7 @@ import logging
 
 from pyloto_corp.observability.logging import get_logger
 
+from .cached_provider import CachedSecretProvider
 from .env_provider import EnvSecretProvider
 from .gcp_provider import SecretManagerProvider
 from .protocol import SecretProvider
@@ -11,8 +12,18 @@ from .protocol import SecretProvider
 logger: logging.Logger = get_logger(__name__)
 
 
-def create_secret_provider(backend: str = "env", project_id: str | None = None) -> SecretProvider:
-    """Factory para criar o provider de secrets apropriado."""
+def create_secret_provider(
+    backend: str = "env",
+    project_id: str | None = None,
+    *,
+    cache_ttl_seconds: float = 0.0,
+    cache_max_stale_seconds: float = 3600.0,
+) -> SecretProvider:
+    """Factory para criar o provider de secrets apropriado.
+
+    Com `cache_ttl_seconds > 0`, o Secret Manager é envolvido por
+    `CachedSecretProvider` (env vars não precisam de cache).
+    """
     if backend == "env":
         logger.info("Usando EnvSecretProvider para secrets")
         return EnvSecretProvider()
@@ -22,7 +33,14 @@ def create_secret_provider(backend: str = "env", project_id: str | None = None)
             "Usando SecretManagerProvider para secrets",
             extra={"project_id": project_id},
         )
-        return SecretManagerProvider(project_id=project_id)
+        provider = SecretManagerProvider(project_id=project_id)
+        if cache_ttl_seconds > 0:
+            return CachedSecretProvider(
+                provider,
+                ttl_seconds=cache_ttl_seconds,
+                max_stale_seconds=cache_max_stale_seconds,
+            )
+        return provider
 
     raise ValueError(f"Backend de secrets não reconhecido: {backend}")
 
@@ -0,0 +1,352 @@
+"""Cache L1 em processo na frente do SessionStore (Redis/Firestore).
+
+Responsabilidades:
+- LRU limitado a `max_entries`, com expiração por TTL (staleness máxima)
+- Coerência por versão: o save otimista (`compare_and_set`) continua indo
+  ao backend; em conflito a entrada é invalidada e o reload seguinte lê o
+  backend (o merge do `SessionManager` nunca trabalha sobre a cópia do cache)
+- Política de escrita por backend:
+  - `through`: grava no backend e atualiza o cache (padrão)
+  - `behind`: grava só no cache e o backend recebe a última versão no
+    `flush()` (thread periódica, eviction e `close()` no shutdown) —
+    seguro apenas com um escritor por sessão (lease de sessão ativo)
+- Contadores de hit/miss/eviction para observabilidade
+- `AsyncCachedSessionStore`: mesma LRU na frente de um store assíncrono
+  (sempre write-through)
+
+O cache guarda e devolve cópias: o chamador pode mutar a sessão carregada
+sem corromper a entrada.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from pyloto_corp.infra.session_contract import SessionStore
+from pyloto_corp.infra.session_contract_async import AsyncSessionStore
+from pyloto_corp.infra.session_validations import ensure_terminal_outcome
+from pyloto_corp.observability.logging import get_logger
+
+if TYPE_CHECKING:
+    from pyloto_corp.application.session import SessionState
+    from pyloto_corp.config.settings import Settings
+
+logger: logging.Logger = get_logger(__name__)
+
+WRITE_POLICIES = ("through", "behind")
+
+
+@dataclass(slots=True)
+class SessionCacheStats:
+    """Contadores do cache L1."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    deferred_writes: int = 0
+    flushed_writes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    session: SessionState
+    expires_at: float
+    ttl_seconds: int = 7200
+    dirty: bool = False
+
+
+class _SessionLru:
+    """LRU + TTL de sessões compartilhado pelas variantes síncrona e assíncrona."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float],
+    ) -> None:
+        self._max_entries = max(max_entries, 1)
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.stats = SessionCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _fresh(self, entry: _Entry | None) -> bool:
+        return entry is not None and (entry.dirty or entry.expires_at > self._clock())
+
+    def _cached(self, session_id: str) -> SessionState | None:
+        """Cópia da entrada válida (conta hit) ou None (conta miss)."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if self._fresh(entry):
+                self._entries.move_to_end(session_id)
+                self.stats.hits += 1
+                return entry.session.model_copy(deep=True)
+            self.stats.misses += 1
+            return None
+
+    def _contains(self, session_id: str) -> bool:
+        with self._lock:
+            return self._fresh(self._entries.get(session_id))
+
+    def _remember(
+        self, session: SessionState, *, dirty: bool, ttl_seconds: int = 7200
+    ) -> list[_Entry]:
+        """Guarda uma cópia; retorna as entradas sujas expulsas pelo LRU."""
+        evicted: list[_Entry] = []
+        with self._lock:
+            self._entries[session.session_id] = _Entry(
+                session=session.model_copy(deep=True),
+                expires_at=self._clock() + self._ttl,
+                ttl_seconds=ttl_seconds,
+                dirty=dirty,
+            )
+            self._entries.move_to_end(session.session_id)
+            if dirty:
+                self.stats.deferred_writes += 1
+            while len(self._entries) > self._max_entries:
+                _, oldest = self._entries.popitem(last=False)
+                self.stats.evictions += 1
+                if oldest.dirty:
+                    evicted.append(oldest)
+        return evicted
+
+    def _forget(self, session_id: str) -> _Entry | None:
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self.stats.invalidations += 1
+            return entry
+
+
+class CachedSessionStore(_SessionLru, SessionStore):
+    """SessionStore com cache L1 (LRU + TTL) na frente de outro store."""
+
+    def __init__(
+        self,
+        inner: SessionStore,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float = 30.0,
+        write_policy: str = "through",
+        flush_interval_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if write_policy not in WRITE_POLICIES:
+            raise ValueError(f"write_policy inválida: {write_policy}")
+        super().__init__(max_entries, ttl_seconds, clock)
+        self._inner = inner
+        self._write_policy = write_policy
+
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+        if write_policy == "behind" and flush_interval_seconds > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                args=(flush_interval_seconds,),
+                name="session-cache-flush",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    @property
+    def write_policy(self) -> str:
+        return self._write_policy
+
+    # ---- leitura -------------------------------------------------------
+
+    def load(self, session_id: str) -> SessionState | None:
+        cached = self._cached(session_id)
+        if cached is not None:
+            return cached
+
+        session = self._inner.load(session_id)
+        if session is not None:
+            self._put(session, dirty=False)
+        return session
+
+    def exists(self, session_id: str) -> bool:
+        return self._contains(session_id) or self._inner.exists(session_id)
+
+    # ---- escrita -------------------------------------------------------
+
+    def save(self, session: SessionState, ttl_seconds: int = 7200) -> None:
+        if self._write_policy == "behind":
+            ensure_terminal_outcome(session)
+            self._put(session, dirty=True, ttl_seconds=ttl_seconds)
+            return
+        self._inner.save(session, ttl_seconds)
+        self._put(session, dirty=False)
+
+    def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        if self._write_policy == "behind":
+            # Versão no cache = última versão gravada no backend (o flush a avança)
+            with self._lock:
+                entry = self._entries.get(session.session_id)
+                if entry is not None and entry.session.version != session.version:
+                    return False
+            ensure_terminal_outcome(session)
+            self._put(session, dirty=True, ttl_seconds=ttl_seconds)
+            return True
+
+        if not self._inner.compare_and_set(session, ttl_seconds):
+            self.invalidate(session.session_id)
+            return False
+        self._put(session, dirty=False)
+        return True
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            cached = self._entries.pop(session_id, None)
+        deleted = self._inner.delete(session_id)
+        return deleted or (cached is not None and cached.dirty)
+
+    def invalidate(self, session_id: str) -> None:
+        """Descarta a entrada (escrita pendente é gravada antes)."""
+        entry = self._forget(session_id)
+        if entry is not None and entry.dirty:
+            self._write_back(entry)
+
+    # ---- write-behind --------------------------------------------------
+
+    def flush(self) -> int:
+        """Grava no backend as entradas pendentes; retorna quantas gravou."""
+        with self._lock:
+            pending = [entry for entry in self._entries.values() if entry.dirty]
+            for entry in pending:
+                entry.dirty = False
+        written = 0
+        for entry in pending:
+            try:
+                written += self._write_back(entry)
+            except Exception as exc:  # noqa: BLE001 - continua pendente
+                entry.dirty = True
+                logger.warning("session_cache_flush_failed", extra={"error": type(exc).__name__})
+        return written
+
+    def close(self) -> None:
+        """Para a thread de flush e grava o que estiver pendente."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def _write_back(self, entry: _Entry) -> bool:
+        session = entry.session.model_copy(deep=True)
+        if not self._inner.compare_and_set(session, entry.ttl_seconds):
+            # Outro escritor gravou no meio: a versão local é descartada
+            logger.warning(
+                "session_cache_write_behind_conflict",
+                extra={"session_id": session.session_id[:8] + "..."},
+            )
+            with self._lock:
+                if self._entries.get(session.session_id) is entry:
+                    del self._entries[session.session_id]
+            return False
+        with self._lock:
+            # Entrada atual (a gravada ou uma mais nova da mesma base) segue a versão
+            current = self._entries.get(session.session_id)
+            if current is not None and current.session.version == session.version - 1:
+                current.session.version = session.version
+            self.stats.flushed_writes += 1
+        return True
+
+    # ---- LRU -----------------------------------------------------------
+
+    def _put(self, session: SessionState, *, dirty: bool, ttl_seconds: int = 7200) -> None:
+        for entry in self._remember(session, dirty=dirty, ttl_seconds=ttl_seconds):
+            self._write_back(entry)
+
+
+class AsyncCachedSessionStore(_SessionLru, AsyncSessionStore):
+    """Variante assíncrona do cache L1, sempre write-through.
+
+    Sem thread de flush no event loop: toda escrita vai ao backend e o
+    cache só economiza leituras (`load`/`exists`).
+    """
+
+    def __init__(
+        self,
+        inner: AsyncSessionStore,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(max_entries, ttl_seconds, clock)
+        self._inner = inner
+
+    async def load(self, session_id: str) -> SessionState | None:
+        cached = self._cached(session_id)
+        if cached is not None:
+            return cached
+
+        session = await self._inner.load(session_id)
+        if session is not None:
+            self._remember(session, dirty=False)
+        return session
+
+    async def exists(self, session_id: str) -> bool:
+        return self._contains(session_id) or await self._inner.exists(session_id)
+
+    async def save(self, session: SessionState, ttl_seconds: int = 7200) -> None:
+        await self._inner.save(session, ttl_seconds)
+        self._remember(session, dirty=False)
+
+    async def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        if not await self._inner.compare_and_set(session, ttl_seconds):
+            self._forget(session.session_id)
+            return False
+        self._remember(session, dirty=False)
+        return True
+
+    async def delete(self, session_id: str) -> bool:
+        with self._lock:
+            self._entries.pop(session_id, None)
+        return await self._inner.delete(session_id)
+
+
+def wrap_session_store(store: SessionStore, settings: Settings, backend: str) -> SessionStore:
+    """Aplica o cache L1 conforme settings (store original se desabilitado)."""
+    backend_normalized = backend.lower()
+    if not settings.session_cache_enabled or backend_normalized == "memory":
+        return store
+    return CachedSessionStore(
+        store,
+        max_entries=settings.session_cache_max_entries,
+        ttl_seconds=settings.session_cache_ttl_seconds,
+        write_policy=settings.session_cache_write_policies.get(backend_normalized, "through"),
+        flush_interval_seconds=settings.session_cache_flush_interval_seconds,
+    )
+
+
+def wrap_async_session_store(
+    store: AsyncSessionStore, settings: Settings, backend: str
+) -> AsyncSessionStore:
+    """Versão assíncrona de `wrap_session_store` (write-through em qualquer backend)."""
+    if not settings.session_cache_enabled or backend.lower() == "memory":
+        return store
+    return AsyncCachedSessionStore(
+        store,
+        max_entries=settings.session_cache_max_entries,
+        ttl_seconds=settings.session_cache_ttl_seconds,
+    )
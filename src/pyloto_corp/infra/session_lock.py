@@ -0,0 +1,375 @@
+"""Lock distribuído de sessão com lease, renovação e espera com backoff.
+
+Responsabilidades:
+- Backends de lock: Redis (`SET NX PX` + token, release/renew via Lua),
+  Firestore (documento de lease com precondição `update_time`) e memória
+- `SessionLeaseManager`: adquire com espera limitada (backoff exponencial
+  com jitter), renova o lease em background durante estágios LLM longos e
+  libera ao final — versões síncrona (thread) e assíncrona (task)
+
+Garante que o read-modify-write da sessão (load → LLM → save) de um mesmo
+usuário rode em uma instância por vez, mesmo com Cloud Tasks entregando
+mensagens simultâneas a instâncias diferentes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from pyloto_corp.domain.protocols.session_lock import (
+    SessionLockError,
+    SessionLockProtocol,
+    SessionLockTimeoutError,
+)
+from pyloto_corp.observability.logging import get_logger
+
+if TYPE_CHECKING:
+    from pyloto_corp.config.settings import Settings
+
+logger: logging.Logger = get_logger(__name__)
+
+# Release/renew somente se o token ainda for do dono do lease
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+_RENEW_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class InMemorySessionLock(SessionLockProtocol):
+    """Lock em memória (dev/testes; não coordena instâncias)."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._leases: dict[str, tuple[str, float]] = {}
+
+    def try_acquire(self, key: str, token: str, ttl_ms: int) -> bool:
+        now = self._clock()
+        with self._lock:
+            current = self._leases.get(key)
+            if current is not None and current[1] > now:
+                return False
+            self._leases[key] = (token, now + ttl_ms / 1000)
+            return True
+
+    def renew(self, key: str, token: str, ttl_ms: int) -> bool:
+        now = self._clock()
+        with self._lock:
+            current = self._leases.get(key)
+            if current is None or current[0] != token or current[1] <= now:
+                return False
+            self._leases[key] = (token, now + ttl_ms / 1000)
+            return True
+
+    def release(self, key: str, token: str) -> bool:
+        with self._lock:
+            current = self._leases.get(key)
+            if current is None or current[0] != token:
+                return False
+            del self._leases[key]
+            return True
+
+
+class RedisSessionLock(SessionLockProtocol):
+    """Lock via Redis: `SET NX PX` com token; release/renew atômicos (Lua)."""
+
+    def __init__(self, redis_client: Any, key_prefix: str = "session_lock") -> None:
+        self._redis = redis_client
+        self._prefix = key_prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    def try_acquire(self, key: str, token: str, ttl_ms: int) -> bool:
+        return bool(self._redis.set(self._key(key), token, nx=True, px=ttl_ms))
+
+    def renew(self, key: str, token: str, ttl_ms: int) -> bool:
+        return bool(self._redis.eval(_RENEW_SCRIPT, 1, self._key(key), token, ttl_ms))
+
+    def release(self, key: str, token: str) -> bool:
+        return bool(self._redis.eval(_RELEASE_SCRIPT, 1, self._key(key), token))
+
+
+class FirestoreSessionLock(SessionLockProtocol):
+    """Lease em Firestore: `create()` para lease novo; lease expirado ou
+    renovação só com precondição de `update_time` (sem corrida entre instâncias).
+    """
+
+    def __init__(self, firestore_client: Any, collection: str = "session_locks") -> None:
+        self._client = firestore_client
+        self._collection = collection
+
+    def _doc(self, key: str) -> Any:
+        return self._client.collection(self._collection).document(key)
+
+    @staticmethod
+    def _lease_fields(token: str, ttl_ms: int) -> dict[str, Any]:
+        return {"token": token, "expires_at": datetime.now(tz=UTC) + timedelta(milliseconds=ttl_ms)}
+
+    def _conditional(self, snapshot: Any) -> Any:
+        return self._client.write_option(last_update_time=snapshot.update_time)
+
+    def try_acquire(self, key: str, token: str, ttl_ms: int) -> bool:
+        from google.api_core import exceptions as gcp_exceptions
+
+        doc_ref = self._doc(key)
+        try:
+            doc_ref.create(self._lease_fields(token, ttl_ms))
+            return True
+        except (gcp_exceptions.Conflict, gcp_exceptions.AlreadyExists):
+            pass
+
+        snapshot = doc_ref.get()
+        if not snapshot.exists:
+            return False  # liberado entre as chamadas: próxima tentativa cria
+        expires_at = (snapshot.to_dict() or {}).get("expires_at")
+        if isinstance(expires_at, datetime) and expires_at > datetime.now(tz=UTC):
+            return False
+        try:
+            doc_ref.update(self._lease_fields(token, ttl_ms), option=self._conditional(snapshot))
+            return True
+        except (gcp_exceptions.FailedPrecondition, gcp_exceptions.NotFound):
+            return False
+
+    def renew(self, key: str, token: str, ttl_ms: int) -> bool:
+        from google.api_core import exceptions as gcp_exceptions
+
+        doc_ref = self._doc(key)
+        snapshot = doc_ref.get()
+        if not snapshot.exists or (snapshot.to_dict() or {}).get("token") != token:
+            return False
+        try:
+            doc_ref.update(self._lease_fields(token, ttl_ms), option=self._conditional(snapshot))
+            return True
+        except (gcp_exceptions.FailedPrecondition, gcp_exceptions.NotFound):
+            return False
+
+    def release(self, key: str, token: str) -> bool:
+        from google.api_core import exceptions as gcp_exceptions
+
+        doc_ref = self._doc(key)
+        snapshot = doc_ref.get()
+        if not snapshot.exists or (snapshot.to_dict() or {}).get("token") != token:
+            return False
+        try:
+            doc_ref.delete(option=self._conditional(snapshot))
+            return True
+        except (gcp_exceptions.FailedPrecondition, gcp_exceptions.NotFound):
+            return False
+
+
+@dataclass(slots=True)
+class SessionLease:
+    """Lease em posse do chamador; `lost` indica que a renovação falhou."""
+
+    key: str
+    token: str
+    lost: bool = False
+
+
+class SessionLeaseManager:
+    """Adquire, renova e libera leases de sessão.
+
+    - Espera limitada a `wait_timeout_seconds`, com backoff exponencial e
+      jitter entre `initial_backoff_seconds` e `max_backoff_seconds`
+    - Renova a cada `ttl_ms / 3` enquanto o bloco executa; se a renovação
+      falhar, marca `lease.lost` (o save seguinte deve tratar o conflito)
+    - Erros do backend na liberação são logados; o lease expira pelo TTL
+    """
+
+    def __init__(
+        self,
+        lock: SessionLockProtocol,
+        *,
+        ttl_ms: int = 15_000,
+        wait_timeout_seconds: float = 10.0,
+        initial_backoff_seconds: float = 0.05,
+        max_backoff_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._lock = lock
+        self._ttl_ms = ttl_ms
+        self._wait_timeout = wait_timeout_seconds
+        self._initial_backoff = initial_backoff_seconds
+        self._max_backoff = max_backoff_seconds
+        self._clock = clock
+
+    @property
+    def renew_interval_seconds(self) -> float:
+        return self._ttl_ms / 3000
+
+    def _backoffs(self) -> Iterator[float]:
+        delay = self._initial_backoff
+        while True:
+            yield random.uniform(delay / 2, delay)
+            delay = min(delay * 2, self._max_backoff)
+
+    def _timeout(self, key: str) -> SessionLockTimeoutError:
+        logger.warning("session_lease_wait_timeout", extra={"session_key": key[:8] + "..."})
+        return SessionLockTimeoutError(f"lease de sessão não obtido em {self._wait_timeout}s")
+
+    def acquire(self, key: str) -> SessionLease:
+        """Adquire o lease (bloqueante) ou levanta `SessionLockTimeoutError`."""
+        token = uuid.uuid4().hex
+        deadline = self._clock() + self._wait_timeout
+        for delay in self._backoffs():
+            if self._lock.try_acquire(key, token, self._ttl_ms):
+                return SessionLease(key=key, token=token)
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                raise self._timeout(key)
+            time.sleep(min(delay, remaining))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def acquire_async(self, key: str) -> SessionLease:
+        """Versão assíncrona de `acquire` (chamadas ao backend em thread)."""
+        token = uuid.uuid4().hex
+        deadline = self._clock() + self._wait_timeout
+        for delay in self._backoffs():
+            if await asyncio.to_thread(self._lock.try_acquire, key, token, self._ttl_ms):
+                return SessionLease(key=key, token=token)
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                raise self._timeout(key)
+            await asyncio.sleep(min(delay, remaining))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _renew(self, lease: SessionLease) -> bool:
+        try:
+            renewed = self._lock.renew(lease.key, lease.token, self._ttl_ms)
+        except Exception as exc:  # noqa: BLE001 - tenta de novo no próximo ciclo
+            logger.warning("session_lease_renew_error", extra={"error": type(exc).__name__})
+            return True
+        if not renewed:
+            lease.lost = True
+            logger.warning("session_lease_lost", extra={"session_key": lease.key[:8] + "..."})
+        return renewed
+
+    def _release(self, lease: SessionLease) -> None:
+        try:
+            self._lock.release(lease.key, lease.token)
+        except Exception as exc:  # noqa: BLE001 - lease expira pelo TTL
+            logger.warning("session_lease_release_failed", extra={"error": type(exc).__name__})
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[SessionLease]:
+        """Mantém o lease de `key` durante o bloco (renovação em thread)."""
+        lease = self.acquire(key)
+        stop = threading.Event()
+
+        def renew_loop() -> None:
+            while not stop.wait(self.renew_interval_seconds):
+                if not self._renew(lease):
+                    return
+
+        renewer = threading.Thread(target=renew_loop, name="session-lease-renew", daemon=True)
+        renewer.start()
+        try:
+            yield lease
+        finally:
+            stop.set()
+            renewer.join()
+            self._release(lease)
+
+    @asynccontextmanager
+    async def hold_async(self, key: str) -> AsyncIterator[SessionLease]:
+        """Mantém o lease de `key` durante o bloco (renovação em task)."""
+        lease = await self.acquire_async(key)
+
+        async def renew_loop() -> None:
+            while True:
+                await asyncio.sleep(self.renew_interval_seconds)
+                if not await asyncio.to_thread(self._renew, lease):
+                    return
+
+        renewer = asyncio.create_task(renew_loop())
+        try:
+            yield lease
+        finally:
+            renewer.cancel()
+            await asyncio.gather(renewer, return_exceptions=True)
+            await asyncio.to_thread(self._release, lease)
+
+
+def create_session_lock(
+    backend: str,
+    *,
+    client: object | None = None,
+    collection: str = "session_locks",
+) -> SessionLockProtocol:
+    """Cria o lock de sessão (memory | redis | firestore)."""
+    backend_normalized = backend.lower()
+
+    if backend_normalized == "memory":
+        return InMemorySessionLock()
+
+    if backend_normalized == "redis":
+        if client is None:
+            raise SessionLockError("Redis client é obrigatório para lock redis")
+        return RedisSessionLock(client)
+
+    if backend_normalized == "firestore":
+        if client is None:
+            raise SessionLockError("Firestore client é obrigatório para lock firestore")
+        return FirestoreSessionLock(client, collection=collection)
+
+    raise SessionLockError(f"Backend de lock de sessão não suportado: {backend}")
+
+
+def _client_from_settings(settings: Settings, backend: str) -> object | None:
+    """Cliente Redis/Firestore do lock quando o chamador não compartilha um."""
+    if backend == "redis":
+        if not settings.redis_url:
+            raise SessionLockError("REDIS_URL é obrigatório quando session_lock_backend=redis")
+        import redis
+
+        return redis.from_url(settings.redis_url, decode_responses=True)
+
+    if backend == "firestore":
+        from google.cloud import firestore
+
+        return firestore.Client(
+            project=settings.firestore_project_id or settings.gcp_project,
+            database=settings.firestore_database_id,
+        )
+
+    return None
+
+
+def create_session_lease_manager(
+    settings: Settings, *, client: object | None = None
+) -> SessionLeaseManager | None:
+    """Lease manager conforme `session_lock_backend` (None quando `none`).
+
+    Sem `client`, backends redis/firestore criam o próprio cliente a partir
+    das settings; a app passa o cliente já compartilhado pelos stores.
+    """
+    backend = settings.session_lock_backend.lower()
+    if backend == "none":
+        return None
+    if client is None:
+        client = _client_from_settings(settings, backend)
+    return SessionLeaseManager(
+        create_session_lock(backend, client=client),
+        ttl_ms=settings.session_lock_ttl_ms,
+        wait_timeout_seconds=settings.session_lock_wait_seconds,
+    )
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from pyloto_corp.infra.session_contract import SessionStore, SessionStoreError
 from pyloto_corp.infra.session_validations import ensure_terminal_outcome
@@ -30,6 +30,59 @@ def _parse_expire_at(raw_expire_at: datetime | str | None) -> datetime | None:
         return None
 
 
+def _versioned_payload(session: SessionState, expire_at: datetime) -> dict[str, Any]:
+    payload = session.model_dump(mode="json")
+    payload["version"] = session.version + 1
+    payload["_ttl_expire_at"] = expire_at
+    return payload
+
+
+def _stored_version(snapshot: Any) -> int | None:
+    """Versão persistida no snapshot (None: ausente ou expirado)."""
+    if not snapshot.exists:
+        return None
+    data = snapshot.to_dict() or {}
+    expire_at = _parse_expire_at(data.get("_ttl_expire_at"))
+    if expire_at and datetime.now(tz=UTC) > expire_at:
+        return None
+    return int(data.get("version") or 0)
+
+
+def firestore_compare_and_set(
+    client: Any, doc_ref: Any, session: SessionState, ttl_seconds: int
+) -> bool:
+    """CAS do documento de sessão.
+
+    Documento novo via `create()`; existente via `update()` de todos os campos
+    com precondição `update_time` do snapshot lido (outro escritor entre a
+    leitura e a escrita faz a precondição falhar).
+    """
+    from google.api_core import exceptions as gcp_exceptions
+
+    expire_at = datetime.now(tz=UTC) + timedelta(seconds=ttl_seconds)
+    payload = _versioned_payload(session, expire_at)
+    snapshot = doc_ref.get()
+    stored = _stored_version(snapshot)
+
+    try:
+        if not snapshot.exists:
+            doc_ref.create(payload)
+        elif stored is not None and stored != session.version:
+            return False
+        else:
+            option = client.write_option(last_update_time=snapshot.update_time)
+            doc_ref.update(payload, option=option)
+    except (
+        gcp_exceptions.Conflict,
+        gcp_exceptions.AlreadyExists,
+        gcp_exceptions.FailedPrecondition,
+        gcp_exceptions.NotFound,
+    ):
+        return False
+    session.version += 1
+    return True
+
+
 class FirestoreSessionStore(SessionStore):
     """Armazenamento de sessão em Firestore.
 
@@ -47,9 +100,9 @@ class FirestoreSessionStore(SessionStore):
         expire_at = datetime.now(tz=UTC) + timedelta(seconds=ttl_seconds)
 
         try:
-            payload = session.model_dump(mode="json")
-            payload["_ttl_expire_at"] = expire_at
+            payload = _versioned_payload(session, expire_at)
             doc_ref.set(payload)
+            session.version += 1
             logger.debug(
                 "Session saved (Firestore)",
                 extra={"session_id": session.session_id[:8] + "...", "ttl_seconds": ttl_seconds},
@@ -61,6 +114,26 @@ class FirestoreSessionStore(SessionStore):
             )
             raise SessionStoreError(f"Firestore save failed: {e}") from e
 
+    def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        ensure_terminal_outcome(session)
+        doc_ref = self._client.collection(self._collection).document(session.session_id)
+
+        try:
+            written = firestore_compare_and_set(self._client, doc_ref, session, ttl_seconds)
+        except Exception as e:  # pragma: no cover - log + wrap
+            logger.error(
+                "Failed to save session to Firestore",
+                extra={"session_id": session.session_id[:8] + "...", "error": str(e)},
+            )
+            raise SessionStoreError(f"Firestore save failed: {e}") from e
+
+        if not written:
+            logger.info(
+                "session_version_conflict",
+                extra={"session_id": session.session_id[:8] + "...", "version": session.version},
+            )
+        return written
+
     def load(self, session_id: str) -> SessionState | None:
         doc_ref = self._client.collection(self._collection).document(session_id)
 
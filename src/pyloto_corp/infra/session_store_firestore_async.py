@@ -9,6 +9,7 @@ from pyloto_corp.infra.session_contract_async import (
     AsyncSessionStore,
     AsyncSessionStoreError,
 )
+from pyloto_corp.infra.session_store_firestore import firestore_compare_and_set
 from pyloto_corp.infra.session_validations import ensure_terminal_outcome
 from pyloto_corp.observability.logging import get_logger
 
@@ -37,8 +38,10 @@ class AsyncFirestoreSessionStore(AsyncSessionStore):
 
         try:
             payload = session.model_dump(mode="json")
+            payload["version"] = session.version + 1
             payload["_ttl_expire_at"] = expire_at
             doc_ref.set(payload)
+            session.version += 1
             logger.debug(
                 "session_saved_firestore",
                 extra={
@@ -53,6 +56,27 @@ class AsyncFirestoreSessionStore(AsyncSessionStore):
             )
             raise AsyncSessionStoreError(f"Failed to save session to Firestore: {e}") from e
 
+    async def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        """Save condicionado à versão lida (False em conflito)."""
+        ensure_terminal_outcome(session)
+        doc_ref = self._client.collection(self._collection).document(session.session_id)
+
+        try:
+            written = firestore_compare_and_set(self._client, doc_ref, session, ttl_seconds)
+        except Exception as e:
+            logger.error(
+                "failed_save_firestore",
+                extra={"session_id": session.session_id[:8] + "...", "error": str(e)},
+            )
+            raise AsyncSessionStoreError(f"Failed to save session to Firestore: {e}") from e
+
+        if not written:
+            logger.info(
+                "session_version_conflict",
+                extra={"session_id": session.session_id[:8] + "...", "version": session.version},
+            )
+        return written
+
     async def load(self, session_id: str) -> SessionState | None:
         """Carrega sessão de Firestore (assíncrono)."""
         try:
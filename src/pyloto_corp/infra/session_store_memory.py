@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
@@ -21,16 +22,33 @@ class InMemorySessionStore(SessionStore):
 
     def __init__(self) -> None:
         self._sessions: dict[str, tuple[SessionState, float]] = {}
+        self._lock = threading.Lock()
 
     def save(self, session: SessionState, ttl_seconds: int = 7200) -> None:
         ensure_terminal_outcome(session)
-        expire_at = datetime.now(tz=UTC).timestamp() + ttl_seconds
-        self._sessions[session.session_id] = (session, expire_at)
+        with self._lock:
+            self._store(session, ttl_seconds)
         logger.debug(
             "Session saved (in-memory)",
             extra={"session_id": session.session_id[:8] + "...", "ttl_seconds": ttl_seconds},
         )
 
+    def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        ensure_terminal_outcome(session)
+        with self._lock:
+            current = self._sessions.get(session.session_id)
+            now = datetime.now(tz=UTC).timestamp()
+            if current is not None and current[1] > now and current[0].version != session.version:
+                return False
+            self._store(session, ttl_seconds)
+        return True
+
+    def _store(self, session: SessionState, ttl_seconds: int) -> None:
+        # Cópia: sem ela, load e o chamador dividem o objeto e o CAS nunca conflita
+        session.version += 1
+        expire_at = datetime.now(tz=UTC).timestamp() + ttl_seconds
+        self._sessions[session.session_id] = (session.model_copy(deep=True), expire_at)
+
     def load(self, session_id: str) -> SessionState | None:
         if session_id not in self._sessions:
             logger.debug(
@@ -51,7 +69,7 @@ class InMemorySessionStore(SessionStore):
             return None
 
         logger.debug("Session loaded (in-memory)", extra={"session_id": session_id[:8] + "..."})
-        return session
+        return session.model_copy(deep=True)
 
     def delete(self, session_id: str) -> bool:
         if session_id in self._sessions:
@@ -14,6 +14,21 @@ if TYPE_CHECKING:
 
 logger: logging.Logger = get_logger(__name__)
 
+# CAS atômico: grava só se a versão persistida for a esperada (chave ausente
+# ou expirada não tem concorrente). Lua evita o round-trip extra do WATCH/MULTI.
+_CAS_SCRIPT = """
+local current = redis.call("GET", KEYS[1])
+if current then
+    local ok, doc = pcall(cjson.decode, current)
+    local version = ok and tonumber(doc["version"]) or 0
+    if version ~= tonumber(ARGV[1]) then
+        return 0
+    end
+end
+redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+return 1
+"""
+
 
 class RedisSessionStore(SessionStore):
     """Armazenamento em Redis (Upstash) para produção."""
@@ -24,10 +39,11 @@ class RedisSessionStore(SessionStore):
     def save(self, session: SessionState, ttl_seconds: int = 7200) -> None:
         ensure_terminal_outcome(session)
         key = f"session:{session.session_id}"
-        payload = session.model_dump_json()
+        payload = _next_version_json(session)
 
         try:
             self._redis.setex(key, ttl_seconds, payload)
+            session.version += 1
             logger.debug(
                 "Session saved (Redis)",
                 extra={"session_id": session.session_id[:8] + "...", "ttl_seconds": ttl_seconds},
@@ -39,6 +55,29 @@ class RedisSessionStore(SessionStore):
             )
             raise SessionStoreError(f"Redis save failed: {e}") from e
 
+    def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        ensure_terminal_outcome(session)
+        key = f"session:{session.session_id}"
+        payload = _next_version_json(session)
+
+        try:
+            written = self._redis.eval(_CAS_SCRIPT, 1, key, session.version, payload, ttl_seconds)
+        except Exception as e:  # pragma: no cover - log + wrap
+            logger.error(
+                "Failed to save session to Redis",
+                extra={"session_id": session.session_id[:8] + "...", "error": str(e)},
+            )
+            raise SessionStoreError(f"Redis save failed: {e}") from e
+
+        if not written:
+            logger.info(
+                "session_version_conflict",
+                extra={"session_id": session.session_id[:8] + "...", "version": session.version},
+            )
+            return False
+        session.version += 1
+        return True
+
     def load(self, session_id: str) -> SessionState | None:
         key = f"session:{session_id}"
 
@@ -93,3 +132,7 @@ class RedisSessionStore(SessionStore):
                 extra={"session_id": session_id[:8] + "...", "error": str(e)},
             )
             return False
+
+
+def _next_version_json(session: SessionState) -> str:
+    return session.model_copy(update={"version": session.version + 1}).model_dump_json()
@@ -0,0 +1,163 @@
+"""Single-flight distribuído via Redis para chamadas LLM idênticas.
+
+Responsabilidades:
+- Coalescer localmente (SingleFlight em memória) antes de ir ao Redis
+- Eleger um líder entre instâncias com `SET NX PX` + token
+- Publicar o resultado (JSON) numa chave do voo (`result:<key>:<token>`),
+  que só os seguidores que viram o lock daquele voo conhecem
+- Liberar o lock apenas se o token ainda for do líder (script Lua)
+
+Seguidores aguardam até `wait_timeout_seconds`; se o líder falhar (lock some
+sem resultado) ou o prazo estourar, executam a chamada localmente. Não é
+cache: uma chamada que chega depois do voo terminar elege novo líder e
+executa de novo (o TTL do resultado só cobre seguidores atrasados).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from pyloto_corp.ai.single_flight import SingleFlight, SingleFlightStats
+from pyloto_corp.observability.logging import get_logger
+
+if TYPE_CHECKING:
+    from pyloto_corp.config.settings import Settings
+
+logger: logging.Logger = get_logger(__name__)
+
+# Libera o lock somente se o token ainda pertencer ao líder
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisSingleFlight:
+    """Single-flight entre instâncias Cloud Run (resultados JSON-serializáveis)."""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        lock_ttl_ms: int = 20_000,
+        result_ttl_seconds: int = 10,
+        wait_timeout_seconds: float = 20.0,
+        poll_interval_seconds: float = 0.05,
+        key_prefix: str = "llm_sf",
+    ) -> None:
+        self._redis = redis_client
+        self._local = SingleFlight()
+        self._lock_ttl_ms = lock_ttl_ms
+        self._result_ttl = result_ttl_seconds
+        self._wait_timeout = wait_timeout_seconds
+        self._poll_interval = poll_interval_seconds
+        self._prefix = key_prefix
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self._local.stats
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        return self._local.do(key, lambda: self._do_distributed(key, fn))
+
+    def _do_distributed(self, key: str, fn: Callable[[], Any]) -> Any:
+        lock_key = f"{self._prefix}:lock:{key}"
+        token = uuid.uuid4().hex
+        try:
+            flight = self._join_flight(lock_key, token)
+        except Exception as exc:  # noqa: BLE001 - Redis indisponível não bloqueia LLM
+            logger.warning("llm_single_flight_redis_error", extra={"error": type(exc).__name__})
+            return fn()
+
+        if flight is None:
+            # Voos terminando em sequência: não vale seguir tentando eleger
+            return fn()
+        result_key = f"{self._prefix}:result:{key}:{flight}"
+        if flight == token:
+            return self._run_as_leader(lock_key, result_key, token, fn)
+
+        try:
+            waited = self._wait_for_leader(lock_key, result_key, flight)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("llm_single_flight_redis_error", extra={"error": type(exc).__name__})
+            waited = None
+        return waited if waited is not None else fn()
+
+    def _join_flight(self, lock_key: str, token: str, attempts: int = 2) -> str | None:
+        """Token do voo em andamento (o próprio `token` quando vira líder)."""
+        for _ in range(attempts):
+            if self._redis.set(lock_key, token, nx=True, px=self._lock_ttl_ms):
+                return token
+            current = self._redis.get(lock_key)
+            if current is not None:
+                return current.decode("utf-8") if isinstance(current, bytes) else current
+        return None
+
+    def _run_as_leader(self, lock_key: str, result_key: str, token: str, fn: Callable) -> Any:
+        try:
+            result = fn()
+            try:
+                self._redis.set(result_key, json.dumps(result), ex=self._result_ttl)
+            except (TypeError, ValueError):
+                logger.debug("llm_single_flight_result_not_serializable")
+            except Exception as exc:  # noqa: BLE001 - seguidores caem no próprio timeout
+                logger.warning(
+                    "llm_single_flight_publish_failed", extra={"error": type(exc).__name__}
+                )
+            return result
+        finally:
+            try:
+                self._redis.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+            except Exception as exc:  # noqa: BLE001 - lock expira pelo TTL
+                logger.warning(
+                    "llm_single_flight_release_failed", extra={"error": type(exc).__name__}
+                )
+
+    def _wait_for_leader(self, lock_key: str, result_key: str, flight: str) -> Any | None:
+        deadline = time.monotonic() + self._wait_timeout
+        while time.monotonic() < deadline:
+            result = self._read_result(result_key)
+            if result is not None:
+                return result
+            current = self._redis.get(lock_key)
+            if isinstance(current, bytes):
+                current = current.decode("utf-8")
+            if current != flight:
+                # Líder terminou: última leitura evita corrida com a publicação
+                return self._read_result(result_key)
+            time.sleep(self._poll_interval)
+        logger.warning("llm_single_flight_wait_timeout")
+        return None
+
+    def _read_result(self, result_key: str) -> Any | None:
+        raw = self._redis.get(result_key)
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return json.loads(raw)
+
+
+def create_llm_single_flight_from_settings(
+    settings: Settings, redis_client: Any | None = None
+) -> SingleFlight | RedisSingleFlight | None:
+    """Cria single-flight conforme `LLM_SINGLE_FLIGHT_BACKEND` (memory | redis).
+
+    Retorna None quando desabilitado.
+    """
+    if not settings.llm_single_flight_enabled:
+        return None
+    backend = settings.llm_single_flight_backend.lower()
+    if backend == "memory":
+        return SingleFlight()
+    if backend == "redis":
+        if redis_client is None:
+            raise ValueError("llm_single_flight_backend=redis requer REDIS_URL configurado")
+        return RedisSingleFlight(redis_client)
+    raise ValueError(f"Unknown llm single-flight backend: {backend}")
@@ -0,0 +1,234 @@
+"""Unit of work por request: escritas remotas agrupadas em um commit.
+
+Responsabilidades:
+- Coletar escritas "cegas" (sem leitura prévia nem resultado usado pelo
+  fluxo) feitas durante o request: auditoria de decisão, fim do rastro
+  inbound, marcas de outbound dedupe
+- Gravar tudo em um round trip por backend: um `WriteBatch` por client
+  Firestore (atômico, até 500 operações por commit) e um pipeline
+  `MULTI/EXEC` por client Redis
+
+Os stores participam via `current_unit_of_work()`: sem unit of work ativa,
+gravam na hora (comportamento original). Escritas que dependem de resultado
+imediato (save otimista da sessão, `mark_if_new`, append transacional de
+conversa) continuam diretas.
+
+Pontos de flush: saída do bloco `unit_of_work()` (sucesso ou erro — os
+registros descrevem o que aconteceu, inclusive falhas) e `flush()`
+explícito. Handlers async usam `async_unit_of_work()`/`flush_async()`, que
+fazem o commit síncrono numa thread. Falha no flush após sucesso do bloco levanta `UnitOfWorkError`;
+após erro do bloco é logada e o erro original segue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from pyloto_corp.observability.logging import get_logger
+
+logger: logging.Logger = get_logger(__name__)
+
+FIRESTORE_BATCH_LIMIT = 500
+
+_current: ContextVar[UnitOfWork | None] = ContextVar("unit_of_work", default=None)
+
+
+class UnitOfWorkError(Exception):
+    """Falha ao gravar as escritas agrupadas."""
+
+
+@dataclass(slots=True)
+class _FirestoreOp:
+    method: str  # set | update | delete
+    doc_ref: Any
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+
+
+@dataclass(slots=True)
+class _RedisOp:
+    command: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+
+
+@dataclass(slots=True)
+class UnitOfWorkStats:
+    """Escritas coletadas e commits feitos (round trips)."""
+
+    deferred: int = 0
+    commits: int = 0
+
+
+@dataclass(slots=True)
+class _Pending:
+    firestore: dict[int, tuple[Any, list[_FirestoreOp]]] = field(default_factory=dict)
+    redis: dict[int, tuple[Any, list[_RedisOp]]] = field(default_factory=dict)
+
+
+class UnitOfWork:
+    """Coleta escritas e as grava agrupadas em `flush()`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending = _Pending()
+        self.stats = UnitOfWorkStats()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(ops) for _, ops in self._pending.firestore.values()) + sum(
+                len(ops) for _, ops in self._pending.redis.values()
+            )
+
+    def firestore_set(self, client: Any, doc_ref: Any, data: dict[str, Any], **kwargs: Any) -> None:
+        self._add_firestore(client, _FirestoreOp("set", doc_ref, (data,), kwargs))
+
+    def firestore_update(self, client: Any, doc_ref: Any, data: dict[str, Any]) -> None:
+        self._add_firestore(client, _FirestoreOp("update", doc_ref, (data,), {}))
+
+    def firestore_delete(self, client: Any, doc_ref: Any) -> None:
+        self._add_firestore(client, _FirestoreOp("delete", doc_ref, (), {}))
+
+    def redis(self, client: Any, command: str, *args: Any, **kwargs: Any) -> None:
+        """Enfileira um comando Redis (ex.: `uow.redis(r, "set", key, value, ex=60)`)."""
+        with self._lock:
+            _, ops = self._pending.redis.setdefault(id(client), (client, []))
+            ops.append(_RedisOp(command, args, kwargs))
+            self.stats.deferred += 1
+
+    def _add_firestore(self, client: Any, op: _FirestoreOp) -> None:
+        with self._lock:
+            _, ops = self._pending.firestore.setdefault(id(client), (client, []))
+            ops.append(op)
+            self.stats.deferred += 1
+
+    def discard(self) -> None:
+        """Descarta as escritas pendentes."""
+        with self._lock:
+            self._pending = _Pending()
+
+    def flush(self) -> int:
+        """Grava as escritas pendentes; retorna o número de commits.
+
+        Cada backend é gravado de forma independente: falha em um não impede
+        os outros. A primeira falha é levantada como `UnitOfWorkError` ao
+        final (as escritas do backend com falha são descartadas — o retry
+        fica com o chamador/Cloud Tasks).
+        """
+        with self._lock:
+            pending, self._pending = self._pending, _Pending()
+
+        commits = 0
+        errors: list[Exception] = []
+        for client, ops in pending.firestore.values():
+            try:
+                commits += _commit_firestore(client, ops)
+            except Exception as exc:  # noqa: BLE001 - reportado ao final
+                errors.append(exc)
+        for client, ops in pending.redis.values():
+            try:
+                _commit_redis(client, ops)
+                commits += 1
+            except Exception as exc:  # noqa: BLE001 - reportado ao final
+                errors.append(exc)
+
+        self.stats.commits += commits
+        if errors:
+            logger.error(
+                "unit_of_work_flush_failed",
+                extra={"errors": len(errors), "error": type(errors[0]).__name__},
+            )
+            raise UnitOfWorkError(f"flush falhou: {errors[0]}") from errors[0]
+        return commits
+
+    def try_flush(self) -> bool:
+        """`flush()` para escritas best-effort: falha fica só no log."""
+        try:
+            self.flush()
+        except UnitOfWorkError:
+            return False
+        return True
+
+    async def flush_async(self) -> int:
+        """`flush()` numa thread: o commit síncrono não trava o event loop."""
+        if not len(self):
+            return 0
+        return await asyncio.to_thread(self.flush)
+
+    async def try_flush_async(self) -> bool:
+        """Versão assíncrona de `try_flush()`."""
+        try:
+            await self.flush_async()
+        except UnitOfWorkError:
+            return False
+        return True
+
+
+def _commit_firestore(client: Any, ops: list[_FirestoreOp]) -> int:
+    commits = 0
+    for start in range(0, len(ops), FIRESTORE_BATCH_LIMIT):
+        batch = client.batch()
+        for op in ops[start : start + FIRESTORE_BATCH_LIMIT]:
+            getattr(batch, op.method)(op.doc_ref, *op.args, **op.kwargs)
+        batch.commit()
+        commits += 1
+    return commits
+
+
+def _commit_redis(client: Any, ops: list[_RedisOp]) -> None:
+    pipe = client.pipeline(transaction=True)
+    for op in ops:
+        getattr(pipe, op.command)(*op.args, **op.kwargs)
+    pipe.execute()
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    """Unit of work ativa no contexto atual (None fora de `unit_of_work()`)."""
+    return _current.get()
+
+
+@contextmanager
+def unit_of_work() -> Iterator[UnitOfWork]:
+    """Abre uma unit of work (ou participa da já ativa) e faz flush na saída."""
+    active = _current.get()
+    if active is not None:
+        yield active
+        return
+
+    uow = UnitOfWork()
+    token = _current.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        _current.reset(token)
+        uow.try_flush()  # falha só no log: o erro do bloco tem precedência
+        raise
+    _current.reset(token)
+    uow.flush()
+
+
+@asynccontextmanager
+async def async_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """`unit_of_work()` para handlers async: o flush da saída roda numa thread."""
+    active = _current.get()
+    if active is not None:
+        yield active
+        return
+
+    uow = UnitOfWork()
+    token = _current.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        _current.reset(token)
+        await uow.try_flush_async()  # falha só no log: o erro do bloco tem precedência
+        raise
+    _current.reset(token)
+    await uow.flush_async()
@@ -0,0 +1,153 @@
+"""Pipeline de logging assíncrono (fila limitada + listener em background).
+
+Responsabilidades:
+- `BoundedQueueHandler`: no caminho da request apenas enriquece o record
+  (correlation_id via filtros) e enfileira — sem formatar JSON nem escrever
+- Política de overflow da fila limitada: `drop_new` (descarta o record
+  novo) ou `drop_oldest` (descarta o mais antigo), com contadores
+- `BatchLogListener`: thread que formata e escreve em lotes no stream
+- `stop()` drena a fila antes de encerrar (flush garantido no shutdown);
+  `direct_handler()` dá o handler síncrono que assume depois disso
+
+Os filtros do handler rodam na thread de origem, então ContextVars
+(correlation_id) são capturados corretamente antes do enfileiramento.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler
+from typing import Any, TextIO
+
+OVERFLOW_POLICIES = ("drop_new", "drop_oldest")
+
+_STOP = object()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler com fila limitada, política de overflow e contadores."""
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str = "drop_new") -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy inválida: {overflow_policy}")
+        super().__init__(log_queue)
+        self._overflow_policy = overflow_policy
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self._forward_to: logging.Handler | None = None
+
+    def forward_to(self, handler: logging.Handler) -> None:
+        """Repassa a `handler` os records emitidos a partir de agora.
+
+        Usado na reconfiguração: threads que já leram a lista antiga de
+        handlers do root ainda emitem aqui depois da troca. Tomar o lock do
+        handler garante que nenhum record entra na fila após o retorno.
+        """
+        with self.lock:
+            self._forward_to = handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        target = self._forward_to
+        if target is not None:
+            target.handle(record)
+            return
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Congela mensagem/exceção sem formatar o JSON (feito no listener)."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self._overflow_policy == "drop_oldest":
+                try:
+                    self.queue.get_nowait()
+                    self.queue.put_nowait(record)
+                except (queue.Empty, queue.Full):
+                    pass
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            self.enqueued += 1
+
+
+class BatchLogListener:
+    """Consome a fila em background, formatando e escrevendo em lotes."""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        formatter: logging.Formatter,
+        stream: TextIO,
+        batch_size: int = 256,
+    ) -> None:
+        self._queue = log_queue
+        self._formatter = formatter
+        self._stream = stream
+        self._batch_size = batch_size
+        self._thread: threading.Thread | None = None
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+
+    def direct_handler(self) -> logging.StreamHandler:
+        """Handler síncrono equivalente (mesmo formatter/stream), para depois do stop."""
+        handler = logging.StreamHandler(self._stream)
+        handler.setFormatter(self._formatter)
+        return handler
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Sinaliza parada e aguarda a drenagem completa da fila."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            self._write([item for item in batch if item is not _STOP])
+            if stop:
+                return
+
+    def _write(self, records: list[Any]) -> None:
+        if not records:
+            return
+        lines = []
+        for record in records:
+            try:
+                lines.append(self._formatter.format(record))
+            except Exception:  # noqa: BLE001
+                self.write_errors += 1
+        try:
+            self._stream.write("\n".join(lines) + "\n")
+            self._stream.flush()
+        except Exception:  # noqa: BLE001
+            self.write_errors += 1
+            return
+        self.written += len(lines)
+        self.batches += 1
@@ -0,0 +1,101 @@
+"""Amostragem e limite de taxa por evento para logs de hot path.
+
+Responsabilidades:
+- Taxa de amostragem por nome de evento (mensagem do log, ex.:
+  `inbound_processing_started`): 1.0 loga tudo, 0.1 loga ~10%
+- Teto por evento/segundo (token bucket) para rajadas
+- Sempre logar WARNING+ e correlation_ids sinalizados (debug de um fluxo)
+- Contadores de records suprimidos por evento
+
+A amostragem é determinística por correlation_id (hash): uma request ou é
+logada inteira ou não é, preservando rastros completos.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+
+class LogSamplingFilter(logging.Filter):
+    """Filtro de amostragem/limite por evento (aplicar após o filtro de correlation_id)."""
+
+    def __init__(
+        self,
+        sample_rates: Mapping[str, float] | None = None,
+        rate_limits: Mapping[str, float] | None = None,
+        always_log_correlation_ids: Iterable[str] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self._sample_rates = dict(sample_rates or {})
+        self._rate_limits = dict(rate_limits or {})
+        self._flagged = set(always_log_correlation_ids)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # evento -> (tokens disponíveis, último refill)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._suppressed: dict[str, dict[str, int]] = {}
+
+    def flag_correlation_id(self, correlation_id: str) -> None:
+        """Passa a logar tudo desta correlation_id (ignora amostragem/limite)."""
+        with self._lock:
+            self._flagged.add(correlation_id)
+
+    def unflag_correlation_id(self, correlation_id: str) -> None:
+        with self._lock:
+            self._flagged.discard(correlation_id)
+
+    def filter(self, record: logging.LogRecord) -> bool:  # noqa: A003
+        event = record.msg if isinstance(record.msg, str) else str(record.msg)
+        rate = self._sample_rates.get(event)
+        limit = self._rate_limits.get(event)
+        if (rate is None and limit is None) or record.levelno >= logging.WARNING:
+            return True
+        correlation_id = getattr(record, "correlation_id", "") or ""
+        if correlation_id and correlation_id in self._flagged:
+            return True
+        if rate is not None and not self._sampled(rate, correlation_id):
+            self._count(event, "sampled_out")
+            return False
+        if limit is not None and not self._take_token(event, limit):
+            self._count(event, "rate_limited")
+            return False
+        return True
+
+    @staticmethod
+    def _sampled(rate: float, correlation_id: str) -> bool:
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        if correlation_id:
+            return zlib.crc32(correlation_id.encode()) / 2**32 < rate
+        return random.random() < rate  # noqa: S311 - amostragem, não criptografia
+
+    def _take_token(self, event: str, per_second: float) -> bool:
+        now = self._clock()
+        with self._lock:
+            capacity = max(per_second, 1.0)
+            tokens, updated = self._buckets.get(event, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * per_second)
+            if tokens < 1.0:
+                self._buckets[event] = (tokens, now)
+                return False
+            self._buckets[event] = (tokens - 1.0, now)
+            return True
+
+    def _count(self, event: str, reason: str) -> None:
+        with self._lock:
+            counters = self._suppressed.setdefault(event, {"sampled_out": 0, "rate_limited": 0})
+            counters[reason] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Records suprimidos por evento e motivo."""
+        with self._lock:
+            return {event: dict(counters) for event, counters in self._suppressed.items()}
@@ -1,13 +1,29 @@
-"""Configuração de logging estruturado (JSON)."""
+"""Configuração de logging estruturado (JSON).
+
+Com `async_enabled`, o root logger recebe um `BoundedQueueHandler` e um
+listener em background formata/escreve em lotes (ver `log_queue.py`).
+Eventos de hot path podem ser amostrados/limitados (ver `log_sampling.py`).
+"""
 
 from __future__ import annotations
 
+import atexit
 import logging
+import queue
+import sys
+from collections.abc import Iterable, Mapping
+from typing import Any
 
 from pythonjsonlogger.json import JsonFormatter
 
+from pyloto_corp.observability.log_queue import BatchLogListener, BoundedQueueHandler
+from pyloto_corp.observability.log_sampling import LogSamplingFilter
 from pyloto_corp.observability.middleware import get_correlation_id
 
+_listener: BatchLogListener | None = None
+_queue_handler: BoundedQueueHandler | None = None
+_sampling_filter: LogSamplingFilter | None = None
+
 
 class CorrelationIdFilter(logging.Filter):
     """Insere correlation_id e service no record de log.
@@ -27,22 +43,126 @@ class CorrelationIdFilter(logging.Filter):
         return True
 
 
-def configure_logging(level: str, service_name: str) -> None:
-    """Configura logging JSON com campos padrao do serviço."""
+def configure_logging(
+    level: str,
+    service_name: str,
+    *,
+    async_enabled: bool = False,
+    queue_max_size: int = 10_000,
+    overflow_policy: str = "drop_new",
+    batch_size: int = 256,
+    sample_rates: Mapping[str, float] | None = None,
+    rate_limits: Mapping[str, float] | None = None,
+    always_log_correlation_ids: Iterable[str] = (),
+) -> None:
+    """Configura logging JSON com campos padrao do serviço.
+
+    `async_enabled=True` tira formatação e escrita do caminho da request:
+    records vão para uma fila limitada consumida por um listener em lotes.
+    `sample_rates`/`rate_limits` (por nome de evento) descartam records de
+    hot path antes de enfileirar; WARNING+ e correlation_ids sinalizados
+    sempre passam.
+    """
+    global _listener, _queue_handler, _sampling_filter
 
     formatter = JsonFormatter(
         "%(asctime)s %(levelname)s %(name)s %(message)s %(correlation_id)s %(service)s",
         rename_fields={"levelname": "level", "name": "logger"},
     )
 
-    handler = logging.StreamHandler()
+    # O pipeline anterior só para depois da troca de handlers: records emitidos
+    # durante a reconfiguração caem na fila antiga (drenada no stop) ou são
+    # repassados ao handler novo.
+    previous_listener, _listener = _listener, None
+    previous_handler = _queue_handler
+
+    if async_enabled:
+        handler: logging.Handler = _start_async_pipeline(
+            formatter, queue_max_size, overflow_policy, batch_size
+        )
+    else:
+        _queue_handler = None
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
     handler.setLevel(level)
-    handler.setFormatter(formatter)
     handler.addFilter(CorrelationIdFilter(service_name))
+    _sampling_filter = None
+    if sample_rates or rate_limits:
+        _sampling_filter = LogSamplingFilter(
+            sample_rates, rate_limits, always_log_correlation_ids=always_log_correlation_ids
+        )
+        handler.addFilter(_sampling_filter)
 
     root = logging.getLogger()
     root.setLevel(level)
     root.handlers = [handler]
+    if previous_handler is not None:
+        previous_handler.forward_to(handler)
+    if previous_listener is not None:
+        previous_listener.stop()
+
+
+def _start_async_pipeline(
+    formatter: logging.Formatter, queue_max_size: int, overflow_policy: str, batch_size: int
+) -> BoundedQueueHandler:
+    global _listener, _queue_handler
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_max_size)
+    _queue_handler = BoundedQueueHandler(log_queue, overflow_policy=overflow_policy)
+    _listener = BatchLogListener(log_queue, formatter, sys.stderr, batch_size=batch_size)
+    _listener.start()
+    return _queue_handler
+
+
+def shutdown_logging(timeout: float | None = 5.0) -> None:
+    """Drena a fila de logs pendentes e encerra o listener (idempotente).
+
+    O `BoundedQueueHandler` sai do root e dá lugar a um handler síncrono
+    com o mesmo formatter/filtros: records emitidos depois (ex.: após o
+    lifespan de um `TestClient`) são escritos em vez de ficarem numa fila
+    sem consumidor.
+    """
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    if _queue_handler is not None:
+        direct = listener.direct_handler()
+        direct.setLevel(_queue_handler.level)
+        for log_filter in _queue_handler.filters:
+            direct.addFilter(log_filter)
+        root = logging.getLogger()
+        root.handlers = [direct if h is _queue_handler else h for h in root.handlers]
+        _queue_handler.forward_to(direct)
+    listener.stop(timeout)
+
+
+def get_sampling_filter() -> LogSamplingFilter | None:
+    """Filtro de amostragem ativo (para sinalizar correlation_ids em runtime)."""
+    return _sampling_filter
+
+
+def logging_stats() -> dict[str, Any]:
+    """Contadores do pipeline assíncrono e records suprimidos por evento."""
+    stats: dict[str, Any] = {}
+    if _sampling_filter is not None:
+        stats["suppressed"] = _sampling_filter.stats()
+    if _queue_handler is None:
+        return stats
+    stats.update(
+        enqueued=_queue_handler.enqueued,
+        dropped=_queue_handler.dropped,
+        queue_depth=_queue_handler.queue.qsize(),
+    )
+    if _listener is not None:
+        stats.update(
+            written=_listener.written,
+            batches=_listener.batches,
+            write_errors=_listener.write_errors,
+        )
+    return stats
+
+
+atexit.register(shutdown_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
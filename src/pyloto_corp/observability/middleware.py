@@ -1,16 +1,25 @@
-"""Middlewares de observabilidade."""
+"""Middlewares de observabilidade.
+
+`CorrelationIdMiddleware` é ASGI puro (sem `BaseHTTPMiddleware`): não cria
+task extra nem reempacota o stream da resposta. Na mesma passada propaga o
+correlation_id, mede a latência, conta status HTTP e mantém o gauge de
+requests em andamento (`RequestMetrics`).
+"""
 
 from __future__ import annotations
 
+import threading
+import time
 import uuid
 from contextvars import ContextVar
+from typing import Any
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 _correlation_id: ContextVar[str] = ContextVar("correlation_id", default="")
 
+_HEADER = b"x-correlation-id"
+
 
 def get_correlation_id() -> str:
     """Retorna o correlation_id corrente (ou vazio)."""
@@ -18,17 +27,83 @@ def get_correlation_id() -> str:
     return _correlation_id.get()
 
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    """Gera ou propaga correlation_id em cada request."""
+class RequestMetrics:
+    """Contadores HTTP do processo: em andamento, status e latência."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._requests = 0
+        self._status_counts: dict[int, int] = {}
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def finished(self, status_code: int, elapsed_seconds: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._requests += 1
+            self._status_counts[status_code] = self._status_counts.get(status_code, 0) + 1
+            self._latency_total += elapsed_seconds
+            self._latency_max = max(self._latency_max, elapsed_seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Estado atual para logs/métricas."""
+        with self._lock:
+            requests = self._requests
+            return {
+                "in_flight": self._in_flight,
+                "requests": requests,
+                "status_counts": dict(self._status_counts),
+                "avg_latency_ms": (
+                    round(self._latency_total / requests * 1000, 2) if requests else 0.0
+                ),
+                "max_latency_ms": round(self._latency_max * 1000, 2),
+            }
+
+
+# Métricas padrão do processo (compartilhadas pelas apps criadas)
+request_metrics = RequestMetrics()
 
-    async def dispatch(self, request: Request, call_next) -> Response:  # type: ignore[override]
-        incoming = request.headers.get("x-correlation-id")
+
+class CorrelationIdMiddleware:
+    """Gera ou propaga correlation_id em cada request (ASGI puro)."""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics | None = None) -> None:
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", ()):
+            if name == _HEADER:
+                incoming = value.decode("latin-1")
+                break
         correlation_id = incoming or str(uuid.uuid4())
+        header_value = correlation_id.encode("latin-1")
+        status_code = 500
+
+        async def send_with_correlation(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [(k, v) for k, v in message.get("headers", ()) if k.lower() != _HEADER]
+                headers.append((_HEADER, header_value))
+                message = {**message, "headers": headers}
+            await send(message)
+
         token = _correlation_id.set(correlation_id)
+        self.metrics.started()
+        started = time.perf_counter()
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_correlation)
         finally:
+            self.metrics.finished(status_code, time.perf_counter() - started)
             _correlation_id.reset(token)
-
-        response.headers["x-correlation-id"] = correlation_id
-        return response
@@ -0,0 +1,95 @@
+"""Codec JSON único do projeto, com backend rápido plugável.
+
+Responsabilidades:
+- `loads`/`dumps`/`dumpb` com a mesma semântica do `json` da stdlib
+  (UTF-8 sem escape de não-ASCII, ordem de chaves preservada)
+- Usar `orjson` quando instalado; fallback transparente para a stdlib
+- `JSONDecodeError` único para tratamento de erro nos call sites
+
+Paridade: o que o orjson recusa (chaves não-str, inteiros > 64 bits no
+encode, literais NaN/Infinity no decode) é reprocessado pela stdlib, então
+o resultado (ou o erro) é o da stdlib. Divergências conhecidas do orjson:
+floats NaN/Infinity viram `null` no encode e inteiros > 64 bits viram float
+no decode — nenhum dos dois ocorre nos payloads Meta/OpenAI/Redis daqui.
+A saída é sempre compacta (`","`/`":"`); quem precisa de bytes estáveis
+para hash (ex.: `compute_inbound_event_id`) continua na stdlib.
+
+Backend forçado via env `PYLOTO_JSON_BACKEND=stdlib` ou `set_backend()`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None  # type: ignore[assignment]
+
+JSONDecodeError = json.JSONDecodeError
+
+BACKENDS = ("orjson", "stdlib")
+
+_backend = "stdlib"
+
+
+def _stdlib_dumps(obj: Any, sort_keys: bool) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+
+
+def set_backend(name: str) -> None:
+    """Seleciona o backend (`orjson` exige o pacote instalado)."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"backend JSON inválido: {name}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("backend orjson indisponível (pacote não instalado)")
+    _backend = name
+
+
+def backend_name() -> str:
+    """Nome do backend ativo."""
+    return _backend
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decodifica JSON; levanta `JSONDecodeError` para entrada inválida.
+
+    Bytes fora de UTF-8 também viram `JSONDecodeError` (a stdlib levanta
+    `UnicodeDecodeError`), para os call sites tratarem um único tipo.
+    """
+    if _backend == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # stdlib decide: aceita NaN/big ints ou gera o erro canônico
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    try:
+        return json.loads(data)
+    except UnicodeDecodeError as exc:
+        doc = exc.object.decode("utf-8", errors="replace")
+        raise JSONDecodeError(f"UTF-8 inválido: {exc.reason}", doc, exc.start) from exc
+
+
+def dumpb(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """Serializa para bytes UTF-8 compactos."""
+    if _backend == "orjson":
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except TypeError:
+            pass  # orjson.JSONEncodeError: stdlib serializa ou gera o erro canônico
+    return _stdlib_dumps(obj, sort_keys).encode("utf-8")
+
+
+def dumps(obj: Any, *, sort_keys: bool = False) -> str:
+    """Serializa para str compacta."""
+    if _backend == "orjson":
+        return dumpb(obj, sort_keys=sort_keys).decode("utf-8")
+    return _stdlib_dumps(obj, sort_keys)
+
+
+if orjson is not None and os.getenv("PYLOTO_JSON_BACKEND", "orjson") != "stdlib":
+    _backend = "orjson"
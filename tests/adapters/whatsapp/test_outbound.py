@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 from unittest.mock import patch
 
+import pytest
+
 from pyloto_corp.adapters.whatsapp.models import (
     OutboundMessageRequest,
     OutboundMessageResponse,
 )
 from pyloto_corp.adapters.whatsapp.outbound import (
     OutboundMessage,
+    PreparedMessage,
     WhatsAppOutboundClient,
 )
+from pyloto_corp.adapters.whatsapp.payload_builders import factory
 
 
 class TestOutboundMessage:
@@ -198,7 +204,7 @@ class TestWhatsAppOutboundClientSendMessage:
 
 
 class TestWhatsAppOutboundClientSendBatch:
-    """Testes para método send_batch."""
+    """Testes para método send_batch_sync."""
 
     def _create_valid_request(self, to: str) -> OutboundMessageRequest:
         """Helper para criar requisição válida."""
@@ -217,7 +223,7 @@ class TestWhatsAppOutboundClientSendBatch:
         )
 
         requests = [self._create_valid_request("+5511987654321")]
-        responses = client.send_batch(requests)
+        responses = client.send_batch_sync(requests)
 
         assert len(responses) == 1
         assert responses[0].success is True
@@ -236,7 +242,7 @@ class TestWhatsAppOutboundClientSendBatch:
             self._create_valid_request("+5511933334444"),
         ]
 
-        responses = client.send_batch(requests)
+        responses = client.send_batch_sync(requests)
 
         assert len(responses) == 3
         assert all(r.success is True for r in responses)
@@ -260,7 +266,7 @@ class TestWhatsAppOutboundClientSendBatch:
             self._create_valid_request("+5511912345678"),
         ]
 
-        responses = client.send_batch(requests)
+        responses = client.send_batch_sync(requests)
 
         assert len(responses) == 3
         assert responses[0].success is True
@@ -275,7 +281,7 @@ class TestWhatsAppOutboundClientSendBatch:
             phone_number_id="957912434071464",
         )
 
-        responses = client.send_batch([])
+        responses = client.send_batch_sync([])
         assert responses == []
 
 
@@ -442,3 +448,56 @@ class TestWhatsAppOutboundClientBuildPayloadSafe:
 
         assert isinstance(result, OutboundMessageResponse)
         assert result.success is False
+
+
+class TestWhatsAppOutboundClientPreparedMessage:
+    """Testes para prepare/send_prepared (preparo único por mensagem)."""
+
+    def _client(self) -> WhatsAppOutboundClient:
+        return WhatsAppOutboundClient(
+            api_endpoint="https://graph.facebook.com",
+            access_token="token-123",
+            phone_number_id="957912434071464",
+        )
+
+    def test_prepare_builds_and_serializes_once(self):
+        """send_message constrói o payload uma única vez e envia bytes."""
+        client = self._client()
+        request = OutboundMessageRequest(
+            to="+5511987654321", message_type="text", text="Olá", idempotency_key="k-1"
+        )
+
+        with patch(
+            "pyloto_corp.adapters.whatsapp.outbound.build_full_payload",
+            wraps=factory.build_full_payload,
+        ) as build:
+            response = client.send_message_sync(request)
+
+        assert response.success is True
+        assert build.call_count == 1
+
+    def test_prepared_message_is_immutable_and_reused(self):
+        """A mesma PreparedMessage é reenviada sem reconstrução."""
+        client = self._client()
+        prepared = client.prepare(
+            OutboundMessageRequest(to="+5511987654321", message_type="text", text="Olá")
+        )
+        assert isinstance(prepared, PreparedMessage)
+        assert json.loads(prepared.body)["text"]["body"] == "Olá"
+        assert prepared.payload["to"] == "+5511987654321"
+        with pytest.raises(AttributeError):
+            prepared.body = b"{}"  # type: ignore[misc]
+
+        with patch("pyloto_corp.adapters.whatsapp.outbound.build_full_payload") as build:
+            for _ in range(2):
+                response = asyncio.run(client.send_prepared(prepared))
+                assert response.success is True
+        build.assert_not_called()
+
+    def test_prepare_returns_validation_error(self):
+        """Erro de validação não gera PreparedMessage."""
+        result = self._client().prepare(
+            OutboundMessageRequest(to="invalid", message_type="text", text="Olá")
+        )
+        assert isinstance(result, OutboundMessageResponse)
+        assert result.error_code == "VALIDATION_ERROR"
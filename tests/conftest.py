@@ -5,6 +5,8 @@ from fastapi.testclient import TestClient
 
 from pyloto_corp.api.app import create_app
 from pyloto_corp.config.settings import get_settings
+from pyloto_corp.infra.dedupe import InMemoryDedupeStore
+from tests.helpers.webhook import WEBHOOK_SECRET, CaptureDispatcher
 
 
 @pytest.fixture()
@@ -14,3 +16,23 @@ def client(monkeypatch: pytest.MonkeyPatch):
     app = create_app()
     with TestClient(app) as test_client:
         yield test_client
+
+
+@pytest.fixture()
+def webhook_env() -> dict[str, str]:
+    """Variáveis extras do `webhook_app`; módulos sobrescrevem este fixture."""
+    return {}
+
+
+@pytest.fixture()
+def webhook_app(monkeypatch: pytest.MonkeyPatch, webhook_env: dict[str, str]):
+    """App com segredo de webhook conhecido, dedupe em memória e dispatcher fake."""
+    env = {"WHATSAPP_WEBHOOK_SECRET": WEBHOOK_SECRET, "INTERNAL_TASK_TOKEN": "internal"}
+    for name, value in {**env, **webhook_env}.items():
+        monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+    app = create_app()
+    app.state.dedupe_store = InMemoryDedupeStore()
+    app.state.tasks_dispatcher = CaptureDispatcher()
+    yield app
+    get_settings.cache_clear()
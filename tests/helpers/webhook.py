@@ -0,0 +1,38 @@
+"""Fakes compartilhados pelos testes do webhook WhatsApp (assinatura + dispatcher)."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+from typing import Any
+
+from pyloto_corp.infra.cloud_tasks import CloudTaskDispatchError, TaskMetadata
+
+WEBHOOK_SECRET = "secret"
+
+
+def sign_webhook(body: bytes, secret: str = WEBHOOK_SECRET) -> str:
+    """Header X-Hub-Signature-256 válido para `body`."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class CaptureDispatcher:
+    """Dispatcher fake que captura enqueues raw e estruturados.
+
+    Eventos com `inbound_event_id` em `fail_ids` falham como fila indisponível.
+    """
+
+    def __init__(self, fail_ids: set[str] | None = None) -> None:
+        self.inbound: list[dict[str, Any]] = []
+        self.raw: list[dict[str, Any]] = []
+        self.fail_ids = fail_ids or set()
+
+    async def enqueue_inbound(self, payload: dict[str, Any], schedule_time=None):  # noqa: ANN001
+        if payload["inbound_event_id"] in self.fail_ids:
+            raise CloudTaskDispatchError("queue down")
+        self.inbound.append(payload)
+        return TaskMetadata(name=f"inbound-{len(self.inbound)}", queue="whatsapp-inbound")
+
+    async def enqueue_inbound_raw(self, body: bytes, *, headers, schedule_time=None):  # noqa: ANN001
+        self.raw.append({"body": body, "headers": dict(headers)})
+        return TaskMetadata(name=f"raw-{len(self.raw)}", queue="whatsapp-inbound")
@@ -155,16 +155,19 @@ class TestInMemorySessionStoreLoad:
         # Sessão deve ter sido deletada
         assert "test-session" not in store._sessions
 
-    def test_load_returns_same_object(self):
-        """Deve retornar a mesma instância de sessão."""
+    def test_load_returns_independent_copy(self):
+        """Deve retornar cópia igual, sem compartilhar a instância salva."""
         store = InMemorySessionStore()
         session = self._create_session()
         store.save(session)
 
         loaded = store.load("test-session")
 
-        # Deve ser a mesma instância
-        assert loaded is session
+        # Cópia: mutar o objeto carregado não altera o armazenado (CAS funciona)
+        assert loaded is not session
+        assert loaded == session
+        loaded.message_history.append({"summary": "local"})
+        assert store.load("test-session").message_history == session.message_history
 
     def test_load_multiple_sessions(self):
         """Deve carregar sessões diferentes."""
@@ -251,7 +251,7 @@ def test_process_inbound_logs_and_persists(
     response = client.post("/internal/process_inbound", json=inbound_body, headers=headers)
     assert response.status_code == 200
     expected_id = payload["entry"][0]["changes"][0]["value"]["messages"][0]["id"]
-    mock_store.mark_started.assert_called_once_with(expected_id, "corr-1", "task-1")
+    mock_store.mark_started_async.assert_awaited_once_with(expected_id, "corr-1", "task-1")
     mock_store.mark_finished.assert_called_once_with(
         expected_id,
         correlation_id="corr-1",
@@ -0,0 +1,82 @@
+"""Testes do startup via lifespan (construção lazy, prewarm e shutdown)."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from pyloto_corp.api.app import create_app
+from pyloto_corp.config.settings import Settings
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+def test_lazy_app_initializes_backends_in_lifespan() -> None:
+    app = create_app(Settings(environment="development"), lazy=True)
+
+    assert not app.state.backends_ready
+    assert not hasattr(app.state, "session_store")
+
+    with TestClient(app) as client:
+        assert app.state.backends_ready
+        assert app.state.ready
+        assert app.state.session_store is not None
+        assert app.state.tasks_dispatcher is not None
+        assert client.get("/health").status_code == 200
+
+    assert not app.state.ready
+
+
+def test_lifespan_keeps_backends_of_eager_app() -> None:
+    app = create_app(Settings(environment="development"))
+    dispatcher = MagicMock()
+    app.state.tasks_dispatcher = dispatcher
+
+    with TestClient(app):
+        assert app.state.tasks_dispatcher is dispatcher
+
+
+def test_prewarm_failures_do_not_block_startup() -> None:
+    settings = Settings(environment="development", app_prewarm_enabled=True)
+    app = create_app(settings, lazy=True)
+    broken_redis = MagicMock()
+    broken_redis.ping.side_effect = ConnectionError("down")
+
+    with patch("pyloto_corp.api.app._build_stores") as build_stores:
+        build_stores.return_value = {"session_store": MagicMock(), "redis_client": broken_redis}
+        with TestClient(app):
+            assert app.state.ready
+            assert app.state.institutional_context is not None
+
+    broken_redis.ping.assert_called_once()
+
+
+def test_shutdown_stops_secret_refresh_and_flushes_logs() -> None:
+    app = create_app(Settings(environment="development"))
+    verifier = MagicMock()
+    app.state.signature_verifier = verifier
+
+    with patch("pyloto_corp.api.lifespan.shutdown_logging") as shutdown_logging, TestClient(app):
+        pass
+
+    verifier.stop_refresh.assert_called_once()
+    shutdown_logging.assert_called_once()
+
+
+def test_importing_app_module_does_not_build_app_or_load_cloud_sdks() -> None:
+    code = (
+        "import sys, pyloto_corp.api.app as m; "
+        "print('app' in vars(m), 'google.cloud.firestore' in sys.modules, "
+        "'google.cloud.tasks_v2' in sys.modules)"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+
+    assert result.stdout.split() == ["False", "False", "False"]
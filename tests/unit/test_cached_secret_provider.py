@@ -0,0 +1,160 @@
+"""Testes do CachedSecretProvider (TTL, stale-while-revalidate, single-flight)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pyloto_corp.infra.secrets import (
+    CachedSecretProvider,
+    SecretManagerProvider,
+    create_secret_provider,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingProvider:
+    """Provider fake que conta leituras; pode bloquear ou falhar."""
+
+    def __init__(self, values: dict[str, str]) -> None:
+        self.values = values
+        self.calls = 0
+        self.fail = False
+        self.gate: threading.Event | None = None
+
+    def get_secret(self, name: str, version: str = "latest") -> str:
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(2.0)
+        if self.fail:
+            raise RuntimeError("secret manager indisponível")
+        if name not in self.values:
+            raise RuntimeError(f"Secret {name} não encontrado")
+        return self.values[name]
+
+    def secret_exists(self, name: str) -> bool:
+        return name in self.values
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:  # noqa: ANN001
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_hits_within_ttl_do_not_call_provider() -> None:
+    inner = CountingProvider({"A": "1"})
+    cached = CachedSecretProvider(inner, ttl_seconds=60, clock=FakeClock())
+
+    assert [cached.get_secret("A") for _ in range(5)] == ["1"] * 5
+    assert inner.calls == 1
+    assert cached.stats.hits == 4
+
+
+def test_stale_value_is_served_while_refreshing_in_background() -> None:
+    clock = FakeClock()
+    inner = CountingProvider({"A": "old"})
+    cached = CachedSecretProvider(inner, ttl_seconds=10, max_stale_seconds=100, clock=clock)
+    cached.get_secret("A")
+
+    inner.values["A"] = "new"
+    clock.now = 15.0
+    assert cached.get_secret("A") == "old"
+    _wait_for(lambda: cached.stats.refreshes == 1)
+
+    assert cached.get_secret("A") == "new"
+    assert inner.calls == 2
+
+
+def test_refresh_failure_keeps_cached_value() -> None:
+    clock = FakeClock()
+    inner = CountingProvider({"A": "1"})
+    cached = CachedSecretProvider(inner, ttl_seconds=10, clock=clock)
+    cached.get_secret("A")
+
+    inner.fail = True
+    clock.now = 11.0
+    assert cached.get_secret("A") == "1"
+    _wait_for(lambda: cached.stats.refresh_errors == 1)
+
+    assert cached.get_secret("A") == "1"
+
+
+def test_entries_past_max_stale_are_reloaded_synchronously() -> None:
+    clock = FakeClock()
+    inner = CountingProvider({"A": "1"})
+    cached = CachedSecretProvider(inner, ttl_seconds=10, max_stale_seconds=5, clock=clock)
+    cached.get_secret("A")
+
+    inner.values["A"] = "2"
+    clock.now = 20.0
+
+    assert cached.get_secret("A") == "2"
+    assert cached.stats.misses == 2
+
+
+def test_per_secret_ttl_override() -> None:
+    clock = FakeClock()
+    inner = CountingProvider({"A": "1", "B": "1"})
+    cached = CachedSecretProvider(
+        inner, ttl_seconds=100, ttl_overrides={"B": 1}, max_stale_seconds=0, clock=clock
+    )
+    cached.get_secret("A")
+    cached.get_secret("B")
+
+    clock.now = 2.0
+    cached.get_secret("A")
+    cached.get_secret("B")
+
+    assert inner.calls == 3
+
+
+def test_concurrent_misses_are_single_flight() -> None:
+    inner = CountingProvider({"A": "1"})
+    inner.gate = threading.Event()
+    cached = CachedSecretProvider(inner, ttl_seconds=60)
+    results: list[str] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cached.get_secret("A"))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: cached.stats.misses == 8)
+    inner.gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["1"] * 8
+    assert inner.calls == 1
+
+
+def test_invalidate_forces_reload_and_errors_are_not_cached() -> None:
+    inner = CountingProvider({"A": "1"})
+    cached = CachedSecretProvider(inner, ttl_seconds=60)
+    cached.get_secret("A")
+
+    inner.values["A"] = "2"
+    cached.invalidate("A")
+    assert cached.get_secret("A") == "2"
+
+    with pytest.raises(RuntimeError):
+        cached.get_secret("MISSING")
+    inner.values["MISSING"] = "x"
+    assert cached.get_secret("MISSING") == "x"
+
+
+def test_factory_wraps_secret_manager_only_with_ttl() -> None:
+    wrapped = create_secret_provider("secret_manager", "proj", cache_ttl_seconds=60)
+    plain = create_secret_provider("secret_manager", "proj")
+
+    assert isinstance(wrapped, CachedSecretProvider)
+    assert isinstance(plain, SecretManagerProvider)
@@ -0,0 +1,150 @@
+"""Testes da janela de contexto LLM (orçamento de tokens + resumo rolante)."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from pyloto_corp.ai.token_estimator import estimate_messages_tokens, estimate_tokens
+from pyloto_corp.application import orchestration_state
+from pyloto_corp.application.context_window import (
+    ContextWindowManager,
+    render_history_entry,
+)
+from pyloto_corp.application.session import SessionState
+from pyloto_corp.application.session_helpers import append_received_event
+from pyloto_corp.config.settings import get_settings
+
+
+def _session_with_hints(count: int) -> SessionState:
+    session = SessionState(session_id="s-ctx")
+    for i in range(count):
+        session.message_history.append({"summary": "state_hint", "hint": f"dica numero {i}"})
+    return session
+
+
+class TestTokenEstimator:
+    def test_empty_text_is_zero(self) -> None:
+        assert estimate_tokens("") == 0
+        assert estimate_tokens(None) == 0
+
+    def test_grows_with_length(self) -> None:
+        assert estimate_tokens("a" * 40) == 10
+        assert estimate_tokens("a" * 400) > estimate_tokens("a" * 40)
+
+    def test_short_words_count_at_least_one_token_each(self) -> None:
+        assert estimate_tokens("a b c d e f") == 6
+
+    def test_messages_include_overhead(self) -> None:
+        messages = [{"role": "user", "content": "a" * 40}]
+        assert estimate_messages_tokens(messages) == 10 + 4
+
+
+class TestContextWindowManager:
+    def test_short_history_fits_entirely_without_summary(self) -> None:
+        session = _session_with_hints(3)
+
+        context = ContextWindowManager(max_tokens=500).build(session)
+
+        assert len(context.recent) == 3
+        assert context.rolling_summary == ""
+        assert session.context_summary_upto == 0
+
+    def test_window_is_bounded_by_token_budget(self) -> None:
+        session = _session_with_hints(200)
+        manager = ContextWindowManager(max_tokens=80, summary_max_tokens=30)
+
+        context = manager.build(session)
+
+        assert context.token_count <= 80
+        assert 0 < len(context.recent) < 200
+        assert context.recent[-1]["hint"] == "dica numero 199"
+
+    def test_evicted_entries_are_folded_once(self) -> None:
+        session = _session_with_hints(50)
+        manager = ContextWindowManager(max_tokens=60, summary_max_tokens=30)
+
+        manager.build(session)
+        first_upto = session.context_summary_upto
+        assert first_upto > 0
+        assert session.context_summary
+
+        # Sem novas entradas, nada é incorporado novamente
+        summary_before = session.context_summary
+        manager.build(session)
+        assert session.context_summary_upto == first_upto
+        assert session.context_summary == summary_before
+
+    def test_summary_is_incremental_and_bounded(self) -> None:
+        session = _session_with_hints(30)
+        manager = ContextWindowManager(max_tokens=60, summary_max_tokens=20)
+        manager.build(session)
+
+        for i in range(30, 60):
+            session.message_history.append({"summary": "state_hint", "hint": f"dica numero {i}"})
+        context = manager.build(session)
+
+        assert estimate_tokens(context.rolling_summary) <= 20 + 1
+        assert "dica numero 59" in context.recent[-1]["hint"]
+        assert context.history_summary()[0].startswith("resumo:")
+
+    def test_prompt_size_does_not_grow_with_session_length(self) -> None:
+        manager = ContextWindowManager(max_tokens=100, summary_max_tokens=40)
+        small = manager.build(_session_with_hints(20)).token_count
+        large = manager.build(_session_with_hints(2000)).token_count
+
+        assert large <= 100
+        assert small <= 100
+
+    def test_context_is_sanitized(self) -> None:
+        session = SessionState(session_id="s-pii")
+        session.message_history.append({"summary": "state_hint", "hint": "CPF 123.456.789-10"})
+
+        context = ContextWindowManager().build(session)
+
+        assert "123.456.789-10" not in str(context.recent)
+        assert "[CPF]" in context.history_summary()[0]
+
+    def test_render_received_only_entry(self) -> None:
+        entry = {"received_at": "2026-01-01T00:00:00+00:00", "message_id": "wamid.X"}
+        assert render_history_entry(entry) == "mensagem recebida"
+
+    def test_invalid_budget_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            ContextWindowManager(max_tokens=100, summary_max_tokens=100)
+
+    def test_prune_keeps_summary_cursor_aligned(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(get_settings(), "SESSION_MESSAGE_HISTORY_MAX_ENTRIES", 10)
+        session = SessionState(session_id="s-prune-ctx")
+        for i in range(10):
+            append_received_event(session, i, message_id=f"m{i}")
+        session.context_summary_upto = 6
+
+        append_received_event(session, 11, message_id="m11")
+
+        assert len(session.message_history) == 10
+        assert session.context_summary_upto == 5
+
+
+def test_orchestration_without_context_uses_settings_limits(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(get_settings(), "llm_context_max_tokens", 80)
+    monkeypatch.setattr(get_settings(), "llm_context_summary_max_tokens", 30)
+    summaries: list[list[str]] = []
+
+    def fake_select(selector_input, *args, **kwargs):
+        summaries.append(selector_input.history_summary)
+        return SimpleNamespace(accepted=False, response_hint=None)
+
+    monkeypatch.setattr(orchestration_state, "select_next_state", fake_select)
+    session = _session_with_hints(40)
+    assert ContextWindowManager().build(_session_with_hints(40)).rolling_summary == ""
+
+    orchestration_state.orchestrate_state_selection(
+        session, SimpleNamespace(text="oi", message_id="m1"), None, None, 0.7
+    )
+
+    assert session.context_summary_upto > 0
+    assert summaries
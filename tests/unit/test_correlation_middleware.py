@@ -0,0 +1,79 @@
+"""Testes do middleware ASGI de correlation-id, latência e status."""
+
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from pyloto_corp.observability.middleware import (
+    CorrelationIdMiddleware,
+    RequestMetrics,
+    get_correlation_id,
+)
+
+
+def _app(metrics: RequestMetrics) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CorrelationIdMiddleware, metrics=metrics)
+
+    @app.get("/cid")
+    def cid() -> dict[str, object]:
+        return {
+            "correlation_id": get_correlation_id(),
+            "in_flight": metrics.snapshot()["in_flight"],
+        }
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    @app.get("/boom")
+    def boom() -> None:
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_propagates_incoming_correlation_id() -> None:
+    client = TestClient(_app(RequestMetrics()))
+
+    response = client.get("/cid", headers={"X-Correlation-ID": "abc-123"})
+
+    assert response.headers["x-correlation-id"] == "abc-123"
+    assert response.json()["correlation_id"] == "abc-123"
+
+
+def test_generates_correlation_id_and_resets_context() -> None:
+    client = TestClient(_app(RequestMetrics()))
+
+    response = client.get("/cid")
+
+    generated = response.headers["x-correlation-id"]
+    assert len(generated) == 36
+    assert response.json()["correlation_id"] == generated
+    assert get_correlation_id() == ""
+
+
+def test_streaming_response_is_not_buffered_or_broken() -> None:
+    client = TestClient(_app(RequestMetrics()))
+
+    response = client.get("/stream", headers={"X-Correlation-ID": "s-1"})
+
+    assert response.text == "abc"
+    assert response.headers["x-correlation-id"] == "s-1"
+
+
+def test_counts_status_codes_latency_and_in_flight() -> None:
+    metrics = RequestMetrics()
+    client = TestClient(_app(metrics), raise_server_exceptions=False)
+
+    assert client.get("/cid").json()["in_flight"] == 1
+    client.get("/missing")
+    client.get("/boom")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["requests"] == 3
+    assert snapshot["status_counts"] == {200: 1, 404: 1, 500: 1}
+    assert snapshot["max_latency_ms"] >= snapshot["avg_latency_ms"] > 0
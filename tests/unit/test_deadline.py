@@ -0,0 +1,238 @@
+"""Testes de prazo por mensagem e requisições hedged nos estágios LLM."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from pyloto_corp.ai.hedging import LatencyTracker, hedged_call
+from pyloto_corp.ai.single_flight import AsyncSingleFlight
+from pyloto_corp.application.deadline import Deadline
+from pyloto_corp.application.pipeline import WhatsAppInboundPipeline
+from pyloto_corp.application.pipeline_async import PipelineAsyncV3, _within_deadline
+from pyloto_corp.application.session import SessionState
+from pyloto_corp.domain.enums import Outcome
+from pyloto_corp.infra.dedupe import InMemoryDedupeStore
+from pyloto_corp.infra.session_store import InMemorySessionStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class DummyMessage:
+    def __init__(self, text: str = "quero falar com humano") -> None:
+        self.text = text
+        self.message_id = "msg-deadline"
+        self.chat_id = "chat-deadline"
+
+
+class DummyOrchestrator:
+    def process_message(self, message, session=None, is_duplicate=False):
+        return SimpleNamespace(
+            outcome=Outcome.AWAITING_USER, reply_text=None, intent=None, confidence=0.5
+        )
+
+
+class SlowStateSelector:
+    """LLM fake cuja latência injetada consome o relógio do prazo."""
+
+    def __init__(self, clock: FakeClock, latency: float) -> None:
+        self.clock = clock
+        self.latency = latency
+
+    def __call__(self, *args, **kwargs):
+        self.clock.now += self.latency
+        return {"selected_state": "HANDOFF_HUMAN", "confidence": 0.9, "status": "done"}
+
+
+class RecordingGenerator:
+    def __init__(self) -> None:
+        self.timeouts: list[float | None] = []
+
+    def complete(self, prompt, model=None, timeout=None):
+        self.timeouts.append(timeout)
+        return {
+            "responses": ["r1", "r2", "r3"],
+            "response_style_tags": [],
+            "chosen_index": 0,
+            "safety_notes": [],
+        }
+
+
+def _pipeline(clock: FakeClock, latency: float, generator: RecordingGenerator):
+    return WhatsAppInboundPipeline(
+        dedupe_store=InMemoryDedupeStore(),
+        session_store=InMemorySessionStore(),
+        orchestrator=DummyOrchestrator(),
+        state_selector_client=SlowStateSelector(clock, latency),
+        response_generator_client=generator,
+        response_generator_timeout=10.0,
+        master_decider_client=MagicMock(),
+    )
+
+
+def test_stage_timeout_is_bounded_by_remaining_budget() -> None:
+    clock = FakeClock()
+    deadline = Deadline.start(5.0, clock=clock)
+
+    assert deadline.stage_timeout(10.0) == pytest.approx(5.0)
+    clock.now += 4.0
+    assert deadline.stage_timeout(10.0) == pytest.approx(1.0)
+    assert deadline.stage_timeout() == pytest.approx(1.0)
+    clock.now += 2.0
+    assert deadline.expired
+    assert deadline.remaining() == 0.0
+
+
+def test_pipeline_passes_remaining_budget_to_next_stage() -> None:
+    clock = FakeClock()
+    generator = RecordingGenerator()
+    pipeline = _pipeline(clock, latency=3.0, generator=generator)
+
+    pipeline._orchestrate_and_save(
+        DummyMessage(), SessionState(session_id="s1"), deadline=Deadline.start(5.0, clock=clock)
+    )
+
+    assert generator.timeouts == [pytest.approx(2.0)]
+
+
+def test_pipeline_skips_stages_after_deadline_expires() -> None:
+    clock = FakeClock()
+    generator = RecordingGenerator()
+    pipeline = _pipeline(clock, latency=6.0, generator=generator)
+
+    result = pipeline._orchestrate_and_save(
+        DummyMessage(), SessionState(session_id="s2"), deadline=Deadline.start(5.0, clock=clock)
+    )
+
+    assert generator.timeouts == []
+    assert result.response_options is None
+    assert result.master_decision is None
+    assert result.outcome == Outcome.AWAITING_USER
+
+
+class SlowAsyncLLM:
+    """Cliente OpenAI fake com latência injetada."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def generate_response(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text_content="lento", options=[], confidence=0.9)
+
+
+def test_async_pipeline_falls_back_when_budget_runs_out() -> None:
+    pipeline = PipelineAsyncV3(dedupe_store=MagicMock(), async_session_store=MagicMock())
+    pipeline._openai_client = SlowAsyncLLM(latency=1.0)
+    llm1 = SimpleNamespace(detected_intent=None)
+
+    started = time.monotonic()
+    result = asyncio.run(
+        pipeline._run_llm2_response_generation(
+            DummyMessage(), llm1, "INIT", "GENERATING_RESPONSE", deadline=Deadline.start(0.05)
+        )
+    )
+
+    assert time.monotonic() - started < 0.5
+    assert result.text_content != "lento"
+
+
+def test_latency_tracker_requires_min_samples() -> None:
+    tracker = LatencyTracker(window=100, min_samples=5)
+    for value in (0.1, 0.2, 0.3, 0.4):
+        tracker.record(value)
+    assert tracker.percentile(0.95) is None
+
+    tracker.record(1.0)
+    assert tracker.percentile(0.95) == 1.0
+    assert tracker.percentile(0.5) == 0.3
+
+
+def test_hedged_call_returns_fastest_attempt_and_cancels_slow_one() -> None:
+    attempts = [("primary", 0.5), ("hedge", 0.01)]
+    cancelled: list[str] = []
+
+    async def fake_llm() -> str:
+        name, latency = attempts.pop(0)
+        try:
+            await asyncio.sleep(latency)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return name
+
+    started = time.monotonic()
+    result = asyncio.run(hedged_call(fake_llm, hedge_delay=0.05))
+
+    assert result == "hedge"
+    assert time.monotonic() - started < 0.3
+    assert cancelled == ["primary"]
+
+
+def test_hedged_call_without_delay_runs_once() -> None:
+    calls = 0
+
+    async def fake_llm() -> str:
+        nonlocal calls
+        calls += 1
+        return "ok"
+
+    assert asyncio.run(hedged_call(fake_llm, hedge_delay=None)) == "ok"
+    assert calls == 1
+
+
+def test_expired_deadline_cancels_in_flight_llm_attempts() -> None:
+    flight = AsyncSingleFlight()
+    started: list[str] = []
+    cancelled: list[str] = []
+
+    async def fake_llm() -> str:
+        name = f"attempt-{len(started)}"
+        started.append(name)
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return name
+
+    async def scenario() -> None:
+        call = flight.do("k", lambda: hedged_call(fake_llm, hedge_delay=0.01))
+        with pytest.raises(TimeoutError):
+            await _within_deadline(call, Deadline.start(0.05))
+        await asyncio.sleep(0.01)  # deixa o cancelamento propagar
+
+        # Ainda dentro do loop: nenhuma chamada fica órfã consumindo vaga/tokens
+        assert started == ["attempt-0", "attempt-1"]
+        assert sorted(cancelled) == started
+
+    asyncio.run(scenario())
+
+
+def test_async_pipeline_deadline_starts_before_the_session_lease() -> None:
+    pipeline = PipelineAsyncV3(dedupe_store=InMemoryDedupeStore(), async_session_store=MagicMock())
+    received: list[Deadline] = []
+
+    async def leased(msg, deadline):
+        received.append(deadline)
+        return True
+
+    pipeline._process_message_leased = leased
+    message = {"id": "wamid.dl", "from": "5511900000002", "type": "text", "text": {"body": "oi"}}
+    payload = {"entry": [{"changes": [{"value": {"messages": [message]}}]}]}
+    deadline = Deadline.start(25.0)
+
+    summary = asyncio.run(pipeline.process_webhook(payload, deadline=deadline))
+
+    assert summary.total_processed == 1
+    assert received == [deadline]
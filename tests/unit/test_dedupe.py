@@ -17,6 +17,7 @@ from pyloto_corp.infra.dedupe import (
     RedisDedupeStore,
     create_dedupe_store,
 )
+from pyloto_corp.infra.dedupe_firestore import FirestoreDedupeStore
 
 
 class TestInMemoryDedupeStore:
@@ -286,3 +287,46 @@ class TestCreateDedupeStore:
 
             assert store is store_instance
             mock_store_cls.assert_called_once()
+
+
+class TestFirestoreDedupeStore:
+    """Testes para FirestoreDedupeStore com cliente fake."""
+
+    @staticmethod
+    def _store(existing: set[str]) -> tuple[FirestoreDedupeStore, MagicMock, MagicMock]:
+        client = MagicMock()
+
+        def document(key: str) -> MagicMock:
+            ref = MagicMock()
+            ref.id = key
+            return ref
+
+        def get_all(refs: list[MagicMock], transaction: object) -> list[MagicMock]:
+            return [MagicMock(id=ref.id, exists=ref.id in existing) for ref in refs]
+
+        client.collection.return_value.document.side_effect = document
+        client.get_all.side_effect = get_all
+        return FirestoreDedupeStore(client), client, client.transaction.return_value
+
+    def test_mark_many_if_new_uses_one_transaction(self) -> None:
+        """Lote inteiro numa transação: cria só as chaves novas, uma vez cada."""
+        store, client, tx = self._store(existing={"old"})
+
+        with patch("google.cloud.firestore.transactional", side_effect=lambda f: f):
+            results = store.mark_many_if_new(["a", "old", "b", "a"])
+
+        assert results == [True, False, True, False]
+        client.transaction.assert_called_once()
+        client.get_all.assert_called_once()
+        assert [call.args[0].id for call in tx.create.call_args_list] == ["a", "b"]
+
+    def test_mark_many_if_new_fail_closed_raises(self) -> None:
+        """Falha na transação com fail_closed=True levanta DedupeError."""
+        store, client, _ = self._store(existing=set())
+        client.get_all.side_effect = RuntimeError("unavailable")
+
+        with (
+            patch("google.cloud.firestore.transactional", side_effect=lambda f: f),
+            pytest.raises(DedupeError),
+        ):
+            store.mark_many_if_new(["a"])
@@ -0,0 +1,198 @@
+"""Testes do rastro inbound (escritas atômicas, ordem de início/fim, async)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+
+import pytest
+
+from pyloto_corp.infra.inbound_processing_log import (
+    FirestoreInboundProcessingLogStore,
+    MemoryInboundProcessingLogStore,
+    RedisInboundProcessingLogStore,
+)
+from pyloto_corp.infra.unit_of_work import unit_of_work
+
+
+class FakePipeline:
+    """Pipeline MULTI/EXEC: comandos aplicados juntos em `execute`."""
+
+    def __init__(self, client: FakeRedis) -> None:
+        self._client = client
+        self._commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, command: str):
+        def queue(*args: Any, **kwargs: Any) -> None:
+            self._commands.append((command, args, kwargs))
+
+        return queue
+
+    def execute(self) -> list[Any]:
+        with self._client.lock:
+            self._client.round_trips += 1
+            return [getattr(self._client, f"_{cmd}")(*a, **kw) for cmd, a, kw in self._commands]
+
+
+class FakeRedis:
+    """Redis mínimo com hashes; `get`/`set` diretos são proibidos (sem read-modify-write)."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.round_trips = 0
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        assert transaction
+        return FakePipeline(self)
+
+    def _hset(self, key: str, mapping: dict[str, str]) -> int:
+        self.hashes.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def _hsetnx(self, key: str, field: str, value: str) -> int:
+        current = self.hashes.setdefault(key, {})
+        if field in current:
+            return 0
+        current[field] = value
+        return 1
+
+    def _hdel(self, key: str, field: str) -> int:
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    def _expire(self, key: str, ttl: int) -> bool:
+        self.ttls[key] = ttl
+        return True
+
+
+class FakeDoc:
+    def __init__(self, client: FakeFirestore, doc_id: str) -> None:
+        self._client = client
+        self._doc_id = doc_id
+
+    def set(self, data: dict[str, Any], merge: bool = False) -> None:
+        assert merge, "marcas do rastro devem ser merge writes"
+        self._client.round_trips += 1
+        self._client.docs.setdefault(self._doc_id, {}).update(data)
+
+
+class FakeFirestore:
+    def __init__(self) -> None:
+        self.round_trips = 0
+        self.docs: dict[str, dict[str, Any]] = {}
+
+    def collection(self, name: str) -> FakeFirestore:
+        return self
+
+    def document(self, doc_id: str) -> FakeDoc:
+        return FakeDoc(self, doc_id)
+
+
+def _start(store: Any) -> None:
+    store.mark_started("evt-1", "corr-1", "task-1")
+
+
+def _finish(store: Any, error: str | None = None) -> None:
+    store.mark_finished(
+        "evt-1", correlation_id=None, task_name=None, enqueued_outbound=True, error=error
+    )
+
+
+@pytest.mark.parametrize("finish_first", [False, True])
+def test_redis_start_and_finish_merge_in_any_order(finish_first: bool) -> None:
+    redis = FakeRedis()
+    store = RedisInboundProcessingLogStore(redis, ttl_seconds=60)
+
+    steps = [_finish, _start] if finish_first else [_start, _finish]
+    for step in steps:
+        step(store)
+
+    record = redis.hashes["inbound:log:evt-1"]
+    assert record["correlation_id"] == "corr-1"
+    assert record["task_name"] == "task-1"
+    assert record["enqueued_outbound"] == "1"
+    assert "finished_at" in record and "started_at" in record
+    assert redis.ttls["inbound:log:evt-1"] == 60
+    assert redis.round_trips == 2  # um pipeline por marca, sem GET
+
+
+def test_redis_success_clears_previous_error_and_joins_unit_of_work() -> None:
+    redis = FakeRedis()
+    store = RedisInboundProcessingLogStore(redis)
+    _start(store)
+    _finish(store, error="TimeoutError")
+    assert redis.hashes["inbound:log:evt-1"]["error"] == "TimeoutError"
+
+    with unit_of_work():
+        _finish(store)
+        assert redis.round_trips == 2
+
+    assert redis.round_trips == 3
+    assert "error" not in redis.hashes["inbound:log:evt-1"]
+
+
+def test_redis_concurrent_marks_from_threads_keep_all_fields() -> None:
+    redis = FakeRedis()
+    store = RedisInboundProcessingLogStore(redis)
+    barrier = threading.Barrier(2)
+
+    def run(step: Any) -> None:
+        barrier.wait()
+        step(store)
+
+    threads = [threading.Thread(target=run, args=(step,)) for step in (_start, _finish)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    record = redis.hashes["inbound:log:evt-1"]
+    assert {"started_at", "finished_at", "enqueued_outbound", "correlation_id"} <= set(record)
+
+
+@pytest.mark.parametrize("finish_first", [False, True])
+def test_firestore_marks_are_single_merge_writes(finish_first: bool) -> None:
+    firestore = FakeFirestore()
+    store = FirestoreInboundProcessingLogStore(firestore)
+
+    steps = [_finish, _start] if finish_first else [_start, _finish]
+    for step in steps:
+        step(store)
+
+    doc = firestore.docs["evt-1"]
+    assert doc["correlation_id"] == "corr-1"
+    assert doc["finished_at"] is not None
+    assert doc["started_at"] is not None
+    assert doc["enqueued_outbound"] is True
+    assert "expires_at" in doc
+    assert firestore.round_trips == 2
+
+
+def test_async_interface_for_memory_and_threaded_stores() -> None:
+    memory = MemoryInboundProcessingLogStore()
+    redis = FakeRedis()
+    redis_store = RedisInboundProcessingLogStore(redis)
+
+    async def scenario() -> None:
+        for store in (memory, redis_store):
+            await asyncio.gather(
+                store.mark_finished_async(
+                    "evt-1",
+                    correlation_id=None,
+                    task_name=None,
+                    enqueued_outbound=False,
+                    error="ValueError",
+                ),
+                store.mark_started_async("evt-1", "corr-1", "task-1"),
+            )
+
+    asyncio.run(scenario())
+
+    record = memory.get("evt-1")
+    assert record.correlation_id == "corr-1"
+    assert record.finished_at is not None
+    assert record.error == "ValueError"
+    assert redis.hashes["inbound:log:evt-1"]["error"] == "ValueError"
+    assert redis.hashes["inbound:log:evt-1"]["correlation_id"] == "corr-1"
@@ -0,0 +1,78 @@
+"""Testes de paridade do codec JSON (orjson x stdlib)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pyloto_corp.infra.cloud_tasks import CloudTaskDispatchError, _serialize_payload
+from pyloto_corp.utils import json_codec
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "fixtures" / "whatsapp" / "webhook"
+BACKENDS = [
+    pytest.param(
+        "orjson",
+        marks=pytest.mark.skipif(json_codec.orjson is None, reason="orjson não instalado"),
+    ),
+    "stdlib",
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request: pytest.FixtureRequest):
+    previous = json_codec.backend_name()
+    json_codec.set_backend(request.param)
+    yield request.param
+    json_codec.set_backend(previous)
+
+
+@pytest.mark.parametrize("fixture", sorted(p.name for p in FIXTURES_DIR.glob("*.json")))
+def test_roundtrip_matches_stdlib_on_webhook_fixtures(backend: str, fixture: str) -> None:
+    raw = (FIXTURES_DIR / fixture).read_bytes()
+    expected = json.loads(raw)
+
+    decoded = json_codec.loads(raw)
+
+    assert decoded == expected
+    assert json_codec.dumpb(decoded) == json.dumps(
+        expected, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    assert json_codec.dumps(decoded, sort_keys=True) == json.dumps(
+        expected, ensure_ascii=False, separators=(",", ":"), sort_keys=True
+    )
+
+
+def test_unicode_and_nested_values_match_stdlib(backend: str) -> None:
+    value = {"texto": 'ação 🚀 "aspas" \\ \n', "n": [1, 2.5, None, True], "v": {"x": -3}}
+
+    assert json_codec.loads(json_codec.dumps(value)) == value
+    assert json_codec.dumps(value) == json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def test_inputs_outside_fast_path_fall_back_to_stdlib(backend: str) -> None:
+    assert json_codec.dumps({1: "a"}) == '{"1":"a"}'
+    assert json_codec.dumps({"big": 2**70}) == f'{{"big":{2**70}}}'
+    assert json_codec.loads(b'{"x": NaN}')["x"] != json_codec.loads(b'{"x": NaN}')["x"]
+    assert json_codec.loads(memoryview(b"[1]")) == [1]
+
+
+def test_errors_match_stdlib_types(backend: str) -> None:
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads(b"{not json")
+    with pytest.raises(TypeError):
+        json_codec.dumpb({"obj": object()})
+    with pytest.raises(CloudTaskDispatchError):
+        _serialize_payload({"obj": object()})
+
+
+@pytest.mark.parametrize("raw", [b"\xff\xfe{", b'{"texto": "\xc3"}', bytearray(b"\x80")])
+def test_invalid_utf8_raises_json_decode_error(backend: str, raw: bytes) -> None:
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads(raw)
+
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        json_codec.set_backend("ujson")
@@ -0,0 +1,153 @@
+"""Testes do executor por chave (ordem por conversa, paralelismo entre conversas)."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from pyloto_corp.application.keyed_executor import KeyedExecutor
+from pyloto_corp.application.whatsapp_async import handle_inbound_task
+from pyloto_corp.infra.cloud_tasks import TaskMetadata
+
+
+def test_same_key_runs_in_submission_order() -> None:
+    executor = KeyedExecutor(max_concurrency=4)
+    seen: dict[str, list[int]] = {"a": [], "b": [], "c": []}
+    rng = random.Random(7)
+    items = [(key, idx) for idx in range(10) for key in seen]
+
+    async def work(item: tuple[str, int]) -> None:
+        await asyncio.sleep(rng.random() / 500)
+        seen[item[0]].append(item[1])
+
+    asyncio.run(executor.map(items, key=lambda item: item[0], fn=work))
+
+    assert all(order == list(range(10)) for order in seen.values())
+
+
+def test_same_key_never_overlaps_and_global_limit_holds() -> None:
+    executor = KeyedExecutor(max_concurrency=3)
+    active: dict[int, int] = {}
+
+    async def work(key: int) -> None:
+        active[key] = active.get(key, 0) + 1
+        assert active[key] == 1
+        await asyncio.sleep(0.005)
+        active[key] -= 1
+
+    asyncio.run(executor.map([i % 6 for i in range(30)], key=lambda k: k, fn=work))
+
+    assert executor.stats.max_in_flight == 3
+    assert executor.stats.completed == 30
+
+
+def test_different_keys_gain_throughput() -> None:
+    async def work(_: int) -> None:
+        await asyncio.sleep(0.02)
+
+    def elapsed(executor: KeyedExecutor, keys: list[int]) -> float:
+        started = time.perf_counter()
+        asyncio.run(executor.map(keys, key=lambda k: k, fn=work))
+        return time.perf_counter() - started
+
+    serial = elapsed(KeyedExecutor(max_concurrency=10), [0] * 20)
+    parallel = elapsed(KeyedExecutor(max_concurrency=10), list(range(20)))
+
+    assert parallel < serial / 4
+
+
+def test_map_returns_exceptions_in_input_order() -> None:
+    async def work(value: int) -> int:
+        if value == 1:
+            raise ValueError("boom")
+        return value * 10
+
+    results = asyncio.run(KeyedExecutor().map([0, 1, 2], key=lambda v: v, fn=work))
+
+    assert results[0] == 0
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 20
+
+
+def test_invalid_limit_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        KeyedExecutor(max_concurrency=0)
+
+
+class _Dispatcher:
+    def __init__(self, fail_for: str | None = None) -> None:
+        self.jobs: list[dict[str, Any]] = []
+        self.fail_for = fail_for
+
+    async def enqueue_outbound(self, job: dict[str, Any]) -> TaskMetadata:
+        if job["idempotency_key"] == self.fail_for:
+            raise RuntimeError("queue down")
+        await asyncio.sleep(0)
+        self.jobs.append(job)
+        return TaskMetadata(name=f"out-{job['idempotency_key']}", queue="whatsapp-outbound")
+
+
+def _payload(messages: list[tuple[str, str]]) -> dict[str, Any]:
+    value = {
+        "messages": [
+            {"id": msg_id, "from": sender, "type": "text", "text": {"body": f"texto {msg_id}"}}
+            for msg_id, sender in messages
+        ]
+    }
+    return {"object": "whatsapp_business_account", "entry": [{"changes": [{"value": value}]}]}
+
+
+def _orchestrator() -> MagicMock:
+    orchestrator = MagicMock()
+    orchestrator.process_message.side_effect = lambda message: MagicMock(
+        reply_text=f"resposta {message.message_id}", intent=None, outcome=None
+    )
+    return orchestrator
+
+
+def test_inbound_task_keeps_order_per_sender_with_executor() -> None:
+    messages = [(f"wamid.{i}", "5511000000001" if i % 2 else "5511000000002") for i in range(8)]
+    dispatcher = _Dispatcher()
+
+    result = asyncio.run(
+        handle_inbound_task(
+            _payload(messages),
+            "evt",
+            "corr",
+            dispatcher,
+            _orchestrator(),
+            executor=KeyedExecutor(max_concurrency=4),
+        )
+    )
+
+    assert result["processed"] == 8
+    assert result["outbound_tasks"] == [f"out-wamid.{i}" for i in range(8)]
+    for sender in ("+5511000000001", "+5511000000002"):
+        keys = [job["idempotency_key"] for job in dispatcher.jobs if job["to"] == sender]
+        assert keys == sorted(keys, key=lambda k: int(k.split(".")[1]))
+
+
+def test_inbound_task_raises_503_after_other_conversations_finish() -> None:
+    messages = [("wamid.0", "5511000000001"), ("wamid.1", "5511000000002")]
+    dispatcher = _Dispatcher(fail_for="wamid.0")
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            handle_inbound_task(
+                _payload(messages),
+                "evt",
+                "corr",
+                dispatcher,
+                _orchestrator(),
+                executor=KeyedExecutor(max_concurrency=2),
+            )
+        )
+
+    assert exc_info.value.status_code == 503
+    assert [job["idempotency_key"] for job in dispatcher.jobs] == ["wamid.1"]
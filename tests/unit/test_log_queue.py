@@ -0,0 +1,170 @@
+"""Testes do pipeline de logging assíncrono (fila limitada + listener em lotes)."""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+
+import pytest
+
+from pyloto_corp.observability.log_queue import BatchLogListener, BoundedQueueHandler
+from pyloto_corp.observability.logging import (
+    CorrelationIdFilter,
+    configure_logging,
+    logging_stats,
+    shutdown_logging,
+)
+from pyloto_corp.observability.middleware import _correlation_id
+
+
+class SlowSink:
+    """Stream lento: cada write custa `delay` segundos."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.lines: list[str] = []
+        self.writes = 0
+
+    def write(self, data: str) -> None:
+        time.sleep(self.delay)
+        self.writes += 1
+        self.lines.extend(line for line in data.splitlines() if line)
+
+    def flush(self) -> None:
+        return None
+
+
+def _logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test_log_queue.{id(handler)}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _pipeline(sink: SlowSink, maxsize: int = 1000, policy: str = "drop_new"):
+    log_queue: queue.Queue = queue.Queue(maxsize=maxsize)
+    handler = BoundedQueueHandler(log_queue, overflow_policy=policy)
+    handler.addFilter(CorrelationIdFilter("svc"))
+    formatter = logging.Formatter("%(message)s|%(correlation_id)s")
+    listener = BatchLogListener(log_queue, formatter, sink, batch_size=50)
+    return handler, listener
+
+
+def test_slow_sink_does_not_block_callers_and_flushes_on_stop() -> None:
+    sink = SlowSink(delay=0.05)
+    handler, listener = _pipeline(sink)
+    listener.start()
+    logger = _logger(handler)
+
+    started = time.perf_counter()
+    for i in range(200):
+        logger.info("event %s", i)
+    caller_elapsed = time.perf_counter() - started
+
+    listener.stop()
+
+    assert caller_elapsed < 0.05
+    assert len(sink.lines) == 200
+    assert sink.lines[0] == "event 0|"
+    assert sink.writes < 200  # escrito em lotes
+    assert listener.written == 200
+
+
+def test_correlation_id_is_captured_on_caller_thread() -> None:
+    sink = SlowSink()
+    handler, listener = _pipeline(sink)
+    listener.start()
+    logger = _logger(handler)
+
+    token = _correlation_id.set("cid-42")
+    try:
+        logger.info("hello")
+    finally:
+        _correlation_id.reset(token)
+    listener.stop()
+
+    assert sink.lines == ["hello|cid-42"]
+
+
+@pytest.mark.parametrize(("policy", "expected"), [("drop_new", "m0"), ("drop_oldest", "m2")])
+def test_bounded_queue_applies_overflow_policy(policy: str, expected: str) -> None:
+    sink = SlowSink()
+    handler, listener = _pipeline(sink, maxsize=3, policy=policy)
+    logger = _logger(handler)
+
+    for i in range(5):
+        logger.info("m%s", i)
+    listener.start()
+    listener.stop()
+
+    assert handler.dropped == 2
+    assert handler.enqueued == 3
+    assert sink.lines[0].startswith(expected)
+
+
+def test_invalid_overflow_policy_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(), overflow_policy="block")
+
+
+def test_configure_logging_async_flushes_on_shutdown(capsys: pytest.CaptureFixture) -> None:
+    configure_logging("INFO", "svc", async_enabled=True, queue_max_size=100)
+    try:
+        logging.getLogger("test_log_queue.async").info("async_event", extra={"k": 1})
+        shutdown_logging()
+
+        stats = logging_stats()
+        assert stats["enqueued"] == 1
+        assert stats["dropped"] == 0
+        record = json.loads(capsys.readouterr().err.strip())
+        assert record["message"] == "async_event"
+        assert record["service"] == "svc"
+    finally:
+        configure_logging("INFO", "svc")
+
+
+def test_reconfigure_does_not_lose_records_logged_meanwhile(capsys: pytest.CaptureFixture) -> None:
+    logger = logging.getLogger("test_log_queue.reconfigure")
+    done = threading.Event()
+    sent: list[int] = []
+
+    def produce() -> None:
+        seq = 0
+        while not done.is_set():
+            logger.info("seq", extra={"seq": seq})
+            sent.append(seq)
+            seq += 1
+
+    configure_logging("INFO", "svc", async_enabled=True, queue_max_size=1_000_000)
+    producer = threading.Thread(target=produce)
+    producer.start()
+    try:
+        for _ in range(20):
+            configure_logging("INFO", "svc", async_enabled=True, queue_max_size=1_000_000)
+        configure_logging("INFO", "svc")
+    finally:
+        done.set()
+        producer.join()
+        configure_logging("INFO", "svc")
+
+    lines = capsys.readouterr().err.splitlines()
+    written = [json.loads(line)["seq"] for line in lines if '"seq"' in line]
+    assert sorted(written) == sent
+
+
+def test_records_after_shutdown_are_written_directly(capsys: pytest.CaptureFixture) -> None:
+    configure_logging("INFO", "svc", async_enabled=True, queue_max_size=100)
+    try:
+        shutdown_logging()
+        logging.getLogger("test_log_queue.after").info("after_shutdown")
+
+        record = json.loads(capsys.readouterr().err.strip())
+        assert record["message"] == "after_shutdown"
+        assert record["service"] == "svc"
+        assert not any(isinstance(h, BoundedQueueHandler) for h in logging.getLogger().handlers)
+    finally:
+        configure_logging("INFO", "svc")
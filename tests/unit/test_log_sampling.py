@@ -0,0 +1,77 @@
+"""Testes de amostragem e limite de taxa por evento nos logs."""
+
+from __future__ import annotations
+
+import logging
+
+from pyloto_corp.observability.log_sampling import LogSamplingFilter
+from pyloto_corp.observability.logging import configure_logging, logging_stats
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _record(msg: str, level: int = logging.INFO, correlation_id: str = "") -> logging.LogRecord:
+    record = logging.LogRecord("test", level, __file__, 1, msg, None, None)
+    record.correlation_id = correlation_id
+    return record
+
+
+def test_unconfigured_events_always_pass() -> None:
+    sampler = LogSamplingFilter(sample_rates={"hot": 0.0})
+    assert sampler.filter(_record("other_event"))
+
+
+def test_sample_rate_is_deterministic_per_correlation_id() -> None:
+    sampler = LogSamplingFilter(sample_rates={"hot": 0.5})
+
+    decisions = {
+        cid: sampler.filter(_record("hot", correlation_id=cid)) for cid in map(str, range(200))
+    }
+    repeated = {cid: sampler.filter(_record("hot", correlation_id=cid)) for cid in decisions}
+
+    assert decisions == repeated
+    assert 60 < sum(decisions.values()) < 140
+    assert sampler.stats()["hot"]["sampled_out"] == 2 * (200 - sum(decisions.values()))
+
+
+def test_rate_limit_caps_events_per_second() -> None:
+    clock = FakeClock()
+    sampler = LogSamplingFilter(rate_limits={"hot": 5}, clock=clock)
+
+    first_second = [sampler.filter(_record("hot")) for _ in range(20)]
+    clock.now = 1.0
+    next_second = [sampler.filter(_record("hot")) for _ in range(20)]
+
+    assert sum(first_second) == 5
+    assert sum(next_second) == 5
+    assert sampler.stats()["hot"]["rate_limited"] == 30
+
+
+def test_warnings_and_flagged_correlation_ids_bypass_sampling() -> None:
+    sampler = LogSamplingFilter(sample_rates={"hot": 0.0}, always_log_correlation_ids=["debug-me"])
+
+    assert sampler.filter(_record("hot", level=logging.WARNING))
+    assert sampler.filter(_record("hot", correlation_id="debug-me"))
+    assert not sampler.filter(_record("hot", correlation_id="someone-else"))
+
+    sampler.flag_correlation_id("someone-else")
+    assert sampler.filter(_record("hot", correlation_id="someone-else"))
+
+
+def test_configure_logging_installs_sampler_and_reports_suppressed() -> None:
+    configure_logging("INFO", "svc", sample_rates={"hot_event": 0.0})
+    try:
+        logger = logging.getLogger("test_log_sampling")
+        for _ in range(3):
+            logger.info("hot_event")
+        logger.error("hot_event")
+
+        assert logging_stats()["suppressed"] == {"hot_event": {"sampled_out": 3, "rate_limited": 0}}
+    finally:
+        configure_logging("INFO", "svc")
@@ -0,0 +1,135 @@
+"""Testes do roteamento de modelo por complexidade (stubs de modelo)."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from pyloto_corp.ai.model_router import (
+    LLMStage,
+    ModelRouter,
+    RouteSignals,
+    set_model_router,
+)
+from pyloto_corp.ai.openai_client import OpenAIClientManager
+from pyloto_corp.application.state_selector import select_next_state
+from pyloto_corp.domain.conversation_state import ConversationState, StateSelectorInput
+
+
+@pytest.fixture
+def router():
+    router = ModelRouter(fast_model="stub-fast", strong_model="stub-strong")
+    set_model_router(router)
+    yield router
+    set_model_router(None)
+
+
+class StubModels:
+    """Stub de modelos: registra o modelo recebido e responde JSON fixo."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.models: list[str | None] = []
+        self.fail = fail
+
+    def complete(self, prompt, model=None):
+        self.models.append(model)
+        if self.fail:
+            raise RuntimeError("stub_failure")
+        return {"selected_state": "AWAITING_USER", "confidence": 0.9, "status": "in_progress"}
+
+
+def _selector_input(text: str) -> StateSelectorInput:
+    return StateSelectorInput(
+        current_state=ConversationState.AWAITING_USER,
+        possible_next_states=[ConversationState.AWAITING_USER, ConversationState.HANDOFF_HUMAN],
+        message_text=text,
+    )
+
+
+def test_simple_signals_use_fast_model(router: ModelRouter) -> None:
+    route = router.route(LLMStage.STATE_SELECTION, RouteSignals(message_length=20))
+    assert (route.model, route.tier, route.reason) == ("stub-fast", "fast", "simple")
+
+
+@pytest.mark.parametrize(
+    ("stage", "signals", "reason"),
+    [
+        (LLMStage.EVENT_DETECTION, RouteSignals(message_length=1000), "long_message"),
+        (LLMStage.STATE_SELECTION, RouteSignals(precheck_confidence=0.3), "low_confidence"),
+        (LLMStage.RESPONSE_GENERATION, RouteSignals(fsm_state="HANDOFF_HUMAN"), "complex_state"),
+    ],
+)
+def test_complex_signals_escalate_to_strong_model(
+    router: ModelRouter, stage: LLMStage, signals: RouteSignals, reason: str
+) -> None:
+    route = router.route(stage, signals)
+    assert (route.model, route.reason) == ("stub-strong", reason)
+
+
+def test_trivial_stages_ignore_confidence_and_state(router: ModelRouter) -> None:
+    signals = RouteSignals(precheck_confidence=0.1, fsm_state="HANDOFF_HUMAN")
+    assert router.route(LLMStage.MESSAGE_TYPE_SELECTION, signals).model == "stub-fast"
+
+
+def test_explicit_and_stage_models_take_precedence() -> None:
+    router = ModelRouter(
+        fast_model="stub-fast",
+        strong_model="stub-strong",
+        stage_models={LLMStage.MASTER_DECISION: "stub-master"},
+    )
+    long_msg = RouteSignals(message_length=1000)
+
+    assert router.route(LLMStage.MASTER_DECISION, long_msg).model == "stub-master"
+    assert router.route(LLMStage.MASTER_DECISION, long_msg, model="stub-x").model == "stub-x"
+
+
+def test_without_strong_model_there_is_no_escalation() -> None:
+    router = ModelRouter(fast_model="stub-fast")
+    route = router.route(LLMStage.STATE_SELECTION, RouteSignals(message_length=1000))
+    assert (route.model, route.reason) == ("stub-fast", "long_message")
+
+
+def test_state_selector_routes_by_precheck_confidence(router: ModelRouter) -> None:
+    stub = StubModels()
+
+    select_next_state(_selector_input("tudo certo"), stub, correlation_id="c1")
+    select_next_state(_selector_input("agora outra coisa"), stub, correlation_id="c2")
+
+    assert stub.models == ["stub-fast", "stub-strong"]
+    stats = router.snapshot()
+    assert stats["state_selection:stub-fast"]["calls"] == 1
+    assert stats["state_selection:stub-strong"]["calls"] == 1
+
+
+def test_route_errors_are_accounted(router: ModelRouter) -> None:
+    select_next_state(_selector_input("oi"), StubModels(fail=True), correlation_id="c3")
+
+    stats = router.snapshot()["state_selection:stub-fast"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 1
+
+
+class StubCompletions:
+    def __init__(self) -> None:
+        self.models: list[str] = []
+
+    async def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        message = SimpleNamespace(content='{"event": "USER_SENT_TEXT"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_openai_client_uses_routed_model_per_stage(router: ModelRouter) -> None:
+    stub = StubCompletions()
+    manager = OpenAIClientManager(api_key="test-key", model_router=router)
+    manager._client = SimpleNamespace(chat=SimpleNamespace(completions=stub))
+
+    asyncio.run(manager.detect_event("oi"))
+    asyncio.run(manager.detect_event("x" * 1000))
+
+    assert stub.models == ["stub-fast", "stub-strong"]
+    stats = manager.route_stats()
+    assert stats["event_detection:stub-fast"]["calls"] == 1
+    assert stats["event_detection:stub-strong"]["errors"] == 0
@@ -0,0 +1,208 @@
+"""Testes do limitador adaptativo OpenAI (token buckets, AIMD, Retry-After)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from pyloto_corp.ai import openai_rate_limit
+from pyloto_corp.ai.openai_client import OpenAIClientManager
+from pyloto_corp.ai.openai_rate_limit import OpenAIRateLimiter
+from pyloto_corp.ai.rate_limiter import (
+    LLMRateLimitExceeded,
+    ModelRateLimiter,
+    TokenBucket,
+    parse_retry_after,
+)
+from pyloto_corp.application import state_selector
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _rate_limit_error(retry_after: str = "0.05") -> openai.RateLimitError:
+    """Cria RateLimitError sem depender da implementação HTTP do SDK."""
+    exc = openai.RateLimitError.__new__(openai.RateLimitError)
+    Exception.__init__(exc, "rate limited")
+    exc.status_code = 429
+    exc.response = SimpleNamespace(headers={"retry-after": retry_after})
+    return exc
+
+
+class Fake429Completions:
+    """Fake local da API: emite N respostas 429 antes de responder."""
+
+    def __init__(self, failures: int, retry_after: str = "0.05", delay: float = 0.0) -> None:
+        self.failures = failures
+        self.retry_after = retry_after
+        self.delay = delay
+        self.calls = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures > 0:
+                self.failures -= 1
+                raise _rate_limit_error(self.retry_after)
+            message = SimpleNamespace(content='{"event": "USER_SENT_TEXT"}')
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        finally:
+            self.concurrent -= 1
+
+
+def _limiter(**overrides) -> OpenAIRateLimiter:
+    params = {
+        "max_retries": 3,
+        "requests_per_minute": 60_000,
+        "tokens_per_minute": 10_000_000,
+        "max_concurrency": 4,
+        "queue_timeout_seconds": 2.0,
+    }
+    params.update(overrides)
+    return OpenAIRateLimiter(**params)
+
+
+def test_token_bucket_refills_over_time() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_second=10, capacity=10, clock=clock)
+
+    bucket.consume(10)
+    assert bucket.time_until_available(5) == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.time_until_available(5) == 0.0
+
+
+def test_parse_retry_after_variants() -> None:
+    assert parse_retry_after({"retry-after": "2"}) == 2.0
+    assert parse_retry_after({"retry-after-ms": "150"}) == pytest.approx(0.15)
+    assert parse_retry_after({"retry-after": "invalid"}) is None
+    assert parse_retry_after(None) is None
+
+
+def test_aimd_halves_on_429_and_grows_additively() -> None:
+    limiter = ModelRateLimiter(requests_per_minute=6000, tokens_per_minute=10**7, max_concurrency=8)
+    limiter.release(0.1, rate_limited=True, retry_after=0)
+    assert limiter.snapshot()["concurrency_limit"] == 4
+
+    limiter.release(0.1)
+    assert limiter.snapshot()["concurrency_limit"] == pytest.approx(4.25)
+
+
+def test_aimd_shrinks_when_latency_exceeds_target() -> None:
+    limiter = ModelRateLimiter(
+        requests_per_minute=6000,
+        tokens_per_minute=10**7,
+        max_concurrency=10,
+        target_latency_seconds=1.0,
+    )
+    limiter.release(5.0)
+    assert limiter.snapshot()["concurrency_limit"] == 9
+
+
+def test_queue_timeout_raises_when_paused_by_retry_after() -> None:
+    limiter = ModelRateLimiter(
+        requests_per_minute=6000,
+        tokens_per_minute=10**7,
+        max_concurrency=2,
+        queue_timeout_seconds=0.1,
+    )
+    limiter.release(0.1, rate_limited=True, retry_after=30)
+
+    with pytest.raises(LLMRateLimitExceeded):
+        asyncio.run(limiter.acquire(10))
+    assert limiter.snapshot()["timeouts"] == 1
+
+
+def test_run_retries_429_honouring_retry_after() -> None:
+    fake = Fake429Completions(failures=2, retry_after="0.05")
+    limiter = _limiter()
+
+    started = time.monotonic()
+    result = asyncio.run(limiter.run("gpt-4o-mini", 100, lambda: fake.create()))
+    elapsed = time.monotonic() - started
+
+    assert result.choices[0].message.content
+    assert fake.calls == 3
+    assert elapsed >= 0.1
+    stats = limiter.snapshot()["gpt-4o-mini"]
+    assert stats["rate_limited"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_run_gives_up_after_max_retries() -> None:
+    fake = Fake429Completions(failures=10, retry_after="0")
+    limiter = _limiter(max_retries=1)
+
+    with pytest.raises(openai.RateLimitError):
+        asyncio.run(limiter.run("gpt-4o-mini", 100, lambda: fake.create()))
+    assert fake.calls == 2
+
+
+def test_concurrency_is_capped_and_queue_depth_exposed() -> None:
+    fake = Fake429Completions(failures=0, delay=0.05)
+    limiter = _limiter(max_concurrency=2)
+    depths: list[int] = []
+
+    async def run() -> None:
+        tasks = [
+            asyncio.create_task(limiter.run("gpt-4o-mini", 10, lambda: fake.create()))
+            for _ in range(6)
+        ]
+        await asyncio.sleep(0.01)
+        depths.append(limiter.snapshot()["gpt-4o-mini"]["queue_depth"])
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    assert fake.max_concurrent <= 3
+    assert depths[0] >= 3
+    stats = limiter.snapshot()["gpt-4o-mini"]
+    assert stats["acquired"] == 6
+    assert stats["max_wait_ms"] > 0
+
+
+def test_client_manager_falls_back_under_persistent_429() -> None:
+    fake = Fake429Completions(failures=100, retry_after="0")
+    manager = OpenAIClientManager(api_key="test-key", rate_limiter=_limiter(max_retries=1))
+    manager._client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+
+    result = asyncio.run(manager.detect_event("oi"))
+
+    assert result is not None
+    assert fake.calls == 2
+    assert manager.rate_limiter_stats()["gpt-4o-mini"]["rate_limited"] == 2
+
+
+def test_sync_llm_helper_runs_under_shared_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = Fake429Completions(failures=1, retry_after="0")
+
+    class SyncCompletions:
+        def create(self, **kwargs):
+            return asyncio.run(fake.create(**kwargs))
+
+    limiter = _limiter()
+    monkeypatch.setattr(openai_rate_limit, "_openai_rate_limiter", limiter)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SyncCompletions()))
+
+    result = state_selector._call_llm(client, "prompt", model="gpt-4o-mini")
+
+    assert result == {"event": "USER_SENT_TEXT"}
+    assert fake.calls == 2
+    stats = limiter.snapshot()["gpt-4o-mini"]
+    assert stats["rate_limited"] == 1
+    assert stats["in_flight"] == 0
@@ -0,0 +1,170 @@
+"""Testes do envio outbound em lote contra uma Graph API fake (httpx.MockTransport)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from pyloto_corp.adapters.whatsapp.http_client import WhatsAppHttpClient, _parse_meta_error
+from pyloto_corp.adapters.whatsapp.models import OutboundMessageRequest
+from pyloto_corp.adapters.whatsapp.outbound import WhatsAppOutboundClient
+from pyloto_corp.adapters.whatsapp.rate_shaper import OutboundRateShaper
+from pyloto_corp.config.settings import Settings
+from pyloto_corp.infra.http import HttpClientConfig
+
+
+class FakeClock:
+    """Relógio + sleep fake: o sleep só avança o tempo."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeGraphApi:
+    """Graph API mínima: responde wamid por destinatário e simula rate limits."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.received: list[str] = []
+        self.rate_limit_once: dict[str, int] = {}  # destinatário -> código Meta
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        to = body["to"]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        self.received.append(to)
+
+        code = self.rate_limit_once.pop(to, None)
+        if code is not None:
+            error = {"message": "rate limit hit", "type": "OAuthException", "code": code}
+            return httpx.Response(400, json={"error": error})
+        return httpx.Response(200, json={"messages": [{"id": f"wamid.{to}"}]})
+
+
+@pytest.fixture
+def settings(monkeypatch: pytest.MonkeyPatch) -> Settings:
+    settings = Settings(
+        whatsapp_phone_number_id="1234567890",
+        whatsapp_access_token="test-token",
+        whatsapp_rate_limit_max_retries=2,
+    )
+    monkeypatch.setattr("pyloto_corp.config.settings.get_settings", lambda: settings)
+    return settings
+
+
+def _client(api: FakeGraphApi) -> WhatsAppOutboundClient:
+    http = WhatsAppHttpClient(
+        config=HttpClientConfig(max_retries=0), transport=httpx.MockTransport(api)
+    )
+    return WhatsAppOutboundClient(
+        api_endpoint="https://graph.facebook.com",
+        access_token="test-token",
+        phone_number_id="1234567890",
+        http_client=http,
+    )
+
+
+def _request(to: str, **kwargs: Any) -> OutboundMessageRequest:
+    return OutboundMessageRequest(to=to, message_type="text", text="Olá", **kwargs)
+
+
+def test_batch_is_concurrent_bounded_and_ordered(settings: Settings) -> None:
+    api = FakeGraphApi(latency=0.01)
+    client = _client(api)
+    requests = [_request(f"+55119000000{i:02d}", idempotency_key=f"k{i}") for i in range(10)]
+    requests.insert(3, _request("invalid"))
+
+    results = asyncio.run(
+        client.send_batch(requests, max_concurrency=3, rate_shaper=OutboundRateShaper())
+    )
+
+    assert 1 < api.max_in_flight <= 3
+    assert [result.index for result in results] == list(range(11))
+    assert results[3].error_code == "VALIDATION_ERROR"
+    assert results[3].attempts == 0
+    sent = [result for result in results if result.success]
+    assert len(sent) == 10
+    assert sent[0].message_id == "wamid.+5511900000000"
+    assert sent[0].idempotency_key == "k0"
+    assert all(result.attempts == 1 and result.rate_limited == 0 for result in sent)
+
+
+def test_pair_rate_limit_pauses_only_that_recipient_and_retries(settings: Settings) -> None:
+    api = FakeGraphApi()
+    api.rate_limit_once["+5511900000001"] = 131056
+    clock = FakeClock()
+    shaper = OutboundRateShaper(clock=clock, sleep=clock.sleep)
+
+    results = asyncio.run(
+        _client(api).send_batch(
+            [_request("+5511900000001"), _request("+5511900000002")], rate_shaper=shaper
+        )
+    )
+
+    limited, other = results
+    assert limited.success and limited.attempts == 2 and limited.rate_limited == 1
+    assert limited.throttled_seconds == pytest.approx(6.0)
+    assert other.success and other.throttled_seconds == 0.0
+    assert shaper.snapshot()["penalties"] == 1
+
+
+def test_rate_limit_retries_are_bounded(settings: Settings) -> None:
+    class AlwaysLimited(FakeGraphApi):
+        async def __call__(self, request: httpx.Request) -> httpx.Response:
+            self.rate_limit_once[json.loads(request.content)["to"]] = 130429
+            return await super().__call__(request)
+
+    clock = FakeClock()
+    api = AlwaysLimited()
+    results = asyncio.run(
+        _client(api).send_batch(
+            [_request("+5511900000001")],
+            rate_shaper=OutboundRateShaper(clock=clock, sleep=clock.sleep),
+        )
+    )
+
+    assert results[0].error_code == "WHATSAPP_RATE_LIMITED"
+    assert results[0].attempts == settings.whatsapp_rate_limit_max_retries + 1
+    assert len(api.received) == 3
+
+
+def test_shaper_spaces_pair_and_number_throughput() -> None:
+    clock = FakeClock()
+    shaper = OutboundRateShaper(
+        messages_per_second=1000, pair_interval_seconds=6.0, pair_burst=2, clock=clock
+    )
+    assert [shaper.reserve("pn", "+551190000") for _ in range(4)] == [0.0, 0.0, 6.0, 12.0]
+    assert shaper.reserve("pn", "+551190001") == 0.0
+
+    slow = OutboundRateShaper(messages_per_second=2, clock=clock)
+    delays = [slow.reserve("pn", f"+55{i}") for i in range(4)]
+    assert delays == pytest.approx([0.0, 0.0, 0.5, 1.0])
+
+
+def test_meta_rate_limit_codes_are_transient() -> None:
+    for code in (131056, 130429, 80007, 4):
+        error = _parse_meta_error({"error": {"type": "OAuthException", "code": code}})
+        assert error.is_rate_limited
+        assert not error.is_permanent
+
+    auth = _parse_meta_error({"error": {"type": "OAuthException", "code": 190}})
+    assert auth.is_permanent and not auth.is_rate_limited
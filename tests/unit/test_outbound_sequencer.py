@@ -0,0 +1,285 @@
+"""Testes do sequenciamento outbound por destinatário contra uma Graph API fake."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from pyloto_corp.adapters.whatsapp import http_client as http_client_module
+from pyloto_corp.adapters.whatsapp.http_client import WhatsAppHttpClient
+from pyloto_corp.adapters.whatsapp.models import OutboundMessageRequest
+from pyloto_corp.adapters.whatsapp.outbound import WhatsAppOutboundClient
+from pyloto_corp.adapters.whatsapp.outbound_sequencer import (
+    SEQUENCE_ABORTED,
+    OutboundSequencer,
+    coalesce_text_requests,
+    set_outbound_sequencer,
+)
+from pyloto_corp.adapters.whatsapp.rate_shaper import OutboundRateShaper
+from pyloto_corp.application.whatsapp_async import handle_inbound_task, handle_outbound_task
+from pyloto_corp.config.settings import Settings
+from pyloto_corp.infra.cloud_tasks import TaskMetadata
+from pyloto_corp.infra.http import HttpClientConfig
+from pyloto_corp.infra.outbound_dedup_memory import InMemoryOutboundDedupeStore
+
+TO = "+5511900000001"
+
+
+class FakeClock:
+    """Relógio + sleep fake: o sleep só avança o tempo."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeGraphApi:
+    """Graph API mínima: registra (destinatário, texto) e simula erros Meta por texto."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.received: list[tuple[str, str]] = []
+        self.errors: dict[str, list[int]] = {}  # texto -> códigos Meta, um por tentativa
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        text = body.get("text", {}).get("body") or body.get("interactive", {}).get("body", {}).get(
+            "text", ""
+        )
+        await asyncio.sleep(self.latency)
+        self.received.append((body["to"], text))
+
+        codes = self.errors.get(text)
+        if codes:
+            error = {"message": "rejected", "type": "OAuthException", "code": codes.pop(0)}
+            return httpx.Response(400, json={"error": error})
+        return httpx.Response(200, json={"messages": [{"id": f"wamid.{len(self.received)}"}]})
+
+    def texts(self) -> list[str]:
+        return [text for _, text in self.received]
+
+
+@pytest.fixture
+def settings(monkeypatch: pytest.MonkeyPatch) -> Settings:
+    settings = Settings(
+        whatsapp_phone_number_id="1234567890",
+        whatsapp_access_token="test-token",
+        whatsapp_rate_limit_max_retries=1,
+    )
+    monkeypatch.setattr("pyloto_corp.config.settings.get_settings", lambda: settings)
+    return settings
+
+
+def _http(api: FakeGraphApi) -> WhatsAppHttpClient:
+    return WhatsAppHttpClient(
+        config=HttpClientConfig(max_retries=0), transport=httpx.MockTransport(api)
+    )
+
+
+def _client(api: FakeGraphApi) -> WhatsAppOutboundClient:
+    return WhatsAppOutboundClient(
+        api_endpoint="https://graph.facebook.com",
+        access_token="test-token",
+        phone_number_id="1234567890",
+        http_client=_http(api),
+    )
+
+
+def _sequencer(clock: FakeClock, **kwargs: Any) -> OutboundSequencer:
+    shaper = OutboundRateShaper(pair_burst=1, clock=clock, sleep=clock.sleep)
+    return OutboundSequencer(shaper, rate_limit_max_retries=1, **kwargs)
+
+
+def _text(text: str, key: str, to: str = TO) -> OutboundMessageRequest:
+    return OutboundMessageRequest(to=to, message_type="text", text=text, idempotency_key=key)
+
+
+def _buttons(text: str, key: str) -> OutboundMessageRequest:
+    return OutboundMessageRequest(
+        to=TO,
+        message_type="interactive",
+        interactive_type="button",
+        text=text,
+        buttons=[{"id": "sim", "title": "Sim"}],
+        idempotency_key=key,
+    )
+
+
+def test_coalesce_merges_consecutive_plain_texts_only() -> None:
+    requests = [
+        _text("a", "k1"),
+        _text("b", "k2"),
+        _buttons("confirma?", "k3"),
+        _text("c", "k4"),
+        _text("d", "k5", to="+5511900000002"),
+        _text("x" * 10, "k6", to="+5511900000002"),
+    ]
+
+    merged = coalesce_text_requests(requests, max_chars=12)
+
+    assert [(m.text, m.idempotency_key) for m in merged] == [
+        ("a\n\nb", "k1+1"),
+        ("confirma?", "k3"),
+        ("c", "k4"),
+        ("d", "k5"),
+        ("x" * 10, "k6"),
+    ]
+    assert coalesce_text_requests(requests, max_chars=0) == requests
+
+
+def test_sequence_is_coalesced_ordered_and_spaced_per_pair(settings: Settings) -> None:
+    api = FakeGraphApi()
+    clock = FakeClock()
+    requests = [_text("a", "k1"), _text("b", "k2"), _buttons("confirma?", "k3"), _text("c", "k4")]
+
+    results = asyncio.run(_sequencer(clock).send(_client(api), requests))
+
+    assert api.texts() == ["a\n\nb", "confirma?", "c"]
+    assert all(result.success for result in results)
+    assert results[0].source_keys == ("k1", "k2")
+    assert results[1].source_keys == ()
+    # pair_burst=1: cada envio seguinte ao mesmo usuário espera o pair rate
+    assert [result.throttled_seconds for result in results] == pytest.approx([0.0, 6.0, 6.0])
+
+
+def test_pair_rate_limit_backs_off_and_keeps_order(settings: Settings) -> None:
+    api = FakeGraphApi()
+    api.errors["primeira"] = [131056]
+    clock = FakeClock()
+    sequencer = _sequencer(clock, max_merge_chars=0)
+
+    results = asyncio.run(
+        sequencer.send(_client(api), [_text("primeira", "k1"), _text("segunda", "k2")])
+    )
+
+    assert api.texts() == ["primeira", "primeira", "segunda"]
+    assert results[0].success and results[0].rate_limited == 1
+    assert results[1].success
+    assert sequencer.shaper.snapshot()["penalties"] == 1
+
+
+def test_failure_stops_sequence_without_sending_later_parts(settings: Settings) -> None:
+    api = FakeGraphApi()
+    api.errors["primeira"] = [131056, 131056]
+    clock = FakeClock()
+
+    results = asyncio.run(
+        _sequencer(clock, max_merge_chars=0).send(
+            _client(api), [_text("primeira", "k1"), _text("segunda", "k2")]
+        )
+    )
+
+    assert api.texts() == ["primeira", "primeira"]
+    assert results[0].error_code == "WHATSAPP_PAIR_RATE_LIMITED"
+    assert results[1].error_code == SEQUENCE_ABORTED
+
+
+def test_concurrent_sequences_to_same_recipient_do_not_interleave(settings: Settings) -> None:
+    api = FakeGraphApi(latency=0.005)
+    sequencer = OutboundSequencer(OutboundRateShaper(), max_merge_chars=0)
+    client = _client(api)
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            sequencer.send(client, [_text(f"a{i}", f"a{i}") for i in range(3)]),
+            sequencer.send(client, [_text(f"b{i}", f"b{i}") for i in range(3)]),
+            sequencer.send(client, [_text("outro", "o1", to="+5511900000002")]),
+        )
+
+    asyncio.run(scenario())
+
+    same_user = [text for to, text in api.received if to == TO]
+    assert same_user in (["a0", "a1", "a2", "b0", "b1", "b2"], ["b0", "b1", "b2", "a0", "a1", "a2"])
+    assert sequencer.active_recipients() == 0
+
+
+class _Dispatcher:
+    def __init__(self) -> None:
+        self.jobs: list[dict[str, Any]] = []
+
+    async def enqueue_outbound(self, job: dict[str, Any]) -> TaskMetadata:
+        self.jobs.append(job)
+        return TaskMetadata(name=f"out-{job['idempotency_key']}", queue="whatsapp-outbound")
+
+
+def _payload(messages: list[tuple[str, str]]) -> dict[str, Any]:
+    value = {
+        "messages": [
+            {"id": msg_id, "from": sender, "type": "text", "text": {"body": f"texto {msg_id}"}}
+            for msg_id, sender in messages
+        ]
+    }
+    return {"object": "whatsapp_business_account", "entry": [{"changes": [{"value": value}]}]}
+
+
+def _orchestrator() -> MagicMock:
+    orchestrator = MagicMock()
+    orchestrator.process_message.side_effect = lambda message: MagicMock(
+        reply_text=f"resposta {message.message_id}", intent=None, outcome=None
+    )
+    return orchestrator
+
+
+def test_inbound_burst_becomes_one_sequenced_task_per_recipient() -> None:
+    messages = [("wamid.0", "5511900000001"), ("wamid.1", "5511900000002")]
+    messages.append(("wamid.2", "5511900000001"))
+    dispatcher = _Dispatcher()
+
+    result = asyncio.run(
+        handle_inbound_task(
+            _payload(messages), "evt", "corr", dispatcher, _orchestrator(), sequence_outbound=True
+        )
+    )
+
+    assert result["processed"] == 3
+    assert result["outbound_tasks"] == ["out-wamid.0+1", "out-wamid.1"]
+    burst, single = dispatcher.jobs
+    assert burst["to"] == TO
+    assert [part["idempotency_key"] for part in burst["parts"]] == ["wamid.0", "wamid.2"]
+    assert "to" not in burst["parts"][0]
+    assert single["idempotency_key"] == "wamid.1" and "parts" not in single
+
+
+def test_outbound_task_with_parts_resumes_after_rate_limit(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api = FakeGraphApi()
+    api.errors["segunda"] = [131056, 131056]
+    monkeypatch.setattr(http_client_module, "WhatsAppHttpClient", lambda: _http(api))
+    set_outbound_sequencer(_sequencer(FakeClock(), max_merge_chars=0))
+    store = InMemoryOutboundDedupeStore()
+    body = {
+        "to": TO,
+        "parts": [
+            {"message_type": "text", "text": "primeira", "idempotency_key": "k1"},
+            {"message_type": "text", "text": "segunda", "idempotency_key": "k2"},
+        ],
+        "idempotency_key": "k1+1",
+    }
+
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(handle_outbound_task(body, settings, store))
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.detail == "whatsapp_rate_limited"
+        assert store.get_status("k1") == "sent"
+        assert store.get_status("k2") == "pending"
+
+        result = asyncio.run(handle_outbound_task(body, settings, store))
+    finally:
+        set_outbound_sequencer(None)
+
+    assert api.texts() == ["primeira", "segunda", "segunda", "segunda"]
+    assert result["status"] == "sent" and len(result["message_ids"]) == 2
+    assert store.get_status("k2") == "sent"
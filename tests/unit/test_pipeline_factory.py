@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+from unittest.mock import MagicMock
+
+import redis
+
 from pyloto_corp.ai.orchestrator import AIOrchestrator
-from pyloto_corp.application.factories.pipeline_factory import build_whatsapp_pipeline
+from pyloto_corp.application.factories import pipeline_factory
+from pyloto_corp.application.factories.pipeline_factory import (
+    build_pipeline_async,
+    build_whatsapp_pipeline,
+)
 from pyloto_corp.application.pipeline import WhatsAppInboundPipeline
+from pyloto_corp.config.settings import Settings
 from pyloto_corp.infra.dedupe import InMemoryDedupeStore
+from pyloto_corp.infra.session_lock import RedisSessionLock, SessionLeaseManager
 from pyloto_corp.infra.session_store import InMemorySessionStore
 
 
@@ -23,3 +33,29 @@ def test_factory_uses_defaults_when_not_provided() -> None:
     # Apenas garantir que não explode quando chamado sem args
     pipeline = build_whatsapp_pipeline()
     assert isinstance(pipeline, WhatsAppInboundPipeline)
+
+
+def test_factory_builds_redis_session_lease_from_settings(monkeypatch) -> None:
+    client = MagicMock()
+    monkeypatch.setattr(redis, "from_url", lambda url, **kwargs: client)
+    settings = Settings(session_lock_backend="redis", redis_url="redis://localhost:6379/0")
+
+    pipeline = build_whatsapp_pipeline(
+        dedupe_store=InMemoryDedupeStore(),
+        session_store=InMemorySessionStore(),
+        orchestrator=AIOrchestrator(),
+        settings=settings,
+    )
+
+    lock = pipeline._session_manager._leases._lock
+    assert isinstance(lock, RedisSessionLock)
+    assert lock._redis is client
+
+
+def test_async_factory_wires_session_lease_from_settings(monkeypatch) -> None:
+    settings = Settings(session_lock_backend="memory")
+    monkeypatch.setattr(pipeline_factory, "get_settings", lambda: settings)
+
+    pipeline = build_pipeline_async(InMemoryDedupeStore(), InMemorySessionStore())
+
+    assert isinstance(pipeline._async_session_manager._leases, SessionLeaseManager)
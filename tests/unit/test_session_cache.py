@@ -0,0 +1,231 @@
+"""Testes do cache L1 de sessão (LRU + TTL, coerência por versão, write-behind)."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+from pyloto_corp.api.routes_async import _get_async_session_store
+from pyloto_corp.application.session import SessionState
+from pyloto_corp.application.session.manager import SessionManager
+from pyloto_corp.config.settings import Settings
+from pyloto_corp.domain.enums import Outcome
+from pyloto_corp.infra.session_cache import (
+    AsyncCachedSessionStore,
+    CachedSessionStore,
+    wrap_session_store,
+)
+from pyloto_corp.infra.session_contract_async import AsyncSessionStore
+from pyloto_corp.infra.session_store_memory import InMemorySessionStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingStore(InMemorySessionStore):
+    """Store em memória que conta leituras/escritas e isola cópias (como Redis)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.loads = 0
+        self.writes = 0
+
+    def load(self, session_id: str) -> SessionState | None:
+        self.loads += 1
+        session = super().load(session_id)
+        return session.model_copy(deep=True) if session is not None else None
+
+    def save(self, session: SessionState, ttl_seconds: int = 7200) -> None:
+        self.writes += 1
+        super().save(session.model_copy(deep=True), ttl_seconds)
+        session.version += 1
+
+    def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        self.writes += 1
+        stored = session.model_copy(deep=True)
+        if not super().compare_and_set(stored, ttl_seconds):
+            return False
+        session.version = stored.version
+        return True
+
+
+class AsyncCountingStore(AsyncSessionStore):
+    """Fachada assíncrona do `CountingStore`."""
+
+    def __init__(self) -> None:
+        self.sync = CountingStore()
+
+    async def load(self, session_id: str) -> SessionState | None:
+        return self.sync.load(session_id)
+
+    async def save(self, session: SessionState, ttl_seconds: int = 7200) -> None:
+        self.sync.save(session, ttl_seconds)
+
+    async def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+        return self.sync.compare_and_set(session, ttl_seconds)
+
+    async def delete(self, session_id: str) -> bool:
+        return self.sync.delete(session_id)
+
+    async def exists(self, session_id: str) -> bool:
+        return self.sync.exists(session_id)
+
+
+def _session(session_id: str = "sess-1", **kwargs: Any) -> SessionState:
+    return SessionState(session_id=session_id, outcome=Outcome.AWAITING_USER, **kwargs)
+
+
+def _cache(inner: CountingStore, **kwargs: Any) -> CachedSessionStore:
+    kwargs.setdefault("flush_interval_seconds", 0)
+    return CachedSessionStore(inner, **kwargs)
+
+
+def test_hits_return_independent_copies_and_count_ratio() -> None:
+    inner = CountingStore()
+    inner.save(_session())
+    cache = _cache(inner)
+
+    first = cache.load("sess-1")
+    first.current_state = "MUTATED"
+    second = cache.load("sess-1")
+
+    assert second.current_state != "MUTATED"
+    assert inner.loads == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert cache.stats.hit_ratio == 0.5
+
+
+def test_ttl_expiry_and_lru_eviction() -> None:
+    clock = FakeClock()
+    inner = CountingStore()
+    for session_id in ("a", "b", "c"):
+        inner.save(_session(session_id))
+    cache = _cache(inner, max_entries=2, ttl_seconds=10, clock=clock)
+
+    cache.load("a")
+    cache.load("b")
+    cache.load("a")  # "b" vira o menos recente
+    cache.load("c")
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+
+    loads = inner.loads
+    cache.load("b")
+    assert inner.loads == loads + 1
+
+    clock.now += 11
+    cache.load("b")
+    assert inner.loads == loads + 2
+
+
+def test_write_through_conflict_invalidates_stale_entry() -> None:
+    inner = CountingStore()
+    inner.save(_session(message_history=[{"message_id": "m1"}]))
+    cache = _cache(inner)
+    manager = SessionManager(cache)
+
+    local = cache.load("sess-1")
+    local.message_history.append({"message_id": "m3"})
+
+    # Outra instância grava direto no backend: a entrada do cache fica velha
+    other = inner.load("sess-1")
+    other.message_history.append({"message_id": "m2"})
+    assert inner.compare_and_set(other)
+
+    manager.persist(local)
+
+    stored = inner.load("sess-1")
+    assert [rec["message_id"] for rec in stored.message_history] == ["m1", "m2", "m3"]
+    assert cache.stats.invalidations == 1
+    assert cache.load("sess-1").version == stored.version
+
+
+def test_write_behind_defers_until_flush() -> None:
+    inner = CountingStore()
+    cache = _cache(inner, write_policy="behind")
+    session = _session()
+
+    assert cache.compare_and_set(session)
+    session.current_state = "TRIAGE"
+    assert cache.compare_and_set(session)
+    assert inner.writes == 0
+    assert cache.load("sess-1").current_state == "TRIAGE"
+
+    assert cache.flush() == 1
+    assert inner.writes == 1
+    assert inner.load("sess-1").current_state == "TRIAGE"
+    assert cache.load("sess-1").version == inner.load("sess-1").version == 1
+
+    stale = _session(version=0)
+    assert not cache.compare_and_set(stale)
+
+
+def test_write_behind_eviction_and_close_write_pending() -> None:
+    inner = CountingStore()
+    cache = _cache(inner, write_policy="behind", max_entries=1)
+
+    cache.save(_session("a"))
+    cache.save(_session("b"))  # evicta "a" (pendente) → grava no backend
+    assert inner.load("a") is not None
+    assert inner.load("b") is None
+
+    cache.close()
+    assert inner.load("b") is not None
+
+
+def test_wrap_session_store_respects_settings() -> None:
+    inner = InMemorySessionStore()
+    settings = SimpleNamespace(
+        session_cache_enabled=True,
+        session_cache_max_entries=10,
+        session_cache_ttl_seconds=5.0,
+        session_cache_write_policies={"redis": "through", "firestore": "behind"},
+        session_cache_flush_interval_seconds=0,
+    )
+
+    assert wrap_session_store(inner, settings, "memory") is inner
+    assert wrap_session_store(inner, settings, "redis").write_policy == "through"
+    assert wrap_session_store(inner, settings, "firestore").write_policy == "behind"
+
+    settings.session_cache_enabled = False
+    assert wrap_session_store(inner, settings, "redis") is inner
+
+
+def test_async_cache_serves_loads_and_invalidates_on_conflict() -> None:
+    inner = AsyncCountingStore()
+    cache = AsyncCachedSessionStore(inner)
+
+    async def scenario() -> None:
+        await cache.save(_session())
+        loaded = await cache.load("sess-1")
+        assert inner.sync.loads == 0
+        assert loaded.version == 1
+
+        # Outra instância grava no backend: o CAS da cópia velha falha e invalida
+        other = inner.sync.load("sess-1")
+        assert inner.sync.compare_and_set(other)
+        assert not await cache.compare_and_set(loaded)
+        assert (await cache.load("sess-1")).version == 2
+        assert inner.sync.loads == 2
+
+    asyncio.run(scenario())
+    assert cache.stats.hits == 1
+    assert cache.stats.invalidations == 1
+
+
+def test_async_task_route_reuses_one_cached_session_store() -> None:
+    state = SimpleNamespace(firestore_client=MagicMock())
+    request = SimpleNamespace(app=SimpleNamespace(state=state))
+    settings = Settings(session_cache_enabled=True)
+
+    store = _get_async_session_store(request, settings)
+
+    assert isinstance(store, AsyncCachedSessionStore)
+    assert _get_async_session_store(request, settings) is store
@@ -0,0 +1,250 @@
+"""Testes do lock distribuído de sessão (lease, renovação, backoff)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from google.api_core import exceptions as gcp_exceptions
+
+from pyloto_corp.application.session.manager import AsyncSessionManager, SessionManager
+from pyloto_corp.infra.session_lock import (
+    FirestoreSessionLock,
+    InMemorySessionLock,
+    RedisSessionLock,
+    SessionLeaseManager,
+    SessionLockError,
+    SessionLockTimeoutError,
+    create_session_lock,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_in_memory_lock_is_exclusive_until_expiry() -> None:
+    clock = FakeClock()
+    lock = InMemorySessionLock(clock=clock)
+
+    assert lock.try_acquire("chat", "a", ttl_ms=1000)
+    assert not lock.try_acquire("chat", "b", ttl_ms=1000)
+    assert lock.renew("chat", "a", ttl_ms=1000)
+    assert not lock.release("chat", "b")
+
+    clock.now += 2
+    assert not lock.renew("chat", "a", ttl_ms=1000)
+    assert lock.try_acquire("chat", "b", ttl_ms=1000)
+    assert not lock.release("chat", "a")
+    assert lock.release("chat", "b")
+
+
+def test_redis_lock_uses_set_nx_px_and_token_scripts() -> None:
+    redis = MagicMock()
+    redis.set.return_value = True
+    redis.eval.return_value = 1
+    lock = RedisSessionLock(redis)
+
+    assert lock.try_acquire("chat", "tok", ttl_ms=5000)
+    assert lock.renew("chat", "tok", ttl_ms=5000)
+    assert lock.release("chat", "tok")
+
+    redis.set.assert_called_once_with("session_lock:chat", "tok", nx=True, px=5000)
+    renew_call, release_call = redis.eval.call_args_list
+    assert "PEXPIRE" in renew_call.args[0]
+    assert renew_call.args[1:] == (1, "session_lock:chat", "tok", 5000)
+    assert "DEL" in release_call.args[0]
+    assert release_call.args[1:] == (1, "session_lock:chat", "tok")
+
+
+def _firestore(snapshot_data: dict | None) -> tuple[MagicMock, MagicMock]:
+    client = MagicMock()
+    doc_ref = client.collection.return_value.document.return_value
+    doc_ref.create.side_effect = gcp_exceptions.Conflict("exists")
+    snapshot = SimpleNamespace(
+        exists=snapshot_data is not None,
+        update_time="t1",
+        to_dict=lambda: snapshot_data,
+    )
+    doc_ref.get.return_value = snapshot
+    return client, doc_ref
+
+
+def test_firestore_lock_respects_active_lease() -> None:
+    future = datetime.now(tz=UTC) + timedelta(seconds=30)
+    client, doc_ref = _firestore({"token": "other", "expires_at": future})
+
+    assert not FirestoreSessionLock(client).try_acquire("chat", "tok", ttl_ms=1000)
+    doc_ref.update.assert_not_called()
+
+
+def test_firestore_lock_takes_over_expired_lease_with_precondition() -> None:
+    past = datetime.now(tz=UTC) - timedelta(seconds=1)
+    client, doc_ref = _firestore({"token": "other", "expires_at": past})
+
+    assert FirestoreSessionLock(client).try_acquire("chat", "tok", ttl_ms=1000)
+
+    client.write_option.assert_called_once_with(last_update_time="t1")
+    fields = doc_ref.update.call_args.args[0]
+    assert fields["token"] == "tok"
+    assert doc_ref.update.call_args.kwargs["option"] is client.write_option.return_value
+
+
+def test_firestore_lock_loses_takeover_race() -> None:
+    past = datetime.now(tz=UTC) - timedelta(seconds=1)
+    client, doc_ref = _firestore({"token": "other", "expires_at": past})
+    doc_ref.update.side_effect = gcp_exceptions.FailedPrecondition("changed")
+
+    assert not FirestoreSessionLock(client).try_acquire("chat", "tok", ttl_ms=1000)
+
+
+def test_firestore_release_only_for_owner() -> None:
+    client, doc_ref = _firestore({"token": "tok"})
+    lock = FirestoreSessionLock(client)
+
+    assert not lock.release("chat", "other")
+    assert lock.release("chat", "tok")
+    doc_ref.delete.assert_called_once()
+
+
+def test_acquire_gives_up_after_bounded_wait() -> None:
+    lock = InMemorySessionLock()
+    lock.try_acquire("chat", "holder", ttl_ms=60_000)
+    manager = SessionLeaseManager(
+        lock, wait_timeout_seconds=0.1, initial_backoff_seconds=0.01, max_backoff_seconds=0.02
+    )
+
+    started = time.monotonic()
+    with pytest.raises(SessionLockTimeoutError):
+        manager.acquire("chat")
+
+    assert 0.1 <= time.monotonic() - started < 0.5
+
+
+def test_concurrent_holders_do_not_lose_updates() -> None:
+    manager = SessionLeaseManager(InMemorySessionLock(), ttl_ms=1000, initial_backoff_seconds=0.001)
+    state = {"count": 0}
+
+    def worker() -> None:
+        for _ in range(5):
+            with manager.hold("chat"):
+                current = state["count"]
+                time.sleep(0.001)
+                state["count"] = current + 1
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert state["count"] == 20
+
+
+def test_lease_is_renewed_while_held() -> None:
+    lock = InMemorySessionLock()
+    manager = SessionLeaseManager(lock, ttl_ms=90)
+
+    with manager.hold("chat") as lease:
+        time.sleep(0.25)
+        assert not lock.try_acquire("chat", "intruder", ttl_ms=1000)
+        assert not lease.lost
+
+    assert lock.try_acquire("chat", "next", ttl_ms=1000)
+
+
+def test_lost_lease_is_flagged() -> None:
+    lock = MagicMock()
+    lock.try_acquire.return_value = True
+    lock.renew.return_value = False
+    manager = SessionLeaseManager(lock, ttl_ms=60)
+
+    with manager.hold("chat") as lease:
+        time.sleep(0.1)
+
+    assert lease.lost
+
+
+def test_async_hold_serializes_coroutines() -> None:
+    manager = SessionLeaseManager(InMemorySessionLock(), ttl_ms=1000, initial_backoff_seconds=0.001)
+    order: list[str] = []
+
+    async def worker(name: str) -> None:
+        async with manager.hold_async("chat"):
+            order.append(f"{name}:in")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}:out")
+
+    async def main() -> None:
+        await asyncio.gather(worker("a"), worker("b"))
+
+    asyncio.run(main())
+
+    assert order in (["a:in", "a:out", "b:in", "b:out"], ["b:in", "b:out", "a:in", "a:out"])
+
+
+def test_session_manager_lease_uses_chat_id_or_sender() -> None:
+    lease_manager = MagicMock()
+    manager = SessionManager(session_store=MagicMock(), lease_manager=lease_manager)
+
+    manager.lease(SimpleNamespace(chat_id="chat-1", from_number="5511"))
+    manager.lease(SimpleNamespace(chat_id=None, from_number="5511"))
+
+    assert [c.args[0] for c in lease_manager.hold.call_args_list] == ["chat-1", "5511"]
+
+
+def test_session_manager_lease_is_noop_without_manager() -> None:
+    with SessionManager(session_store=MagicMock()).lease(SimpleNamespace(chat_id="c")):
+        pass
+
+    async def main() -> None:
+        async with AsyncSessionManager(async_session_store=MagicMock()).lease(
+            SimpleNamespace(chat_id="c")
+        ):
+            pass
+
+    asyncio.run(main())
+
+
+def test_create_session_lock_requires_client() -> None:
+    assert isinstance(create_session_lock("memory"), InMemorySessionLock)
+    with pytest.raises(SessionLockError):
+        create_session_lock("redis")
+    with pytest.raises(SessionLockError):
+        create_session_lock("etcd")
+
+
+def test_async_pipeline_lease_timeout_does_not_consume_dedupe() -> None:
+    from pyloto_corp.application.pipeline_async import PipelineAsyncV3
+    from pyloto_corp.infra.dedupe import InMemoryDedupeStore
+
+    lock = InMemorySessionLock()
+    assert lock.try_acquire("5511900000001", "other-instance", 60_000)
+    leases = SessionLeaseManager(
+        lock, ttl_ms=1000, wait_timeout_seconds=0.02, initial_backoff_seconds=0.001
+    )
+    dedupe = InMemoryDedupeStore()
+    pipeline = PipelineAsyncV3(
+        dedupe_store=dedupe,
+        async_session_store=MagicMock(),
+        async_session_manager=AsyncSessionManager(
+            async_session_store=MagicMock(), lease_manager=leases
+        ),
+    )
+    message = {"id": "wamid.lease", "from": "5511900000001", "type": "text", "text": {"body": "oi"}}
+    payload = {"entry": [{"changes": [{"value": {"messages": [message]}}]}]}
+
+    with pytest.raises(SessionLockTimeoutError):
+        asyncio.run(pipeline.process_webhook(payload))
+
+    # O retry da task encontra a mensagem ainda não marcada
+    assert dedupe.mark_if_new("wamid.lease") is True
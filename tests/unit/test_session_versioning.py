@@ -0,0 +1,237 @@
+"""Testes do save otimista de sessão (versão, CAS e merge-and-retry)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google.api_core import exceptions as gcp_exceptions
+
+from pyloto_corp.application.session import SessionState
+from pyloto_corp.application.session.manager import AsyncSessionManager, SessionManager
+from pyloto_corp.application.session.merge import merge_concurrent_session
+from pyloto_corp.domain.enums import Outcome
+from pyloto_corp.domain.models import LeadProfile
+from pyloto_corp.domain.protocols.session_store import SessionConflictError
+from pyloto_corp.infra.session_store_firestore import FirestoreSessionStore
+from pyloto_corp.infra.session_store_firestore_async import AsyncFirestoreSessionStore
+from pyloto_corp.infra.session_store_memory import InMemorySessionStore
+from pyloto_corp.infra.session_store_redis import RedisSessionStore
+
+
+class FakeRedis:
+    """Redis mínimo: `eval` emula o script CAS (versão no JSON)."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    def setex(self, key: str, ttl: int, value: str) -> None:
+        self.data[key] = value
+
+    def eval(self, script: str, numkeys: int, key: str, expected: int, payload: str, ttl: int):
+        current = self.data.get(key)
+        if current is not None and json.loads(current).get("version", 0) != expected:
+            return 0
+        self.data[key] = payload
+        return 1
+
+
+class FakeFirestoreDoc:
+    """Documento com `update_time` e precondições como no Firestore."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] | None = None
+        self.update_time = 0
+
+    def get(self) -> SimpleNamespace:
+        data = dict(self.data) if self.data is not None else None
+        return SimpleNamespace(
+            exists=data is not None, update_time=self.update_time, to_dict=lambda: data
+        )
+
+    def set(self, payload: dict[str, Any]) -> None:
+        self._write(payload)
+
+    def create(self, payload: dict[str, Any]) -> None:
+        if self.data is not None:
+            raise gcp_exceptions.AlreadyExists("exists")
+        self._write(payload)
+
+    def update(self, payload: dict[str, Any], option: Any) -> None:
+        if self.data is None:
+            raise gcp_exceptions.NotFound("missing")
+        if option.last_update_time != self.update_time:
+            raise gcp_exceptions.FailedPrecondition("stale")
+        self._write({**self.data, **payload})
+
+    def _write(self, payload: dict[str, Any]) -> None:
+        self.data = dict(payload)
+        self.update_time += 1
+
+
+class FakeFirestore:
+    def __init__(self) -> None:
+        self.doc = FakeFirestoreDoc()
+
+    def collection(self, name: str) -> FakeFirestore:
+        return self
+
+    def document(self, doc_id: str) -> FakeFirestoreDoc:
+        return self.doc
+
+    def write_option(self, last_update_time: Any) -> SimpleNamespace:
+        return SimpleNamespace(last_update_time=last_update_time)
+
+
+def _session(**kwargs: Any) -> SessionState:
+    return SessionState(session_id="sess-1", outcome=Outcome.AWAITING_USER, **kwargs)
+
+
+def test_redis_cas_rejects_stale_writer() -> None:
+    store = RedisSessionStore(FakeRedis())
+    store.save(_session())
+
+    writer_a = store.load("sess-1")
+    writer_b = store.load("sess-1")
+    assert writer_a.version == writer_b.version == 1
+
+    assert store.compare_and_set(writer_a)
+    assert writer_a.version == 2
+    assert not store.compare_and_set(writer_b)
+    assert writer_b.version == 1
+    assert store.load("sess-1").version == 2
+
+
+def test_firestore_cas_uses_update_time_precondition() -> None:
+    client = FakeFirestore()
+    store = FirestoreSessionStore(client)
+    assert store.compare_and_set(_session())
+    assert client.doc.data["version"] == 1
+
+    writer_a = store.load("sess-1")
+    writer_b = store.load("sess-1")
+    assert store.compare_and_set(writer_a)
+    assert not store.compare_and_set(writer_b)
+
+    # Escritor concorrente entre a leitura e o update: precondição falha
+    writer_c = store.load("sess-1")
+    original_get = client.doc.get
+
+    def racing_get() -> SimpleNamespace:
+        snapshot = original_get()
+        client.doc.update_time += 1
+        return snapshot
+
+    client.doc.get = racing_get
+    assert not store.compare_and_set(writer_c)
+
+
+def test_memory_cas_and_plain_save_bump_version() -> None:
+    store = InMemorySessionStore()
+    session = _session()
+    store.save(session)
+    assert session.version == 1
+
+    stale = session.model_copy(update={"version": 0})
+    assert not store.compare_and_set(stale)
+    assert store.compare_and_set(session)
+    assert session.version == 2
+
+
+def test_memory_cas_detects_concurrent_writer_of_loaded_copies() -> None:
+    store = InMemorySessionStore()
+    store.save(_session())
+    writer_a = store.load("sess-1")
+    writer_b = store.load("sess-1")
+    assert writer_a is not writer_b
+
+    writer_a.current_state = "TRIAGE"
+    assert store.compare_and_set(writer_a)
+
+    assert not store.compare_and_set(writer_b)
+    assert store.load("sess-1").current_state == "TRIAGE"
+
+
+def _history(*message_ids: str) -> list[dict[str, Any]]:
+    return [{"received_at": None, "message_id": mid} for mid in message_ids]
+
+
+def test_merge_unions_history_and_keeps_local_decision() -> None:
+    remote = _session(
+        message_history=_history("m1", "m2"),
+        lead_profile=LeadProfile(name="Ana", city="Recife"),
+        current_state="INITIAL",
+        version=5,
+    )
+    local = _session(
+        message_history=_history("m1", "m3"),
+        lead_profile=LeadProfile(city="Olinda"),
+        current_state="TRIAGE",
+        version=4,
+    )
+
+    merge_concurrent_session(local, remote)
+
+    assert [rec["message_id"] for rec in local.message_history] == ["m1", "m2", "m3"]
+    assert local.current_state == "TRIAGE"
+    assert local.lead_profile.name == "Ana"
+    assert local.lead_profile.city == "Olinda"
+    assert local.version == 5
+
+
+def test_manager_merges_and_retries_on_concurrent_write() -> None:
+    store = RedisSessionStore(FakeRedis())
+    store.save(_session(message_history=_history("m1")))
+    manager_a = SessionManager(store)
+    manager_b = SessionManager(store)
+
+    session_a = store.load("sess-1")
+    session_b = store.load("sess-1")
+    session_a.message_history.extend(_history("m2"))
+    session_b.message_history.extend(_history("m3"))
+
+    manager_a.persist(session_a)
+    manager_b.persist(session_b)
+
+    stored = store.load("sess-1")
+    assert [rec["message_id"] for rec in stored.message_history] == ["m1", "m2", "m3"]
+    assert stored.version == 3
+
+
+def test_manager_raises_conflict_after_max_attempts() -> None:
+    class AlwaysConflicting(InMemorySessionStore):
+        def compare_and_set(self, session: SessionState, ttl_seconds: int = 7200) -> bool:
+            return False
+
+    store = AlwaysConflicting()
+    manager = SessionManager(store, settings=SimpleNamespace(session_save_max_attempts=2))
+
+    with pytest.raises(SessionConflictError):
+        manager.save_with_merge(_session())
+
+
+def test_async_manager_merges_concurrent_firestore_write() -> None:
+    client = FakeFirestore()
+    store = AsyncFirestoreSessionStore(client)
+    manager = AsyncSessionManager(store)
+
+    async def scenario() -> SessionState | None:
+        await store.save(_session(message_history=_history("m1")))
+        session_a = await store.load("sess-1")
+        session_b = await store.load("sess-1")
+        session_a.message_history.extend(_history("m2"))
+        session_b.message_history.extend(_history("m3"))
+        await manager.persist(session_a)
+        await manager.persist(session_b)
+        return await store.load("sess-1")
+
+    stored = asyncio.run(scenario())
+
+    assert [rec["message_id"] for rec in stored.message_history] == ["m1", "m2", "m3"]
+    assert stored.version == 3
@@ -0,0 +1,151 @@
+"""Testes do verificador de assinatura pré-chaveado (rotação e refresh)."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+
+import pytest
+
+from pyloto_corp.adapters.whatsapp.signature import (
+    WebhookSignatureVerifier,
+    verify_meta_signature,
+)
+from pyloto_corp.config.settings import Settings
+from pyloto_corp.infra.secrets import CachedSecretProvider
+
+BODY = b'{"object":"whatsapp_business_account","entry":[]}'
+
+
+def _headers(secret: str, body: bytes = BODY) -> dict[str, str]:
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return {"x-hub-signature-256": f"sha256={digest}"}
+
+
+class FakeProvider:
+    """Provider em memória; ausentes levantam RuntimeError como os reais."""
+
+    def __init__(self, secrets: dict[str, str]) -> None:
+        self.secrets = secrets
+        self.calls = 0
+        self.fail = False
+        self.failing: set[str] = set()  # falha transitória por nome (RuntimeError, como o GCP)
+
+    def get_secret(self, name: str, version: str = "latest") -> str:
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("secret manager down")
+        if name in self.failing or name not in self.secrets:
+            raise RuntimeError(f"Não foi possível acessar secret {name}")
+        return self.secrets[name]
+
+    def secret_exists(self, name: str) -> bool:
+        return name in self.secrets
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        _headers("current"),
+        _headers("other"),
+        {},
+        {"x-hub-signature-256": "md5=abc"},
+    ],
+)
+def test_matches_verify_meta_signature(headers: dict[str, str]) -> None:
+    verifier = WebhookSignatureVerifier(["current"])
+
+    assert verifier.verify(BODY, headers) == verify_meta_signature(BODY, headers, "current")
+
+
+def test_without_secrets_validation_is_skipped() -> None:
+    verifier = WebhookSignatureVerifier([None, ""])
+
+    assert not verifier.configured
+    assert verifier.verify(BODY, {}).skipped
+
+
+def test_rotation_accepts_current_and_previous_secret() -> None:
+    verifier = WebhookSignatureVerifier(["new", "old"])
+
+    assert verifier.verify(BODY, _headers("new")).valid
+    assert verifier.verify(BODY, _headers("old")).valid
+    assert verifier.verify(BODY, _headers("stranger")).error == "signature_mismatch"
+
+    verifier.set_secrets(["new"])
+    assert not verifier.verify(BODY, _headers("old")).valid
+
+
+def test_refresh_swaps_secrets_and_keeps_them_on_failure() -> None:
+    provider = FakeProvider({"WHATSAPP_WEBHOOK_SECRET": "v1"})
+    settings = Settings(whatsapp_webhook_secret="v1")
+    verifier = WebhookSignatureVerifier.from_settings(settings, provider)
+
+    provider.secrets = {
+        "WHATSAPP_WEBHOOK_SECRET": "v2",
+        "WHATSAPP_WEBHOOK_PREVIOUS_SECRET": "v1",
+    }
+    assert verifier.refresh()
+    assert verifier.verify(BODY, _headers("v2")).valid
+    assert verifier.verify(BODY, _headers("v1")).valid
+
+    provider.fail = True
+    assert not verifier.refresh()
+    assert verifier.refresh_failures == 1
+    assert verifier.verify(BODY, _headers("v2")).valid
+
+
+def test_refresh_keeps_keys_when_current_secret_fails_transiently() -> None:
+    provider = FakeProvider(
+        {"WHATSAPP_WEBHOOK_SECRET": "v2", "WHATSAPP_WEBHOOK_PREVIOUS_SECRET": "v1"}
+    )
+    verifier = WebhookSignatureVerifier.from_settings(Settings(), provider)
+    assert verifier.refresh()
+
+    provider.failing.add("WHATSAPP_WEBHOOK_SECRET")
+
+    assert not verifier.refresh()
+    assert verifier.verify(BODY, _headers("v2")).valid
+    assert verifier.verify(BODY, _headers("v1")).valid
+
+
+def test_refresh_skips_missing_previous_secret_without_reading_it() -> None:
+    provider = FakeProvider({"WHATSAPP_WEBHOOK_SECRET": "v2"})
+    verifier = WebhookSignatureVerifier.from_settings(Settings(), provider)
+
+    assert verifier.refresh()
+    assert provider.calls == 1
+    assert verifier.verify(BODY, _headers("v2")).valid
+
+
+def test_refresh_bypasses_secret_cache_ttl() -> None:
+    provider = FakeProvider({"WHATSAPP_WEBHOOK_SECRET": "v1"})
+    cached = CachedSecretProvider(provider, ttl_seconds=3600.0)
+    verifier = WebhookSignatureVerifier.from_settings(Settings(), cached)
+    assert verifier.refresh()
+
+    provider.secrets = {"WHATSAPP_WEBHOOK_SECRET": "v2"}
+
+    assert verifier.refresh()
+    assert verifier.verify(BODY, _headers("v2")).valid
+    assert not verifier.verify(BODY, _headers("v1")).valid
+
+
+def test_background_refresh_picks_up_rotated_secret() -> None:
+    provider = FakeProvider({"WHATSAPP_WEBHOOK_SECRET": "v2"})
+    verifier = WebhookSignatureVerifier(
+        ["v1"],
+        loader=lambda: [provider.get_secret("WHATSAPP_WEBHOOK_SECRET")],
+        refresh_interval_seconds=0.01,
+    )
+    verifier.start_refresh()
+    try:
+        deadline = time.monotonic() + 2.0
+        while not verifier.verify(BODY, _headers("v2")).valid and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        verifier.stop_refresh()
+
+    assert verifier.verify(BODY, _headers("v2")).valid
+    assert not verifier.verify(BODY, _headers("v1")).valid
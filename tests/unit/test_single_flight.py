@@ -0,0 +1,244 @@
+"""Testes de single-flight (coalescência de chamadas LLM idênticas)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyloto_corp.ai.single_flight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    coalesce_llm_call,
+    llm_call_key,
+    set_llm_single_flight,
+)
+from pyloto_corp.infra.single_flight_redis import RedisSingleFlight
+
+
+class SlowFakeLLM:
+    """LLM falso com latência e contador de chamadas reais."""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.calls = 0
+        self._delay = delay
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str) -> dict:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self._delay)
+        return {"echo": prompt}
+
+
+class FakeRedis:
+    """Subconjunto de comandos Redis usados pelo RedisSingleFlight."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+def test_llm_call_key_is_deterministic_and_hides_prompt() -> None:
+    key = llm_call_key("stage", "gpt-4o-mini", "CPF 123.456.789-10")
+    assert key == llm_call_key("stage", "gpt-4o-mini", "CPF 123.456.789-10")
+    assert key != llm_call_key("stage", "gpt-4o", "CPF 123.456.789-10")
+    assert "123" not in key
+
+
+def test_concurrent_identical_sync_calls_share_one_execution() -> None:
+    flight = SingleFlight()
+    llm = SlowFakeLLM(delay=0.1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "same-key", lambda: llm.complete("oi")) for _ in range(8)]
+        results = [f.result() for f in futures]
+
+    assert llm.calls == 1
+    assert all(result == {"echo": "oi"} for result in results)
+    assert flight.stats.leaders == 1
+    assert flight.stats.coalesced == 7
+
+
+def test_sequential_calls_are_not_cached() -> None:
+    flight = SingleFlight()
+    llm = SlowFakeLLM(delay=0)
+
+    flight.do("k", lambda: llm.complete("a"))
+    flight.do("k", lambda: llm.complete("a"))
+
+    assert llm.calls == 2
+
+
+def test_leader_error_is_propagated_to_followers() -> None:
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing() -> dict:
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("llm_down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "k", failing)
+        started.wait()
+        follower = pool.submit(flight.do, "k", failing)
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError):
+                future.result()
+
+
+def test_concurrent_identical_async_calls_share_one_execution() -> None:
+    flight = AsyncSingleFlight()
+    calls = 0
+
+    async def fake_completion() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "resposta"
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(flight.do("k", fake_completion) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert calls == 1
+    assert results == ["resposta"] * 5
+    assert flight.stats.coalesced == 4
+
+
+def test_async_follower_cancellation_does_not_cancel_leader() -> None:
+    flight = AsyncSingleFlight()
+
+    async def fake_completion() -> str:
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def run() -> str:
+        leader = asyncio.create_task(flight.do("k", fake_completion))
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(flight.do("k", fake_completion), timeout=0.01)
+        return await leader
+
+    assert asyncio.run(run()) == "ok"
+
+
+def test_async_call_is_cancelled_when_last_caller_gives_up() -> None:
+    flight = AsyncSingleFlight()
+    cancelled = asyncio.Event()
+
+    async def fake_completion() -> str:
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "ok"
+
+    async def run() -> None:
+        callers = [asyncio.create_task(flight.do("k", fake_completion)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        callers[0].cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled.is_set()  # ainda há um chamador esperando
+        callers[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=0.5)
+
+    asyncio.run(run())
+
+
+def test_coalesce_llm_call_uses_global_single_flight() -> None:
+    flight = SingleFlight()
+    set_llm_single_flight(flight)
+    llm = SlowFakeLLM(delay=0.1)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(
+                    coalesce_llm_call, "state_selector", None, "p", lambda: llm.complete("p")
+                )
+                for _ in range(4)
+            ]
+            [f.result() for f in futures]
+    finally:
+        set_llm_single_flight(None)
+
+    assert llm.calls == 1
+
+
+def test_redis_variant_followers_reuse_leader_result() -> None:
+    redis = FakeRedis()
+    llm = SlowFakeLLM(delay=0.1)
+    # Duas "instâncias" independentes compartilhando o mesmo Redis
+    instance_a = RedisSingleFlight(redis, poll_interval_seconds=0.01)
+    instance_b = RedisSingleFlight(redis, poll_interval_seconds=0.01)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(instance_a.do, "k", lambda: llm.complete("x"))
+        time.sleep(0.02)
+        second = pool.submit(instance_b.do, "k", lambda: llm.complete("x"))
+        results = [first.result(), second.result()]
+
+    assert llm.calls == 1
+    assert results == [{"echo": "x"}, {"echo": "x"}]
+    assert not any(key.startswith("llm_sf:lock:") for key in redis.data)
+
+
+def test_redis_variant_runs_again_after_flight_completes() -> None:
+    redis = FakeRedis()
+    llm = SlowFakeLLM(delay=0)
+    instance_a = RedisSingleFlight(redis)
+    instance_b = RedisSingleFlight(redis)
+
+    assert instance_a.do("k", lambda: llm.complete("x")) == {"echo": "x"}
+    assert instance_b.do("k", lambda: llm.complete("x")) == {"echo": "x"}
+
+    assert llm.calls == 2
+
+
+def test_redis_variant_falls_back_when_redis_fails() -> None:
+    class BrokenRedis(FakeRedis):
+        def set(self, key, value, nx=False, px=None, ex=None):
+            raise ConnectionError("down")
+
+    llm = SlowFakeLLM(delay=0)
+    flight = RedisSingleFlight(BrokenRedis())
+
+    assert flight.do("k", lambda: llm.complete("y")) == {"echo": "y"}
+    assert llm.calls == 1
+
+
+def test_redis_leader_keeps_result_when_publish_fails() -> None:
+    class PublishFailsRedis(FakeRedis):
+        def set(self, key, value, nx=False, px=None, ex=None):
+            if ":result:" in key:
+                raise ConnectionError("down")
+            return super().set(key, value, nx=nx, px=px, ex=ex)
+
+    redis = PublishFailsRedis()
+    llm = SlowFakeLLM(delay=0)
+
+    assert RedisSingleFlight(redis).do("k", lambda: llm.complete("z")) == {"echo": "z"}
+    assert llm.calls == 1
+    assert not any(key.startswith("llm_sf:lock:") for key in redis.data)
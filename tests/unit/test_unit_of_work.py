@@ -0,0 +1,224 @@
+"""Testes da unit of work por request (WriteBatch / MULTI e semântica de falha)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+
+import pytest
+
+from pyloto_corp.infra.decision_audit_store import FirestoreDecisionAuditStore
+from pyloto_corp.infra.inbound_processing_log import FirestoreInboundProcessingLogStore
+from pyloto_corp.infra.outbound_dedup_redis import RedisOutboundDedupeStore
+from pyloto_corp.infra.unit_of_work import (
+    FIRESTORE_BATCH_LIMIT,
+    UnitOfWork,
+    UnitOfWorkError,
+    async_unit_of_work,
+    current_unit_of_work,
+    unit_of_work,
+)
+
+
+class FakeDoc:
+    def __init__(self, client: FakeFirestore, path: str) -> None:
+        self._client = client
+        self.path = path
+
+    def set(self, data: dict[str, Any], merge: bool = False) -> None:
+        self._client.round_trips += 1
+        self._client.docs[self.path] = data
+
+
+class FakeBatch:
+    def __init__(self, client: FakeFirestore) -> None:
+        self._client = client
+        self._ops: list[tuple[FakeDoc, dict[str, Any]]] = []
+
+    def set(self, doc_ref: FakeDoc, data: dict[str, Any], merge: bool = False) -> None:
+        self._ops.append((doc_ref, data))
+
+    def commit(self) -> None:
+        self._client.round_trips += 1
+        if self._client.fail_commit:
+            raise RuntimeError("firestore down")
+        for doc_ref, data in self._ops:
+            self._client.docs[doc_ref.path] = data
+
+
+class FakeFirestore:
+    """Conta round trips: cada `set` direto e cada `commit` de batch."""
+
+    def __init__(self) -> None:
+        self.round_trips = 0
+        self.docs: dict[str, dict[str, Any]] = {}
+        self.fail_commit = False
+        self._collection = ""
+
+    def collection(self, name: str) -> FakeFirestore:
+        self._collection = name
+        return self
+
+    def document(self, doc_id: str) -> FakeDoc:
+        return FakeDoc(self, f"{self._collection}/{doc_id}")
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self._client = client
+        self._commands: list[tuple[str, Any]] = []
+
+    def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self._commands.append((key, value))
+
+    def execute(self) -> list[bool]:
+        self._client.round_trips += 1
+        self._client.data.update(self._commands)
+        return [True] * len(self._commands)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.round_trips = 0
+        self.data: dict[str, str] = {}
+        self.transactions: list[bool] = []
+
+    def set(self, key: str, value: str, ex: int | None = None) -> bool:
+        self.round_trips += 1
+        self.data[key] = value
+        return True
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        self.transactions.append(transaction)
+        return FakePipeline(self)
+
+
+def _request_writes(firestore: FakeFirestore, redis: FakeRedis) -> None:
+    """Escritas cegas típicas de um request com duas mensagens."""
+    audit = FirestoreDecisionAuditStore(firestore)
+    inbound_log = FirestoreInboundProcessingLogStore(firestore)
+    outbound = RedisOutboundDedupeStore(redis)
+    audit.append({"correlation_id": "m1", "final_state": "TRIAGE"})
+    audit.append({"correlation_id": "m2", "final_state": "TRIAGE"})
+    inbound_log.mark_finished("evt", correlation_id="c", task_name="t", enqueued_outbound=True)
+    outbound.mark_sent("m1", "wamid.1")
+    outbound.mark_failed("m2", "timeout")
+
+
+def test_without_unit_of_work_each_write_is_a_round_trip() -> None:
+    firestore, redis = FakeFirestore(), FakeRedis()
+    _request_writes(firestore, redis)
+
+    assert firestore.round_trips == 3
+    assert redis.round_trips == 2
+
+
+def test_unit_of_work_commits_one_batch_per_backend() -> None:
+    firestore, redis = FakeFirestore(), FakeRedis()
+
+    with unit_of_work() as uow:
+        _request_writes(firestore, redis)
+        assert firestore.round_trips == redis.round_trips == 0
+        assert len(uow) == 5
+
+    assert firestore.round_trips == 1
+    assert redis.round_trips == 1
+    assert redis.transactions == [True]  # MULTI/EXEC
+    assert len(firestore.docs) == 3
+    assert set(redis.data) == {"outbound:m1", "outbound:m2"}
+    assert uow.stats.commits == 2
+    assert current_unit_of_work() is None
+
+
+def test_firestore_batches_are_chunked_at_limit() -> None:
+    firestore = FakeFirestore()
+    uow = UnitOfWork()
+    for index in range(FIRESTORE_BATCH_LIMIT + 1):
+        uow.firestore_set(firestore, firestore.document(str(index)), {"i": index})
+
+    assert uow.flush() == 2
+    assert len(firestore.docs) == FIRESTORE_BATCH_LIMIT + 1
+
+
+def test_block_error_still_flushes_and_propagates() -> None:
+    firestore = FakeFirestore()
+    store = FirestoreInboundProcessingLogStore(firestore)
+
+    with pytest.raises(ValueError), unit_of_work():
+        store.mark_finished("evt", correlation_id=None, task_name=None, enqueued_outbound=False)
+        raise ValueError("boom")
+
+    assert firestore.round_trips == 1
+    assert "inbound_processing_logs/evt" in firestore.docs
+
+
+def test_flush_failure_raises_but_other_backends_commit() -> None:
+    firestore, redis = FakeFirestore(), FakeRedis()
+    firestore.fail_commit = True
+
+    with pytest.raises(UnitOfWorkError), unit_of_work():
+        _request_writes(firestore, redis)
+
+    assert redis.round_trips == 1
+    assert set(redis.data) == {"outbound:m1", "outbound:m2"}
+
+    uow = UnitOfWork()
+    uow.firestore_set(firestore, firestore.document("x"), {})
+    assert uow.try_flush() is False
+    assert len(uow) == 0
+
+
+def test_nested_blocks_and_worker_threads_share_the_unit_of_work() -> None:
+    firestore = FakeFirestore()
+    audit = FirestoreDecisionAuditStore(firestore)
+
+    async def request() -> None:
+        with unit_of_work() as outer:
+            with unit_of_work() as inner:
+                assert inner is outer
+            await asyncio.gather(
+                asyncio.to_thread(audit.append, {"correlation_id": "a"}),
+                asyncio.to_thread(audit.append, {"correlation_id": "b"}),
+            )
+            assert firestore.round_trips == 0
+
+    asyncio.run(request())
+
+    assert firestore.round_trips == 1
+    assert len(firestore.docs) == 2
+
+
+def test_async_unit_of_work_commits_off_the_event_loop() -> None:
+    commit_threads: list[int] = []
+
+    class ThreadRecordingFirestore(FakeFirestore):
+        def batch(self) -> FakeBatch:
+            batch = super().batch()
+            commit = batch.commit
+
+            def recording_commit() -> None:
+                commit_threads.append(threading.get_ident())
+                commit()
+
+            batch.commit = recording_commit
+            return batch
+
+    firestore = ThreadRecordingFirestore()
+
+    async def request() -> int:
+        async with async_unit_of_work() as uow:
+            uow.firestore_set(firestore, firestore.document("a"), {})
+            assert await uow.try_flush_async()
+            uow.firestore_set(firestore, firestore.document("b"), {})
+        assert current_unit_of_work() is None
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(request())
+
+    assert len(commit_threads) == 2
+    assert loop_thread not in commit_threads
+    assert set(firestore.docs) == {"/a", "/b"}
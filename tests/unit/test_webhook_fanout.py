@@ -0,0 +1,137 @@
+"""Testes do fan-out do webhook (uma task por mensagem/status)."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from pyloto_corp.application.whatsapp_async import compute_inbound_event_id, fan_out_webhook
+from pyloto_corp.infra.dedupe import InMemoryDedupeStore, RedisDedupeStore
+from tests.helpers.webhook import CaptureDispatcher, sign_webhook
+
+
+def _message(msg_id: str) -> dict[str, Any]:
+    return {"id": msg_id, "from": "5511999999999", "type": "text", "text": {"body": "oi"}}
+
+
+def _multi_entry_webhook() -> dict[str, Any]:
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [
+            {
+                "id": "waba-1",
+                "changes": [
+                    {
+                        "value": {
+                            "metadata": {"phone_number_id": "1"},
+                            "messages": [_message("wamid.A"), _message("wamid.B")],
+                        }
+                    }
+                ],
+            },
+            {
+                "id": "waba-2",
+                "changes": [
+                    {
+                        "value": {
+                            "metadata": {"phone_number_id": "2"},
+                            "messages": [_message("wamid.C")],
+                            "statuses": [{"id": "wamid.X", "status": "read"}],
+                        }
+                    }
+                ],
+            },
+        ],
+    }
+
+
+@pytest.fixture()
+def webhook_env() -> dict[str, str]:
+    return {"WEBHOOK_FANOUT_ENABLED": "true"}
+
+
+def _post(app, payload: dict[str, Any]):
+    body = json.dumps(payload).encode()
+    return TestClient(app).post(
+        "/webhooks/whatsapp", content=body, headers={"x-hub-signature-256": sign_webhook(body)}
+    )
+
+
+def test_fan_out_gives_each_event_its_own_key_and_metadata() -> None:
+    units = fan_out_webhook(_multi_entry_webhook())
+
+    assert [key for key, _ in units] == ["wamid.A", "wamid.B", "wamid.C", "status:wamid.X:read"]
+    for key, unit in units:
+        value = unit["entry"][0]["changes"][0]["value"]
+        assert sum(len(value.get(k, [])) for k in ("messages", "statuses")) == 1
+        if key.startswith("wamid."):
+            assert compute_inbound_event_id(unit, b"") == key
+    assert units[2][1]["entry"][0]["id"] == "waba-2"
+
+
+def test_fan_out_of_payload_without_events_uses_hash() -> None:
+    [(key, unit)] = fan_out_webhook({"entry": []})
+
+    assert key.startswith("payload:")
+    assert unit == {"entry": []}
+
+
+def test_ingress_enqueues_one_task_per_event(webhook_app) -> None:
+    response = _post(webhook_app, _multi_entry_webhook())
+
+    assert response.status_code == 200
+    assert response.json()["task_count"] == 4
+    tasks = webhook_app.state.tasks_dispatcher.inbound
+    assert sorted(task["inbound_event_id"] for task in tasks) == [
+        "status:wamid.X:read",
+        "wamid.A",
+        "wamid.B",
+        "wamid.C",
+    ]
+    # Cada task aponta para o webhook original (primeira mensagem)
+    assert {task["parent_event_id"] for task in tasks} == {"wamid.A"}
+    assert response.json()["inbound_event_id"] == "wamid.A"
+
+
+def test_retry_only_enqueues_new_events(webhook_app) -> None:
+    first = _multi_entry_webhook()
+    _post(webhook_app, first)
+    first["entry"][0]["changes"][0]["value"]["messages"].append(_message("wamid.D"))
+
+    body = _post(webhook_app, first).json()
+
+    assert body["task_count"] == 1
+    assert body["duplicates"] == 4
+    assert webhook_app.state.tasks_dispatcher.inbound[-1]["inbound_event_id"] == "wamid.D"
+
+
+def test_enqueue_failure_releases_only_failed_keys(webhook_app) -> None:
+    webhook_app.state.tasks_dispatcher = CaptureDispatcher(fail_ids={"wamid.B"})
+
+    response = _post(webhook_app, _multi_entry_webhook())
+
+    assert response.status_code == 503
+    dedupe: InMemoryDedupeStore = webhook_app.state.dedupe_store
+    assert not dedupe.is_duplicate("wamid.B")
+    assert dedupe.is_duplicate("wamid.A")
+    assert dedupe.is_duplicate("wamid.C")
+
+
+def test_redis_mark_many_uses_single_pipeline() -> None:
+    store = RedisDedupeStore("redis://localhost:6379/0", ttl_seconds=60)
+    client = MagicMock()
+    client.pipeline.return_value.execute.return_value = [True, None, True]
+    store._client = client
+
+    assert store.mark_many_if_new(["a", "b", "c"]) == [True, False, True]
+    client.pipeline.assert_called_once_with(transaction=False)
+    assert client.pipeline.return_value.set.call_count == 3
+    client.pipeline.return_value.set.assert_any_call("dedupe:a", "1", nx=True, ex=60)
+
+
+def test_in_memory_mark_many_treats_repeated_key_as_duplicate() -> None:
+    assert InMemoryDedupeStore().mark_many_if_new(["a", "a", "b"]) == [True, False, True]
@@ -0,0 +1,183 @@
+"""Testes dos limites do webhook (corpo em streaming e eventos por task)."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from pyloto_corp.adapters.whatsapp.webhook_split import (
+    count_webhook_events,
+    split_webhook_payload,
+)
+from pyloto_corp.application.whatsapp_async import RAW_INGRESS_HEADER
+from tests.helpers.webhook import sign_webhook
+
+
+def _webhook(messages: int, statuses: int = 0) -> dict[str, Any]:
+    value = {
+        "messaging_product": "whatsapp",
+        "metadata": {"phone_number_id": "123"},
+        "contacts": [{"wa_id": "5511999999999"}],
+        "messages": [
+            {"id": f"wamid.{i}", "from": "5511999999999", "type": "text", "text": {"body": "oi"}}
+            for i in range(messages)
+        ],
+        "statuses": [{"id": f"wamid.s{i}", "status": "delivered"} for i in range(statuses)],
+    }
+    return {
+        "object": "whatsapp_business_account",
+        "entry": [{"id": "waba", "changes": [{"field": "messages", "value": value}]}],
+    }
+
+
+@pytest.fixture()
+def webhook_env() -> dict[str, str]:
+    return {"WEBHOOK_MAX_BODY_BYTES": "4096", "WEBHOOK_MAX_EVENTS_PER_TASK": "10"}
+
+
+def test_split_keeps_order_metadata_and_limit() -> None:
+    payload = _webhook(messages=25, statuses=7)
+
+    chunks = split_webhook_payload(payload, 10)
+
+    assert [count_webhook_events(chunk) for chunk in chunks] == [10, 10, 10, 2]
+    ids = [
+        event["id"]
+        for chunk in chunks
+        for entry in chunk["entry"]
+        for change in entry["changes"]
+        for key in ("messages", "statuses")
+        for event in change["value"].get(key, [])
+    ]
+    assert ids == [f"wamid.{i}" for i in range(25)] + [f"wamid.s{i}" for i in range(7)]
+    for chunk in chunks:
+        assert chunk["object"] == "whatsapp_business_account"
+        value = chunk["entry"][0]["changes"][0]["value"]
+        assert value["metadata"] == {"phone_number_id": "123"}
+        assert value["contacts"] == [{"wa_id": "5511999999999"}]
+
+
+def test_split_returns_same_payload_when_within_limit() -> None:
+    payload = _webhook(messages=3)
+
+    assert split_webhook_payload(payload, 10) == [payload]
+    assert split_webhook_payload(payload, 0)[0] is payload
+    assert split_webhook_payload({"entry": "invalid"}, 1) == [{"entry": "invalid"}]
+
+
+def test_declared_oversized_body_is_rejected_before_reading(webhook_app) -> None:
+    body = b"{" + b" " * 8192 + b"}"
+
+    response = TestClient(webhook_app).post(
+        "/webhooks/whatsapp", content=body, headers={"x-hub-signature-256": sign_webhook(body)}
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == "payload_too_large"
+    assert webhook_app.state.tasks_dispatcher.inbound == []
+
+
+def test_chunked_oversized_body_stops_streaming(webhook_app) -> None:
+    def body() -> Iterator[bytes]:
+        for _ in range(100):
+            yield b" " * 1024
+
+    response = TestClient(webhook_app).post("/webhooks/whatsapp", content=body())
+
+    assert response.status_code == 413
+    assert webhook_app.state.tasks_dispatcher.inbound == []
+
+
+def test_webhook_with_many_events_is_split_into_tasks(webhook_app) -> None:
+    body = json.dumps(_webhook(messages=12, statuses=5)).encode()
+
+    response = TestClient(webhook_app).post(
+        "/webhooks/whatsapp", content=body, headers={"x-hub-signature-256": sign_webhook(body)}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["task_count"] == 2
+    tasks = webhook_app.state.tasks_dispatcher.inbound
+    assert [count_webhook_events(task["payload"]) for task in tasks] == [10, 7]
+    assert [task["inbound_event_id"] for task in tasks] == ["wamid.0#1/2", "wamid.0#2/2"]
+
+
+def test_raw_task_with_many_events_is_split_by_worker(webhook_app) -> None:
+    body = json.dumps(_webhook(messages=25)).encode()
+
+    response = TestClient(webhook_app).post(
+        "/internal/process_inbound",
+        content=body,
+        headers={
+            RAW_INGRESS_HEADER: "1",
+            "X-Inbound-Event-Id": "wamid.0",
+            "X-Internal-Token": "internal",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["split"] == 3
+    tasks = webhook_app.state.tasks_dispatcher.inbound
+    assert [count_webhook_events(task["payload"]) for task in tasks] == [10, 10, 5]
+
+
+def test_partial_chunk_enqueue_failure_retries_only_failed_chunks(webhook_app) -> None:
+    dispatcher = webhook_app.state.tasks_dispatcher
+    dispatcher.fail_ids = {"wamid.0#2/3"}
+    body = json.dumps(_webhook(messages=25)).encode()
+    client = TestClient(webhook_app)
+
+    def post():
+        return client.post(
+            "/webhooks/whatsapp", content=body, headers={"x-hub-signature-256": sign_webhook(body)}
+        )
+
+    assert post().status_code == 503
+    assert [task["inbound_event_id"] for task in dispatcher.inbound] == [
+        "wamid.0#1/3",
+        "wamid.0#3/3",
+    ]
+
+    # Redelivery da Meta: só o pedaço que falhou é enfileirado de novo
+    dispatcher.fail_ids.clear()
+    response = post()
+    assert response.status_code == 200
+    assert response.json()["task_count"] == 1
+    assert dispatcher.inbound[-1]["inbound_event_id"] == "wamid.0#2/3"
+    assert len(dispatcher.inbound) == 3
+
+    assert post().json()["status"] == "duplicate"
+
+
+def test_worker_resplit_retry_enqueues_only_failed_chunks(webhook_app) -> None:
+    dispatcher = webhook_app.state.tasks_dispatcher
+    dispatcher.fail_ids = {"wamid.0#3/3"}
+    body = json.dumps(_webhook(messages=25)).encode()
+    client = TestClient(webhook_app)
+
+    def post():
+        return client.post(
+            "/internal/process_inbound",
+            content=body,
+            headers={
+                RAW_INGRESS_HEADER: "1",
+                "X-Inbound-Event-Id": "wamid.0",
+                "X-Internal-Token": "internal",
+            },
+        )
+
+    assert post().status_code == 503
+    assert len(dispatcher.inbound) == 2
+
+    # Retry do Cloud Tasks: pedaços já enfileirados não saem de novo
+    dispatcher.fail_ids.clear()
+    assert post().status_code == 200
+    assert [task["inbound_event_id"] for task in dispatcher.inbound] == [
+        "wamid.0#1/3",
+        "wamid.0#2/3",
+        "wamid.0#3/3",
+    ]
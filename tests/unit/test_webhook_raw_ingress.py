@@ -0,0 +1,105 @@
+"""Testes do ingress raw do webhook (varredura de bytes + task com corpo original)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from pyloto_corp.adapters.whatsapp.webhook_scan import scan_first_message_id
+from pyloto_corp.application.whatsapp_async import (
+    INBOUND_EVENT_ID_HEADER,
+    RAW_INGRESS_HEADER,
+    compute_inbound_event_id,
+    compute_inbound_event_id_raw,
+)
+from pyloto_corp.infra.cloud_tasks import _build_task
+from tests.helpers.webhook import CaptureDispatcher, sign_webhook
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "fixtures" / "whatsapp" / "webhook"
+
+
+@pytest.fixture()
+def webhook_env() -> dict[str, str]:
+    return {"WHATSAPP_VERIFY_TOKEN": "verify-token", "WEBHOOK_RAW_INGRESS_ENABLED": "true"}
+
+
+@pytest.mark.parametrize("fixture", sorted(p.name for p in FIXTURES_DIR.glob("*.json")))
+def test_raw_event_id_matches_parsed_event_id(fixture: str) -> None:
+    raw = (FIXTURES_DIR / fixture).read_bytes()
+
+    assert compute_inbound_event_id_raw(raw) == compute_inbound_event_id(json.loads(raw), raw)
+
+
+def test_scan_ignores_context_id_and_escaped_text() -> None:
+    message = {
+        "context": {"id": "wamid.ORIGINAL"},
+        "text": {"body": 'fake "id": "wamid.FAKE" } ] \\'},
+        "id": "wamid.REAL",
+    }
+    raw = json.dumps({"entry": [{"changes": [{"value": {"messages": [message]}}]}]}).encode()
+
+    assert scan_first_message_id(raw) == "wamid.REAL"
+
+
+def test_scan_returns_none_without_messages() -> None:
+    assert scan_first_message_id(b'{"entry": [{"changes": [{"value": {"statuses": []}}]}]}') is None
+    assert scan_first_message_id(b'{"messages": [{"id": "trunc') is None
+
+
+def test_raw_ingress_forwards_original_bytes(webhook_app) -> None:
+    client = TestClient(webhook_app)
+    dispatcher: CaptureDispatcher = webhook_app.state.tasks_dispatcher
+    raw = (FIXTURES_DIR / "text.single.json").read_bytes()
+
+    response = client.post(
+        "/webhooks/whatsapp", content=raw, headers={"X-Hub-Signature-256": sign_webhook(raw)}
+    )
+    duplicate = client.post(
+        "/webhooks/whatsapp", content=raw, headers={"X-Hub-Signature-256": sign_webhook(raw)}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["enqueued"] is True
+    assert duplicate.json()["status"] == "duplicate"
+    assert dispatcher.inbound == []
+    assert len(dispatcher.raw) == 1
+    task = dispatcher.raw[0]
+    assert task["body"] == raw
+    assert task["headers"][RAW_INGRESS_HEADER] == "1"
+    assert task["headers"][INBOUND_EVENT_ID_HEADER] == scan_first_message_id(raw)
+
+
+@pytest.mark.parametrize("body", [b"{not json", b"[1, 2]", b"\xff\xfe{"])
+def test_invalid_raw_body_is_acked_and_dropped_by_worker(webhook_app, body: bytes) -> None:
+    client = TestClient(webhook_app)
+    dispatcher: CaptureDispatcher = webhook_app.state.tasks_dispatcher
+
+    # Ingress raw não parseia: o corpo inválido chega ao worker como task
+    ingress = client.post(
+        "/webhooks/whatsapp", content=body, headers={"X-Hub-Signature-256": sign_webhook(body)}
+    )
+    assert ingress.status_code == 200
+    task = dispatcher.raw[0]
+
+    response = client.post(
+        "/internal/process_inbound",
+        content=task["body"],
+        headers={**task["headers"], "X-Internal-Token": "internal"},
+    )
+
+    # 2xx: o Cloud Tasks não reenvia uma task que nunca vai passar
+    assert response.status_code == 200
+    assert response.json()["status"] == "dropped"
+    assert dispatcher.inbound == []
+
+
+def test_build_task_sends_bytes_payload_unchanged() -> None:
+    raw = b'{"b": 2,  "a": 1}'
+
+    task = _build_task("https://internal.test/internal/process_inbound", raw, {"X-A": "1"}, None)
+
+    assert task.http_request.body == raw
+    assert task.http_request.headers["X-A"] == "1"